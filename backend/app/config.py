@@ -31,17 +31,35 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./jana.db"
+    db_pool_size: int = 10  # persistent connections per worker process
+    db_max_overflow: int = 10  # extra connections opened under bursts, closed when returned
+    db_pool_timeout: float = 10.0  # seconds to wait for a free connection before erroring
+    db_pool_recycle: int = 1800  # replace connections older than this (seconds); -1 never
+    db_pool_pre_ping: bool = True  # test connections on checkout and replace stale ones
+    db_statement_timeout_ms: int = 30000  # PostgreSQL statement_timeout; 0 disables
+    sqlite_busy_timeout_ms: int = 5000  # wait for SQLite's write lock instead of failing
+    sqlite_wal: bool = True  # WAL journal so readers don't block on the writer
     
     # JWT Authentication
     # Development-only default. Production must provide a strong SECRET_KEY.
     secret_key: str = UNSAFE_DEVELOPMENT_SECRET
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 24 * 7  # 7 days
+    user_cache_ttl_seconds: float = 30.0  # identity cache for get_current_user
+    user_cache_max_entries: int = 10_000
+    listening_audio_cache_ttl_seconds: float = 300.0  # question id -> audio file lookup
+    listening_audio_max_age_seconds: int = 86400  # browser Cache-Control for listening audio
+    leaderboard_refresh_seconds: float = 300.0  # reload in-memory leaderboards to see other workers' XP
+    password_hash_workers: int = 2  # bcrypt thread pool size; 0 hashes inline
+    password_hash_max_queue: int = 256  # waiting hashes before logins get 503
 
     # Authorization and browser access
     admin_emails: str = ""
     backend_cors_origins: str = "http://localhost:3000,http://127.0.0.1:3000,https://ielts-jana.vercel.app"
     rate_limit_enabled: bool = True
+    rate_limit_storage: str = ""  # limits storage URI; empty = REDIS_URL, else a local SQLite file
+    rate_limit_strategy: str = "sliding-window-counter"  # or fixed-window, moving-window (memory/redis only)
+    redis_url: str | None = None
     
     # Gamification
     base_xp: int = 10
@@ -60,7 +78,20 @@ class Settings(BaseSettings):
     ollama_base_url: str = "http://localhost:11434"
     ollama_model: str = "qwen2.5:7b"
     ollama_timeout_sec: int = 20
+    ollama_max_concurrency: int = 4  # in-flight Ollama requests per worker process
+    gemini_timeout_sec: int = 30
+    gemini_max_concurrency: int = 4
+    ai_queue_timeout_sec: float = 30.0  # wait for a provider slot before falling back
+    evaluation_workers: int = 2  # in-process evaluation job workers; 0 = separate worker process
+    evaluation_job_max_attempts: int = 3
+    evaluation_retry_backoff_sec: float = 5.0  # doubled on each retry
+    evaluation_poll_interval_sec: float = 2.0
+    evaluation_cache_ttl_seconds: float = 7 * 24 * 3600  # reuse identical evaluations; 0 disables
+    evaluation_cache_max_entries: int = 50_000  # least recently used entries are evicted beyond this
     whisper_model: str = "base"
+    whisper_max_queue: int = 8  # waiting clips before transcription is skipped
+    whisper_batch_size: int = 1  # >1 decodes queued clips under 30s together
+    whisper_preload: bool = False  # load the model at startup instead of on first use
     gemini_api_key: str | None = None
     
     # Email Configuration (SMTP)
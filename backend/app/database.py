@@ -1,17 +1,149 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from .config import get_settings
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from .config import Settings, get_settings, is_postgres_url
 
 settings = get_settings()
 
-# Create engine - for SQLite, need connect_args for thread safety
-connect_args = {"check_same_thread": False} if "sqlite" in settings.database_url else {}
-engine = create_engine(settings.database_url, connect_args=connect_args)
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._metrics_lock:
+                self.checkouts += 1
+                self.timeouts += timed_out
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool, InstrumentedQueuePool):
+    """The async engine's pool, with the same checkout metrics."""
+
+
+def engine_options(settings: Settings, poolclass: type = InstrumentedQueuePool) -> Dict[str, Any]:
+    """``create_engine`` keyword arguments for the configured database."""
+    url = make_url(settings.database_url)
+    if url.get_backend_name() == "sqlite":
+        # Sessions are used from FastAPI's threadpool as well as the event loop thread.
+        options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+        if url.database in (None, "", ":memory:"):
+            return options  # one shared in-memory database; SQLAlchemy picks the pool
+    else:
+        options = {"connect_args": {}}
+        if is_postgres_url(settings.database_url) and settings.db_statement_timeout_ms > 0:
+            options["connect_args"]["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    return options
+
+
+def configure_sqlite_pragmas(engine, settings: Settings) -> None:
+    """Set busy_timeout (and WAL for file databases) on every new SQLite connection."""
+    if engine.dialect.name != "sqlite":
+        return
+    use_wal = settings.sqlite_wal and engine.url.database not in (None, "", ":memory:")
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}")
+        if use_wal:
+            cursor.execute("PRAGMA journal_mode = WAL")
+            cursor.execute("PRAGMA synchronous = NORMAL")  # durable at checkpoints; safe with WAL
+        cursor.close()
+
+
+def async_database_url(database_url: str) -> str:
+    """The same database through an asyncio driver: aiosqlite, or psycopg 3 async for PostgreSQL."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if backend == "postgresql":
+        return url.set(drivername="postgresql+psycopg").render_as_string(hide_password=False)
+    return database_url
+
+
+def database_identity(bind) -> tuple:
+    """Which database an engine points at, ignoring the driver.
+
+    Process-wide caches key on this, so that the sync engine and the async
+    read path share one entry for the same database.
+    """
+    url = bind.url
+    if url.database in (None, "", ":memory:"):
+        return ("memory", id(bind))  # private to this engine
+    return url.get_backend_name(), url.host, url.port, url.database
+
+
+def pool_stats(engine) -> Dict[str, Any]:
+    """Connection pool occupancy and checkout wait times for health checks."""
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"pool": type(pool).__name__}
+    with pool._metrics_lock:
+        checkouts, timeouts = pool.checkouts, pool.timeouts
+        wait_seconds, max_wait_seconds = pool.wait_seconds, pool.max_wait_seconds
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "checkouts": checkouts,
+        "timeouts": timeouts,
+        "avg_wait_ms": round(wait_seconds / checkouts * 1000, 3) if checkouts else 0.0,
+        "max_wait_ms": round(max_wait_seconds * 1000, 3),
+    }
+
+
+engine = create_engine(settings.database_url, **engine_options(settings))
+configure_sqlite_pragmas(engine, settings)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async read path, side by side with the sync engine above. Read-heavy async
+# endpoints use it so that waiting on the database does not block the event loop.
+async_engine = create_async_engine(
+    async_database_url(settings.database_url),
+    **engine_options(settings, poolclass=InstrumentedAsyncQueuePool),
+)
+configure_sqlite_pragmas(async_engine.sync_engine, settings)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db():
     """Dependency to get database session."""
@@ -20,3 +152,37 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency to get an async database session for read endpoints.
+
+    Existing sync query code runs unchanged through ``await db.run_sync(fn)``.
+    ORM attributes must be read inside that call or loaded eagerly, because
+    lazy loads cannot run outside it.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def release_connection(db) -> None:
+    """
+    End the session's read transaction before a long await.
+
+    The pooled connection goes back to the pool; otherwise every request
+    waiting on slow work (bcrypt, AI providers) holds one, and a burst of them
+    exhausts the pool and blocks the event loop on checkout.
+    """
+    db.commit()
+
+
+def dialect_insert(db):
+    """Return the dialect-specific insert() supporting ON CONFLICT, or None."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
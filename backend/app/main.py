@@ -1,22 +1,58 @@
 """IELTS JANA - Gamified AI-Powered Reading Prep Platform"""
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
-from .database import engine, Base
+from .database import async_engine, engine, Base, SessionLocal, pool_stats
+from .ml import question_catalog, transcription_engine
 from .routers import (
     auth_router, questions_router, dashboard_router, 
     gamification_router, writing_router, speaking_router, 
     vocabulary_router, generator_router, mock_router,
     achievements_router, listening_router, admin_router,
     content_router, practice_router, review_router, study_plan_router,
-    prompts_router, plan_router, diagnostic_router
+    prompts_router, plan_router, diagnostic_router, evaluation_jobs_router
 )
 from .middleware.rate_limiter import setup_rate_limiter
+from .services.ai_provider import ollama_client
+from .services.evaluation_jobs import evaluation_workers
+from .services.password_hasher import PasswordHasherBusy, password_hasher
 from .config import get_settings
 
+
+def warm_question_catalog() -> None:
+    """Build the adaptive selector's question index before the first request."""
+    db = SessionLocal()
+    try:
+        question_catalog.get(db)
+    except SQLAlchemyError:
+        # Schema not migrated yet; the index is built lazily on first use.
+        question_catalog.invalidate()
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm process-wide caches and start workers on startup; stop them on shutdown."""
+    warm_question_catalog()
+    if get_settings().whisper_preload:
+        transcription_engine.warm()
+    if evaluation_workers.concurrency > 0:
+        await evaluation_workers.start()
+    yield
+    await evaluation_workers.stop()
+    await ollama_client.aclose()
+    password_hasher.shutdown()
+    transcription_engine.shutdown()
+    await async_engine.dispose()
+
+
 # Create FastAPI app
 settings = get_settings()
 app = FastAPI(
@@ -24,7 +60,8 @@ app = FastAPI(
     description="Gamified AI-powered IELTS Reading preparation platform",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -38,6 +75,16 @@ app.add_middleware(
 # Setup rate limiting
 setup_rate_limiter(app)
 
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Shed login/signup load once the bcrypt queue is full."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is temporarily busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
 # Keep local startup forgiving. Production must use Alembic migrations:
 #   cd backend && alembic upgrade head
 if settings.auto_create_tables:
@@ -63,6 +110,7 @@ app.include_router(study_plan_router, prefix="/api")
 app.include_router(prompts_router, prefix="/api")
 app.include_router(plan_router, prefix="/api")
 app.include_router(diagnostic_router, prefix="/api")
+app.include_router(evaluation_jobs_router, prefix="/api")
 
 
 @app.get("/")
@@ -83,8 +131,11 @@ async def health_check():
 
 
 @app.get("/api/health")
-async def api_health_check():
-    """Deployment health check with a lightweight database probe."""
+async def api_health_check(pool: bool = False):
+    """Deployment health check with a lightweight database probe.
+
+    ``?pool=true`` adds connection pool occupancy and checkout wait times.
+    """
     database_status = "ok"
     status_code = 200
     try:
@@ -101,4 +152,6 @@ async def api_health_check():
         "database": database_status,
         "version": app.version,
     }
+    if pool:
+        payload["pool"] = pool_stats(engine)
     return JSONResponse(status_code=status_code, content=payload)
@@ -0,0 +1,187 @@
+"""Rate limit counter storage shared by every worker process.
+
+slowapi keeps its counters in a ``limits`` storage backend. ``memory://`` is
+private to one process, so with N uvicorn workers each client effectively got
+N times the advertised limit. ``rate_limit_storage_uri`` picks a shared backend
+instead:
+
+* ``RATE_LIMIT_STORAGE`` when set (any ``limits`` URI, e.g. ``memory://`` to
+  opt back into per-process counters);
+* otherwise ``REDIS_URL``. The ``limits`` Redis backend runs each
+  sliding-window check as one Lua script, so a check costs one round trip and
+  is atomic across instances;
+* otherwise a SQLite file in the temp directory, via ``SQLiteStorage`` below.
+  This covers tests and single-box deployments without Redis.
+
+``SQLiteStorage`` keeps one ``(key, value, expires_at)`` row per window
+counter. A sliding-window check reads the previous and current windows and
+increments the current one inside a single ``BEGIN IMMEDIATE`` transaction.
+SQLite's write lock serializes that step across processes, so two workers
+cannot both take the last slot. WAL journaling keeps readers off the writer's
+lock, and expired rows are purged every ``PURGE_EVERY`` writes.
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from math import floor
+from typing import Optional, Tuple
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+
+from ..config import Settings
+
+
+DEFAULT_SQLITE_PATH = os.path.join(tempfile.gettempdir(), "jana-rate-limits.sqlite3")
+
+
+def rate_limit_storage_uri(settings: Settings) -> str:
+    """The ``limits`` storage URI the app's limiter should use."""
+    if settings.rate_limit_storage:
+        return settings.rate_limit_storage
+    if settings.redis_url:
+        return settings.redis_url
+    return f"sqlite:///{DEFAULT_SQLITE_PATH}"
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Fixed and sliding window counters in a SQLite file (``sqlite:///<path>``)."""
+
+    STORAGE_SCHEME = ["sqlite"]
+    PURGE_EVERY = 1000
+
+    def __init__(self, uri: Optional[str] = None, wrap_exceptions: bool = False, timeout: float = 5.0, **options):
+        path = (uri or f"sqlite:///{DEFAULT_SQLITE_PATH}").split("://", 1)[1]
+        self.path = path[1:] if path.startswith("/") else path
+        if not self.path:
+            raise ValueError("sqlite rate limit storage needs a file path, e.g. sqlite:////tmp/limits.sqlite3")
+        self.timeout = float(timeout)
+        self._local = threading.local()
+        self._writes = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_counters ("
+                "key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, reopened after a fork."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _transaction(self):
+        return _ImmediateTransaction(self._connection())
+
+    def _incr(self, connection: sqlite3.Connection, key: str, expiry: float, amount: int, now: float) -> int:
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            connection.execute("DELETE FROM rate_limit_counters WHERE expires_at <= ?", (now,))
+        return connection.execute(
+            "INSERT INTO rate_limit_counters (key, value, expires_at) VALUES (:key, :amount, :expires_at) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "value = CASE WHEN expires_at <= :now THEN :amount ELSE value + :amount END, "
+            "expires_at = CASE WHEN expires_at <= :now THEN :expires_at ELSE expires_at END "
+            "RETURNING value",
+            {"key": key, "amount": amount, "expires_at": now + expiry, "now": now},
+        ).fetchone()[0]
+
+    @staticmethod
+    def _counts(connection: sqlite3.Connection, now: float, *keys: str) -> dict:
+        placeholders = ", ".join("?" for _ in keys)
+        return dict(connection.execute(
+            f"SELECT key, value FROM rate_limit_counters WHERE key IN ({placeholders}) AND expires_at > ?",
+            (*keys, now),
+        ).fetchall())
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        with self._transaction() as connection:
+            return self._incr(connection, key, expiry, amount, time.time())
+
+    def get(self, key: str) -> int:
+        return self._counts(self._connection(), time.time(), key).get(key, 0)
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = self._connection().execute(
+            "SELECT expires_at FROM rate_limit_counters WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def clear(self, key: str) -> None:
+        self._connection().execute("DELETE FROM rate_limit_counters WHERE key = ?", (key,))
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> Optional[int]:
+        return self._connection().execute("DELETE FROM rate_limit_counters").rowcount
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        with self._transaction() as connection:
+            now = time.time()
+            previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+            counts = self._counts(connection, now, previous_key, current_key)
+            previous_count, previous_ttl = counts.get(previous_key, 0), self._previous_ttl(expiry, now)
+            weighted = previous_count * previous_ttl / expiry + counts.get(current_key, 0)
+            if floor(weighted) + amount > limit:
+                return False
+            self._incr(connection, current_key, 2 * expiry, amount, now)
+            return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        counts = self._counts(self._connection(), now, previous_key, current_key)
+        previous_count = counts.get(previous_key, 0)
+        return (
+            previous_count,
+            self._previous_ttl(expiry, now) if previous_count else 0.0,
+            counts.get(current_key, 0),
+            (1 - (now / expiry) % 1) * expiry + expiry,
+        )
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self._connection().execute(
+            "DELETE FROM rate_limit_counters WHERE key IN (?, ?)", (previous_key, current_key)
+        )
+
+    @staticmethod
+    def _previous_ttl(expiry: int, now: float) -> float:
+        """Seconds until the previous window stops counting towards the current one."""
+        return (1 - ((now - expiry) / expiry) % 1) * expiry
+
+
+class _ImmediateTransaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT``: takes SQLite's write lock up front."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
@@ -1,27 +1,110 @@
 """Rate limiting middleware using slowapi."""
 
+import threading
+from collections import Counter
+from typing import Any, Dict
+
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from fastapi import Request
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
 from ..config import get_settings
+from ..services.auth import decode_token
+from .rate_limit_storage import rate_limit_storage_uri
 
 
 def get_user_identifier(request: Request) -> str:
     """Get identifier for rate limiting - use user ID if authenticated, else IP."""
-    # Try to get user from request state (set by auth middleware)
-    if hasattr(request.state, 'user') and request.state.user:
-        return f"user:{request.state.user.id}"
+    # Set by UserIdentityMiddleware from a valid bearer token
+    user_id = getattr(request.state, "user_id", None)
+    if user_id:
+        return f"user:{user_id}"
     # Fall back to IP address
     return get_remote_address(request)
 
 
-# Create limiter instance
+class UserIdentityMiddleware:
+    """Put the bearer token's user id on ``request.state.user_id``.
+
+    Only the JWT signature and expiry are checked; there is no database
+    lookup. That is enough for a rate limit key, because a forged token
+    fails the signature check and falls back to the client IP. Endpoints still
+    authenticate through ``get_current_user``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            user_id = None
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    scheme, _, token = value.decode("latin-1").partition(" ")
+                    if scheme.lower() == "bearer" and token:
+                        user_id = decode_token(token.strip())
+                    break
+            scope.setdefault("state", {})["user_id"] = user_id
+        await self.app(scope, receive, send)
+
+
+class ThrottleStats:
+    """Counts requests rejected with 429, by route template and by limit."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Counter = Counter()
+        self._limits: Counter = Counter()
+
+    def record(self, request: Request, exc: RateLimitExceeded) -> None:
+        route = _route_template(request)
+        with self._lock:
+            self._routes[f"{request.method} {route}"] += 1
+            self._limits[str(exc.detail)] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._limits.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "throttled": sum(self._routes.values()),
+                "by_route": dict(self._routes.most_common()),
+                "by_limit": dict(self._limits.most_common()),
+            }
+
+
+def _route_template(request: Request) -> str:
+    """``/api/mock/{session_id}/writing`` rather than the concrete path, so ids don't fan out."""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", request.url.path)
+    return request.url.path
+
+
+throttle_stats = ThrottleStats()
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    """slowapi's 429 response, counted per route."""
+    throttle_stats.record(request, exc)
+    return _rate_limit_exceeded_handler(request, exc)
+
+
+# Create limiter instance. Counters live in shared storage so every worker
+# process and instance enforces the same budget (see rate_limit_storage).
 limiter = Limiter(
     key_func=get_user_identifier,
     default_limits=["200/minute"],  # Default limit for all endpoints
-    storage_uri="memory://",  # Use in-memory storage, can switch to Redis
+    storage_uri=rate_limit_storage_uri(get_settings()),
+    strategy=get_settings().rate_limit_strategy,
+    in_memory_fallback_enabled=True,  # per-process counters while the shared store is down
     enabled=get_settings().rate_limit_enabled,
 )
 
@@ -32,11 +115,26 @@ limiter = Limiter(
 SIGNUP_LIMIT = "5/minute"
 AUTH_LIMIT = "10/minute"  # Strict limit for login endpoints
 API_LIMIT = "100/minute"  # Normal limit for API endpoints
-HEAVY_LIMIT = "20/minute"  # Limit for heavy operations (AI, etc.)
+HEAVY_LIMIT = "20/minute"  # Token budget per user shared by heavy operations (AI, etc.)
+
+# Tokens a heavy request takes from the HEAVY_LIMIT budget
+WRITING_EVALUATION_COST = 2  # one LLM essay evaluation
+SPEAKING_EVALUATION_COST = 4  # transcription plus an LLM evaluation
+READING_GENERATION_COST = 5  # article fetch plus a long LLM generation
+
+
+def heavy_limit(cost: int):
+    """Charge ``cost`` tokens from the user's shared HEAVY_LIMIT budget; the default limit still applies.
+
+    The decorated endpoint needs a ``request: Request`` parameter.
+    """
+    return limiter.shared_limit(HEAVY_LIMIT, scope="heavy", cost=cost, override_defaults=False)
 
 
 def setup_rate_limiter(app):
     """Configure rate limiter for FastAPI app."""
     app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
     app.add_middleware(SlowAPIMiddleware)
+    # Added last so it runs first: SlowAPIMiddleware keys default limits on the user id.
+    app.add_middleware(UserIdentityMiddleware)
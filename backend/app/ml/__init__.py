@@ -1,7 +1,11 @@
 from .knowledge_tracing import KnowledgeTracer, BKTParams, knowledge_tracer
+from .question_catalog import QuestionCatalog, question_catalog
 from .adaptive_selector import AdaptiveSelector, adaptive_selector
+from .transcription import TranscriptionEngine, transcription_engine
 
 __all__ = [
     "KnowledgeTracer", "BKTParams", "knowledge_tracer",
-    "AdaptiveSelector", "adaptive_selector"
+    "QuestionCatalog", "question_catalog",
+    "AdaptiveSelector", "adaptive_selector",
+    "TranscriptionEngine", "transcription_engine",
 ]
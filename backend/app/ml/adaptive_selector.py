@@ -2,12 +2,12 @@
 
 from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 import random
 
-from ..models import Question, Attempt, UserSkillMastery, Skill
+from ..models import Question, Attempt, UserSkillMastery
 from ..services.module_skills import get_categories_for_module, normalize_module
 from .knowledge_tracing import knowledge_tracer
+from .question_catalog import CatalogIndex, SkillEntry, question_catalog
 
 
 class AdaptiveSelector:
@@ -43,6 +43,7 @@ class AdaptiveSelector:
             Tuple of (Question, target_skill_name, selection_reason)
         """
         normalized_module = normalize_module(module)
+        catalog = question_catalog.get(db)
 
         # Get user's skill masteries
         masteries = db.query(UserSkillMastery).filter(
@@ -54,23 +55,13 @@ class AdaptiveSelector:
         categories = get_categories_for_module(normalized_module)
         skills = []
         if categories:
-            skills = db.query(Skill).filter(Skill.category.in_(categories)).all()
+            skills = catalog.skills_in_categories(categories)
 
         if not skills:
-            skills = (
-                db.query(Skill)
-                .join(Question, Question.skill_id == Skill.id)
-                .filter(
-                    Question.module == normalized_module,
-                    Question.is_active == True,
-                    Question.approved == True,
-                )
-                .distinct()
-                .all()
-            )
+            skills = catalog.skills_with_questions(normalized_module)
 
         if not skills:
-            skills = db.query(Skill).all()
+            skills = catalog.all_skills()
         
         # Find target skill based on strategy
         target_skill, reason = self._select_target_skill(
@@ -97,56 +88,39 @@ class AdaptiveSelector:
         
         # Select question matching criteria
         question = self._select_question(
-            db, target_skill.id, target_difficulty, recent_ids, normalized_module, question_type
+            db, target_skill.id, target_difficulty, recent_ids, normalized_module, question_type, catalog
         )
         
         if question:
             return question, target_skill.name, reason
         
         # Fallback: any question from this skill
-        question = db.query(Question).filter(
-            Question.skill_id == target_skill.id,
-            Question.module == normalized_module,
-            Question.is_active == True,
-            Question.approved == True,
-            ~Question.id.in_(recent_ids) if recent_ids else True
-        ).first()
+        question = self._load(db, catalog.first_for_skill(target_skill.id, normalized_module, recent_ids))
         
         if question:
             return question, target_skill.name, f"{reason} (difficulty fallback)"
         
         # Last resort: any active question for the requested module. If this
         # switches skills, return that question's skill name to avoid a mismatch.
-        question_query = db.query(Question).filter(
-            Question.module == normalized_module,
-            Question.is_active == True,
-            Question.approved == True,
-        )
-
         question = None
         if categories:
-            question = (
-                question_query.join(Skill)
-                .filter(Skill.category.in_(categories))
-                .order_by(func.random())
-                .first()
-            )
+            question = self._load(db, catalog.random_for_module(normalized_module, categories))
 
         if not question:
-            question = question_query.order_by(func.random()).first()
+            question = self._load(db, catalog.random_for_module(normalized_module))
 
         if question and question.skill_id != target_skill.id:
-            question_skill = db.query(Skill).filter(Skill.id == question.skill_id).first()
+            question_skill = catalog.skills.get(question.skill_id)
             return question, question_skill.name if question_skill else "General", "No matching questions found"
         
         return question, target_skill.name if target_skill else "General", "No matching questions found"
     
     def _select_target_skill(
         self,
-        skills: List[Skill],
+        skills: List[SkillEntry],
         mastery_map: dict,
         preferred_category: Optional[str]
-    ) -> Tuple[Optional[Skill], str]:
+    ) -> Tuple[Optional[SkillEntry], str]:
         """Select which skill to target based on mastery and attempts."""
         
         if not skills:
@@ -226,6 +200,13 @@ class AdaptiveSelector:
         
         return [r[0] for r in recent]
     
+    @staticmethod
+    def _load(db: Session, question_id: Optional[int]) -> Optional[Question]:
+        """Load a catalog pick by primary key (identity map first)."""
+        if question_id is None:
+            return None
+        return db.get(Question, question_id)
+
     def _select_question(
         self,
         db: Session,
@@ -234,46 +215,19 @@ class AdaptiveSelector:
         exclude_ids: List[int],
         module: str,
         question_type: Optional[str],
+        catalog: Optional[CatalogIndex] = None,
     ) -> Optional[Question]:
         """Select a question matching skill and difficulty criteria."""
-        
-        # Query for questions with matching difficulty (±2 range)
-        query = db.query(Question).filter(
-            Question.skill_id == skill_id,
-            Question.module == normalize_module(module),
-            Question.is_active == True,
-            Question.approved == True,
-            Question.difficulty.between(max(1, target_difficulty - 2), min(10, target_difficulty + 2))
-        )
-        if question_type:
-            query = query.filter(Question.question_type == question_type)
-        
-        if exclude_ids:
-            query = query.filter(~Question.id.in_(exclude_ids))
-        
-        # Get all matching questions and pick randomly
-        questions = query.all()
-        
-        if not questions:
-            return None
-        
-        # Prefer questions closer to target difficulty
-        weights = []
-        for q in questions:
-            diff_distance = abs(q.difficulty - target_difficulty)
-            weight = 1 / (diff_distance + 1)
-            weights.append(weight)
-        
-        # Weighted random selection
-        total_weight = sum(weights)
-        r = random.random() * total_weight
-        cumsum = 0
-        for q, w in zip(questions, weights):
-            cumsum += w
-            if r <= cumsum:
-                return q
-        
-        return questions[0]
+        if catalog is None:
+            catalog = question_catalog.get(db)
+        # Questions within ±2 of the target difficulty, weighted towards it
+        return self._load(db, catalog.pick(
+            skill_id,
+            normalize_module(module),
+            target_difficulty,
+            exclude_ids,
+            question_type,
+        ))
 
 
 # Singleton instance
@@ -0,0 +1,223 @@
+"""Offline per-skill BKT parameter fitting.
+
+Attempts are streamed from the database ordered by (skill, user, attempt) in
+fixed-size chunks, so only one skill's compact sequence arrays are held in
+memory at a time. Each skill is fitted by maximizing the BKT log-likelihood:
+a coarse grid search picks a starting point and ``scipy.optimize`` (L-BFGS-B)
+refines it. Every likelihood evaluation is a vectorized forward pass that
+advances all (user, skill) sequences in lockstep.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import product
+from typing import Iterator, List, Optional
+
+import numpy as np
+from scipy.optimize import minimize
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import Attempt, Question, Skill
+from .knowledge_tracing import BKTParams, knowledge_tracer, lockstep_layout
+
+
+# (p_init, p_learn, p_guess, p_slip). Guess and slip stay below 0.5 so the
+# fitted model cannot degenerate into "mastery predicts wrong answers".
+PARAM_BOUNDS = ((0.01, 0.99), (0.01, 0.6), (0.01, 0.45), (0.01, 0.45))
+GRID = tuple(product((0.2, 0.4, 0.6), (0.05, 0.15, 0.3), (0.1, 0.25), (0.05, 0.15)))
+
+
+@dataclass
+class SkillSequences:
+    """One skill's attempts as dense sequence ids and outcomes."""
+    skill_id: int
+    sequence_ids: np.ndarray
+    outcomes: np.ndarray
+
+    @property
+    def n_sequences(self) -> int:
+        return int(self.sequence_ids.max()) + 1 if self.sequence_ids.size else 0
+
+
+@dataclass
+class SkillFit:
+    """Fitted parameters and fit diagnostics for one skill."""
+    skill_id: int
+    attempts: int
+    sequences: int
+    params: BKTParams
+    log_likelihood: float
+    default_log_likelihood: float
+    seconds: float
+    converged: bool
+
+
+def iter_skill_sequences(
+    db: Session,
+    chunk_size: int = 50_000,
+    max_sequence_length: int = 200,
+    max_attempts_per_skill: int = 5_000_000,
+) -> Iterator[SkillSequences]:
+    """
+    Stream attempts grouped by skill, yielding each skill once it is complete.
+
+    Sequences are truncated to their first ``max_sequence_length`` attempts
+    (late attempts of heavy users add little information about the
+    parameters) and each skill keeps at most ``max_attempts_per_skill``
+    attempts, which bounds memory independently of table size.
+    """
+    statement = select(
+        Question.skill_id, Attempt.user_id, Attempt.is_correct
+    ).join(
+        Question, Question.id == Attempt.question_id
+    ).order_by(
+        Question.skill_id, Attempt.user_id, Attempt.id
+    ).execution_options(yield_per=chunk_size)
+
+    current_skill = None
+    sequence_parts: List[np.ndarray] = []
+    outcome_parts: List[np.ndarray] = []
+    kept = next_sequence = run_length = 0
+    last_user = None
+
+    for partition in db.execute(statement).partitions():
+        skills = np.fromiter((row[0] for row in partition), dtype=np.int64, count=len(partition))
+        users = np.fromiter((row[1] for row in partition), dtype=np.int64, count=len(partition))
+        correct = np.fromiter((bool(row[2]) for row in partition), dtype=bool, count=len(partition))
+
+        boundaries = (np.flatnonzero(np.diff(skills)) + 1).tolist()
+        for start, end in zip([0] + boundaries, boundaries + [len(skills)]):
+            skill_id = int(skills[start])
+            if skill_id != current_skill:
+                if current_skill is not None:
+                    yield _finish_skill(current_skill, sequence_parts, outcome_parts)
+                current_skill = skill_id
+                sequence_parts, outcome_parts = [], []
+                kept = next_sequence = run_length = 0
+                last_user = None
+
+            segment_users = users[start:end]
+            count = end - start
+            new_run = np.empty(count, dtype=bool)
+            new_run[0] = segment_users[0] != last_user
+            new_run[1:] = segment_users[1:] != segment_users[:-1]
+            run_index = np.cumsum(new_run)
+            indexes = np.arange(count)
+            run_start = np.maximum.accumulate(np.where(new_run, indexes, -1))
+            # A run continued from the previous chunk keeps counting positions.
+            position = np.where(run_start >= 0, indexes - run_start, indexes + run_length)
+
+            keep = np.flatnonzero(position < max_sequence_length)[:max(0, max_attempts_per_skill - kept)]
+            sequence_parts.append((next_sequence - 1 + run_index[keep]).astype(np.int64))
+            outcome_parts.append(correct[start:end][keep])
+            kept += len(keep)
+
+            next_sequence += int(new_run.sum())
+            run_length = run_length + count if run_start[-1] < 0 else count - int(run_start[-1])
+            last_user = int(segment_users[-1])
+
+    if current_skill is not None:
+        yield _finish_skill(current_skill, sequence_parts, outcome_parts)
+
+
+def _finish_skill(skill_id: int, sequence_parts, outcome_parts) -> SkillSequences:
+    sequence_ids = np.concatenate(sequence_parts) if sequence_parts else np.empty(0, dtype=np.int64)
+    outcomes = np.concatenate(outcome_parts) if outcome_parts else np.empty(0, dtype=bool)
+    return SkillSequences(skill_id, sequence_ids, outcomes)
+
+
+def log_likelihood(layout, params: BKTParams) -> float:
+    """
+    Log-likelihood of all observed outcomes under ``params``.
+
+    ``layout`` comes from ``lockstep_layout``. Each step predicts
+    P(correct) = (1 - slip)·L + guess·(1 - L) for every active sequence, then
+    applies the same clamped update as ``KnowledgeTracer.update_mastery``.
+    """
+    by_length, active, outcomes = layout
+    state = np.full(len(by_length), params.p_init, dtype=np.float64)
+    p_obs_if_mastered = np.where(outcomes, 1 - params.p_slip, params.p_slip)
+    p_obs_if_not_mastered = np.where(outcomes, params.p_guess, 1 - params.p_guess)
+    total = 0.0
+    offset = 0
+    for count in active.tolist():
+        prior = state[:count]
+        numerator = p_obs_if_mastered[offset:offset + count] * prior
+        denominator = numerator + p_obs_if_not_mastered[offset:offset + count] * (1 - prior)
+        total += float(np.log(denominator).sum())
+        posterior = numerator / denominator
+        updated = posterior + (1 - posterior) * params.p_learn
+        state[:count] = np.minimum(0.99, np.maximum(0.01, updated))
+        offset += count
+    return total
+
+
+def fit_skill(sequences: SkillSequences, max_iterations: int = 100) -> SkillFit:
+    """Fit BKT parameters for one skill by grid search + L-BFGS-B."""
+    started = time.perf_counter()
+    layout = lockstep_layout(sequences.sequence_ids, sequences.outcomes, sequences.n_sequences)
+    attempts = len(sequences.outcomes)
+
+    def negative_mean_log_likelihood(values) -> float:
+        return -log_likelihood(layout, BKTParams(*values)) / attempts
+
+    start = min(GRID, key=negative_mean_log_likelihood)
+    result = minimize(
+        negative_mean_log_likelihood,
+        x0=np.array(start),
+        method="L-BFGS-B",
+        bounds=PARAM_BOUNDS,
+        options={"maxiter": max_iterations},
+    )
+    params = BKTParams(*(float(value) for value in result.x))
+    return SkillFit(
+        skill_id=sequences.skill_id,
+        attempts=attempts,
+        sequences=sequences.n_sequences,
+        params=params,
+        log_likelihood=log_likelihood(layout, params),
+        default_log_likelihood=log_likelihood(layout, knowledge_tracer.params),
+        seconds=time.perf_counter() - started,
+        converged=bool(result.success),
+    )
+
+
+def fit_all_skills(
+    db: Session,
+    chunk_size: int = 50_000,
+    max_sequence_length: int = 200,
+    max_attempts_per_skill: int = 5_000_000,
+    min_attempts: int = 200,
+    persist: bool = True,
+) -> List[SkillFit]:
+    """
+    Fit every skill with at least ``min_attempts`` attempts.
+
+    With ``persist`` the fitted parameters and diagnostics are stored on Skill
+    and the tracer's per-skill cache is invalidated.
+    """
+    fits = [
+        fit_skill(sequences)
+        for sequences in iter_skill_sequences(db, chunk_size, max_sequence_length, max_attempts_per_skill)
+        if len(sequences.outcomes) >= min_attempts
+    ]
+    if persist and fits:
+        # Written after streaming finishes so the open cursor is never
+        # invalidated by a commit.
+        fitted_at = datetime.now()
+        for fit in fits:
+            skill: Optional[Skill] = db.get(Skill, fit.skill_id)
+            if skill is None:
+                continue
+            skill.bkt_p_init = fit.params.p_init
+            skill.bkt_p_learn = fit.params.p_learn
+            skill.bkt_p_guess = fit.params.p_guess
+            skill.bkt_p_slip = fit.params.p_slip
+            skill.bkt_log_likelihood = fit.log_likelihood
+            skill.bkt_fit_attempts = fit.attempts
+            skill.bkt_fitted_at = fitted_at
+        db.commit()
+        knowledge_tracer.invalidate_skill_params()
+    return fits
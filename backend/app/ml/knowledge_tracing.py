@@ -1,7 +1,15 @@
 """Bayesian Knowledge Tracing implementation for IELTS Reading skill mastery."""
 
+import time
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..database import database_identity
+from ..models import Skill
 
 
 @dataclass
@@ -13,6 +21,39 @@ class BKTParams:
     p_slip: float = 0.1    # P(S) - Probability of slipping (wrong answer despite mastery)
 
 
+def lockstep_layout(
+    sequence_ids: np.ndarray,
+    outcomes: np.ndarray,
+    n_sequences: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Arrange attempts so all sequences can advance one step at a time.
+
+    Sequences are ranked longest first, so at step k the still-active
+    sequences are exactly ranks 0..active[k]-1 and that step's outcomes form
+    one contiguous slice (step offset + rank).
+
+    Returns:
+        (by_length, active, ordered_outcomes): sequence ids in rank order,
+        number of active sequences per step, and outcomes in step-major order.
+    """
+    # Position of each attempt within its sequence.
+    lengths = np.bincount(sequence_ids, minlength=n_sequences)
+    grouped = np.argsort(sequence_ids, kind="stable")
+    starts = np.cumsum(lengths) - lengths
+    steps = np.empty_like(sequence_ids)
+    steps[grouped] = np.arange(sequence_ids.size) - np.repeat(starts, lengths)
+
+    by_length = np.argsort(-lengths, kind="stable")
+    rank = np.empty(n_sequences, dtype=np.int64)
+    rank[by_length] = np.arange(n_sequences)
+    active = np.bincount(steps)
+    step_offsets = np.cumsum(active) - active
+    ordered_outcomes = np.empty_like(outcomes)
+    ordered_outcomes[step_offsets[steps] + rank[sequence_ids]] = outcomes
+    return by_length, active, ordered_outcomes
+
+
 class KnowledgeTracer:
     """
     Bayesian Knowledge Tracing for adaptive learning.
@@ -21,10 +62,55 @@ class KnowledgeTracer:
     a skill based on their performance on questions.
     """
     
-    def __init__(self, params: BKTParams = None):
+    # Below this many concurrently active sequences replay_sequences falls
+    # back to the scalar update, which beats NumPy's per-call overhead.
+    BATCH_MIN_ACTIVE = 16
+
+    def __init__(self, params: BKTParams = None, skill_params_ttl_seconds: float = 300.0):
         self.params = params or BKTParams()
+        self.skill_params_ttl_seconds = skill_params_ttl_seconds
+        self._skill_params: Optional[Dict[int, BKTParams]] = None
+        self._skill_params_database = None
+        self._skill_params_loaded_at = 0.0
+
+    def invalidate_skill_params(self) -> None:
+        """Reload fitted per-skill parameters on next use."""
+        self._skill_params = None
+
+    def params_for_skill(self, db: Session, skill_id: Optional[int]) -> BKTParams:
+        """
+        Return the fitted parameters for a skill, or the global defaults.
+
+        Fitted values live on Skill (see ``bkt_fitting``); they are cached for
+        ``skill_params_ttl_seconds`` and loaded for all skills in one query.
+        """
+        database = database_identity(db.get_bind())
+        if (
+            self._skill_params is None
+            or self._skill_params_database != database
+            or time.monotonic() - self._skill_params_loaded_at > self.skill_params_ttl_seconds
+        ):
+            self._skill_params = {
+                row.id: BKTParams(
+                    p_init=row.bkt_p_init,
+                    p_learn=row.bkt_p_learn,
+                    p_guess=row.bkt_p_guess,
+                    p_slip=row.bkt_p_slip,
+                )
+                for row in db.query(
+                    Skill.id, Skill.bkt_p_init, Skill.bkt_p_learn, Skill.bkt_p_guess, Skill.bkt_p_slip
+                ).filter(Skill.bkt_p_init.isnot(None))
+            }
+            self._skill_params_database = database
+            self._skill_params_loaded_at = time.monotonic()
+        return self._skill_params.get(skill_id, self.params)
     
-    def update_mastery(self, prior_mastery: float, is_correct: bool) -> float:
+    def update_mastery(
+        self,
+        prior_mastery: float,
+        is_correct: bool,
+        params: Optional[BKTParams] = None,
+    ) -> float:
         """
         Update mastery probability based on an attempt.
         
@@ -34,11 +120,12 @@ class KnowledgeTracer:
         Args:
             prior_mastery: Current mastery probability P(L)
             is_correct: Whether the answer was correct
+            params: Skill-specific parameters (defaults to the tracer's)
             
         Returns:
             Updated mastery probability
         """
-        p = self.params
+        p = params or self.params
         
         if is_correct:
             # P(correct | mastered) = 1 - P(slip)
@@ -70,6 +157,84 @@ class KnowledgeTracer:
         # Clamp to valid probability range
         return max(0.01, min(0.99, updated_mastery))
     
+    def replay_sequences(
+        self,
+        sequence_ids: Sequence[int],
+        outcomes: Sequence[bool],
+        initial_mastery: Optional[Sequence[float]] = None,
+        n_sequences: Optional[int] = None,
+        params: Optional[BKTParams] = None,
+    ) -> np.ndarray:
+        """
+        Replay many attempt sequences at once and return final mastery per sequence.
+
+        Equivalent to folding ``update_mastery`` over each sequence, bit for bit:
+        the same float64 operations run in the same order, including the
+        0.01/0.99 clamp. Sequences advance in lockstep, one vectorized update per
+        step position while enough sequences are active; the remaining tail of
+        a few very long sequences is finished with ``update_mastery``.
+
+        Args:
+            sequence_ids: Dense sequence index (0..n-1) of every attempt. Attempts
+                of one sequence must appear in chronological order; sequences
+                may be interleaved.
+            outcomes: Whether each attempt was correct.
+            initial_mastery: Starting P(L) per sequence (defaults to p_init).
+            n_sequences: Number of sequences, for sequences without attempts.
+            params: Parameters for every sequence (defaults to the tracer's).
+
+        Returns:
+            float64 array of final mastery, indexed by sequence id.
+        """
+        sequence_ids = np.asarray(sequence_ids, dtype=np.int64)
+        outcomes = np.asarray(outcomes, dtype=bool)
+        if n_sequences is None:
+            if initial_mastery is not None:
+                n_sequences = len(initial_mastery)
+            else:
+                n_sequences = int(sequence_ids.max()) + 1 if sequence_ids.size else 0
+        if initial_mastery is None:
+            mastery = np.full(n_sequences, (params or self.params).p_init, dtype=np.float64)
+        else:
+            mastery = np.array(initial_mastery, dtype=np.float64)
+        if not sequence_ids.size:
+            return mastery
+
+        by_length, active, correct = lockstep_layout(sequence_ids, outcomes, n_sequences)
+
+        p = params or self.params
+        p_obs_if_mastered = np.where(correct, 1 - p.p_slip, p.p_slip)
+        p_obs_if_not_mastered = np.where(correct, p.p_guess, 1 - p.p_guess)
+        state = mastery[by_length]
+        offset = 0
+        step = 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Vectorize while many sequences are active; a handful of long
+            # sequences is cheaper to finish with the scalar update itself.
+            while step < len(active) and active[step] >= self.BATCH_MIN_ACTIVE:
+                count = active[step]
+                prior = state[:count]
+                numerator = p_obs_if_mastered[offset:offset + count] * prior
+                denominator = numerator + p_obs_if_not_mastered[offset:offset + count] * (1 - prior)
+                posterior = np.where(denominator > 0, numerator / denominator, prior)
+                updated = posterior + (1 - posterior) * p.p_learn
+                state[:count] = np.minimum(0.99, np.maximum(0.01, updated))
+                offset += count
+                step += 1
+
+        if step < len(active):
+            tail = state[:active[step]].tolist()
+            tail_outcomes = correct[offset:].tolist()
+            position = 0
+            for count in active[step:].tolist():
+                for index in range(count):
+                    tail[index] = self.update_mastery(tail[index], tail_outcomes[position], p)
+                    position += 1
+            state[:len(tail)] = tail
+
+        mastery[by_length] = state
+        return mastery
+    
     def predict_performance(self, mastery: float) -> float:
         """
         Predict probability of correct answer given mastery level.
@@ -137,5 +302,16 @@ class KnowledgeTracer:
         return round(band_score * 2) / 2
 
 
+def default_params() -> BKTParams:
+    """Global BKT parameters from settings, used for skills without a fit."""
+    settings = get_settings()
+    return BKTParams(
+        p_init=settings.bkt_initial_mastery,
+        p_learn=settings.bkt_learn_rate,
+        p_guess=settings.bkt_guess_rate,
+        p_slip=settings.bkt_slip_rate,
+    )
+
+
 # Singleton instance for use across the app
-knowledge_tracer = KnowledgeTracer()
+knowledge_tracer = KnowledgeTracer(default_params())
@@ -0,0 +1,237 @@
+"""In-process index of practice questions for adaptive selection.
+
+The catalog keeps only the columns the selector filters on (id, module,
+skill, question type, difficulty) for active, approved questions, grouped by
+(module, skill_id, question_type, difficulty). Selection then picks an id in
+memory and loads exactly one Question by primary key instead of scanning the
+questions table on every /next call.
+
+The index is built lazily (and warmed at startup), rebuilt after ``ttl_seconds``
+so other worker processes eventually see content changes, and invalidated
+explicitly by admin content endpoints.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..database import database_identity
+from ..models import Question, Skill
+
+
+@dataclass(frozen=True)
+class SkillEntry:
+    """Session-independent view of a Skill row."""
+    id: int
+    name: str
+    category: str
+
+
+class CatalogIndex:
+    """Immutable question index; rebuilt wholesale, never mutated in place."""
+
+    def __init__(
+        self,
+        question_rows: Iterable[Tuple[int, str, int, str, Optional[int]]],
+        skill_rows: Iterable[Tuple[int, str, str]],
+    ):
+        self.skills: Dict[int, SkillEntry] = {
+            skill_id: SkillEntry(skill_id, name, category)
+            for skill_id, name, category in sorted(skill_rows)
+        }
+        self.by_key: Dict[Tuple[str, int, str, int], List[int]] = {}
+        self.types_by_skill: Dict[Tuple[str, int], Set[str]] = {}
+        self.by_skill: Dict[Tuple[str, int], List[int]] = {}
+        self.by_module_category: Dict[Tuple[str, str], List[int]] = {}
+        self.by_module: Dict[str, List[int]] = {}
+        self.key_by_id: Dict[int, Tuple[str, int, str, Optional[int]]] = {}
+
+        for question_id, module, skill_id, question_type, difficulty in sorted(question_rows):
+            self.key_by_id[question_id] = (module, skill_id, question_type, difficulty)
+            self.by_skill.setdefault((module, skill_id), []).append(question_id)
+            self.by_module.setdefault(module, []).append(question_id)
+            skill = self.skills.get(skill_id)
+            if skill is not None:
+                self.by_module_category.setdefault((module, skill.category), []).append(question_id)
+            if difficulty is None:
+                continue
+            self.by_key.setdefault((module, skill_id, question_type, difficulty), []).append(question_id)
+            self.types_by_skill.setdefault((module, skill_id), set()).add(question_type)
+
+    def __len__(self) -> int:
+        return len(self.key_by_id)
+
+    def skills_in_categories(self, categories: Sequence[str]) -> List[SkillEntry]:
+        wanted = set(categories)
+        return [skill for skill in self.skills.values() if skill.category in wanted]
+
+    def skills_with_questions(self, module: str) -> List[SkillEntry]:
+        return [
+            skill for skill in self.skills.values()
+            if (module, skill.id) in self.by_skill
+        ]
+
+    def all_skills(self) -> List[SkillEntry]:
+        return list(self.skills.values())
+
+    def pick(
+        self,
+        skill_id: int,
+        module: str,
+        target_difficulty: int,
+        exclude_ids: Iterable[int] = (),
+        question_type: Optional[str] = None,
+        spread: int = 2,
+    ) -> Optional[int]:
+        """
+        Weighted random pick within ``target_difficulty ± spread``.
+
+        Each question is weighted 1 / (|difficulty - target| + 1), matching the
+        original per-row weighting: a (type, difficulty) bucket is chosen with
+        weight × available rows, then a row uniformly within it.
+        """
+        types = (
+            [question_type] if question_type
+            else sorted(self.types_by_skill.get((module, skill_id), ()))
+        )
+        excluded = set(exclude_ids)
+        excluded_per_key: Dict[Tuple[str, int, str, int], int] = {}
+        for question_id in excluded:
+            key = self.key_by_id.get(question_id)
+            if key is not None and key[3] is not None:
+                excluded_per_key[key] = excluded_per_key.get(key, 0) + 1
+
+        buckets = []
+        total_weight = 0.0
+        for difficulty in range(max(1, target_difficulty - spread), min(10, target_difficulty + spread) + 1):
+            weight = 1 / (abs(difficulty - target_difficulty) + 1)
+            for candidate_type in types:
+                key = (module, skill_id, candidate_type, difficulty)
+                ids = self.by_key.get(key)
+                if not ids:
+                    continue
+                available = len(ids) - excluded_per_key.get(key, 0)
+                if available <= 0:
+                    continue
+                buckets.append((ids, weight * available))
+                total_weight += weight * available
+
+        if not buckets:
+            return None
+
+        r = random.random() * total_weight
+        ids = buckets[-1][0]
+        for bucket_ids, bucket_weight in buckets:
+            r -= bucket_weight
+            if r <= 0:
+                ids = bucket_ids
+                break
+        return _choice_excluding(ids, excluded)
+
+    def first_for_skill(self, skill_id: int, module: str, exclude_ids: Iterable[int] = ()) -> Optional[int]:
+        """Lowest-id question of a skill regardless of difficulty."""
+        excluded = set(exclude_ids)
+        for question_id in self.by_skill.get((module, skill_id), ()):
+            if question_id not in excluded:
+                return question_id
+        return None
+
+    def random_for_module(self, module: str, categories: Optional[Sequence[str]] = None) -> Optional[int]:
+        """Uniform random question of a module, optionally limited to categories."""
+        if categories:
+            pools = [
+                self.by_module_category[(module, category)]
+                for category in categories
+                if self.by_module_category.get((module, category))
+            ]
+        else:
+            pools = [self.by_module.get(module, [])]
+        total = sum(len(pool) for pool in pools)
+        if not total:
+            return None
+        index = random.randrange(total)
+        for pool in pools:
+            if index < len(pool):
+                return pool[index]
+            index -= len(pool)
+        return None
+
+
+def _choice_excluding(ids: List[int], excluded: Set[int]) -> Optional[int]:
+    """Uniform choice from ``ids`` skipping ``excluded`` without copying the list."""
+    if not excluded:
+        return random.choice(ids)
+    for _ in range(8):
+        candidate = random.choice(ids)
+        if candidate not in excluded:
+            return candidate
+    remaining = [question_id for question_id in ids if question_id not in excluded]
+    return random.choice(remaining) if remaining else None
+
+
+class QuestionCatalog:
+    """Process-wide holder of the current CatalogIndex."""
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self._index: Optional[CatalogIndex] = None
+        self._database = None
+        self._loaded_at = 0.0
+        self._building = False
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Force a rebuild on next use after questions or skills change."""
+        self._index = None
+
+    def get(self, db: Session) -> CatalogIndex:
+        """Return the index for ``db``'s database, rebuilding it when stale.
+
+        The build runs outside the lock: under ``AsyncSession.run_sync`` its
+        queries yield to the event loop, and another request on the same thread
+        would deadlock waiting for the lock. While one rebuild is in progress,
+        other requests keep using the stale index; they only build themselves
+        when there is no index for this database yet.
+        """
+        database = database_identity(db.get_bind())
+        with self._lock:
+            index = self._index
+            if index is not None and self._database == database and (
+                time.monotonic() - self._loaded_at <= self.ttl_seconds or self._building
+            ):
+                return index
+            self._building = True
+        try:
+            index = self.build(db)
+        finally:
+            with self._lock:
+                self._building = False
+        with self._lock:
+            self._index = index
+            self._database = database
+            self._loaded_at = time.monotonic()
+        return index
+
+    @staticmethod
+    def build(db: Session) -> CatalogIndex:
+        """Load the selectable question columns and all skills in two queries."""
+        question_rows = db.query(
+            Question.id,
+            Question.module,
+            Question.skill_id,
+            Question.question_type,
+            Question.difficulty,
+        ).filter(
+            Question.is_active == True,
+            Question.approved == True,
+        ).all()
+        skill_rows = db.query(Skill.id, Skill.name, Skill.category).all()
+        return CatalogIndex(question_rows, skill_rows)
+
+
+# Singleton instance
+question_catalog = QuestionCatalog()
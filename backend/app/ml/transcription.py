@@ -0,0 +1,338 @@
+"""Resident Whisper transcription engine.
+
+The configured ``whisper_model`` is loaded once per process and kept in
+memory. Requests go through a bounded queue to one dedicated worker thread, so
+the event loop never runs inference and a burst of uploads cannot start more
+transcriptions than the machine can hold. With ``batch_size > 1`` the worker
+takes several queued clips at once and decodes those that fit in Whisper's
+30-second window as a single batch; longer recordings are transcribed one by
+one.
+
+Whisper is optional: without the ``whisper`` package every request returns
+None and speaking evaluation falls back as before.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from ..config import get_settings
+
+
+SAMPLE_RATE = 16_000
+WINDOW_SECONDS = 30
+
+
+class WhisperBackend:
+    """Thin wrapper over the ``whisper`` package functions the engine uses."""
+
+    def __init__(self):
+        import whisper  # type: ignore
+
+        self.whisper = whisper
+
+    def load_model(self, name: str):
+        return self.whisper.load_model(name)
+
+    def load_audio(self, path: str):
+        return self.whisper.load_audio(path)
+
+    def transcribe(self, model, audio) -> str:
+        return str(model.transcribe(audio, language="en").get("text", "")).strip()
+
+    def transcribe_batch(self, model, audios: List[Any]) -> List[str]:
+        """Decode clips of at most 30 seconds in one forward pass."""
+        import torch  # type: ignore
+
+        whisper = self.whisper
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=model.dims.n_mels)
+            for audio in audios
+        ]).to(model.device)
+        options = whisper.DecodingOptions(language="en", fp16=model.device.type == "cuda")
+        return [result.text.strip() for result in whisper.decode(model, mels, options)]
+
+
+@dataclass
+class _Request:
+    audio_path: str
+    future: Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class TranscriptionEngine:
+    """Loads Whisper once and serves transcriptions from a bounded queue."""
+
+    def __init__(
+        self,
+        model_name: str,
+        backend_factory=WhisperBackend,
+        max_queue: int = 8,
+        batch_size: int = 1,
+        batch_window_sec: float = 0.05,
+    ):
+        self.model_name = model_name
+        self.backend_factory = backend_factory
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.batch_window_sec = batch_window_sec
+        self._backend = None
+        self._backend_missing = False
+        self._model = None
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._recent_waits = deque(maxlen=1024)
+        self.reset_stats()
+
+    @property
+    def available(self) -> bool:
+        """True when the Whisper backend can be imported."""
+        return self._get_backend() is not None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    async def transcribe(self, audio_path: str) -> Optional[str]:
+        """Transcript of ``audio_path``, or None when unavailable, busy or failed."""
+        future = self.submit(audio_path)
+        if future is None:
+            return None
+        try:
+            return await asyncio.wrap_future(future)
+        except Exception as e:
+            print(f"Local Whisper transcription error: {e}")
+            return None
+
+    def submit(self, audio_path: str) -> Optional[Future]:
+        """Queue a clip; None when Whisper is missing or the queue is full."""
+        if not self.available:
+            return None
+        self._ensure_worker()
+        request = _Request(audio_path, Future())
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            return None
+        return request.future
+
+    def warm(self) -> None:
+        """Load the model on the worker thread without waiting for it."""
+        if self.available:
+            self._ensure_worker()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._put_stop()
+            thread.join()
+
+    def _put_stop(self) -> None:
+        """Queue the stop marker, failing queued requests to make room if the queue is full."""
+        while True:
+            try:
+                self._queue.put_nowait(None)
+                return
+            except queue.Full:
+                pass
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                continue
+            if request is not None and self._claim(request):
+                self._fail(request, RuntimeError("transcription engine shut down"))
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.load_seconds: Optional[float] = None
+            self.completed = 0
+            self.failed = 0
+            self.rejected = 0
+            self.cancelled = 0
+            self.batches = 0
+            self.dequeued = 0
+            self.wait_seconds_total = 0.0
+            self.audio_seconds_total = 0.0
+            self.processing_seconds_total = 0.0
+            self.last_real_time_factor: Optional[float] = None
+            self._recent_waits.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Model load time, queue wait and real-time factor (processing / audio seconds)."""
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            return {
+                "model": self.model_name,
+                "available": not self._backend_missing,
+                "loaded": self._model is not None,
+                "load_seconds": round(self.load_seconds, 2) if self.load_seconds is not None else None,
+                "queued": self._queue.qsize(),
+                "max_queue": self.max_queue,
+                "batch_size": self.batch_size,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "cancelled": self.cancelled,
+                "batches": self.batches,
+                "avg_wait_ms": (
+                    round(self.wait_seconds_total / self.dequeued * 1000, 2) if self.dequeued else 0.0
+                ),
+                "p95_wait_ms": round(waits[int(0.95 * (len(waits) - 1))] * 1000, 2) if waits else 0.0,
+                "real_time_factor": (
+                    round(self.processing_seconds_total / self.audio_seconds_total, 3)
+                    if self.audio_seconds_total else None
+                ),
+                "last_real_time_factor": self.last_real_time_factor,
+            }
+
+    def _get_backend(self):
+        if self._backend is None and not self._backend_missing:
+            try:
+                self._backend = self.backend_factory()
+            except ImportError:
+                self._backend_missing = True
+        return self._backend
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="whisper-transcription", daemon=True)
+                self._thread.start()
+
+    def _load_model(self):
+        if self._model is None:
+            started = time.monotonic()
+            self._model = self._backend.load_model(self.model_name)
+            with self._lock:
+                self.load_seconds = time.monotonic() - started
+        return self._model
+
+    def _run(self) -> None:
+        try:
+            self._load_model()
+        except Exception as e:
+            # Requests retry the load and report the error individually.
+            print(f"Local Whisper model load error: {e}")
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            batch = [request] if self._claim(request) else []
+            deadline = time.monotonic() + self.batch_window_sec
+            while batch and len(batch) < self.batch_size:
+                try:
+                    extra = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if extra is None:
+                    self._process_safely(batch)
+                    return
+                if self._claim(extra):
+                    batch.append(extra)
+            self._process_safely(batch)
+
+    def _claim(self, request: _Request) -> bool:
+        """Mark the request running; False when its caller already cancelled it."""
+        if request.future.set_running_or_notify_cancel():
+            return True
+        with self._lock:
+            self.cancelled += 1
+        return False
+
+    def _process_safely(self, batch: List[_Request]) -> None:
+        """Run a batch; an unexpected error fails its requests but never the worker thread."""
+        if not batch:
+            return
+        try:
+            self._process(batch)
+        except Exception as e:
+            for request in batch:
+                self._fail(request, e)
+
+    def _process(self, batch: List[_Request]) -> None:
+        started = time.monotonic()
+        with self._lock:
+            for request in batch:
+                wait = started - request.enqueued_at
+                self.wait_seconds_total += wait
+                self._recent_waits.append(wait)
+            self.dequeued += len(batch)
+            self.batches += 1
+
+        try:
+            model = self._load_model()
+        except Exception as e:
+            for request in batch:
+                self._fail(request, e)
+            return
+
+        audios = {}
+        for request in batch:
+            try:
+                audios[id(request)] = self._backend.load_audio(request.audio_path)
+            except Exception as e:
+                self._fail(request, e)
+
+        loaded = [request for request in batch if id(request) in audios]
+        short = [r for r in loaded if len(audios[id(r)]) <= WINDOW_SECONDS * SAMPLE_RATE]
+        if len(short) > 1:
+            try:
+                batch_started = time.monotonic()
+                texts = self._backend.transcribe_batch(model, [audios[id(r)] for r in short])
+                elapsed = time.monotonic() - batch_started
+                batch_samples = sum(len(audios[id(r)]) for r in short) or 1
+                for request, text in zip(short, texts):
+                    # Each clip is charged its share of the batch, by length.
+                    audio = audios[id(request)]
+                    self._succeed(request, text, audio, elapsed * len(audio) / batch_samples)
+            except Exception as e:
+                for request in short:
+                    self._fail(request, e)
+            singles = [r for r in loaded if r not in short]
+        else:
+            singles = loaded
+
+        for request in singles:
+            single_started = time.monotonic()
+            try:
+                text = self._backend.transcribe(model, audios[id(request)])
+            except Exception as e:
+                self._fail(request, e)
+                continue
+            self._succeed(request, text, audios[id(request)], time.monotonic() - single_started)
+
+    def _succeed(self, request: _Request, text: str, audio, elapsed: float) -> None:
+        """Resolve the request; ``elapsed`` is the inference time spent on this clip."""
+        audio_seconds = len(audio) / SAMPLE_RATE
+        with self._lock:
+            self.completed += 1
+            self.processing_seconds_total += elapsed
+            self.audio_seconds_total += audio_seconds
+            if audio_seconds:
+                self.last_real_time_factor = round(elapsed / audio_seconds, 3)
+        if not request.future.done():
+            request.future.set_result(text)
+
+    def _fail(self, request: _Request, error: Exception) -> None:
+        if request.future.done():
+            return  # already answered before the error
+        with self._lock:
+            self.failed += 1
+        request.future.set_exception(error)
+
+
+# Singleton instance
+transcription_engine = TranscriptionEngine(
+    get_settings().whisper_model,
+    max_queue=get_settings().whisper_max_queue,
+    batch_size=get_settings().whisper_batch_size,
+)
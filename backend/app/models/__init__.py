@@ -2,13 +2,15 @@ from .models import (
     User, Skill, Question, Attempt, UserSkillMastery, DashboardMetric,
     MockTestSession, Achievement, UserAchievement, TestSet, WritingAttempt,
     SpeakingAttempt, WritingPrompt, SpeakingPrompt, MistakeReview, StudyPlanItem,
-    DiagnosticSession, DiagnosticSessionQuestion
+    DiagnosticSession, DiagnosticSessionQuestion, UserStatsSnapshot, EvaluationJob,
+    EvaluationCacheEntry
 )
 
 __all__ = [
     "User", "Skill", "Question", "Attempt", "UserSkillMastery", "DashboardMetric",
     "MockTestSession", "Achievement", "UserAchievement", "TestSet", "WritingAttempt",
     "SpeakingAttempt", "WritingPrompt", "SpeakingPrompt", "MistakeReview", "StudyPlanItem",
-    "DiagnosticSession", "DiagnosticSessionQuestion"
+    "DiagnosticSession", "DiagnosticSessionQuestion", "UserStatsSnapshot", "EvaluationJob",
+    "EvaluationCacheEntry"
 ]
 
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, JSON, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, JSON, UniqueConstraint, Index
+from sqlalchemy.orm import backref, relationship
 from sqlalchemy.sql import func
 from ..database import Base
 
@@ -31,6 +31,11 @@ class User(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
+    # Leaderboard order: (xp DESC, id) reads without a sort
+    __table_args__ = (
+        Index("ix_users_xp_id", xp.desc(), id),
+    )
+    
     # Relationships
     attempts = relationship("Attempt", back_populates="user")
     skill_masteries = relationship("UserSkillMastery", back_populates="user")
@@ -48,6 +53,15 @@ class Skill(Base):
     parent_skill_id = Column(Integer, ForeignKey("skills.id"), nullable=True)
     mastery_threshold = Column(Float, default=0.7)  # Required to "unlock" next skill
     
+    # Fitted BKT parameters (NULL = use the global defaults from settings)
+    bkt_p_init = Column(Float, nullable=True)
+    bkt_p_learn = Column(Float, nullable=True)
+    bkt_p_guess = Column(Float, nullable=True)
+    bkt_p_slip = Column(Float, nullable=True)
+    bkt_log_likelihood = Column(Float, nullable=True)
+    bkt_fit_attempts = Column(Integer, nullable=True)
+    bkt_fitted_at = Column(DateTime, nullable=True)
+    
     # Relationships
     questions = relationship("Question", back_populates="skill")
     user_masteries = relationship("UserSkillMastery", back_populates="skill")
@@ -57,6 +71,10 @@ class Skill(Base):
 class Question(Base):
     """Practice questions with passages or audio."""
     __tablename__ = "questions"
+    __table_args__ = (
+        # The servable pool (active, approved) per module, then by skill and difficulty
+        Index("ix_questions_module_active_skill", "module", "is_active", "approved", "skill_id", "difficulty"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     skill_id = Column(Integer, ForeignKey("skills.id"), nullable=False)
@@ -123,7 +141,15 @@ class TestSet(Base):
 class Attempt(Base):
     """User attempt on a question."""
     __tablename__ = "attempts"
-    
+    __table_args__ = (
+        # A learner's history by date (dashboard, plan, daily counts) and per question (selector)
+        Index("ix_attempts_user_created", "user_id", "created_at"),
+        Index("ix_attempts_user_question", "user_id", "question_id"),
+    )
+    # Fetch server defaults (created_at) with RETURNING at insert time so the
+    # submission pipeline never needs a refresh SELECT after committing.
+    __mapper_args__ = {"eager_defaults": True}
+
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
@@ -200,6 +226,7 @@ class WritingAttempt(Base):
     band_score = Column(Float, default=0.0)
     criterion_scores = Column(JSON, default=dict)
     feedback = Column(JSON, default=dict)
+    evaluation_status = Column(String(20), default="completed", server_default="completed", nullable=False)  # pending, completed, failed
     created_at = Column(DateTime, server_default=func.now())
 
     user = relationship("User", backref="writing_attempts")
@@ -218,11 +245,56 @@ class SpeakingAttempt(Base):
     band_score = Column(Float, default=0.0)
     criterion_scores = Column(JSON, default=dict)
     feedback = Column(JSON, default=dict)
+    evaluation_status = Column(String(20), default="completed", server_default="completed", nullable=False)  # pending, completed, failed
     created_at = Column(DateTime, server_default=func.now())
 
     user = relationship("User", backref="speaking_attempts")
 
 
+class EvaluationJob(Base):
+    """Queued writing/speaking evaluation; the table is the job queue itself."""
+    __tablename__ = "evaluation_jobs"
+    __table_args__ = (
+        Index("ix_evaluation_jobs_status_available", "status", "available_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    kind = Column(String(20), nullable=False)  # writing, speaking
+    attempt_id = Column(Integer, nullable=False)  # WritingAttempt or SpeakingAttempt id
+    status = Column(String(20), default="pending", nullable=False)  # pending, running, succeeded, failed
+    payload = Column(JSON, default=dict)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    provider = Column(String(50), nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+
+    # Queue timestamps
+    available_at = Column(DateTime, nullable=False)  # not claimable before (retry backoff)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    user = relationship("User", backref="evaluation_jobs")
+
+
+class EvaluationCacheEntry(Base):
+    """Stored AI evaluation keyed by a hash of provider, model and submission."""
+    __tablename__ = "evaluation_cache"
+    __table_args__ = (
+        Index("ix_evaluation_cache_last_used_at", "last_used_at"),
+    )
+
+    key = Column(String(64), primary_key=True)  # sha256 hex digest
+    kind = Column(String(20), nullable=False)  # writing, speaking
+    provider = Column(String(50), nullable=True)
+    result = Column(JSON, nullable=False)
+    hits = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, nullable=False)  # TTL is measured from here
+    last_used_at = Column(DateTime, nullable=False)  # LRU eviction order
+
+
 class WritingPrompt(Base):
     """IELTS Writing Task 1/2 prompt bank."""
     __tablename__ = "writing_prompts"
@@ -257,6 +329,9 @@ class SpeakingPrompt(Base):
 class MistakeReview(Base):
     """Persistent mistake log for review sessions."""
     __tablename__ = "mistake_reviews"
+    __table_args__ = (
+        Index("ix_mistake_reviews_user_resolved_created", "user_id", "is_resolved", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -297,6 +372,9 @@ class StudyPlanItem(Base):
 class UserSkillMastery(Base):
     """Tracks user's mastery probability per skill."""
     __tablename__ = "user_skill_masteries"
+    __table_args__ = (
+        UniqueConstraint("user_id", "skill_id", name="uq_user_skill_mastery_user_skill"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -317,15 +395,14 @@ class UserSkillMastery(Base):
     # Relationships
     user = relationship("User", back_populates="skill_masteries")
     skill = relationship("Skill", back_populates="user_masteries")
-    
-    class Config:
-        # Unique constraint on user_id + skill_id
-        pass
 
 
 class DashboardMetric(Base):
-    """Daily aggregated metrics for dashboard."""
+    """Daily aggregated metrics for dashboard, maintained incrementally per attempt."""
     __tablename__ = "dashboard_metrics"
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", name="uq_dashboard_metric_user_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -336,6 +413,7 @@ class DashboardMetric(Base):
     total_attempts = Column(Integer, default=0)
     correct_attempts = Column(Integer, default=0)
     accuracy_rate = Column(Float, nullable=True)
+    response_time_sum_ms = Column(Integer, default=0)  # Running sum backing avg_response_time_ms
     avg_response_time_ms = Column(Float, nullable=True)
     xp_earned = Column(Integer, default=0)
     
@@ -343,6 +421,45 @@ class DashboardMetric(Base):
     user = relationship("User", back_populates="dashboard_metrics")
 
 
+class UserStatsSnapshot(Base):
+    """Lifetime practice totals per user, updated in the same transaction as each attempt."""
+    __tablename__ = "user_stats_snapshots"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+
+    # Lifetime totals
+    total_attempts = Column(Integer, default=0, nullable=False)
+    correct_attempts = Column(Integer, default=0, nullable=False)
+    response_time_sum_ms = Column(Integer, default=0, nullable=False)
+
+    # Per-module raw scores
+    reading_attempts = Column(Integer, default=0, nullable=False)
+    reading_correct = Column(Integer, default=0, nullable=False)
+    listening_attempts = Column(Integer, default=0, nullable=False)
+    listening_correct = Column(Integer, default=0, nullable=False)
+
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    user = relationship("User", backref=backref("stats_snapshot", uselist=False))
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct_attempts / self.total_attempts if self.total_attempts else 0
+
+    @property
+    def avg_response_time_ms(self) -> float:
+        return self.response_time_sum_ms / self.total_attempts if self.total_attempts else 0
+
+    def module_totals(self, module: str) -> tuple[int, int]:
+        """Return (attempts, correct) for READING or LISTENING."""
+        if module == "READING":
+            return self.reading_attempts or 0, self.reading_correct or 0
+        if module == "LISTENING":
+            return self.listening_attempts or 0, self.listening_correct or 0
+        return 0, 0
+
+
 class Vocabulary(Base):
     """Vocabulary words for SRS study."""
     __tablename__ = "vocabulary"
@@ -359,6 +476,9 @@ class Vocabulary(Base):
 class UserVocabulary(Base):
     """Joint table for User <-> Vocabulary with SRS state."""
     __tablename__ = "user_vocabulary"
+    __table_args__ = (
+        Index("ix_user_vocabulary_user_next_review", "user_id", "next_review_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
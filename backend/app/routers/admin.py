@@ -1,16 +1,28 @@
 """Admin API router for content management."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 from sqlalchemy import case, func
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from datetime import datetime, timedelta
 
-from ..database import get_db
+from ..database import engine, get_db, pool_stats
 from ..models import User, Question, Skill, Achievement, UserAchievement, Attempt, TestSet
 from ..routers.auth import get_current_user
 from ..config import get_settings
+from ..middleware.rate_limiter import limiter, throttle_stats
+from ..ml import question_catalog, transcription_engine
+from ..services.achievements import achievement_engine
+from ..services.content_import import ContentImporter
+from ..services.identity_cache import user_identity_cache
+from ..services.ai_provider import provider_stats
+from ..services.audio_streaming import listening_audio_cache
+from ..services.leaderboard import leaderboard
+from ..services.evaluation_cache import evaluation_cache
+from ..services.evaluation_jobs import evaluation_workers
+from ..services.password_hasher import password_hasher
+from ..services.user_stats import get_user_stats_snapshot
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -151,6 +163,46 @@ async def admin_dashboard(
     }
 
 
+@router.get("/cache-stats")
+async def cache_stats(
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """Hit/miss counters for in-process and persistent caches."""
+    return {
+        "user_identity": user_identity_cache.stats(),
+        "evaluations": evaluation_cache.stats(db),
+        "listening_audio": listening_audio_cache.stats(),
+        "leaderboard": leaderboard.stats(),
+    }
+
+
+@router.get("/worker-stats")
+async def worker_stats(
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """Queue depth and wait-time counters for worker pools and job queues."""
+    return {
+        "password_hasher": password_hasher.stats(),
+        "ai_providers": provider_stats(),
+        "evaluation_jobs": evaluation_workers.stats(db),
+        "transcription": transcription_engine.stats(),
+        "database_pool": pool_stats(engine),
+    }
+
+
+@router.get("/rate-limit-stats")
+async def rate_limit_stats(admin: User = Depends(require_admin)):
+    """Requests rejected with 429 since this worker started, by route and by limit."""
+    return {
+        "enabled": limiter.enabled,
+        "storage": type(limiter._storage).__name__,
+        "storage_healthy": not limiter._storage_dead,
+        **throttle_stats.stats(),
+    }
+
+
 # ============ Questions CRUD ============
 
 @router.get("/questions")
@@ -201,6 +253,7 @@ async def create_question(
     db.add(question)
     db.commit()
     db.refresh(question)
+    question_catalog.invalidate()
     
     return {"id": question.id, "message": "Question created successfully"}
 
@@ -247,6 +300,8 @@ async def update_question(
         setattr(question, key, value)
     
     db.commit()
+    question_catalog.invalidate()
+    listening_audio_cache.invalidate(question_id)
     return {"message": "Question updated successfully"}
 
 
@@ -263,6 +318,8 @@ async def delete_question(
     
     db.delete(question)
     db.commit()
+    question_catalog.invalidate()
+    listening_audio_cache.invalidate(question_id)
     return {"message": "Question deleted successfully"}
 
 
@@ -272,49 +329,66 @@ async def import_content(
     admin: User = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
-    """Import IELTS-style content from JSON. Imported content requires approval by default."""
-    created_sets = []
-    for item in payload:
-        test_set = TestSet(
-            title=item.title,
-            module=item.module.upper(),
-            section=item.section,
-            instructions=item.instructions,
-            passage=item.passage,
-            audio_url=item.audio_url,
-            transcript=item.transcript,
-            source=item.source,
-            estimated_band=item.estimated_band,
-            time_limit_minutes=item.time_limit_minutes,
-            needs_review=item.needs_review,
-            approved=not item.needs_review,
+    """Import IELTS-style content from JSON. Imported content requires approval by default.
+
+    All or nothing: if any test set references an unknown skill, nothing is
+    imported and the rejected items are returned with a 422.
+    """
+    importer = ContentImporter(db, validate=False)
+    for line, item in enumerate(payload, start=1):
+        importer.add(item, line)
+    if importer.failed:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"failed": importer.failed, "errors": importer.errors},
         )
-        db.add(test_set)
-        db.flush()
-        for q in item.questions:
-            db.add(Question(
-                skill_id=q.skill_id,
-                test_set_id=test_set.id,
-                module=item.module.upper(),
-                section=item.section,
-                passage=item.passage or item.transcript,
-                passage_title=item.title,
-                audio_url=item.audio_url,
-                audio_duration_sec=None,
-                question_text=q.question_text,
-                question_type=q.question_type,
-                options=q.options,
-                correct_answer=q.correct_answer,
-                difficulty=q.difficulty,
-                estimated_band=q.estimated_band,
-                explanation=q.explanation,
-                tags=q.tags,
-                needs_review=item.needs_review,
-                approved=not item.needs_review,
-            ))
-        created_sets.append(test_set.id)
-    db.commit()
-    return {"created_test_sets": created_sets, "count": len(created_sets)}
+    report = importer.finish()
+    question_catalog.invalidate()
+    return report
+
+
+def _import_ndjson_line(importer: ContentImporter, raw: bytes, line: int) -> None:
+    if not raw.strip():
+        return
+    try:
+        item = ImportTestSet.model_validate_json(raw)
+    except ValidationError as e:
+        importer.reject(line, [
+            f"{'.'.join(str(part) for part in error['loc']) or 'line'}: {error['msg']}"
+            for error in e.errors()
+        ])
+        return
+    importer.add(item, line)
+
+
+@router.post("/content/import/ndjson")
+async def import_content_ndjson(
+    request: Request,
+    validate: bool = True,
+    batch_size: int = Query(2000, ge=1, le=50_000),
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Stream-import test sets, one ImportTestSet JSON object per line.
+
+    Lines are parsed and validated as the body arrives and inserted in batches
+    of ``batch_size`` questions in one transaction. Invalid lines are skipped
+    and reported by line number.
+    """
+    importer = ContentImporter(db, batch_size=batch_size, validate=validate)
+    pending = b""
+    line = 0
+    async for chunk in request.stream():
+        *complete, pending = (pending + chunk).split(b"\n")
+        for raw in complete:
+            line += 1
+            _import_ndjson_line(importer, raw, line)
+    if pending.strip():
+        _import_ndjson_line(importer, pending, line + 1)
+    report = importer.finish()
+    question_catalog.invalidate()
+    return report
 
 
 @router.get("/content")
@@ -372,6 +446,7 @@ async def approve_content(
         "needs_review": False,
     })
     db.commit()
+    question_catalog.invalidate()
     return {"message": "Content approved", "id": content_id}
 
 
@@ -428,9 +503,7 @@ async def get_user_details(
         raise HTTPException(status_code=404, detail="User not found")
     
     # Get user stats
-    attempts = db.query(Attempt).filter(Attempt.user_id == user_id).all()
-    total_attempts = len(attempts)
-    correct_attempts = sum(1 for a in attempts if a.is_correct)
+    stats = get_user_stats_snapshot(db, user_id)
     
     # Get achievements
     user_achievements = db.query(UserAchievement).filter(
@@ -449,9 +522,9 @@ async def get_user_details(
         "is_email_verified": getattr(user, 'is_email_verified', False),
         "created_at": user.created_at.isoformat() if user.created_at else None,
         "stats": {
-            "total_attempts": total_attempts,
-            "correct_attempts": correct_attempts,
-            "accuracy": correct_attempts / total_attempts if total_attempts > 0 else 0,
+            "total_attempts": stats.total_attempts,
+            "correct_attempts": stats.correct_attempts,
+            "accuracy": stats.accuracy,
             "achievements_unlocked": user_achievements,
         },
     }
@@ -503,6 +576,7 @@ async def create_achievement(
     db.add(achievement)
     db.commit()
     db.refresh(achievement)
+    achievement_engine.invalidate()
     
     return {"id": achievement.id, "message": "Achievement created successfully"}
 
@@ -522,5 +596,6 @@ async def delete_achievement(
     db.query(UserAchievement).filter(UserAchievement.achievement_id == achievement_id).delete()
     db.delete(achievement)
     db.commit()
+    achievement_engine.invalidate()
     
     return {"message": "Achievement deleted successfully"}
@@ -3,20 +3,22 @@
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..schemas import UserCreate, UserResponse, UserLogin, Token
 from ..services import (
-    create_user, authenticate_user, get_user_by_email, get_user_by_id,
+    create_user_async, authenticate_user_async, get_user_by_email,
     create_access_token, decode_token
 )
 from ..services.email_service import (
     send_verification_email, send_password_reset_email,
     verify_email_token, create_email_token
 )
-from ..services.auth import get_password_hash, validate_user_password
+from ..services.auth import get_password_hash_async, validate_user_password
+from ..services.identity_cache import user_identity_cache
 from ..models import User
 from ..middleware.rate_limiter import AUTH_LIMIT, SIGNUP_LIMIT, limiter
 
@@ -58,13 +60,33 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    user = get_user_by_id(db, user_id)
+    user = user_identity_cache.get(db, user_id)
     if user is None:
         raise credentials_exception
     
     return user
 
 
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """``get_current_user`` for endpoints on the async read path.
+
+    The user is attached to the request's ``AsyncSession``, so code that runs
+    inside ``db.run_sync`` can use it like any other loaded instance.
+    """
+    user_id = decode_token(token)
+    user = await db.run_sync(user_identity_cache.get, user_id) if user_id is not None else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit(SIGNUP_LIMIT)
 async def signup(
@@ -82,7 +104,7 @@ async def signup(
             detail="Email already registered"
         )
     
-    user = create_user(db, user_data)
+    user = await create_user_async(db, user_data)
     
     # Send verification email in background
     background_tasks.add_task(send_verification_email, user.email, user.username)
@@ -98,7 +120,7 @@ async def login(
     db: Session = Depends(get_db)
 ):
     """Authenticate user and return JWT token."""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -120,7 +142,7 @@ async def login(
 @limiter.limit(AUTH_LIMIT)
 async def login_json(request: Request, credentials: UserLogin, db: Session = Depends(get_db)):
     """Authenticate user with JSON body and return JWT token."""
-    user = authenticate_user(db, credentials.email, credentials.password)
+    user = await authenticate_user_async(db, credentials.email, credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -169,6 +191,7 @@ async def verify_email(request: VerifyEmailRequest, db: Session = Depends(get_db
     user.is_email_verified = True
     user.email_verified_at = datetime.utcnow()
     db.commit()
+    user_identity_cache.invalidate(user.id)
     
     return {"message": "Email verified successfully! You can now access all features."}
 
@@ -239,7 +262,8 @@ async def reset_password(request: ResetPasswordRequest, db: Session = Depends(ge
         )
     
     # Update password
-    user.password_hash = get_password_hash(request.new_password)
+    user.password_hash = await get_password_hash_async(request.new_password)
     db.commit()
+    user_identity_cache.invalidate(user.id)
     
     return {"message": "Password reset successfully! You can now log in with your new password."}
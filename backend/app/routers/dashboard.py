@@ -1,13 +1,14 @@
 """Dashboard API router for progress and metrics."""
 
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..models import User
 from ..schemas import DashboardResponse, ProgressHistoryItem, SkillProgress
-from ..routers.auth import get_current_user
+from ..routers.auth import get_current_user, get_current_user_async
 from ..services import get_dashboard_data, get_progress_history
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
@@ -15,8 +16,8 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/progress", response_model=DashboardResponse)
 async def get_progress(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get comprehensive dashboard data.
@@ -27,6 +28,10 @@ async def get_progress(
     - Overall accuracy and response time
     - Per-skill breakdown with mastery levels
     """
+    return await db.run_sync(_progress_response, current_user)
+
+
+def _progress_response(db: Session, current_user: User) -> DashboardResponse:
     data = get_dashboard_data(db, current_user.id)
     
     if not data:
@@ -0,0 +1,68 @@
+"""Status endpoints for background writing/speaking evaluation jobs."""
+
+import json
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..database import get_db, release_connection
+from ..models import EvaluationJob, User
+from ..routers.auth import get_current_user
+from ..services.evaluation_jobs import TERMINAL_STATUSES, evaluation_workers, job_status_payload
+
+router = APIRouter(prefix="/evaluation-jobs", tags=["Evaluation Jobs"])
+
+# Upper bound between status checks when the job runs in another process.
+EVENT_POLL_SECONDS = 1.0
+
+
+def _get_own_job(db: Session, job_id: int, user_id: int) -> EvaluationJob:
+    job = db.query(EvaluationJob).filter(
+        EvaluationJob.id == job_id,
+        EvaluationJob.user_id == user_id,
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Evaluation job not found")
+    return job
+
+
+@router.get("/{job_id}")
+async def get_evaluation_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Poll a job; ``result`` holds the evaluation once status is succeeded."""
+    return job_status_payload(_get_own_job(db, job_id, current_user.id))
+
+
+@router.get("/{job_id}/events")
+async def stream_evaluation_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Server-sent events: one ``status`` event per state change, closed when finished."""
+    user_id = current_user.id
+    _get_own_job(db, job_id, user_id)
+
+    async def events():
+        last_status = None
+        while True:
+            # End the transaction so each check sees committed worker updates.
+            release_connection(db)
+            payload = job_status_payload(_get_own_job(db, job_id, user_id))
+            if payload["status"] != last_status:
+                last_status = payload["status"]
+                yield f"event: status\ndata: {json.dumps(payload)}\n\n"
+            if last_status in TERMINAL_STATUSES:
+                return
+            release_connection(db)
+            await evaluation_workers.wait_for_change(EVENT_POLL_SECONDS)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
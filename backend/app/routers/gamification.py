@@ -1,6 +1,8 @@
 """Gamification API router for XP, levels, streaks, and skill tree."""
 
-from fastapi import APIRouter, Depends
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from ..database import get_db
@@ -8,6 +10,7 @@ from ..models import User
 from ..schemas import UserGamificationProfile, SkillTreeResponse, SkillTreeNode
 from ..routers.auth import get_current_user
 from ..services import get_skill_tree_status, get_user_stats
+from ..services.leaderboard import leaderboard
 
 router = APIRouter(prefix="/gamification", tags=["Gamification"])
 
@@ -68,22 +71,37 @@ async def get_skill_tree(
 
 @router.get("/leaderboard")
 async def get_leaderboard(
-    limit: int = 10,
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    window: Literal["all", "weekly", "monthly"] = "all",
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     db: Session = Depends(get_db)
 ):
     """
-    Get the top users by XP.
+    Get the top users by XP, all-time or for the current week/month.
     
-    Note: Optional for MVP, basic implementation.
+    Pages are keyset-paginated: pass the previous response's X-Next-Cursor
+    header as ``cursor``. The header is absent on the last page.
+    """
+    try:
+        entries, next_cursor = leaderboard.page(db, window=window, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return entries
+
+
+@router.get("/leaderboard/me")
+async def get_my_leaderboard_rank(
+    window: Literal["all", "weekly", "monthly"] = "all",
+    radius: int = Query(2, ge=0, le=25),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """
-    users = db.query(User).order_by(User.xp.desc()).limit(limit).all()
+    Get the current user's rank and the users just above and below them.
     
-    return [
-        {
-            "rank": i + 1,
-            "username": u.username,
-            "xp": u.xp,
-            "level": u.level
-        }
-        for i, u in enumerate(users)
-    ]
+    ``rank`` is null on a weekly/monthly board until the user earns XP in it.
+    """
+    return leaderboard.around(db, current_user.id, window=window, radius=radius)
@@ -1,8 +1,9 @@
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel, HttpUrl
 from app.services.content_generator import generator
 from app.services.auth import get_current_user
+from app.middleware.rate_limiter import READING_GENERATION_COST, heavy_limit
 
 router = APIRouter(
     prefix="/generator",
@@ -14,18 +15,19 @@ class UrlRequest(BaseModel):
     difficulty: int = 5
 
 @router.post("/reading")
-async def generate_reading_test(request: UrlRequest, current_user: dict = Depends(get_current_user)):
+@heavy_limit(READING_GENERATION_COST)
+async def generate_reading_test(request: Request, payload: UrlRequest, current_user: dict = Depends(get_current_user)):
     """
     Scrapes the URL and generates an IELTS Reading test.
     """
     try:
         # 1. Fetch content
-        content = generator.fetch_article_content(str(request.url))
+        content = generator.fetch_article_content(str(payload.url))
         if len(content) < 500:
             raise HTTPException(status_code=400, detail="Article text is too short. Try a different URL.")
             
         # 2. Generate questions
-        result = await generator.generate_questions_from_text(content, request.difficulty)
+        result = await generator.generate_questions_from_text(content, payload.difficulty)
         
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
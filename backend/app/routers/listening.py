@@ -1,7 +1,7 @@
 """Listening module router for audio-based practice."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File
+from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from pydantic import BaseModel
@@ -13,7 +13,11 @@ from ..database import get_db
 from ..models import User, Question, Skill, Attempt, MistakeReview
 from ..routers.auth import get_current_user
 from ..config import get_settings
+from ..services.audio_library import library_path, read_audio_metadata
+from ..services.audio_streaming import listening_audio_cache, serve_audio_file
+from ..services.leaderboard import leaderboard
 from ..services.scoring import answer_matches
+from ..services.user_stats import record_attempt_stats
 
 settings = get_settings()
 router = APIRouter(prefix="/listening", tags=["Listening"])
@@ -114,42 +118,58 @@ async def get_listening_question(
 @router.get("/audio/{question_id}")
 async def stream_audio(
     question_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Stream audio file for a listening question."""
-    question = db.query(Question).filter(
-        Question.id == question_id,
-        Question.module == "LISTENING"
-    ).first()
+    """Stream audio file for a listening question (supports Range and conditional GET)."""
+    audio_url = listening_audio_cache.get(db, question_id)
     
-    if not question or not question.audio_url:
+    if not audio_url:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Audio not found"
         )
     
     # Check if it's a local file or external URL
-    if question.audio_url.startswith("http"):
+    if audio_url.startswith("http"):
         # Redirect to external URL
-        from fastapi.responses import RedirectResponse
-        return RedirectResponse(url=question.audio_url)
+        return RedirectResponse(url=audio_url)
     
     # Local file
-    audio_path = AUDIO_DIR / question.audio_url
-    if not audio_path.exists():
+    relative_path = library_path(audio_url)
+    audio_path = AUDIO_DIR / relative_path if relative_path else None
+    if audio_path is None or not audio_path.is_file():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Audio file not found"
         )
     
-    return FileResponse(
-        path=str(audio_path),
+    return serve_audio_file(
+        request,
+        str(audio_path),
         media_type="audio/mpeg",
-        filename=f"listening_{question_id}.mp3"
+        filename=f"listening_{question_id}.mp3",
     )
 
 
+@router.get("/audio/{question_id}/metadata")
+async def get_audio_metadata(
+    question_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Duration, waveform peaks and speech segments from the audio pipeline."""
+    audio_url = listening_audio_cache.get(db, question_id)
+    metadata = read_audio_metadata(str(AUDIO_DIR), audio_url) if audio_url else None
+    if metadata is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audio metadata not found"
+        )
+    return metadata
+
+
 @router.get("/transcript/{question_id}")
 async def get_transcript(
     question_id: int,
@@ -230,7 +250,10 @@ async def submit_listening_answer(
             correct_answer=question.correct_answer,
             explanation=question.explanation,
         ))
+    record_attempt_stats(db, attempt, question.module)
     db.commit()
+    # Listening XP is not added to the user's total; it only counts on the windowed boards.
+    leaderboard.record_xp(current_user.id, None, earned=attempt.xp_earned)
     
     return {
         "is_correct": is_correct,
@@ -1,11 +1,11 @@
 """Today's Plan API router."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models import User
-from ..routers.auth import get_current_user
+from ..routers.auth import get_current_user_async
 from ..schemas import TodayPlanResponse
 from ..services.today_plan import get_today_plan
 
@@ -14,12 +14,13 @@ router = APIRouter(prefix="/plan", tags=["Plan"])
 
 @router.get("/today", response_model=TodayPlanResponse)
 async def get_today_ielts_plan(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get the authenticated user's lightweight daily IELTS plan."""
+    user_id = current_user.id
     try:
-        return get_today_plan(db, current_user.id)
+        return await db.run_sync(get_today_plan, user_id)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,13 +1,15 @@
 """Questions API router for adaptive learning."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..models import User, Question, Attempt, Skill
 from ..schemas import AttemptCreate, AttemptResponse, NextQuestionResponse, QuestionResponse
-from ..routers.auth import get_current_user
+from ..routers.auth import get_current_user, get_current_user_async
 from ..ml import adaptive_selector
 from ..services.attempts import submit_question_attempt
 
@@ -17,8 +19,8 @@ router = APIRouter(prefix="/questions", tags=["Questions"])
 @router.get("/next", response_model=NextQuestionResponse)
 async def get_next_question(
     category: str = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get the next adaptive question for the user.
@@ -28,8 +30,9 @@ async def get_next_question(
     - Appropriate difficulty for current mastery
     - Avoiding recently attempted questions
     """
-    question, target_skill, reason = adaptive_selector.get_next_question(
-        db, current_user.id, preferred_category=category
+    user_id = current_user.id
+    question, target_skill, reason = await db.run_sync(
+        lambda session: adaptive_selector.get_next_question(session, user_id, preferred_category=category)
     )
     
     if not question:
@@ -39,10 +42,12 @@ async def get_next_question(
         )
     
     # Count questions in current session (today)
-    today_attempts = db.query(Attempt).filter(
-        Attempt.user_id == current_user.id,
-        Attempt.created_at >= datetime.now().replace(hour=0, minute=0, second=0)
-    ).count()
+    today_attempts = await db.scalar(
+        select(func.count(Attempt.id)).where(
+            Attempt.user_id == user_id,
+            Attempt.created_at >= datetime.now().replace(hour=0, minute=0, second=0)
+        )
+    )
     
     return NextQuestionResponse(
         question=QuestionResponse(
@@ -1,12 +1,13 @@
 """Mistake review endpoints."""
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from ..database import get_db
-from ..models import MistakeReview
-from ..routers.auth import get_current_user
+from ..database import get_async_db, get_db
+from ..models import MistakeReview, Question
+from ..routers.auth import get_current_user, get_current_user_async
 
 router = APIRouter(prefix="/review", tags=["Review"])
 
@@ -79,19 +80,24 @@ async def list_mistakes(
     question_type: str | None = None,
     status: str | None = None,
     resolved: str | None = None,
-    current_user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    query = db.query(MistakeReview).filter(
+    # Relationships used by _serialize_mistake are loaded up front: lazy loads
+    # cannot run on an AsyncSession.
+    query = select(MistakeReview).where(
         MistakeReview.user_id == current_user.id,
+    ).options(
+        selectinload(MistakeReview.question).selectinload(Question.skill),
+        selectinload(MistakeReview.attempt),
     )
     normalized_status = _normalize_status(status, resolved)
     query = _apply_status_filter(query, normalized_status)
     if module and module.upper() != "ALL":
-        query = query.filter(MistakeReview.module == module.upper())
+        query = query.where(MistakeReview.module == module.upper())
     if question_type and question_type.upper() != "ALL":
-        query = query.filter(MistakeReview.question_type == question_type)
-    mistakes = query.order_by(MistakeReview.created_at.desc()).limit(min(limit, 100)).all()
+        query = query.where(MistakeReview.question_type == question_type)
+    mistakes = (await db.scalars(query.order_by(MistakeReview.created_at.desc()).limit(min(limit, 100)))).all()
     return {
         "mistakes": [_serialize_mistake(mistake) for mistake in mistakes]
     }
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
-import shutil
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 import os
-import uuid
+from app.services.audio_upload import receive_audio_upload
 from app.services.speaking_service import analyze_audio_with_gemini
+from app.services.evaluation_cache import evaluation_cache, speaking_cache_key
+from app.services.evaluation_jobs import apply_speaking_result, enqueue_speaking_evaluation, job_status_payload
 from app.services.auth import get_current_user
-from app.database import get_db
+from app.database import get_db, release_connection
+from app.middleware.rate_limiter import SPEAKING_EVALUATION_COST, heavy_limit
 from app.models import SpeakingAttempt
 from sqlalchemy.orm import Session
 
@@ -13,54 +15,59 @@ router = APIRouter(prefix="/api/speaking", tags=["speaking"])
 TEMP_DIR = "temp_audio"
 os.makedirs(TEMP_DIR, exist_ok=True)
 
-@router.post("/analyze")
+# Documents the multipart form that the endpoints parse themselves.
+UPLOAD_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file", "prompt_text"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "prompt_text": {"type": "string"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+async def _receive_upload(request: Request, db: Session) -> tuple[str, str, str]:
+    """Stream the recording into TEMP_DIR; return its path, the prompt text and its sha256."""
+    # Slow uploads must not hold a pooled connection.
+    release_connection(db)
+    upload = await receive_audio_upload(request, TEMP_DIR)
+    prompt_text = upload.fields.get("prompt_text", "").strip()
+    if not prompt_text:
+        os.remove(upload.path)
+        raise HTTPException(status_code=422, detail="Missing form field 'prompt_text'.")
+    return upload.path, prompt_text, upload.sha256
+
+
+@router.post("/analyze", openapi_extra=UPLOAD_FORM_SCHEMA)
+@heavy_limit(SPEAKING_EVALUATION_COST)
 async def analyze_speaking(
-    file: UploadFile = File(...),
-    prompt_text: str = Form(...),
+    request: Request,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Upload audio and get AI feedback."""
-    
-    # Validate file size (10MB limit)
-    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-    file.file.seek(0, 2)
-    file_size = file.file.tell()
-    file.file.seek(0)
-    
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(status_code=413, detail="File too large. Maximum size is 10MB.")
-
-    # Validate file content type
-    allowed_types = ["audio/webm", "audio/wav", "audio/mp3", "audio/mpeg", "audio/ogg", "audio/m4a"]
-    if file.content_type not in allowed_types:
-        raise HTTPException(status_code=400, detail=f"Invalid file type. Allowed: {', '.join(allowed_types)}")
-
-    # Generate unique filename
-    file_extension = file.filename.split(".")[-1] if "." in file.filename else "webm"
-    temp_filename = f"{uuid.uuid4()}.{file_extension}"
-    temp_path = os.path.join(TEMP_DIR, temp_filename)
+    user_id = current_user.id
+    temp_path, prompt_text, digest = await _receive_upload(request, db)
     
     try:
-        # Save uploaded file
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        result = await analyze_audio_with_gemini(temp_path, prompt_text)
-        db.add(SpeakingAttempt(
-            user_id=current_user.id,
-            prompt_text=prompt_text,
-            audio_path=None,
-            transcription=result.get("transcription", ""),
-            band_score=result.get("band_score", 0.0),
-            criterion_scores={
-                "fluency_coherence": result.get("fluency_coherence", {}).get("score", 0.0),
-                "lexical_resource": result.get("lexical_resource", {}).get("score", 0.0),
-                "grammatical_range": result.get("grammatical_range", {}).get("score", 0.0),
-                "pronunciation": result.get("pronunciation", {}).get("score", 0.0),
-            },
-            feedback=result,
-        ))
+        result = await evaluation_cache.evaluate(
+            db,
+            speaking_cache_key(prompt_text, temp_path, audio_digest=digest),
+            "speaking",
+            lambda: analyze_audio_with_gemini(temp_path, prompt_text),
+        )
+        attempt = SpeakingAttempt(user_id=user_id, prompt_text=prompt_text, audio_path=None)
+        apply_speaking_result(attempt, result)
+        db.add(attempt)
         db.commit()
         
         return result
@@ -74,6 +81,24 @@ async def analyze_speaking(
             os.remove(temp_path)
 
 
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED, openapi_extra=UPLOAD_FORM_SCHEMA)
+@heavy_limit(SPEAKING_EVALUATION_COST)
+async def submit_speaking_job(
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Queue a recording for background evaluation and return the job to poll."""
+    user_id = current_user.id
+    temp_path, prompt_text, _ = await _receive_upload(request, db)
+    try:
+        job = enqueue_speaking_evaluation(db, user_id, prompt_text, temp_path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+    return job_status_payload(job)
+
+
 @router.get("/history")
 async def speaking_history(
     limit: int = 20,
@@ -81,7 +106,8 @@ async def speaking_history(
     db: Session = Depends(get_db)
 ):
     attempts = db.query(SpeakingAttempt).filter(
-        SpeakingAttempt.user_id == current_user.id
+        SpeakingAttempt.user_id == current_user.id,
+        SpeakingAttempt.evaluation_status == "completed",
     ).order_by(SpeakingAttempt.created_at.desc()).limit(limit).all()
     return {
         "attempts": [
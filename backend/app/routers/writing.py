@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
 from typing import Optional, List
 from app.services.writing_service import evaluate_essay_with_gemini
+from app.services.evaluation_cache import evaluation_cache, writing_cache_key
+from app.services.evaluation_jobs import apply_writing_result, enqueue_writing_evaluation, job_status_payload
 from app.services.auth import get_current_user
 from app.database import get_db
+from app.middleware.rate_limiter import WRITING_EVALUATION_COST, heavy_limit
 from app.models import WritingAttempt
 from sqlalchemy.orm import Session
 
@@ -26,45 +29,68 @@ class EvaluationResponse(BaseModel):
     error: Optional[str] = None
 
 @router.post("/evaluate", response_model=EvaluationResponse)
+@heavy_limit(WRITING_EVALUATION_COST)
 async def evaluate_essay(
+    request: Request,
     submission: EssaySubmission,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Evaluate and persist an IELTS essay attempt."""
-    result = await evaluate_essay_with_gemini(
-        essay_text=submission.essay_text,
-        task_type=submission.task_type,
-        prompt_text=submission.prompt_text
+    user_id = current_user.id
+    result = await evaluation_cache.evaluate(
+        db,
+        writing_cache_key(submission.task_type, submission.prompt_text, submission.essay_text),
+        "writing",
+        lambda: evaluate_essay_with_gemini(
+            essay_text=submission.essay_text,
+            task_type=submission.task_type,
+            prompt_text=submission.prompt_text
+        ),
     )
-    word_count = len([word for word in submission.essay_text.split() if word.strip()])
-    db.add(WritingAttempt(
-        user_id=current_user.id,
+    attempt = WritingAttempt(
+        user_id=user_id,
         task_type=submission.task_type,
         prompt_text=submission.prompt_text,
         essay_text=submission.essay_text,
-        word_count=word_count,
+        word_count=len([word for word in submission.essay_text.split() if word.strip()]),
         time_spent_sec=submission.time_spent_sec,
-        band_score=result.get("band_score", 0.0),
-        criterion_scores={
-            "task_response": result.get("task_response", {}).get("score", 0.0),
-            "coherence_cohesion": result.get("coherence_cohesion", {}).get("score", 0.0),
-            "lexical_resource": result.get("lexical_resource", {}).get("score", 0.0),
-            "grammatical_range": result.get("grammatical_range", {}).get("score", 0.0),
-        },
-        feedback=result,
-    ))
+    )
+    apply_writing_result(attempt, result)
+    db.add(attempt)
     db.commit()
     return result
 
 
 @router.post("/submit", response_model=EvaluationResponse)
+@heavy_limit(WRITING_EVALUATION_COST)
 async def submit_essay(
+    request: Request,
+    submission: EssaySubmission,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return await evaluate_essay(request, submission, current_user, db)
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+@heavy_limit(WRITING_EVALUATION_COST)
+async def submit_essay_job(
+    request: Request,
     submission: EssaySubmission,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return await evaluate_essay(submission, current_user, db)
+    """Queue an essay for background evaluation and return the job to poll."""
+    job = enqueue_writing_evaluation(
+        db,
+        user_id=current_user.id,
+        task_type=submission.task_type,
+        prompt_text=submission.prompt_text,
+        essay_text=submission.essay_text,
+        time_spent_sec=submission.time_spent_sec,
+    )
+    return job_status_payload(job)
 
 
 @router.get("/history")
@@ -74,7 +100,8 @@ async def writing_history(
     db: Session = Depends(get_db)
 ):
     attempts = db.query(WritingAttempt).filter(
-        WritingAttempt.user_id == current_user.id
+        WritingAttempt.user_id == current_user.id,
+        WritingAttempt.evaluation_status == "completed",
     ).order_by(WritingAttempt.created_at.desc()).limit(limit).all()
     return {
         "attempts": [
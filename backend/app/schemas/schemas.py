@@ -139,6 +139,7 @@ class AttemptResponse(BaseModel):
     level_up: bool
     new_streak: int
     mastery_change: float
+    new_achievements: List[Dict[str, Any]] = []
     
     class Config:
         from_attributes = True
@@ -1,6 +1,7 @@
 from .auth import (
     verify_password, get_password_hash, create_access_token, decode_token,
-    create_user, authenticate_user, get_user_by_email, get_user_by_id
+    create_user, authenticate_user, get_user_by_email, get_user_by_id,
+    create_user_async, authenticate_user_async
 )
 from .gamification import (
     calculate_xp_for_attempt, get_level_for_xp, get_xp_to_next_level,
@@ -8,17 +9,18 @@ from .gamification import (
     get_user_stats
 )
 from .dashboard import (
-    get_dashboard_data, get_progress_history, update_daily_metrics
+    get_dashboard_data, get_progress_history, record_attempt_metrics, rebuild_daily_metrics
 )
 
 __all__ = [
     # Auth
     "verify_password", "get_password_hash", "create_access_token", "decode_token",
     "create_user", "authenticate_user", "get_user_by_email", "get_user_by_id",
+    "create_user_async", "authenticate_user_async",
     # Gamification
     "calculate_xp_for_attempt", "get_level_for_xp", "get_xp_to_next_level",
     "update_user_xp", "update_streak", "get_skill_tree_status", "check_and_unlock_skills",
     "get_user_stats",
     # Dashboard
-    "get_dashboard_data", "get_progress_history", "update_daily_metrics"
+    "get_dashboard_data", "get_progress_history", "record_attempt_metrics", "rebuild_daily_metrics"
 ]
@@ -1,11 +1,13 @@
 """Achievements service for checking and awarding achievements."""
 
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
-from ..models.models import Achievement, UserAchievement, User, Attempt, UserSkillMastery
+from ..models.models import Achievement, UserAchievement, User, UserStatsSnapshot
+from .dashboard import estimate_user_band
+from .user_stats import get_user_stats_snapshot
 
 
 # Achievement definitions to seed
@@ -72,6 +74,7 @@ def seed_achievements(db: Session) -> None:
             achievement = Achievement(**achievement_data)
             db.add(achievement)
     db.commit()
+    achievement_engine.invalidate()
 
 
 def get_all_achievements(db: Session) -> List[Achievement]:
@@ -104,63 +107,203 @@ def get_user_achievements(db: Session, user_id: int) -> List[Dict[str, Any]]:
     return result
 
 
+# Which requirement types can flip when a given stat changes.
+STAT_REQUIREMENT_TYPES = {
+    "streak": ("streak",),
+    "level": ("level",),
+    "counts": ("attempts", "correct_count", "accuracy"),
+    "band": ("band",),
+}
+ALL_REQUIREMENT_TYPES = tuple(
+    requirement_type
+    for requirement_types in STAT_REQUIREMENT_TYPES.values()
+    for requirement_type in requirement_types
+)
+
+
+@dataclass(frozen=True)
+class AchievementRule:
+    """A plain, session-independent view of one achievement requirement."""
+    achievement_id: int
+    requirement_type: str
+    value: float
+    min_attempts: int
+    xp_reward: int
+
+
+class AchievementEngine:
+    """
+    Awards achievements by evaluating only the requirement types whose
+    underlying stats changed.
+
+    Achievement definitions are indexed by requirement type and sorted by
+    threshold, so a check touches a handful of rules instead of every
+    definition, and expensive inputs (the band estimate) are only computed
+    when a locked rule needs them.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        self.ttl_seconds = ttl_seconds
+        self._index: Optional[Dict[str, List[AchievementRule]]] = None
+        self._loaded_at = 0.0
+
+    def invalidate(self) -> None:
+        """Drop the cached rule index after achievement definitions change."""
+        self._index = None
+
+    def rules_by_type(self, db: Session) -> Dict[str, List[AchievementRule]]:
+        """Return rules grouped by requirement type, ascending by threshold."""
+        if self._index is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+            index: Dict[str, List[AchievementRule]] = {}
+            for achievement_id, requirement, xp_reward in db.query(
+                Achievement.id, Achievement.requirement, Achievement.xp_reward
+            ):
+                requirement = requirement or {}
+                requirement_type = requirement.get("type")
+                if requirement_type not in ALL_REQUIREMENT_TYPES:
+                    continue
+                index.setdefault(requirement_type, []).append(AchievementRule(
+                    achievement_id=achievement_id,
+                    requirement_type=requirement_type,
+                    value=requirement.get("value", 0),
+                    min_attempts=requirement.get("min_attempts", 0),
+                    xp_reward=xp_reward or 0,
+                ))
+            for rules in index.values():
+                rules.sort(key=lambda rule: rule.value)
+            self._index = index
+            self._loaded_at = time.monotonic()
+        return self._index
+
+    def evaluate(
+        self,
+        db: Session,
+        user: User,
+        changed: Optional[Iterable[str]] = None,
+        commit: bool = True,
+        unlocked_ids: Optional[Set[int]] = None,
+        stats: Optional[UserStatsSnapshot] = None,
+    ) -> List[Achievement]:
+        """
+        Award newly earned achievements for one user.
+
+        Args:
+            changed: Stat groups that changed ("streak", "level", "counts",
+                "band"); None evaluates every requirement type.
+            commit: Pass False to stage awards in the caller's unit of work.
+            unlocked_ids / stats: Preloaded inputs used by batch mode.
+        """
+        candidate_types = ALL_REQUIREMENT_TYPES if changed is None else tuple(
+            requirement_type
+            for stat in changed
+            for requirement_type in STAT_REQUIREMENT_TYPES.get(stat, ())
+        )
+        index = self.rules_by_type(db)
+        if not any(index.get(requirement_type) for requirement_type in candidate_types):
+            return []
+
+        if unlocked_ids is None:
+            unlocked_ids = {
+                row[0] for row in db.query(UserAchievement.achievement_id).filter(
+                    UserAchievement.user_id == user.id
+                )
+            }
+
+        lazy_stats = {}
+
+        def snapshot() -> UserStatsSnapshot:
+            if "snapshot" not in lazy_stats:
+                lazy_stats["snapshot"] = stats or get_user_stats_snapshot(db, user.id)
+            return lazy_stats["snapshot"]
+
+        def stat_value(requirement_type: str) -> float:
+            if requirement_type not in lazy_stats:
+                if requirement_type == "streak":
+                    lazy_stats[requirement_type] = user.current_streak or 0
+                elif requirement_type == "level":
+                    lazy_stats[requirement_type] = user.level or 1
+                elif requirement_type == "attempts":
+                    lazy_stats[requirement_type] = snapshot().total_attempts
+                elif requirement_type == "correct_count":
+                    lazy_stats[requirement_type] = snapshot().correct_attempts
+                elif requirement_type == "accuracy":
+                    lazy_stats[requirement_type] = snapshot().accuracy
+                elif requirement_type == "band":
+                    lazy_stats[requirement_type] = estimate_user_band(db, user.id, snapshot())
+            return lazy_stats[requirement_type]
+
+        earned_rules: List[AchievementRule] = []
+        for requirement_type in candidate_types:
+            for rule in index.get(requirement_type, []):
+                if rule.achievement_id in unlocked_ids:
+                    continue
+                if stat_value(requirement_type) < rule.value:
+                    # Rules are sorted by threshold; higher ones cannot pass.
+                    break
+                if requirement_type == "accuracy" and snapshot().total_attempts < rule.min_attempts:
+                    continue
+                earned_rules.append(rule)
+
+        if not earned_rules:
+            return []
+
+        for rule in earned_rules:
+            db.add(UserAchievement(user_id=user.id, achievement_id=rule.achievement_id))
+            unlocked_ids.add(rule.achievement_id)
+            # Add XP reward
+            user.xp += rule.xp_reward
+
+        newly_earned = db.query(Achievement).filter(
+            Achievement.id.in_([rule.achievement_id for rule in earned_rules])
+        ).all()
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        return newly_earned
+
+    def evaluate_all_users(self, db: Session, batch_size: int = 500) -> Dict[str, int]:
+        """
+        Batch mode: evaluate every requirement type for all users.
+
+        Unlock sets and stats snapshots are preloaded per batch of users and
+        each batch is committed on its own.
+        """
+        report = {"users": 0, "awarded": 0}
+        last_id = 0
+        while True:
+            users = db.query(User).filter(User.id > last_id).order_by(User.id).limit(batch_size).all()
+            if not users:
+                break
+            user_ids = [user.id for user in users]
+            unlocked: Dict[int, Set[int]] = {user_id: set() for user_id in user_ids}
+            for user_id, achievement_id in db.query(
+                UserAchievement.user_id, UserAchievement.achievement_id
+            ).filter(UserAchievement.user_id.in_(user_ids)):
+                unlocked[user_id].add(achievement_id)
+            snapshots = {
+                snapshot.user_id: snapshot
+                for snapshot in db.query(UserStatsSnapshot).filter(UserStatsSnapshot.user_id.in_(user_ids))
+            }
+
+            for user in users:
+                earned = self.evaluate(
+                    db,
+                    user,
+                    commit=False,
+                    unlocked_ids=unlocked[user.id],
+                    stats=snapshots.get(user.id),
+                )
+                report["awarded"] += len(earned)
+            db.commit()
+            report["users"] += len(users)
+            last_id = user_ids[-1]
+        return report
+
+
+achievement_engine = AchievementEngine()
+
+
 def check_and_award_achievements(db: Session, user: User) -> List[Achievement]:
     """Check user's progress and award any newly earned achievements."""
-    newly_earned = []
-    
-    # Get all achievements user hasn't unlocked
-    unlocked_ids = [ua.achievement_id for ua in db.query(UserAchievement).filter(
-        UserAchievement.user_id == user.id
-    ).all()]
-    
-    locked_achievements = db.query(Achievement).filter(
-        ~Achievement.id.in_(unlocked_ids) if unlocked_ids else True
-    ).all()
-    
-    # Get user stats
-    total_attempts = db.query(Attempt).filter(Attempt.user_id == user.id).count()
-    correct_attempts = db.query(Attempt).filter(
-        Attempt.user_id == user.id, 
-        Attempt.is_correct == True
-    ).count()
-    accuracy = correct_attempts / total_attempts if total_attempts > 0 else 0
-    
-    # Get estimated band from dashboard service
-    from ..services.dashboard import get_dashboard_data
-    dashboard = get_dashboard_data(db, user.id)
-    estimated_band = dashboard.get("estimated_band", 4.0)
-    
-    for achievement in locked_achievements:
-        req = achievement.requirement
-        earned = False
-        
-        if req["type"] == "streak":
-            earned = user.current_streak >= req["value"]
-        elif req["type"] == "level":
-            earned = user.level >= req["value"]
-        elif req["type"] == "accuracy":
-            earned = accuracy >= req["value"] and total_attempts >= req.get("min_attempts", 0)
-        elif req["type"] == "correct_count":
-            earned = correct_attempts >= req["value"]
-        elif req["type"] == "attempts":
-            earned = total_attempts >= req["value"]
-        elif req["type"] == "band":
-            earned = estimated_band >= req["value"]
-        
-        if earned:
-            # Award achievement
-            user_achievement = UserAchievement(
-                user_id=user.id,
-                achievement_id=achievement.id
-            )
-            db.add(user_achievement)
-            
-            # Add XP reward
-            user.xp += achievement.xp_reward
-            
-            newly_earned.append(achievement)
-    
-    if newly_earned:
-        db.commit()
-    
-    return newly_earned
+    return achievement_engine.evaluate(db, user)
@@ -1,16 +1,28 @@
-"""Local-first AI provider utilities for IELTS feedback."""
+"""Local-first AI provider utilities for IELTS feedback.
+
+Provider calls are async end to end so an evaluation never blocks the event
+loop. Each provider has a ``ProviderLimiter``: a concurrency semaphore with a
+bounded wait for a slot and an overall timeout per call. Ollama is called over
+a pooled keep-alive ``httpx.AsyncClient``; the synchronous Gemini SDK runs in a
+worker thread under its own limiter.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import json
 import re
-from typing import Any
+import time
+from typing import Any, Awaitable, Callable, TypeVar
 
-import requests
+import httpx
 
 from ..config import get_settings
 
 
+T = TypeVar("T")
+
+
 def extract_json(text: str) -> dict[str, Any] | None:
     """Extract a JSON object from model output."""
     if not text:
@@ -31,25 +43,193 @@ def extract_json(text: str) -> dict[str, Any] | None:
             return None
 
 
-def complete_json_with_ollama(prompt: str) -> dict[str, Any] | None:
-    """Call a local Ollama model and parse JSON output."""
-    settings = get_settings()
-    try:
-        response = requests.post(
-            f"{settings.ollama_base_url.rstrip('/')}/api/generate",
-            json={
-                "model": settings.ollama_model,
-                "prompt": prompt,
-                "stream": False,
-                "format": "json",
-            },
-            timeout=settings.ollama_timeout_sec,
+class ProviderLimiter:
+    """Caps concurrent calls to one AI provider and counts queueing and failures."""
+
+    def __init__(self, name: str, max_concurrency: int, queue_timeout_sec: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.queue_timeout_sec = queue_timeout_sec
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.waiting = 0
+        self.in_flight = 0
+        self.max_waiting = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.call_seconds_total = 0.0
+
+    async def call(self, function: Callable[[], Awaitable[T]], timeout_sec: float) -> T | None:
+        """
+        Await ``function()`` within the concurrency limit.
+
+        Returns None when no slot frees up within ``queue_timeout_sec``, when
+        the call exceeds ``timeout_sec`` or when it raises, so callers fall
+        through to the next provider.
+        """
+        semaphore = await self._acquire()
+        if semaphore is None:
+            return None
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(function(), timeout_sec)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            return None
+        except Exception:
+            self.failed += 1
+            return None
+        finally:
+            self.in_flight -= 1
+            self.calls += 1
+            self.call_seconds_total += time.monotonic() - started
+            semaphore.release()
+
+    async def call_in_thread(self, function: Callable[..., T], *args: Any, timeout_sec: float) -> T | None:
+        """
+        Run blocking ``function(*args)`` in a worker thread within the concurrency limit.
+
+        Returns None on the same conditions as ``call``. A thread cannot be
+        cancelled, so after a timeout (or a cancelled caller) the slot stays
+        taken until the thread actually returns.
+        """
+        semaphore = await self._acquire()
+        if semaphore is None:
+            return None
+        started = time.monotonic()
+        task = asyncio.ensure_future(asyncio.to_thread(function, *args))
+
+        def finished(task: asyncio.Future) -> None:
+            if not task.cancelled():
+                task.exception()  # retrieved here when the caller stopped waiting
+            self.in_flight -= 1
+            self.calls += 1
+            self.call_seconds_total += time.monotonic() - started
+            semaphore.release()
+
+        task.add_done_callback(finished)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout_sec)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            return None
+        except Exception:
+            self.failed += 1
+            return None
+
+    async def _acquire(self) -> asyncio.Semaphore | None:
+        """Take a slot, or count a rejection and return None after ``queue_timeout_sec``."""
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.queue_timeout_sec)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return None
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        return semaphore
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "max_waiting": self.max_waiting,
+            "max_in_flight": self.max_in_flight,
+            "calls": self.calls,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+            "avg_call_ms": round(self.call_seconds_total / self.calls * 1000, 2) if self.calls else 0.0,
+        }
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; tests run several loops in turn.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+
+class OllamaClient:
+    """Pooled keep-alive client for the Ollama generate API."""
+
+    def __init__(self, limiter: ProviderLimiter):
+        self.limiter = limiter
+        self._client: httpx.AsyncClient | None = None
+        self._client_key: tuple | None = None
+
+    async def generate_json(self, prompt: str) -> dict[str, Any] | None:
+        """Call the configured Ollama model and parse JSON output."""
+        settings = get_settings()
+
+        async def request() -> dict[str, Any] | None:
+            client = await self._get_client()
+            response = await client.post(
+                "/api/generate",
+                json={
+                    "model": settings.ollama_model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "format": "json",
+                },
+            )
+            response.raise_for_status()
+            return extract_json(str(response.json().get("response", "")))
+
+        return await self.limiter.call(request, settings.ollama_timeout_sec)
+
+    async def aclose(self) -> None:
+        client, key = self._client, self._client_key
+        self._client = self._client_key = None
+        if client is not None and key[0] is asyncio.get_running_loop():
+            await client.aclose()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        settings = get_settings()
+        key = (asyncio.get_running_loop(), settings.ollama_base_url, settings.ollama_timeout_sec)
+        if self._client is not None and self._client_key == key:
+            return self._client
+        await self.aclose()
+        self._client = httpx.AsyncClient(
+            base_url=settings.ollama_base_url.rstrip("/"),
+            timeout=httpx.Timeout(settings.ollama_timeout_sec, connect=min(5.0, settings.ollama_timeout_sec)),
+            limits=httpx.Limits(
+                max_connections=self.limiter.max_concurrency,
+                max_keepalive_connections=self.limiter.max_concurrency,
+            ),
         )
-        response.raise_for_status()
-        payload = response.json()
-        return extract_json(str(payload.get("response", "")))
-    except Exception:
-        return None
+        self._client_key = key
+        return self._client
+
+
+async def complete_json_with_ollama(prompt: str) -> dict[str, Any] | None:
+    """Call a local Ollama model and parse JSON output."""
+    return await ollama_client.generate_json(prompt)
+
+
+async def call_gemini(function: Callable[..., T], *args: Any) -> T | None:
+    """Run a blocking Gemini SDK call in a worker thread under the Gemini limiter."""
+    return await gemini_limiter.call_in_thread(function, *args, timeout_sec=get_settings().gemini_timeout_sec)
+
+
+def provider_stats() -> dict[str, Any]:
+    """Concurrency counters for every AI provider limiter."""
+    return {
+        "ollama": ollama_client.limiter.stats(),
+        "gemini": gemini_limiter.stats(),
+    }
 
 
 def provider_order() -> list[str]:
@@ -65,3 +245,15 @@ def provider_order() -> list[str]:
 def with_provider_meta(result: dict[str, Any], provider: str) -> dict[str, Any]:
     result["ai_provider"] = provider
     return result
+
+
+ollama_client = OllamaClient(ProviderLimiter(
+    "ollama",
+    max_concurrency=get_settings().ollama_max_concurrency,
+    queue_timeout_sec=get_settings().ai_queue_timeout_sec,
+))
+gemini_limiter = ProviderLimiter(
+    "gemini",
+    max_concurrency=get_settings().gemini_max_concurrency,
+    queue_timeout_sec=get_settings().ai_queue_timeout_sec,
+)
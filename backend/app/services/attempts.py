@@ -5,17 +5,21 @@ from datetime import datetime
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from ..database import dialect_insert
 from ..ml import knowledge_tracer
 from ..models import Attempt, MistakeReview, Question, Skill, User, UserSkillMastery
 from ..schemas import AttemptCreate, AttemptResponse
-from ..services.dashboard import update_daily_metrics
+from ..services.achievements import achievement_engine
+from ..services.dashboard import record_attempt_metrics
 from ..services.gamification import (
     calculate_xp_for_attempt,
     check_and_unlock_skills,
     update_streak,
     update_user_xp,
 )
+from ..services.leaderboard import leaderboard
 from ..services.scoring import answer_matches
+from ..services.user_stats import record_attempt_stats
 
 
 def submit_question_attempt(
@@ -24,7 +28,7 @@ def submit_question_attempt(
     attempt_data: AttemptCreate,
     diagnostic_session_id: int | None = None,
 ) -> AttemptResponse:
-    """Score an answer, update mastery/gamification, and persist the attempt."""
+    """Score an answer, update mastery/gamification, and persist the attempt in one commit."""
     question = db.query(Question).filter(Question.id == attempt_data.question_id).first()
     if not question:
         raise HTTPException(
@@ -32,44 +36,22 @@ def submit_question_attempt(
             detail="Question not found",
         )
 
+    # Every step below only stages changes on the session; the single commit at
+    # the end makes the answer, XP, streak, mastery, lifetime stats, mistake
+    # log, unlocks and daily metrics land atomically in one round trip.
     is_correct = answer_matches(attempt_data.user_answer, question.correct_answer)
-    new_streak = update_streak(db, current_user)
+    old_streak = current_user.current_streak
+    new_streak = update_streak(db, current_user, commit=False)
     xp_earned = calculate_xp_for_attempt(
         difficulty=question.difficulty,
         is_correct=is_correct,
         streak=new_streak,
     )
-    new_xp, new_level, level_up = update_user_xp(db, current_user, xp_earned)
+    new_xp, new_level, level_up = update_user_xp(db, current_user, xp_earned, commit=False)
 
-    mastery = db.query(UserSkillMastery).filter(
-        UserSkillMastery.user_id == current_user.id,
-        UserSkillMastery.skill_id == question.skill_id,
-    ).first()
-    if not mastery:
-        skill = db.query(Skill).filter(Skill.id == question.skill_id).first()
-        mastery = UserSkillMastery(
-            user_id=current_user.id,
-            skill_id=question.skill_id,
-            is_unlocked=skill.parent_skill_id is None if skill else True,
-        )
-        db.add(mastery)
-        db.flush()
-
-    old_mastery = mastery.mastery_probability
-    new_mastery = knowledge_tracer.update_mastery(old_mastery, is_correct)
-    mastery.mastery_probability = new_mastery
-    mastery.attempts_count += 1
-    if is_correct:
-        mastery.correct_count += 1
-
-    if mastery.avg_response_time_ms:
-        mastery.avg_response_time_ms = (
-            mastery.avg_response_time_ms * (mastery.attempts_count - 1)
-            + attempt_data.response_time_ms
-        ) / mastery.attempts_count
-    else:
-        mastery.avg_response_time_ms = attempt_data.response_time_ms
-    mastery.last_attempt_at = datetime.now()
+    old_mastery, new_mastery = _stage_mastery_update(
+        db, current_user.id, question, is_correct, attempt_data.response_time_ms
+    )
 
     attempt = Attempt(
         user_id=current_user.id,
@@ -82,6 +64,7 @@ def submit_question_attempt(
     )
     db.add(attempt)
     db.flush()
+    record_attempt_stats(db, attempt, question.module)
 
     if not is_correct:
         db.add(MistakeReview(
@@ -95,13 +78,22 @@ def submit_question_attempt(
             explanation=question.explanation,
         ))
 
-    check_and_unlock_skills(db, current_user.id)
+    check_and_unlock_skills(db, current_user.id, commit=False)
+    record_attempt_metrics(db, attempt, commit=False)
 
-    db.commit()
-    update_daily_metrics(db, current_user.id)
-    db.refresh(attempt)
+    # Only requirement types backed by stats this answer touched are checked.
+    changed_stats = {"counts", "band"}
+    if new_streak != old_streak:
+        changed_stats.add("streak")
+    if level_up:
+        changed_stats.add("level")
+    new_achievements = achievement_engine.evaluate(
+        db, current_user, changed=changed_stats, commit=False
+    )
 
-    return AttemptResponse(
+    # Build the response before committing so expired attributes are not
+    # re-selected afterwards.
+    response = AttemptResponse(
         id=attempt.id,
         question_id=attempt.question_id,
         user_answer=attempt.user_answer,
@@ -111,9 +103,78 @@ def submit_question_attempt(
         created_at=attempt.created_at,
         correct_answer=question.correct_answer,
         explanation=question.explanation if not is_correct else None,
-        new_xp=new_xp,
+        new_xp=current_user.xp,
         new_level=new_level,
         level_up=level_up,
         new_streak=new_streak,
         mastery_change=new_mastery - old_mastery,
+        new_achievements=[
+            {
+                "code": achievement.code,
+                "name": achievement.name,
+                "description": achievement.description,
+                "icon": achievement.icon,
+                "xp_reward": achievement.xp_reward,
+                "rarity": achievement.rarity,
+            }
+            for achievement in new_achievements
+        ],
     )
+    db.commit()
+    leaderboard.record_xp(current_user.id, response.new_xp, earned=xp_earned)
+    return response
+
+
+def _stage_mastery_update(
+    db: Session,
+    user_id: int,
+    question: Question,
+    is_correct: bool,
+    response_time_ms: int,
+) -> tuple[float, float]:
+    """Apply the BKT update for the question's skill and return (old, new) mastery."""
+    params = knowledge_tracer.params_for_skill(db, question.skill_id)
+    mastery_query = db.query(UserSkillMastery).filter(
+        UserSkillMastery.user_id == user_id,
+        UserSkillMastery.skill_id == question.skill_id,
+    )
+    mastery = mastery_query.first()
+    if not mastery:
+        skill = db.query(Skill).filter(Skill.id == question.skill_id).first()
+        values = {
+            "user_id": user_id,
+            "skill_id": question.skill_id,
+            "mastery_probability": params.p_init,
+            "is_unlocked": skill.parent_skill_id is None if skill else True,
+        }
+        insert = dialect_insert(db)
+        if insert is not None:
+            # A concurrent first attempt on this skill may have created the row already.
+            db.execute(
+                insert(UserSkillMastery).values(**values).on_conflict_do_nothing(
+                    index_elements=["user_id", "skill_id"],
+                )
+            )
+            mastery = mastery_query.one()
+        else:
+            mastery = UserSkillMastery(**values)
+            db.add(mastery)
+            db.flush()
+
+    old_mastery = mastery.mastery_probability
+    new_mastery = knowledge_tracer.update_mastery(old_mastery, is_correct, params)
+    mastery.mastery_probability = new_mastery
+    mastery.attempts_count += 1
+    if is_correct:
+        mastery.correct_count += 1
+
+    if mastery.avg_response_time_ms:
+        mastery.avg_response_time_ms = (
+            mastery.avg_response_time_ms * (mastery.attempts_count - 1)
+            + response_time_ms
+        ) / mastery.attempts_count
+    else:
+        mastery.avg_response_time_ms = response_time_ms
+    mastery.last_attempt_at = datetime.now()
+
+    return old_mastery, new_mastery
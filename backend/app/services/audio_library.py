@@ -0,0 +1,308 @@
+"""Offline processing of the listening audio library (``static/audio``).
+
+Each source recording is transcoded with ffmpeg to a low-bitrate, mono,
+loudness-normalized MP3 under ``static/audio/stream/``. Its duration, loudness,
+waveform peaks and speech segments are written to a JSON sidecar next to it.
+Files are processed in parallel in a process pool. ``manifest.json`` records
+each source's content hash and the profile used, so unchanged files are
+skipped on the next run.
+
+``apply_to_questions`` then points listening questions at the streaming copy
+and fills ``audio_duration_sec`` from the probed duration.
+
+ffmpeg and ffprobe must be on PATH; they are only needed by this pipeline, not
+by the API.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models import Question
+
+
+AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".ogg", ".webm", ".flac", ".aac"}
+STREAM_DIR = "stream"
+MANIFEST_NAME = "manifest.json"
+ANALYSIS_SAMPLE_RATE = 8000
+WAVEFORM_BUCKETS = 200
+
+
+@dataclass(frozen=True)
+class StreamingProfile:
+    """Target encoding for streamed listening audio (speech, not music)."""
+    bitrate_kbps: int = 48
+    sample_rate: int = 24000
+    channels: int = 1
+    loudness_lufs: float = -16.0
+    true_peak_db: float = -1.5
+
+    @property
+    def key(self) -> str:
+        return (
+            f"mp3-{self.bitrate_kbps}k-{self.sample_rate}hz-{self.channels}ch-"
+            f"{self.loudness_lufs:g}lufs-{self.true_peak_db:g}tp"
+        )
+
+
+DEFAULT_PROFILE = StreamingProfile()
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as audio:
+        for chunk in iter(lambda: audio.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def library_path(audio_url: Optional[str]) -> Optional[str]:
+    """Path relative to the library for a stored ``audio_url``; None for external URLs.
+
+    Seed data stores values like ``/audio/campus_tour.mp3``; uploads store a
+    bare file name.
+    """
+    if not audio_url or audio_url.startswith("http"):
+        return None
+    path = audio_url.lstrip("/")
+    if path.startswith("audio/"):
+        path = path[len("audio/"):]
+    return path or None
+
+
+def stream_paths(source: str) -> Tuple[str, str]:
+    """Library-relative (audio, metadata) paths of a source's streaming copy."""
+    stem = str(Path(STREAM_DIR) / Path(source).with_suffix(""))
+    return f"{stem}.mp3", f"{stem}.json"
+
+
+def probe_duration(path: str) -> float:
+    output = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+    return float(output)
+
+
+def transcode(source: str, output: str, profile: StreamingProfile = DEFAULT_PROFILE) -> None:
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-v", "error", "-i", source, "-vn",
+            "-af", f"loudnorm=I={profile.loudness_lufs}:TP={profile.true_peak_db}:LRA=11",
+            "-ac", str(profile.channels), "-ar", str(profile.sample_rate),
+            "-c:a", "libmp3lame", "-b:a", f"{profile.bitrate_kbps}k",
+            output,
+        ],
+        check=True, capture_output=True,
+    )
+
+
+def decode_pcm(path: str, sample_rate: int = ANALYSIS_SAMPLE_RATE) -> np.ndarray:
+    """Mono float32 samples in [-1, 1]."""
+    raw = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", path, "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "-"],
+        check=True, capture_output=True,
+    ).stdout
+    return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def waveform_peaks(samples: np.ndarray, buckets: int = WAVEFORM_BUCKETS) -> List[float]:
+    """Peak amplitude per bucket, for drawing a waveform without the audio."""
+    if samples.size == 0:
+        return []
+    buckets = min(buckets, samples.size)
+    edges = np.linspace(0, samples.size, buckets + 1).astype(int)
+    peaks = np.maximum.reduceat(np.abs(samples), edges[:-1])
+    return [round(float(peak), 3) for peak in peaks]
+
+
+def loudness_dbfs(samples: np.ndarray) -> Optional[float]:
+    """RMS level of the whole clip in dBFS; None for silence."""
+    if samples.size == 0:
+        return None
+    rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+    return round(20 * np.log10(rms), 1) if rms > 0 else None
+
+
+def speech_segments(
+    samples: np.ndarray,
+    sample_rate: int = ANALYSIS_SAMPLE_RATE,
+    threshold_db: float = -40.0,
+    min_silence_sec: float = 0.4,
+    frame_sec: float = 0.02,
+) -> List[List[float]]:
+    """[start, end] seconds of the stretches separated by pauses of ``min_silence_sec``."""
+    frame = max(1, int(sample_rate * frame_sec))
+    frames = samples.size // frame
+    if frames == 0:
+        return []
+    rms = np.sqrt(np.mean(np.square(samples[:frames * frame].reshape(frames, frame)), axis=1))
+    voiced = rms > 10 ** (threshold_db / 20)
+    segments: List[List[float]] = []
+    max_gap = int(min_silence_sec / frame_sec)
+    start = end = None
+    for index in np.flatnonzero(voiced):
+        if start is not None and index - end > max_gap:
+            segments.append([round(start * frame_sec, 2), round((end + 1) * frame_sec, 2)])
+            start = None
+        if start is None:
+            start = index
+        end = index
+    if start is not None:
+        segments.append([round(start * frame_sec, 2), round((end + 1) * frame_sec, 2)])
+    return segments
+
+
+def process_audio_file(
+    library_dir: str,
+    source: str,
+    source_sha256: str,
+    profile: StreamingProfile = DEFAULT_PROFILE,
+) -> Dict[str, Any]:
+    """Transcode and analyse one file; runs in a worker process and returns its manifest entry."""
+    output, metadata_path = stream_paths(source)
+    transcode(os.path.join(library_dir, source), os.path.join(library_dir, output), profile)
+    samples = decode_pcm(os.path.join(library_dir, output))
+    metadata = {
+        "source": source,
+        "duration_sec": round(probe_duration(os.path.join(library_dir, output)), 2),
+        "loudness_dbfs": loudness_dbfs(samples),
+        "profile": asdict(profile),
+        "waveform": waveform_peaks(samples),
+        "segments": speech_segments(samples),
+    }
+    with open(os.path.join(library_dir, metadata_path), "w", encoding="utf-8") as sidecar:
+        json.dump(metadata, sidecar)
+    return {
+        "sha256": source_sha256,
+        "profile": profile.key,
+        "output": output,
+        "metadata": metadata_path,
+        "duration_sec": metadata["duration_sec"],
+        "source_bytes": os.path.getsize(os.path.join(library_dir, source)),
+        "output_bytes": os.path.getsize(os.path.join(library_dir, output)),
+    }
+
+
+def scan_library(library_dir: str) -> List[str]:
+    """Library-relative paths of source recordings (streaming copies excluded)."""
+    root = Path(library_dir)
+    return sorted(
+        str(path.relative_to(root))
+        for path in root.rglob("*")
+        if path.is_file()
+        and path.suffix.lower() in AUDIO_EXTENSIONS
+        and path.relative_to(root).parts[0] != STREAM_DIR
+    )
+
+
+def load_manifest(library_dir: str) -> Dict[str, Dict[str, Any]]:
+    path = Path(library_dir) / STREAM_DIR / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_manifest(library_dir: str, manifest: Dict[str, Dict[str, Any]]) -> None:
+    path = Path(library_dir) / STREAM_DIR / MANIFEST_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    temporary.replace(path)
+
+
+def _is_current(library_dir: str, entry: Optional[Dict[str, Any]], sha256: str, profile: StreamingProfile) -> bool:
+    return (
+        entry is not None
+        and entry.get("sha256") == sha256
+        and entry.get("profile") == profile.key
+        and os.path.exists(os.path.join(library_dir, entry["output"]))
+        and os.path.exists(os.path.join(library_dir, entry["metadata"]))
+    )
+
+
+def process_library(
+    library_dir: str,
+    workers: Optional[int] = None,
+    profile: StreamingProfile = DEFAULT_PROFILE,
+    force: bool = False,
+    executor_factory: Callable[[int], Executor] = lambda workers: ProcessPoolExecutor(max_workers=workers),
+    process: Callable[..., Dict[str, Any]] = process_audio_file,
+) -> Dict[str, Any]:
+    """Bring every source's streaming copy up to date; returns a run report."""
+    manifest = load_manifest(library_dir)
+    sources = scan_library(library_dir)
+    report: Dict[str, Any] = {"processed": [], "skipped": [], "failed": {}, "removed": []}
+
+    with executor_factory(workers or os.cpu_count() or 1) as pool:
+        hashes = dict(zip(sources, pool.map(
+            file_sha256, [os.path.join(library_dir, source) for source in sources]
+        )))
+        pending = {}
+        for source in sources:
+            if not force and _is_current(library_dir, manifest.get(source), hashes[source], profile):
+                report["skipped"].append(source)
+            else:
+                pending[source] = pool.submit(process, library_dir, source, hashes[source], profile)
+        for source, future in pending.items():
+            try:
+                manifest[source] = future.result()
+                report["processed"].append(source)
+            except Exception as e:
+                report["failed"][source] = str(e)
+
+    for source in sorted(set(manifest) - set(sources)):
+        # Source deleted: forget it, but keep the streaming copy for questions still using it.
+        del manifest[source]
+        report["removed"].append(source)
+    save_manifest(library_dir, manifest)
+
+    report["entries"] = manifest
+    report["source_bytes"] = sum(entry["source_bytes"] for entry in manifest.values())
+    report["output_bytes"] = sum(entry["output_bytes"] for entry in manifest.values())
+    return report
+
+
+def apply_to_questions(db: Session, manifest: Dict[str, Dict[str, Any]]) -> int:
+    """Point listening questions at streaming copies and fill durations; returns rows changed."""
+    by_path = {}
+    for source, entry in manifest.items():
+        by_path[source] = entry
+        by_path[entry["output"]] = entry
+
+    updated = 0
+    questions = db.query(Question).filter(
+        Question.module == "LISTENING",
+        Question.audio_url.isnot(None),
+    ).all()
+    for question in questions:
+        entry = by_path.get(library_path(question.audio_url))
+        if entry is None:
+            continue
+        duration = max(1, round(entry["duration_sec"]))
+        if question.audio_url != entry["output"] or question.audio_duration_sec != duration:
+            question.audio_url = entry["output"]
+            question.audio_duration_sec = duration
+            updated += 1
+    db.commit()
+    return updated
+
+
+def read_audio_metadata(library_dir: str, audio_url: str) -> Optional[Dict[str, Any]]:
+    """Sidecar metadata for a streaming copy, or None if it was not processed."""
+    path = library_path(audio_url)
+    if path is None or not path.startswith(f"{STREAM_DIR}/"):
+        return None
+    sidecar = Path(library_dir) / Path(path).with_suffix(".json")
+    if not sidecar.is_file():
+        return None
+    return json.loads(sidecar.read_text(encoding="utf-8"))
@@ -0,0 +1,203 @@
+"""Range-aware, cacheable delivery of listening audio files.
+
+The audio player seeks with byte-range requests and replays the same files,
+so ``serve_audio_file`` answers with 206 partial content for a single
+``Range``, with 304 when ``If-None-Match``/``If-Modified-Since`` show the
+client's copy is current, and with strong ETag, Last-Modified and
+Cache-Control headers. ``If-Range`` falls back to the full file when the
+client's validator is stale.
+
+``listening_audio_cache`` maps question id -> stored ``audio_url`` so repeated
+chunk requests skip the Question query. File metadata comes from ``os.stat``
+on each request, so a replaced file gets a new ETag at once.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+import anyio
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import Question
+
+
+CHUNK_SIZE = 64 * 1024
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class ListeningAudioCache:
+    """LRU + TTL map of listening question id -> audio_url."""
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, db: Session, question_id: int) -> Optional[str]:
+        """The question's audio_url, loading it only on a cache miss.
+
+        Missing questions and questions without audio are not cached, so
+        newly added audio is served immediately.
+        """
+        with self._lock:
+            entry = self._entries.get(question_id)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(question_id)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[question_id]
+            self.misses += 1
+
+        audio_url = db.query(Question.audio_url).filter(
+            Question.id == question_id,
+            Question.module == "LISTENING",
+        ).scalar()
+        if audio_url:
+            with self._lock:
+                self._entries[question_id] = (time.monotonic(), audio_url)
+                self._entries.move_to_end(question_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return audio_url
+
+    def invalidate(self, question_id: int) -> None:
+        """Drop one question after its audio_url changes or it is deleted."""
+        with self._lock:
+            self._entries.pop(question_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+def _etag(stat: os.stat_result) -> str:
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _not_modified_since(header: Optional[str], mtime: float) -> bool:
+    if not header:
+        return False
+    try:
+        return int(mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) for a single byte range; None if unsatisfiable.
+
+    Raises ValueError for headers this server ignores (multiple ranges,
+    other units or malformed values); those get the full file.
+    """
+    match = _RANGE_PATTERN.match(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        raise ValueError(header)
+    first, last = match.groups()
+    if first == "":
+        suffix = int(last)
+        if suffix == 0:
+            return None
+        return max(0, size - suffix), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return None
+    return start, end
+
+
+async def _read_file(path: str, start: int, length: int):
+    async with await anyio.open_file(path, "rb") as file:
+        await file.seek(start)
+        while length > 0:
+            chunk = await file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_audio_file(request: Request, path: str, media_type: str, filename: str) -> Response:
+    """Full, partial (206) or not-modified (304) response for a local file."""
+    stat = os.stat(path)
+    size = stat.st_size
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": _etag(stat),
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        # Audio is behind auth, so only the user's own browser may cache it.
+        "Cache-Control": f"private, max-age={get_settings().listening_audio_max_age_seconds}",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, headers["ETag"])
+    else:
+        not_modified = _not_modified_since(request.headers.get("if-modified-since"), stat.st_mtime)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range in (headers["ETag"], headers["Last-Modified"])):
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            pass  # Ignored range: send the full file.
+        else:
+            if byte_range is None:
+                headers["Content-Range"] = f"bytes */{size}"
+                return Response(status_code=416, headers=headers)
+
+    if byte_range is not None:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        status_code = 206
+    else:
+        start, end = 0, size - 1
+        status_code = 200
+    length = end - start + 1
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(
+        _read_file(path, start, length),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+listening_audio_cache = ListeningAudioCache(ttl_seconds=get_settings().listening_audio_cache_ttl_seconds)
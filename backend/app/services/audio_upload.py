@@ -0,0 +1,203 @@
+"""Streaming ingestion of multipart speaking uploads.
+
+The request body is parsed as it arrives, and the recording is written
+directly to its final file. Nothing is spooled to a temporary copy, and the
+body is never re-read to measure its size. Uploads are rejected as early as
+the information allows:
+
+* a Content-Length over the limit is rejected before the body is read;
+* a file part with a non-audio Content-Type is rejected from its part headers;
+* a file whose first bytes are not a known audio container is rejected before
+  anything is written;
+* a body that grows past the limit is rejected at the chunk that crosses it.
+
+The file's sha256 is computed on the way in, so the evaluation cache does not
+read the recording again.
+"""
+
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import multipart
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import parse_options_header
+from fastapi import HTTPException, Request
+
+
+MAX_AUDIO_BYTES = 10 * 1024 * 1024  # 10MB
+MAX_FIELD_BYTES = 64 * 1024
+# Boundaries, part headers and text fields around the audio.
+FORM_OVERHEAD_BYTES = 128 * 1024
+ALLOWED_AUDIO_TYPES = ("audio/webm", "audio/wav", "audio/mp3", "audio/mpeg", "audio/ogg", "audio/m4a")
+SNIFF_BYTES = 12
+
+
+def sniff_audio_format(head: bytes) -> Optional[str]:
+    """File extension for a supported audio container, judged by magic bytes."""
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "webm"
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head.startswith(b"OggS"):
+        return "ogg"
+    if head[4:8] == b"ftyp":
+        return "m4a"
+    if head.startswith(b"ID3") or (len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return "mp3"
+    return None
+
+
+@dataclass
+class AudioUpload:
+    """A received recording plus the form's text fields."""
+    path: str
+    size: int
+    sha256: str
+    fields: Dict[str, str] = field(default_factory=dict)
+
+
+class _AudioFormReceiver:
+    """python-multipart callbacks that stream the ``file`` part to disk."""
+
+    def __init__(self, directory: str, file_field: str, max_bytes: int):
+        self.directory = directory
+        self.file_field = file_field
+        self.max_bytes = max_bytes
+        self.fields: Dict[str, str] = {}
+        self.path: Optional[str] = None
+        self.size = 0
+        self.digest = hashlib.sha256()
+        self._file = None
+        self._head = b""
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+        self._name = ""
+        self._value = b""
+        self._is_file = False
+
+    def callbacks(self):
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+        self._value = b""
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode("latin-1")
+        self._is_file = self._name == self.file_field and b"filename" in options
+        if not self._is_file:
+            return
+        if self.path is not None:
+            raise HTTPException(status_code=400, detail="Only one audio file can be uploaded.")
+        content_type, _ = parse_options_header(self._headers.get(b"content-type", b""))
+        if content_type.decode("latin-1") not in ALLOWED_AUDIO_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_AUDIO_TYPES)}",
+            )
+        self._head = b""
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        chunk = data[start:end]
+        if not self._is_file:
+            self._value += chunk
+            if len(self._value) > MAX_FIELD_BYTES:
+                raise HTTPException(status_code=413, detail=f"Form field '{self._name}' is too large.")
+            return
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise HTTPException(status_code=413, detail="File too large. Maximum size is 10MB.")
+        self.digest.update(chunk)
+        if self._file is None:
+            self._head += chunk
+            if len(self._head) >= SNIFF_BYTES:
+                self._open(self._head)
+            return
+        self._file.write(chunk)
+
+    def on_part_end(self) -> None:
+        if not self._is_file:
+            self.fields[self._name] = self._value.decode("utf-8", errors="replace")
+            return
+        if self._file is None:
+            self._open(self._head)
+        self._file.close()
+        self._is_file = False
+
+    def discard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _open(self, head: bytes) -> None:
+        extension = sniff_audio_format(head)
+        if extension is None:
+            raise HTTPException(status_code=400, detail="Uploaded file is not a supported audio recording.")
+        self.path = os.path.join(self.directory, f"{uuid.uuid4()}.{extension}")
+        self._file = open(self.path, "wb")
+        self._file.write(head)
+
+
+async def receive_audio_upload(
+    request: Request,
+    directory: str,
+    file_field: str = "file",
+    max_bytes: int = MAX_AUDIO_BYTES,
+) -> AudioUpload:
+    """Stream a multipart/form-data body, saving ``file_field`` under ``directory``.
+
+    Raises HTTPException (400/413/422) and leaves no file behind on rejection.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload.")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + FORM_OVERHEAD_BYTES:
+        raise HTTPException(status_code=413, detail="File too large. Maximum size is 10MB.")
+
+    receiver = _AudioFormReceiver(directory, file_field, max_bytes)
+    parser = multipart.MultipartParser(boundary, receiver.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except MultipartParseError:
+        receiver.discard()
+        raise HTTPException(status_code=400, detail="Malformed multipart upload.")
+    except BaseException:
+        receiver.discard()
+        raise
+    if receiver.path is None:
+        raise HTTPException(status_code=422, detail=f"Missing audio file field '{file_field}'.")
+    return AudioUpload(
+        path=receiver.path,
+        size=receiver.size,
+        sha256=receiver.digest.hexdigest(),
+        fields=receiver.fields,
+    )
@@ -2,7 +2,6 @@
 
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException, status
@@ -11,11 +10,13 @@ from fastapi.security import OAuth2PasswordBearer
 from ..models import User
 from ..schemas import UserCreate, Token
 from ..config import get_settings
-from ..database import get_db
+from ..database import get_db, release_connection
 from ..utils.password_validator import validate_password
+from .identity_cache import user_identity_cache
+from .password_hasher import password_hasher
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = password_hasher.context
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
@@ -29,6 +30,16 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool without blocking the event loop."""
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool without blocking the event loop."""
+    return await password_hasher.hash(password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -72,17 +83,16 @@ def validate_user_password(password: str) -> Tuple[bool, str]:
     return validate_password(password)
 
 
-def create_user(db: Session, user_data: UserCreate) -> User:
-    """Create a new user with password validation."""
-    # Validate password
-    is_valid, error_msg = validate_password(user_data.password)
+def _check_new_password(password: str) -> None:
+    is_valid, error_msg = validate_password(password)
     if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=error_msg
         )
-    
-    hashed_password = get_password_hash(user_data.password)
+
+
+def _add_user(db: Session, user_data: UserCreate, hashed_password: str) -> User:
     user = User(
         email=user_data.email,
         username=user_data.username,
@@ -94,6 +104,19 @@ def create_user(db: Session, user_data: UserCreate) -> User:
     return user
 
 
+def create_user(db: Session, user_data: UserCreate) -> User:
+    """Create a new user with password validation."""
+    _check_new_password(user_data.password)
+    return _add_user(db, user_data, get_password_hash(user_data.password))
+
+
+async def create_user_async(db: Session, user_data: UserCreate) -> User:
+    """``create_user`` for async endpoints: hashes on the hashing pool."""
+    _check_new_password(user_data.password)
+    release_connection(db)
+    return _add_user(db, user_data, await get_password_hash_async(user_data.password))
+
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """Authenticate user by email and password."""
     user = db.query(User).filter(User.email == email).first()
@@ -102,6 +125,20 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     return user
 
 
+async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[User]:
+    """``authenticate_user`` for async endpoints: verifies on the hashing pool."""
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        return None
+    # Detach first so ending the transaction does not expire the loaded row.
+    db.expunge(user)
+    release_connection(db)
+    if not await verify_password_async(password, user.password_hash):
+        return None
+    db.add(user)
+    return user
+
+
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """Get user by email."""
     return db.query(User).filter(User.email == email).first()
@@ -122,7 +159,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     user_id = decode_token(token)
     if user_id is None:
         raise credentials_exception
-    user = get_user_by_id(db, user_id=user_id)
+    user = user_identity_cache.get(db, user_id)
     if user is None:
         raise credentials_exception
     return user
@@ -0,0 +1,145 @@
+"""Idempotent bulk seeding keyed on natural keys.
+
+The seed scripts used to look every row up with its own query and ``db.add``
+it, committing along the way. ``BulkSeeder`` instead loads the natural keys
+already in a table with one SELECT and inserts the missing rows with batched
+executemany INSERTs. It refreshes the chosen columns on matching rows with one
+bulk UPDATE by primary key. A natural key is e.g. ``(name, category)`` for
+skills or ``(passage_title, question_text)`` for questions. Nothing is
+committed: the caller commits once, so a seed run is a single transaction and
+can be re-run safely.
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+
+NaturalKey = Tuple[Any, ...]
+
+
+def model_rows(objects: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Column values explicitly set on transient ORM objects, as insert rows."""
+    rows = []
+    for obj in objects:
+        state = inspect(obj)
+        rows.append({
+            attribute.key: state.dict[attribute.key]
+            for attribute in state.mapper.column_attrs
+            if attribute.key in state.dict
+        })
+    return rows
+
+
+class BulkSeeder:
+    """Batched, natural-key upserts in the caller's transaction."""
+
+    def __init__(self, db: Session, batch_size: int = 5000):
+        self.db = db
+        self.batch_size = batch_size
+        self.tables: Dict[str, Dict[str, int]] = {}
+        self.duplicates: Dict[str, List[int]] = {}
+        self._started = time.perf_counter()
+
+    def upsert(
+        self,
+        model,
+        rows: Iterable[Dict[str, Any]],
+        key: Sequence[str],
+        update_columns: Sequence[str] = (),
+        where: Sequence[Any] = (),
+    ) -> Dict[NaturalKey, int]:
+        """
+        Insert rows whose natural key is new and refresh ``update_columns`` on the rest.
+
+        ``where`` narrows the existing rows considered (e.g. one module); rows
+        being inserted must satisfy it too. When the table already holds
+        several rows with the same key, the oldest wins and the others are
+        listed in ``duplicates[table]`` until the next upsert of that table. Returns natural key -> id for every key in
+        ``rows``.
+        """
+        counts = self._counts(model)
+        existing = self._existing(model, key, update_columns, where)
+
+        inserts: List[Dict[str, Any]] = []
+        updates: List[Dict[str, Any]] = []
+        wanted: Dict[NaturalKey, None] = {}
+        for row in rows:
+            natural = tuple(row[column] for column in key)
+            if natural in wanted:
+                continue
+            wanted[natural] = None
+            current = existing.get(natural)
+            if current is None:
+                inserts.append(row)
+                continue
+            changes = {
+                column: row[column]
+                for column in update_columns
+                if column in row and row[column] != current[column]
+            }
+            if changes:
+                updates.append({"id": current["id"], **changes})
+            else:
+                counts["unchanged"] += 1
+
+        self.insert(model, inserts)
+        if updates:
+            self.db.execute(update(model), updates)
+            counts["updated"] += len(updates)
+
+        ids = {natural: current["id"] for natural, current in existing.items()}
+        if inserts:
+            ids.update(
+                (natural, current["id"])
+                for natural, current in self._existing(model, key, (), where).items()
+            )
+        return {natural: ids[natural] for natural in wanted}
+
+    def insert(self, model, rows: List[Dict[str, Any]]) -> int:
+        """Plain batched INSERT of ``rows``; returns the number inserted."""
+        by_columns: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            # executemany needs one column set per statement; rows that omit a
+            # column keep its Python-side default instead of being NULL-padded.
+            by_columns.setdefault(tuple(sorted(row)), []).append(row)
+        for group in by_columns.values():
+            for offset in range(0, len(group), self.batch_size):
+                self.db.execute(insert(model), group[offset:offset + self.batch_size])
+        self._counts(model)["inserted"] += len(rows)
+        return len(rows)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "tables": self.tables,
+            "duplicates": {table: len(ids) for table, ids in self.duplicates.items() if ids},
+            "seconds": round(time.perf_counter() - self._started, 3),
+        }
+
+    def _counts(self, model) -> Dict[str, int]:
+        return self.tables.setdefault(model.__tablename__, {"inserted": 0, "updated": 0, "unchanged": 0})
+
+    def _existing(
+        self,
+        model,
+        key: Sequence[str],
+        columns: Sequence[str],
+        where: Sequence[Any],
+    ) -> Dict[NaturalKey, Dict[str, Any]]:
+        names = list(dict.fromkeys(["id", *key, *columns]))
+        query = select(*(getattr(model, name) for name in names)).order_by(model.id)
+        for condition in where:
+            query = query.where(condition)
+        existing: Dict[NaturalKey, Dict[str, Any]] = {}
+        duplicates: List[int] = []
+        for values in self.db.execute(query):
+            row = dict(zip(names, values))
+            natural = tuple(row[column] for column in key)
+            if natural in existing:
+                duplicates.append(row["id"])
+                continue
+            existing[natural] = row
+        self.duplicates[model.__tablename__] = duplicates
+        return existing
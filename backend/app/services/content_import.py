@@ -0,0 +1,182 @@
+"""Batched import of IELTS test sets and their questions.
+
+``ContentImporter`` validates each test set as it arrives and buffers it. Every
+``batch_size`` questions it writes the buffered sets with INSERT ... RETURNING
+(multi-row where the dialect can keep the ids in parameter order, e.g.
+PostgreSQL). Their questions, the bulk of the rows, go in one executemany
+INSERT. There are no per-row ORM flushes, and everything is committed in a
+single transaction by ``finish``.
+
+Test sets that fail validation are skipped and reported with their line
+number; the rest of the import continues.
+"""
+
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..models import Question, Skill, TestSet
+from .content_validation import validate_reading_question
+
+
+MAX_REPORTED_ERRORS = 1000
+
+
+class ContentImporter:
+    """Accumulates parsed ``ImportTestSet`` items and inserts them in batches."""
+
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int = 2000,
+        validate: bool = True,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.validate = validate
+        self.progress = progress
+        self.skill_categories: Dict[int, str] = dict(db.query(Skill.id, Skill.category).all())
+        self.created_test_sets: List[int] = []
+        self.imported_questions = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.batches = 0
+        self._started = time.perf_counter()
+        self._pending_sets: List[Dict[str, Any]] = []
+        self._pending_questions: List[List[Dict[str, Any]]] = []
+        self._pending_question_count = 0
+
+    def add(self, item, line: Optional[int] = None) -> bool:
+        """Validate and buffer one test set; False (and an error entry) if rejected."""
+        module = item.module.upper()
+        approved = not item.needs_review
+        questions = [self._question_row(item, module, approved, question) for question in item.questions]
+        errors = self._validate(questions) if self.validate else self._check_skills(questions)
+        if errors:
+            self.reject(line, errors, title=item.title)
+            return False
+
+        self._pending_sets.append({
+            "title": item.title,
+            "module": module,
+            "section": item.section,
+            "instructions": item.instructions,
+            "passage": item.passage,
+            "audio_url": item.audio_url,
+            "transcript": item.transcript,
+            "source": item.source,
+            "estimated_band": item.estimated_band,
+            "time_limit_minutes": item.time_limit_minutes,
+            "needs_review": item.needs_review,
+            "approved": approved,
+        })
+        self._pending_questions.append(questions)
+        self._pending_question_count += len(questions)
+        if self._pending_question_count >= self.batch_size:
+            self.flush()
+        return True
+
+    def reject(self, line: Optional[int], errors: List[str], title: Optional[str] = None) -> None:
+        """Record a test set that could not be parsed or validated."""
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "title": title, "errors": errors})
+
+    def flush(self) -> None:
+        """Insert buffered test sets and their questions (not yet committed)."""
+        if not self._pending_sets:
+            return
+        set_ids = self.db.scalars(
+            insert(TestSet).returning(TestSet.id, sort_by_parameter_order=True),
+            self._pending_sets,
+        ).all()
+        question_rows = []
+        for set_id, questions in zip(set_ids, self._pending_questions):
+            for row in questions:
+                row["test_set_id"] = set_id
+                question_rows.append(row)
+        if question_rows:
+            self.db.execute(insert(Question), question_rows)
+
+        self.created_test_sets.extend(set_ids)
+        self.imported_questions += len(question_rows)
+        self.batches += 1
+        self._pending_sets = []
+        self._pending_questions = []
+        self._pending_question_count = 0
+        if self.progress is not None:
+            self.progress(self.report())
+
+    def finish(self) -> Dict[str, Any]:
+        """Flush the last batch, commit everything and return the report."""
+        self.flush()
+        self.db.commit()
+        return self.report()
+
+    def report(self) -> Dict[str, Any]:
+        seconds = time.perf_counter() - self._started
+        return {
+            "created_test_sets": self.created_test_sets,
+            "count": len(self.created_test_sets),
+            "imported_questions": self.imported_questions,
+            "failed": self.failed,
+            "errors": self.errors,
+            "batches": self.batches,
+            "seconds": round(seconds, 3),
+            "questions_per_second": round(self.imported_questions / seconds, 1) if seconds else 0.0,
+        }
+
+    @staticmethod
+    def _question_row(item, module: str, approved: bool, question) -> Dict[str, Any]:
+        return {
+            "skill_id": question.skill_id,
+            "module": module,
+            "section": item.section,
+            "passage": item.passage or item.transcript,
+            "passage_title": item.title,
+            "audio_url": item.audio_url,
+            "audio_duration_sec": None,
+            "question_text": question.question_text,
+            "question_type": question.question_type,
+            "options": question.options,
+            "correct_answer": question.correct_answer,
+            "difficulty": question.difficulty,
+            "estimated_band": question.estimated_band,
+            "explanation": question.explanation,
+            "tags": question.tags,
+            "needs_review": item.needs_review,
+            "approved": approved,
+            "is_active": True,
+        }
+
+    def _check_skills(self, questions: List[Dict[str, Any]]) -> List[str]:
+        return [
+            f"question {index}: unknown skill_id {row['skill_id']}"
+            for index, row in enumerate(questions, start=1)
+            if row["skill_id"] not in self.skill_categories
+        ]
+
+    def _validate(self, questions: List[Dict[str, Any]]) -> List[str]:
+        errors = self._check_skills(questions)
+        if not questions:
+            errors.append("test set has no questions")
+        for index, row in enumerate(questions, start=1):
+            if row["skill_id"] not in self.skill_categories:
+                continue
+            if row["module"] == "READING":
+                skill = SimpleNamespace(category=self.skill_categories[row["skill_id"]])
+                problems = validate_reading_question(SimpleNamespace(skill=skill, **row))
+            else:
+                problems = []
+                if not str(row["question_text"] or "").strip():
+                    problems.append("question_text must be present")
+                if not str(row["correct_answer"] or "").strip():
+                    problems.append("correct_answer must be present")
+                if not isinstance(row["difficulty"], int) or not 1 <= row["difficulty"] <= 10:
+                    problems.append("difficulty must be within 1-10")
+            errors.extend(f"question {index}: {problem}" for problem in problems)
+        return errors
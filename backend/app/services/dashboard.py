@@ -2,13 +2,18 @@
 
 from datetime import datetime, date, timedelta
 from typing import List, Dict
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Float, case, cast, func
 
-from ..models import User, Attempt, UserSkillMastery, Skill, DashboardMetric, Question, MistakeReview
+from ..models import (
+    User, Attempt, UserSkillMastery, Skill, DashboardMetric, Question, MistakeReview,
+    WritingAttempt, SpeakingAttempt
+)
+from ..database import dialect_insert
 from ..ml import knowledge_tracer
 from ..services.gamification import get_xp_to_next_level
 from ..services.scoring import raw_to_band, overall_band
+from ..services.user_stats import get_user_stats_snapshot
 
 
 def get_dashboard_data(db: Session, user_id: int) -> Dict:
@@ -19,28 +24,23 @@ def get_dashboard_data(db: Session, user_id: int) -> Dict:
     if not user:
         return {}
     
-    # Get all attempts
-    attempts = db.query(Attempt).filter(Attempt.user_id == user_id).all()
-    total_attempts = len(attempts)
-    correct_attempts = sum(1 for a in attempts if a.is_correct)
-    
-    # Calculate overall accuracy
-    overall_accuracy = correct_attempts / total_attempts if total_attempts > 0 else 0
-    
-    # Calculate average response time
-    if attempts:
-        avg_response_time = sum(a.response_time_ms for a in attempts) / len(attempts)
-    else:
-        avg_response_time = 0
+    # Lifetime totals and per-module raw scores come from the materialized
+    # snapshot, so this is O(1) in the size of the attempt history.
+    stats = get_user_stats_snapshot(db, user_id)
+    total_attempts = stats.total_attempts
+    overall_accuracy = stats.accuracy
+    avg_response_time = stats.avg_response_time_ms
     
     # Get skill masteries and calculate estimated band
+    all_skills = db.query(Skill).all()
     masteries = db.query(UserSkillMastery).filter(
         UserSkillMastery.user_id == user_id
     ).all()
+    skills_by_id = {skill.id: skill for skill in all_skills}
     
     skill_masteries_by_category = {}
     for m in masteries:
-        skill = db.query(Skill).filter(Skill.id == m.skill_id).first()
+        skill = skills_by_id.get(m.skill_id)
         if skill:
             if skill.category not in skill_masteries_by_category:
                 skill_masteries_by_category[skill.category] = []
@@ -56,21 +56,15 @@ def get_dashboard_data(db: Session, user_id: int) -> Dict:
     
     # Build skills breakdown
     skills_data = []
-    all_skills = db.query(Skill).all()
     mastery_map = {m.skill_id: m for m in masteries}
     
     for skill in all_skills:
         mastery = mastery_map.get(skill.id)
         
-        # Calculate accuracy for this skill
-        skill_attempts = db.query(Attempt).join(Question).filter(
-            Attempt.user_id == user_id,
-            Question.skill_id == skill.id
-        ).all()
-        
+        # Mastery rows carry per-skill counts maintained with every attempt
         skill_accuracy = 0
-        if skill_attempts:
-            skill_accuracy = sum(1 for a in skill_attempts if a.is_correct) / len(skill_attempts)
+        if mastery and mastery.attempts_count:
+            skill_accuracy = mastery.correct_count / mastery.attempts_count
         
         skills_data.append({
             "skill_id": skill.id,
@@ -82,22 +76,7 @@ def get_dashboard_data(db: Session, user_id: int) -> Dict:
             "is_unlocked": mastery.is_unlocked if mastery else (skill.parent_skill_id is None)
         })
 
-    section_bands = {}
-    for module in ["READING", "LISTENING"]:
-        module_attempts = db.query(Attempt).join(Question).filter(
-            Attempt.user_id == user_id,
-            Question.module == module
-        ).all()
-        if module_attempts:
-            correct = sum(1 for a in module_attempts if a.is_correct)
-            section_bands[module.lower()] = raw_to_band(correct, module, len(module_attempts))
-
-    writing_scores = [w.band_score for w in getattr(user, "writing_attempts", []) if w.band_score]
-    speaking_scores = [s.band_score for s in getattr(user, "speaking_attempts", []) if s.band_score]
-    if writing_scores:
-        section_bands["writing"] = writing_scores[-1]
-    if speaking_scores:
-        section_bands["speaking"] = speaking_scores[-1]
+    section_bands = get_section_bands(db, user_id, stats)
     if section_bands:
         estimated_band = overall_band(section_bands.values())
 
@@ -116,7 +95,9 @@ def get_dashboard_data(db: Session, user_id: int) -> Dict:
         for module, question_type, count in weak_rows
     ]
 
-    mistakes = db.query(MistakeReview).filter(
+    mistakes = db.query(MistakeReview).options(
+        joinedload(MistakeReview.question)
+    ).filter(
         MistakeReview.user_id == user_id,
         MistakeReview.is_resolved == False
     ).order_by(MistakeReview.created_at.desc()).limit(5).all()
@@ -168,11 +149,48 @@ def get_dashboard_data(db: Session, user_id: int) -> Dict:
     }
 
 
+def get_section_bands(db: Session, user_id: int, stats=None) -> Dict[str, float]:
+    """Per-section bands from snapshot raw scores and the latest writing/speaking scores."""
+    stats = stats or get_user_stats_snapshot(db, user_id)
+    section_bands = {}
+    for module in ["READING", "LISTENING"]:
+        module_count, module_correct = stats.module_totals(module)
+        if module_count:
+            section_bands[module.lower()] = raw_to_band(module_correct, module, module_count)
+
+    writing_band = _latest_band_score(db, WritingAttempt, user_id)
+    speaking_band = _latest_band_score(db, SpeakingAttempt, user_id)
+    if writing_band:
+        section_bands["writing"] = writing_band
+    if speaking_band:
+        section_bands["speaking"] = speaking_band
+    return section_bands
+
+
+def estimate_user_band(db: Session, user_id: int, stats=None) -> float:
+    """The dashboard's estimated band without building the full dashboard."""
+    section_bands = get_section_bands(db, user_id, stats)
+    if section_bands:
+        return overall_band(section_bands.values())
+    return estimate_band_from_masteries(db, user_id)
+
+
+def _latest_band_score(db: Session, model, user_id: int) -> float | None:
+    """Return the most recent non-zero band score for a writing/speaking model."""
+    return db.query(model.band_score).filter(
+        model.user_id == user_id,
+        model.band_score.isnot(None),
+        model.band_score != 0,
+    ).order_by(model.id.desc()).limit(1).scalar()
+
+
 def get_progress_history(db: Session, user_id: int, days: int = 30) -> List[Dict]:
     """
     Get daily progress history for the last N days.
     """
-    end_date = date.today()
+    # Metric rows are keyed by the UTC day of Attempt.created_at (a database
+    # CURRENT_TIMESTAMP), so the window uses the same clock.
+    end_date = datetime.utcnow().date()
     start_date = end_date - timedelta(days=days)
     
     # Get stored metrics
@@ -194,54 +212,198 @@ def get_progress_history(db: Session, user_id: int, days: int = 30) -> List[Dict
     return history
 
 
-def update_daily_metrics(db: Session, user_id: int):
+def _metric_day(value) -> datetime:
+    """Normalize a timestamp or SQL date value to the midnight key used by DashboardMetric."""
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        value = value.date()
+    return datetime.combine(value, datetime.min.time())
+
+
+def estimate_band_from_masteries(db: Session, user_id: int) -> float:
+    """Estimate the Reading band from per-category average mastery in one query."""
+    rows = db.query(
+        Skill.category,
+        func.avg(UserSkillMastery.mastery_probability),
+    ).join(Skill, Skill.id == UserSkillMastery.skill_id).filter(
+        UserSkillMastery.user_id == user_id
+    ).group_by(Skill.category).all()
+
+    return knowledge_tracer.estimate_band_score({
+        category: float(avg) for category, avg in rows
+    })
+
+
+def record_attempt_metrics(db: Session, attempt: Attempt, commit: bool = True):
     """
-    Update or create today's dashboard metrics.
-    Called after each attempt.
+    Fold a single new attempt into its day's DashboardMetric row.
+
+    Counts, the response-time sum and XP are incremented in place with an
+    upsert keyed on (user_id, date), so the cost does not grow with the
+    number of attempts already made that day. Pass commit=False to stage the
+    write in the caller's unit of work.
     """
-    today = datetime.combine(date.today(), datetime.min.time())
-    
-    # Get or create today's metric
-    metric = db.query(DashboardMetric).filter(
-        DashboardMetric.user_id == user_id,
-        DashboardMetric.date == today
-    ).first()
-    
-    if not metric:
-        metric = DashboardMetric(user_id=user_id, date=today)
-        db.add(metric)
-    
-    # Calculate today's stats from attempts
-    today_attempts = db.query(Attempt).filter(
-        Attempt.user_id == user_id,
-        Attempt.created_at >= today
-    ).all()
-    
-    if today_attempts:
-        metric.total_attempts = len(today_attempts)
-        metric.correct_attempts = sum(1 for a in today_attempts if a.is_correct)
+    # Pending mastery changes must be visible to the band aggregate.
+    db.flush()
+
+    metric_date = _metric_day(attempt.created_at or datetime.utcnow())
+    correct = 1 if attempt.is_correct else 0
+    response_time = attempt.response_time_ms or 0
+    xp_earned = attempt.xp_earned or 0
+    estimated_band = estimate_band_from_masteries(db, attempt.user_id)
+
+    insert = dialect_insert(db)
+    if insert is not None:
+        table = DashboardMetric.__table__
+        stmt = insert(table).values(
+            user_id=attempt.user_id,
+            date=metric_date,
+            total_attempts=1,
+            correct_attempts=correct,
+            accuracy_rate=float(correct),
+            response_time_sum_ms=response_time,
+            avg_response_time_ms=float(response_time),
+            xp_earned=xp_earned,
+            estimated_band=estimated_band,
+        )
+        total = func.coalesce(table.c.total_attempts, 0) + 1
+        correct_total = func.coalesce(table.c.correct_attempts, 0) + stmt.excluded.correct_attempts
+        response_time_total = (
+            func.coalesce(table.c.response_time_sum_ms, 0) + stmt.excluded.response_time_sum_ms
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.date],
+            set_={
+                "total_attempts": total,
+                "correct_attempts": correct_total,
+                "accuracy_rate": cast(correct_total, Float) / total,
+                "response_time_sum_ms": response_time_total,
+                "avg_response_time_ms": cast(response_time_total, Float) / total,
+                "xp_earned": func.coalesce(table.c.xp_earned, 0) + stmt.excluded.xp_earned,
+                "estimated_band": stmt.excluded.estimated_band,
+            },
+        )
+        db.execute(stmt)
+    else:
+        metric = db.query(DashboardMetric).filter(
+            DashboardMetric.user_id == attempt.user_id,
+            DashboardMetric.date == metric_date
+        ).first()
+        if not metric:
+            metric = DashboardMetric(
+                user_id=attempt.user_id,
+                date=metric_date,
+                total_attempts=0,
+                correct_attempts=0,
+                response_time_sum_ms=0,
+                xp_earned=0,
+            )
+            db.add(metric)
+        metric.total_attempts = (metric.total_attempts or 0) + 1
+        metric.correct_attempts = (metric.correct_attempts or 0) + correct
+        metric.response_time_sum_ms = (metric.response_time_sum_ms or 0) + response_time
+        metric.xp_earned = (metric.xp_earned or 0) + xp_earned
         metric.accuracy_rate = metric.correct_attempts / metric.total_attempts
-        metric.avg_response_time_ms = sum(a.response_time_ms for a in today_attempts) / len(today_attempts)
-        metric.xp_earned = sum(a.xp_earned for a in today_attempts)
-    
-    # Calculate estimated band from current masteries
-    masteries = db.query(UserSkillMastery).filter(
-        UserSkillMastery.user_id == user_id
-    ).all()
-    
-    skill_masteries_by_category = {}
-    for m in masteries:
-        skill = db.query(Skill).filter(Skill.id == m.skill_id).first()
-        if skill:
-            if skill.category not in skill_masteries_by_category:
-                skill_masteries_by_category[skill.category] = []
-            skill_masteries_by_category[skill.category].append(m.mastery_probability)
-    
-    category_avg = {
-        cat: sum(probs) / len(probs) 
-        for cat, probs in skill_masteries_by_category.items()
-    }
-    
-    metric.estimated_band = knowledge_tracer.estimate_band_score(category_avg)
-    
-    db.commit()
+        metric.avg_response_time_ms = metric.response_time_sum_ms / metric.total_attempts
+        metric.estimated_band = estimated_band
+
+    if commit:
+        db.commit()
+
+
+def rebuild_daily_metrics(db: Session, user_id: int | None = None, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Reconcile DashboardMetric rows against Attempt history.
+
+    Recomputes counts, sums and averages per (user, day) with GROUP BY and
+    overwrites any drifted rows. Days with a metric row but no attempts are
+    zeroed. Historic estimated_band values are kept; new rows get the user's
+    current estimate. Users are processed and committed in batches.
+
+    Returns counts of users scanned, rows created and rows corrected.
+    """
+    if user_id is not None:
+        user_ids = [user_id]
+    else:
+        user_ids = sorted(
+            {row[0] for row in db.query(Attempt.user_id).distinct()}
+            | {row[0] for row in db.query(DashboardMetric.user_id).distinct()}
+        )
+
+    report = {"users": 0, "created": 0, "corrected": 0}
+    for offset in range(0, len(user_ids), batch_size):
+        batch = user_ids[offset:offset + batch_size]
+        day = func.date(Attempt.created_at)
+        rows = db.query(
+            Attempt.user_id,
+            day,
+            func.count(Attempt.id),
+            func.sum(case((Attempt.is_correct == True, 1), else_=0)),
+            func.sum(Attempt.response_time_ms),
+            func.sum(func.coalesce(Attempt.xp_earned, 0)),
+        ).filter(Attempt.user_id.in_(batch)).group_by(Attempt.user_id, day).all()
+
+        existing = {
+            (metric.user_id, _metric_day(metric.date)): metric
+            for metric in db.query(DashboardMetric).filter(DashboardMetric.user_id.in_(batch))
+        }
+        current_bands: Dict[int, float] = {}
+        seen = set()
+
+        for row_user_id, row_day, total, correct, response_sum, xp_sum in rows:
+            key = (row_user_id, _metric_day(row_day))
+            seen.add(key)
+            expected = {
+                "total_attempts": int(total),
+                "correct_attempts": int(correct or 0),
+                "response_time_sum_ms": int(response_sum or 0),
+                "xp_earned": int(xp_sum or 0),
+                "accuracy_rate": (correct or 0) / total,
+                "avg_response_time_ms": (response_sum or 0) / total,
+            }
+            metric = existing.get(key)
+            if metric is None:
+                if row_user_id not in current_bands:
+                    current_bands[row_user_id] = estimate_band_from_masteries(db, row_user_id)
+                db.add(DashboardMetric(
+                    user_id=row_user_id,
+                    date=key[1],
+                    estimated_band=current_bands[row_user_id],
+                    **expected,
+                ))
+                report["created"] += 1
+            elif _apply_expected(metric, expected):
+                report["corrected"] += 1
+
+        empty = {
+            "total_attempts": 0,
+            "correct_attempts": 0,
+            "response_time_sum_ms": 0,
+            "xp_earned": 0,
+            "accuracy_rate": None,
+            "avg_response_time_ms": None,
+        }
+        for key, metric in existing.items():
+            if key not in seen and _apply_expected(metric, empty):
+                report["corrected"] += 1
+
+        report["users"] += len(batch)
+        db.commit()
+
+    return report
+
+
+def _apply_expected(metric: DashboardMetric, expected: Dict) -> bool:
+    """Overwrite drifted metric fields; return True when anything changed."""
+    changed = False
+    for field, value in expected.items():
+        current = getattr(metric, field)
+        if isinstance(value, float) and current is not None:
+            drifted = abs(current - value) > 1e-9
+        else:
+            drifted = current != value
+        if drifted:
+            setattr(metric, field, value)
+            changed = True
+    return changed
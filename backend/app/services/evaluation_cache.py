@@ -0,0 +1,186 @@
+"""Persistent cache of AI writing/speaking evaluations.
+
+Students often resubmit the same essay, and clients retry after timeouts, so
+the same LLM evaluation would run again. Results are stored in the
+evaluation_cache table under a sha256 of the configured provider and models,
+the task type, the prompt and the normalized submission (the essay text, or
+the bytes of a recording). A repeat returns the stored feedback without
+calling a provider; callers still record a new attempt.
+
+Entries expire ``evaluation_cache_ttl_seconds`` after they were stored. Once
+the table holds more than ``evaluation_cache_max_entries``, the least recently
+used entries are evicted. Local fallback results are never stored: they are
+cheap, and caching them would hide a provider that comes back.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..database import release_connection
+from ..models import EvaluationCacheEntry
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as audio:
+        for chunk in iter(lambda: audio.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_key(kind: str, task_type: str, prompt_text: str, content: str) -> str:
+    settings = get_settings()
+    models = [settings.ollama_model]
+    if kind == "speaking":
+        models.append(settings.whisper_model)
+    material = json.dumps([
+        kind,
+        settings.ai_provider.lower().strip(),
+        models,
+        task_type,
+        _normalize(prompt_text),
+        content,
+    ])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def writing_cache_key(task_type: str, prompt_text: str, essay_text: str) -> str:
+    """Key for an essay; whitespace differences do not change it."""
+    return _cache_key("writing", task_type, prompt_text, _normalize(essay_text))
+
+
+def speaking_cache_key(prompt_text: str, audio_path: str, audio_digest: Optional[str] = None) -> str:
+    """Key for a recording, based on the file's bytes (pass ``audio_digest`` if already hashed)."""
+    return _cache_key("speaking", "", prompt_text, audio_digest or _file_digest(audio_path))
+
+
+class EvaluationCache:
+    """TTL + LRU evaluation store backed by the evaluation_cache table."""
+
+    def __init__(self, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 50_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.reset_stats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    async def evaluate(
+        self,
+        db: Session,
+        key: str,
+        kind: str,
+        evaluate: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Stored result for ``key``, or run ``evaluate`` and store its result.
+
+        The session's transaction is ended before the provider call so no
+        connection is held while it runs.
+        """
+        cached = self.get(db, key)
+        release_connection(db)
+        if cached is not None:
+            return cached
+        result = await evaluate()
+        self.put(db, key, kind, result)
+        return result
+
+    def get(self, db: Session, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        entry = db.get(EvaluationCacheEntry, key)
+        now = datetime.utcnow()
+        if entry is not None and entry.created_at < now - timedelta(seconds=self.ttl_seconds):
+            db.delete(entry)
+            db.commit()
+            self.expired += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        entry.hits += 1
+        entry.last_used_at = now
+        result = dict(entry.result)
+        db.commit()
+        self.hits += 1
+        return result
+
+    def put(self, db: Session, key: str, kind: str, result: Dict[str, Any]) -> None:
+        if not self.enabled or result.get("error") or result.get("ai_provider", "local") == "local":
+            return
+        now = datetime.utcnow()
+        entry = db.get(EvaluationCacheEntry, key)
+        if entry is None:
+            entry = EvaluationCacheEntry(key=key, kind=kind, hits=0, created_at=now)
+            db.add(entry)
+        entry.provider = result.get("ai_provider")
+        entry.result = result
+        entry.created_at = now
+        entry.last_used_at = now
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another request stored the same evaluation first.
+            db.rollback()
+            return
+        self.stores += 1
+        self._evict(db, now)
+
+    def clear(self, db: Session) -> None:
+        db.query(EvaluationCacheEntry).delete(synchronize_session=False)
+        db.commit()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the shared table size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "size": db.query(func.count(EvaluationCacheEntry.key)).scalar() or 0,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    def _evict(self, db: Session, now: datetime) -> None:
+        expired = db.query(EvaluationCacheEntry).filter(
+            EvaluationCacheEntry.created_at < now - timedelta(seconds=self.ttl_seconds)
+        ).delete(synchronize_session=False)
+        self.expired += expired
+        excess = (db.query(func.count(EvaluationCacheEntry.key)).scalar() or 0) - self.max_entries
+        if excess > 0:
+            oldest = db.query(EvaluationCacheEntry.key).order_by(
+                EvaluationCacheEntry.last_used_at.asc()
+            ).limit(excess).subquery()
+            self.evictions += db.query(EvaluationCacheEntry).filter(
+                EvaluationCacheEntry.key.in_(oldest.select())
+            ).delete(synchronize_session=False)
+        db.commit()
+
+
+evaluation_cache = EvaluationCache(
+    ttl_seconds=get_settings().evaluation_cache_ttl_seconds,
+    max_entries=get_settings().evaluation_cache_max_entries,
+)
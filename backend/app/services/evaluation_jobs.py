@@ -0,0 +1,463 @@
+"""Background evaluation of writing and speaking submissions.
+
+Submitting stores a pending WritingAttempt/SpeakingAttempt plus an
+EvaluationJob and returns immediately; clients poll or subscribe to the job.
+The evaluation_jobs table is the queue: a worker claims a job with a
+conditional UPDATE (pending -> running), so worker tasks in one process or
+several processes can share a SQLite or PostgreSQL database without
+processing a job twice. Failed runs are retried with exponential backoff up to
+``max_attempts``; provider fallback happens inside each run via
+``provider_order``.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..database import SessionLocal
+from ..models import EvaluationJob, SpeakingAttempt, WritingAttempt
+from .evaluation_cache import evaluation_cache, speaking_cache_key, writing_cache_key
+from .speaking_service import analyze_audio_with_gemini
+from .writing_service import evaluate_essay_with_gemini
+
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+TERMINAL_STATUSES = {JOB_SUCCEEDED, JOB_FAILED}
+
+# A job still "running" after this long belongs to a crashed or stopped worker.
+STALE_AFTER = timedelta(minutes=10)
+
+
+def apply_writing_result(attempt: WritingAttempt, result: Dict[str, Any]) -> None:
+    """Copy an essay evaluation onto its attempt."""
+    attempt.band_score = result.get("band_score", 0.0)
+    attempt.criterion_scores = {
+        "task_response": result.get("task_response", {}).get("score", 0.0),
+        "coherence_cohesion": result.get("coherence_cohesion", {}).get("score", 0.0),
+        "lexical_resource": result.get("lexical_resource", {}).get("score", 0.0),
+        "grammatical_range": result.get("grammatical_range", {}).get("score", 0.0),
+    }
+    attempt.feedback = result
+    attempt.evaluation_status = "completed"
+
+
+def apply_speaking_result(attempt: SpeakingAttempt, result: Dict[str, Any]) -> None:
+    """Copy a speaking evaluation onto its attempt."""
+    attempt.transcription = result.get("transcription", "")
+    attempt.band_score = result.get("band_score", 0.0)
+    attempt.criterion_scores = {
+        "fluency_coherence": result.get("fluency_coherence", {}).get("score", 0.0),
+        "lexical_resource": result.get("lexical_resource", {}).get("score", 0.0),
+        "grammatical_range": result.get("grammatical_range", {}).get("score", 0.0),
+        "pronunciation": result.get("pronunciation", {}).get("score", 0.0),
+    }
+    attempt.feedback = result
+    attempt.evaluation_status = "completed"
+
+
+def _new_job(user_id: int, kind: str, attempt_id: int, payload: Dict[str, Any]) -> EvaluationJob:
+    now = datetime.utcnow()
+    return EvaluationJob(
+        user_id=user_id,
+        kind=kind,
+        attempt_id=attempt_id,
+        status=JOB_PENDING,
+        payload=payload,
+        attempts=0,
+        max_attempts=get_settings().evaluation_job_max_attempts,
+        available_at=now,
+        created_at=now,
+    )
+
+
+def enqueue_writing_evaluation(
+    db: Session,
+    user_id: int,
+    task_type: str,
+    prompt_text: str,
+    essay_text: str,
+    time_spent_sec: Optional[int] = None,
+) -> EvaluationJob:
+    """Store a pending writing attempt and queue its evaluation."""
+    attempt = WritingAttempt(
+        user_id=user_id,
+        task_type=task_type,
+        prompt_text=prompt_text,
+        essay_text=essay_text,
+        word_count=len([word for word in essay_text.split() if word.strip()]),
+        time_spent_sec=time_spent_sec,
+        band_score=None,
+        evaluation_status="pending",
+    )
+    db.add(attempt)
+    db.flush()
+    job = _new_job(user_id, "writing", attempt.id, {})
+    db.add(job)
+    db.commit()
+    evaluation_workers.notify()
+    return job
+
+
+def enqueue_speaking_evaluation(db: Session, user_id: int, prompt_text: str, audio_path: str) -> EvaluationJob:
+    """Store a pending speaking attempt and queue its evaluation of ``audio_path``."""
+    attempt = SpeakingAttempt(
+        user_id=user_id,
+        prompt_text=prompt_text,
+        band_score=None,
+        evaluation_status="pending",
+    )
+    db.add(attempt)
+    db.flush()
+    job = _new_job(user_id, "speaking", attempt.id, {"audio_path": audio_path})
+    db.add(job)
+    db.commit()
+    evaluation_workers.notify()
+    return job
+
+
+def claim_next_job(db: Session) -> Optional[int]:
+    """Atomically move the oldest claimable pending job to running; return its id."""
+    for _ in range(5):
+        now = datetime.utcnow()
+        job_id = db.query(EvaluationJob.id).filter(
+            EvaluationJob.status == JOB_PENDING,
+            EvaluationJob.available_at <= now,
+        ).order_by(EvaluationJob.id).limit(1).scalar()
+        if job_id is None:
+            return None
+        claimed = db.query(EvaluationJob).filter(
+            EvaluationJob.id == job_id,
+            EvaluationJob.status == JOB_PENDING,
+        ).update({
+            EvaluationJob.status: JOB_RUNNING,
+            EvaluationJob.started_at: now,
+            EvaluationJob.attempts: EvaluationJob.attempts + 1,
+        }, synchronize_session=False)
+        db.commit()
+        if claimed:
+            return job_id
+        # Another worker won the race for this job; try the next one.
+    return None
+
+
+def _mark_failed(db: Session, job: EvaluationJob) -> None:
+    """Give up on ``job`` and mark its attempt's evaluation failed."""
+    job.status = JOB_FAILED
+    job.finished_at = datetime.utcnow()
+    model = WritingAttempt if job.kind == "writing" else SpeakingAttempt
+    attempt = db.get(model, job.attempt_id)
+    if attempt is not None:
+        attempt.evaluation_status = "failed"
+
+
+def requeue_stale_jobs(db: Session, older_than: timedelta = STALE_AFTER) -> int:
+    """Return jobs left running by a dead worker to the queue.
+
+    Jobs that already used all their attempts are marked failed instead, so a
+    job that kills its worker every time is not re-claimed on every restart.
+    """
+    stale = db.query(EvaluationJob).filter(
+        EvaluationJob.status == JOB_RUNNING,
+        EvaluationJob.started_at < datetime.utcnow() - older_than,
+    )
+    exhausted = stale.filter(EvaluationJob.attempts >= EvaluationJob.max_attempts).all()
+    for job in exhausted:
+        job.error = job.error or "Worker stopped while running the job"
+        _mark_failed(db, job)
+    db.flush()
+    requeued = stale.filter(EvaluationJob.attempts < EvaluationJob.max_attempts).update({
+        EvaluationJob.status: JOB_PENDING,
+        EvaluationJob.available_at: datetime.utcnow(),
+    }, synchronize_session=False)
+    db.commit()
+    for job in exhausted:
+        _remove_audio(job)
+    return requeued
+
+
+def job_status_payload(job: EvaluationJob) -> Dict[str, Any]:
+    """Client-facing view of a job; ``result`` is included once it succeeded."""
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "attempt_id": job.attempt_id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "provider": job.provider,
+        "error": job.error if job.status == JOB_FAILED else None,
+        "result": job.result if job.status == JOB_SUCCEEDED else None,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+class EvaluationWorkerPool:
+    """Bounded set of asyncio workers that drain the evaluation job queue."""
+
+    def __init__(
+        self,
+        concurrency: int = 2,
+        retry_backoff_sec: float = 5.0,
+        poll_interval_sec: float = 2.0,
+        session_factory=SessionLocal,
+    ):
+        self.concurrency = concurrency
+        self.retry_backoff_sec = retry_backoff_sec
+        self.poll_interval_sec = poll_interval_sec
+        self.session_factory = session_factory
+        self._tasks = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._recent_waits = deque(maxlen=1024)
+        self._recent_runs = deque(maxlen=1024)
+        self.reset_stats()
+
+    async def start(self) -> None:
+        """Requeue stale jobs and start ``concurrency`` worker tasks on this loop."""
+        db = self.session_factory()
+        try:
+            requeue_stale_jobs(db)
+        except SQLAlchemyError as e:
+            # Schema not migrated yet; workers keep polling until it is.
+            print(f"Evaluation job requeue skipped: {e}")
+        finally:
+            db.close()
+        self._bind_loop()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def notify(self) -> None:
+        """Wake idle workers after a job was enqueued (safe from any thread)."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            wakeup.set()
+        else:
+            loop.call_soon_threadsafe(wakeup.set)
+
+    async def wait_for_change(self, timeout: float) -> None:
+        """Sleep until any job finishes in this process, or ``timeout`` elapses."""
+        changed = self._changed if self._loop is asyncio.get_running_loop() else None
+        if changed is None:
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run_once(self) -> bool:
+        """Claim and process one job; False when nothing is claimable."""
+        db = self.session_factory()
+        try:
+            job_id = claim_next_job(db)
+        finally:
+            db.close()
+        if job_id is None:
+            return False
+        await self._process(job_id)
+        return True
+
+    async def drain(self) -> int:
+        """Process claimable jobs until the queue is empty; return how many ran."""
+        processed = 0
+        while await self.run_once():
+            processed += 1
+        return processed
+
+    def reset_stats(self) -> None:
+        self.claimed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.wait_seconds_total = 0.0
+        self.run_seconds_total = 0.0
+        self._recent_waits.clear()
+        self._recent_runs.clear()
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        """Queue depth from the database plus this process's wait/processing times."""
+        depth = dict(
+            db.query(EvaluationJob.status, func.count(EvaluationJob.id))
+            .group_by(EvaluationJob.status)
+            .all()
+        )
+        oldest_pending = db.query(func.min(EvaluationJob.available_at)).filter(
+            EvaluationJob.status == JOB_PENDING
+        ).scalar()
+        return {
+            "workers": len(self._tasks),
+            "pending": depth.get(JOB_PENDING, 0),
+            "running": depth.get(JOB_RUNNING, 0),
+            "succeeded_total": depth.get(JOB_SUCCEEDED, 0),
+            "failed_total": depth.get(JOB_FAILED, 0),
+            "oldest_pending_sec": (
+                round(max(0.0, (datetime.utcnow() - oldest_pending).total_seconds()), 1)
+                if oldest_pending else 0.0
+            ),
+            "claimed": self.claimed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "avg_wait_ms": _mean_ms(self.wait_seconds_total, self.claimed),
+            "p95_wait_ms": _p95_ms(self._recent_waits),
+            "avg_processing_ms": _mean_ms(self.run_seconds_total, self.claimed),
+            "p95_processing_ms": _p95_ms(self._recent_runs),
+        }
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._changed = asyncio.Event()
+
+    async def _worker(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Evaluation worker error: {e}")
+                processed = False
+            if not processed:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval_sec)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _process(self, job_id: int) -> None:
+        db = self.session_factory()
+        started = time.monotonic()
+        try:
+            job = db.get(EvaluationJob, job_id)
+            wait = (job.started_at - job.available_at).total_seconds()
+            self.claimed += 1
+            self.wait_seconds_total += max(0.0, wait)
+            self._recent_waits.append(max(0.0, wait))
+            try:
+                result = await self._evaluate(db, job)
+                self._succeed(db, job_id, result)
+            except Exception as e:
+                db.rollback()
+                self._fail_or_retry(db, job_id, e)
+        finally:
+            elapsed = time.monotonic() - started
+            self.run_seconds_total += elapsed
+            self._recent_runs.append(elapsed)
+            db.close()
+            self._signal_change()
+
+    async def _evaluate(self, db: Session, job: EvaluationJob) -> Dict[str, Any]:
+        if job.kind == "writing":
+            attempt = db.get(WritingAttempt, job.attempt_id)
+            essay_text, task_type, prompt_text = attempt.essay_text, attempt.task_type, attempt.prompt_text
+            return await evaluation_cache.evaluate(
+                db,
+                writing_cache_key(task_type, prompt_text, essay_text),
+                "writing",
+                lambda: evaluate_essay_with_gemini(essay_text, task_type, prompt_text),
+            )
+        if job.kind == "speaking":
+            attempt = db.get(SpeakingAttempt, job.attempt_id)
+            prompt_text = attempt.prompt_text
+            audio_path = (job.payload or {}).get("audio_path")
+            if not audio_path or not os.path.exists(audio_path):
+                raise FileNotFoundError(f"Audio for speaking job {job.id} is missing")
+            return await evaluation_cache.evaluate(
+                db,
+                speaking_cache_key(prompt_text, audio_path),
+                "speaking",
+                lambda: analyze_audio_with_gemini(audio_path, prompt_text),
+            )
+        raise ValueError(f"Unknown evaluation job kind: {job.kind}")
+
+    def _succeed(self, db: Session, job_id: int, result: Dict[str, Any]) -> None:
+        job = db.get(EvaluationJob, job_id)
+        if job.kind == "writing":
+            apply_writing_result(db.get(WritingAttempt, job.attempt_id), result)
+        else:
+            apply_speaking_result(db.get(SpeakingAttempt, job.attempt_id), result)
+        job.status = JOB_SUCCEEDED
+        job.result = result
+        job.provider = result.get("ai_provider")
+        job.error = None
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        self.succeeded += 1
+        _remove_audio(job)
+
+    def _fail_or_retry(self, db: Session, job_id: int, error: Exception) -> None:
+        job = db.get(EvaluationJob, job_id)
+        job.error = f"{type(error).__name__}: {error}"
+        if job.attempts < job.max_attempts:
+            job.status = JOB_PENDING
+            job.available_at = datetime.utcnow() + timedelta(
+                seconds=self.retry_backoff_sec * 2 ** (job.attempts - 1)
+            )
+            db.commit()
+            self.retried += 1
+            return
+        _mark_failed(db, job)
+        db.commit()
+        self.failed += 1
+        _remove_audio(job)
+
+    def _signal_change(self) -> None:
+        if self._changed is None or self._loop is not asyncio.get_running_loop():
+            return
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+
+def _remove_audio(job: EvaluationJob) -> None:
+    audio_path = (job.payload or {}).get("audio_path")
+    if audio_path and os.path.exists(audio_path):
+        os.remove(audio_path)
+
+
+def _mean_ms(total_seconds: float, count: int) -> float:
+    return round(total_seconds / count * 1000, 2) if count else 0.0
+
+
+def _p95_ms(samples) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 2)
+
+
+evaluation_workers = EvaluationWorkerPool(
+    concurrency=get_settings().evaluation_workers,
+    retry_backoff_sec=get_settings().evaluation_retry_backoff_sec,
+    poll_interval_sec=get_settings().evaluation_poll_interval_sec,
+)
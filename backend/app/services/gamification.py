@@ -3,10 +3,11 @@
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
-from ..models import User, UserSkillMastery, Skill, Attempt
+from ..database import dialect_insert
+from ..models import User, UserSkillMastery, Skill
 from ..config import get_settings
+from .user_stats import get_user_stats_snapshot
 
 settings = get_settings()
 
@@ -70,10 +71,12 @@ def get_xp_to_next_level(xp: int) -> int:
     return LEVEL_THRESHOLDS[current_level] - xp
 
 
-def update_user_xp(db: Session, user: User, xp_earned: int) -> Tuple[int, int, bool]:
+def update_user_xp(db: Session, user: User, xp_earned: int, commit: bool = True) -> Tuple[int, int, bool]:
     """
     Update user's XP and level.
     
+    Pass commit=False to stage the change in the caller's unit of work.
+    
     Returns: (new_xp, new_level, level_up_occurred)
     """
     old_level = user.level
@@ -81,16 +84,19 @@ def update_user_xp(db: Session, user: User, xp_earned: int) -> Tuple[int, int, b
     new_level = get_level_for_xp(user.xp)
     user.level = new_level
     
-    db.commit()
-    db.refresh(user)
+    if commit:
+        db.commit()
+        db.refresh(user)
     
     return user.xp, new_level, new_level > old_level
 
 
-def update_streak(db: Session, user: User) -> int:
+def update_streak(db: Session, user: User, commit: bool = True) -> int:
     """
     Update user's streak based on practice activity.
     
+    Pass commit=False to stage the change in the caller's unit of work.
+    
     Returns: Updated streak count
     """
     today = date.today()
@@ -114,8 +120,9 @@ def update_streak(db: Session, user: User) -> int:
         user.longest_streak = user.current_streak
     
     user.last_practice_date = datetime.now()
-    db.commit()
-    db.refresh(user)
+    if commit:
+        db.commit()
+        db.refresh(user)
     
     return user.current_streak
 
@@ -176,10 +183,12 @@ def get_skill_tree_status(db: Session, user_id: int) -> Dict:
     }
 
 
-def check_and_unlock_skills(db: Session, user_id: int) -> List[int]:
+def check_and_unlock_skills(db: Session, user_id: int, commit: bool = True) -> List[int]:
     """
     Check if any new skills should be unlocked based on mastery.
     
+    Pass commit=False to flush unlocks into the caller's unit of work.
+    
     Returns: List of newly unlocked skill IDs
     """
     skills = db.query(Skill).all()
@@ -208,39 +217,45 @@ def check_and_unlock_skills(db: Session, user_id: int) -> List[int]:
                 if mastery:
                     mastery.is_unlocked = True
                 else:
-                    # Create mastery record
-                    new_mastery = UserSkillMastery(
-                        user_id=user_id,
-                        skill_id=skill.id,
-                        is_unlocked=True
-                    )
-                    db.add(new_mastery)
+                    _create_unlocked_mastery(db, user_id, skill.id)
                 
                 newly_unlocked.append(skill.id)
     
     if newly_unlocked:
-        db.commit()
+        if commit:
+            db.commit()
+        else:
+            db.flush()
     
     return newly_unlocked
 
 
+def _create_unlocked_mastery(db: Session, user_id: int, skill_id: int) -> None:
+    """Create an unlocked mastery record, or unlock the one a concurrent request just created."""
+    insert = dialect_insert(db)
+    if insert is None:
+        db.add(UserSkillMastery(user_id=user_id, skill_id=skill_id, is_unlocked=True))
+        return
+    db.execute(
+        insert(UserSkillMastery)
+        .values(user_id=user_id, skill_id=skill_id, is_unlocked=True)
+        .on_conflict_do_nothing(index_elements=["user_id", "skill_id"])
+    )
+    mastery = db.query(UserSkillMastery).filter(
+        UserSkillMastery.user_id == user_id,
+        UserSkillMastery.skill_id == skill_id,
+    ).one()
+    mastery.is_unlocked = True
+
+
 def get_user_stats(db: Session, user_id: int) -> Dict:
     """Get comprehensive user gamification stats."""
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         return {}
     
-    # Get attempt stats
-    total_attempts = db.query(func.count(Attempt.id)).filter(
-        Attempt.user_id == user_id
-    ).scalar() or 0
-    
-    correct_attempts = db.query(func.count(Attempt.id)).filter(
-        Attempt.user_id == user_id,
-        Attempt.is_correct == True
-    ).scalar() or 0
-    
-    accuracy = correct_attempts / total_attempts if total_attempts > 0 else 0
+    # Get attempt stats from the materialized snapshot
+    stats = get_user_stats_snapshot(db, user_id)
     
     return {
         "xp": user.xp,
@@ -248,6 +263,6 @@ def get_user_stats(db: Session, user_id: int) -> Dict:
         "xp_to_next_level": get_xp_to_next_level(user.xp),
         "current_streak": user.current_streak,
         "longest_streak": user.longest_streak,
-        "total_questions_answered": total_attempts,
-        "accuracy_rate": accuracy
+        "total_questions_answered": stats.total_attempts,
+        "accuracy_rate": stats.accuracy
     }
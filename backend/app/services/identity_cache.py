@@ -0,0 +1,107 @@
+"""Short-lived, bounded cache of authenticated user identities.
+
+``get_current_user`` runs on every authenticated request. On a warm cache it
+attaches a User to the request's session from cached identity columns without
+touching the database. All other columns (XP, streak, ...) are left expired, so
+endpoints that read or change them load the current row on first access and
+never write back stale values.
+
+Entries expire after ``user_cache_ttl_seconds`` and are invalidated explicitly
+when identity columns change in this process (password reset, email
+verification, ...). Other worker processes converge within the TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from ..config import get_settings
+from ..models import User
+
+
+IDENTITY_COLUMNS = ("id", "email", "username", "is_active", "is_email_verified")
+
+
+class UserIdentityCache:
+    """LRU + TTL map of user id -> identity column values."""
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, db: Session, user_id: int) -> Optional[User]:
+        """Return the user attached to ``db``, loading it only on a cache miss."""
+        values = self._lookup(user_id)
+        if values is None:
+            user = db.get(User, user_id)
+            if user is not None:
+                self._store(user_id, {column: getattr(user, column) for column in IDENTITY_COLUMNS})
+            return user
+
+        existing = db.identity_map.get(identity_key(User, user_id))
+        if existing is not None:
+            return existing
+        user = User(**values)
+        # Mark the instance as loaded from the database: the cached columns
+        # count as current and every other column is expired (lazy-loaded).
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop one user after a change to any identity column."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def _lookup(self, user_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def _store(self, user_id: int, values: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic(), values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+user_identity_cache = UserIdentityCache(
+    ttl_seconds=get_settings().user_cache_ttl_seconds,
+    max_entries=get_settings().user_cache_max_entries,
+)
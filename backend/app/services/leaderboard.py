@@ -0,0 +1,266 @@
+"""XP leaderboards with O(log n) rank lookups.
+
+Each board keeps its users in a ``RankIndex``: one sorted Python list of
+integers that pack ``(score DESC, user id ASC)``. A user's rank is one bisect,
+and a page is a bisect plus a slice. Pages are addressed by keyset cursors
+(``"<score>:<user id>"`` of the last row seen), so paging stays stable while
+scores move.
+
+The all-time board is loaded from ``users`` in ``(xp DESC, id)`` order, which
+the ``ix_users_xp_id`` index serves without a sort. Weekly and monthly boards sum
+``Attempt.xp_earned`` since the start of the current ISO week or calendar
+month. After an answer commits, ``record_xp`` moves the user on every loaded
+board. Boards are reloaded every ``leaderboard_refresh_seconds`` to pick up
+changes made by other worker processes, and when a new week or month begins.
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import Attempt, User
+
+
+WINDOWS = ("all", "weekly", "monthly")
+ID_SPACE = 1 << 40
+
+
+class RankIndex:
+    """Users ordered by score (highest first), ties broken by lower user id."""
+
+    def __init__(self):
+        self._keys: List[int] = []
+        self._scores: Dict[int, int] = {}
+
+    @staticmethod
+    def _key(score: int, user_id: int) -> int:
+        return -score * ID_SPACE + user_id
+
+    @staticmethod
+    def _unpack(key: int) -> Tuple[int, int]:
+        return key % ID_SPACE, -(key // ID_SPACE)
+
+    def load(self, rows: Iterable[Tuple[int, int]]) -> None:
+        """Replace the contents with ``(user_id, score)`` rows (already ordered rows sort in O(n))."""
+        scores: Dict[int, int] = {}
+        keys: List[int] = []
+        for user_id, score in rows:
+            score = int(score or 0)
+            scores[user_id] = score
+            keys.append(self._key(score, user_id))
+        keys.sort()
+        self._scores, self._keys = scores, keys
+
+    def set(self, user_id: int, score: int) -> None:
+        old = self._scores.get(user_id)
+        if old == score:
+            return
+        if old is not None:
+            del self._keys[bisect_left(self._keys, self._key(old, user_id))]
+        self._scores[user_id] = score
+        insort(self._keys, self._key(score, user_id))
+
+    def add(self, user_id: int, delta: int) -> None:
+        self.set(user_id, self._scores.get(user_id, 0) + delta)
+
+    def score(self, user_id: int) -> Optional[int]:
+        return self._scores.get(user_id)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """1-based rank, or None if the user is not on the board."""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return bisect_left(self._keys, self._key(score, user_id)) + 1
+
+    def slice(self, start: int, limit: int) -> List[Tuple[int, int, int]]:
+        """``(rank, user_id, score)`` for ``limit`` rows from 0-based position ``start``."""
+        start = max(start, 0)
+        return [
+            (start + offset + 1, *self._unpack(key))
+            for offset, key in enumerate(self._keys[start:start + limit])
+        ]
+
+    def after(self, score: int, user_id: int, limit: int) -> List[Tuple[int, int, int]]:
+        """Keyset page: the ``limit`` rows ranked below ``(score, user_id)``."""
+        return self.slice(bisect_right(self._keys, self._key(score, user_id)), limit)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def window_start(window: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Start of the current period for a windowed board; None for all-time."""
+    now = now or datetime.utcnow()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if window == "weekly":
+        return today - timedelta(days=today.weekday())
+    if window == "monthly":
+        return today.replace(day=1)
+    return None
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[Tuple[int, int]]:
+    """``"<score>:<user id>"`` -> (score, user id); raises ValueError when malformed."""
+    if not cursor:
+        return None
+    score, user_id = cursor.split(":", 1)
+    return int(score), int(user_id)
+
+
+class _Board:
+    def __init__(self, index: RankIndex, period_start: Optional[datetime]):
+        self.index = index
+        self.period_start = period_start
+        self.loaded_at = time.monotonic()
+
+
+class Leaderboard:
+    """All-time, weekly and monthly boards kept in memory per worker process."""
+
+    def __init__(self, refresh_seconds: float = 300.0):
+        self.refresh_seconds = refresh_seconds
+        self._boards: Dict[str, _Board] = {}
+        self._lock = threading.Lock()
+        self._loading: Set[str] = set()
+        self.loads = 0
+        self.load_seconds = 0.0
+        self.updates = 0
+
+    def page(
+        self,
+        db: Session,
+        window: str = "all",
+        limit: int = 10,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of entries and the cursor for the next page (None at the end)."""
+        after = parse_cursor(cursor)
+        index = self._board(db, window).index
+        with self._lock:
+            rows = index.after(*after, limit) if after else index.slice(0, limit)
+            total = len(index)
+        entries = self._entries(db, rows)
+        next_cursor = None
+        if rows and rows[-1][0] < total:
+            next_cursor = f"{rows[-1][2]}:{rows[-1][1]}"
+        return entries, next_cursor
+
+    def around(self, db: Session, user_id: int, window: str = "all", radius: int = 2) -> Dict[str, Any]:
+        """A user's rank plus the ``radius`` entries above and below them."""
+        index = self._board(db, window).index
+        with self._lock:
+            rank = index.rank(user_id)
+            score = index.score(user_id)
+            start = max(rank - 1 - radius, 0) if rank else 0
+            rows = index.slice(start, rank + radius - start) if rank else []
+            total = len(index)
+        return {
+            "window": window,
+            "rank": rank,
+            "xp": score or 0,
+            "total": total,
+            "entries": self._entries(db, rows),
+        }
+
+    def record_xp(self, user_id: int, total_xp: Optional[int], earned: int = 0) -> None:
+        """Apply a committed XP change to every loaded board (``total_xp`` None: total unchanged)."""
+        with self._lock:
+            all_time = self._boards.get("all")
+            if all_time is not None and total_xp is not None:
+                all_time.index.set(user_id, total_xp)
+            if earned:
+                for window in ("weekly", "monthly"):
+                    board = self._boards.get(window)
+                    if board is not None and board.period_start == window_start(window):
+                        board.index.add(user_id, earned)
+            self.updates += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._boards.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "boards": {
+                    window: {
+                        "users": len(board.index),
+                        "age_seconds": round(time.monotonic() - board.loaded_at, 1),
+                    }
+                    for window, board in self._boards.items()
+                },
+                "loads": self.loads,
+                "avg_load_ms": round(self.load_seconds / self.loads * 1000, 1) if self.loads else 0.0,
+                "updates": self.updates,
+                "refresh_seconds": self.refresh_seconds,
+            }
+
+    def _board(self, db: Session, window: str) -> _Board:
+        """The window's board, (re)loading it when missing, expired or from a past period.
+
+        Loads run outside the lock. While one is in progress, other requests
+        keep reading the expired board instead of waiting.
+        """
+        if window not in WINDOWS:
+            raise ValueError(f"window must be one of {', '.join(WINDOWS)}")
+        period_start = window_start(window)
+        with self._lock:
+            board = self._boards.get(window)
+            if board is not None and board.period_start == period_start and (
+                time.monotonic() - board.loaded_at <= self.refresh_seconds or window in self._loading
+            ):
+                return board
+            self._loading.add(window)
+        try:
+            started = time.perf_counter()
+            index = RankIndex()
+            result = db.execute(self._scores_query(period_start).execution_options(yield_per=50_000))
+            index.load(row for partition in result.partitions() for row in partition)
+        finally:
+            with self._lock:
+                self._loading.discard(window)
+        with self._lock:
+            board = self._boards[window] = _Board(index, period_start)
+            self.loads += 1
+            self.load_seconds += time.perf_counter() - started
+        return board
+
+    @staticmethod
+    def _scores_query(period_start: Optional[datetime]):
+        if period_start is None:
+            return select(User.id, User.xp).order_by(User.xp.desc(), User.id)
+        return (
+            select(Attempt.user_id, func.sum(Attempt.xp_earned))
+            .where(Attempt.created_at >= period_start, Attempt.xp_earned > 0)
+            .group_by(Attempt.user_id)
+        )
+
+    @staticmethod
+    def _entries(db: Session, rows: List[Tuple[int, int, int]]) -> List[Dict[str, Any]]:
+        if not rows:
+            return []
+        users = {
+            user_id: (username, level)
+            for user_id, username, level in db.execute(
+                select(User.id, User.username, User.level).where(User.id.in_([row[1] for row in rows]))
+            )
+        }
+        return [
+            {
+                "rank": rank,
+                "username": users.get(user_id, (None, None))[0],
+                "xp": score,
+                "level": users.get(user_id, (None, 1))[1],
+            }
+            for rank, user_id, score in rows
+        ]
+
+
+leaderboard = Leaderboard(refresh_seconds=get_settings().leaderboard_refresh_seconds)
@@ -0,0 +1,134 @@
+"""Rebuild per-skill BKT mastery from Attempt history.
+
+Used after BKT parameters change (including per-skill fits) and to backfill
+users whose attempts were imported in bulk. Attempts are replayed with the
+vectorized ``KnowledgeTracer.replay_sequences``, which applies the same BKT
+update as the submission pipeline, answer by answer.
+
+The replay covers every Attempt row, including listening submits and mock
+test answers, which do not update mastery live. For users with such attempts
+a rebuild therefore changes mastery rather than reproducing it; it folds that
+evidence in.
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..ml import knowledge_tracer
+from ..models import Attempt, Question, Skill, UserSkillMastery
+
+
+def _replay_by_skill_params(
+    db: Session,
+    pair_skills: np.ndarray,
+    sequence_ids: np.ndarray,
+    outcomes: np.ndarray,
+) -> np.ndarray:
+    """Replay sequences with each skill's own (fitted or default) BKT params."""
+    groups: Dict[int, list] = {}
+    params_by_group = {}
+    for skill_id in np.unique(pair_skills).tolist():
+        params = knowledge_tracer.params_for_skill(db, skill_id)
+        groups.setdefault(id(params), []).append(skill_id)
+        params_by_group[id(params)] = params
+
+    mastery = np.empty(len(pair_skills), dtype=np.float64)
+    for key, skill_ids in groups.items():
+        group_sequences = np.flatnonzero(np.isin(pair_skills, skill_ids))
+        dense = np.full(len(pair_skills), -1, dtype=np.int64)
+        dense[group_sequences] = np.arange(len(group_sequences))
+        in_group = dense[sequence_ids] >= 0
+        mastery[group_sequences] = knowledge_tracer.replay_sequences(
+            dense[sequence_ids[in_group]],
+            outcomes[in_group],
+            n_sequences=len(group_sequences),
+            params=params_by_group[key],
+        )
+    return mastery
+
+
+def rebuild_skill_masteries(
+    db: Session,
+    user_ids: Optional[Iterable[int]] = None,
+    batch_size: int = 500,
+) -> Dict[str, int]:
+    """
+    Replay every (user, skill) attempt sequence, from all submission paths, and overwrite mastery rows.
+
+    BKT state, attempt/correct counts, average response time and last attempt
+    time are recomputed; ``is_unlocked`` is kept for existing rows. Commits per
+    batch of users and returns counts of users scanned, rows created and rows
+    updated.
+    """
+    if user_ids is None:
+        user_ids = [row[0] for row in db.query(Attempt.user_id).distinct()]
+    user_ids = sorted(set(user_ids))
+
+    root_skill_ids = {
+        row[0] for row in db.query(Skill.id).filter(Skill.parent_skill_id.is_(None))
+    }
+    report = {"users": 0, "created": 0, "updated": 0}
+    for offset in range(0, len(user_ids), batch_size):
+        batch = user_ids[offset:offset + batch_size]
+        rows = db.query(
+            Attempt.user_id,
+            Question.skill_id,
+            Attempt.is_correct,
+            Attempt.response_time_ms,
+            Attempt.created_at,
+        ).join(
+            Question, Question.id == Attempt.question_id
+        ).filter(
+            Attempt.user_id.in_(batch)
+        ).order_by(Attempt.id).all()
+
+        if rows:
+            users = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            skills = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+            outcomes = np.fromiter((bool(row[2]) for row in rows), dtype=bool, count=len(rows))
+            response_times = np.fromiter((row[3] or 0 for row in rows), dtype=np.float64, count=len(rows))
+
+            pairs, sequence_ids = np.unique(
+                np.stack([users, skills], axis=1), axis=0, return_inverse=True
+            )
+            sequence_ids = sequence_ids.reshape(-1)
+            mastery = _replay_by_skill_params(db, pairs[:, 1], sequence_ids, outcomes)
+            attempts_count = np.bincount(sequence_ids, minlength=len(pairs))
+            correct_count = np.bincount(sequence_ids, weights=outcomes, minlength=len(pairs))
+            response_sum = np.bincount(sequence_ids, weights=response_times, minlength=len(pairs))
+            last_attempt_at = {}
+            for sequence_id, row in zip(sequence_ids.tolist(), rows):
+                last_attempt_at[sequence_id] = row[4]
+
+            existing = {
+                (row.user_id, row.skill_id): row
+                for row in db.query(UserSkillMastery).filter(UserSkillMastery.user_id.in_(batch))
+            }
+            for sequence_id, (user_id, skill_id) in enumerate(pairs.tolist()):
+                values = {
+                    "mastery_probability": float(mastery[sequence_id]),
+                    "attempts_count": int(attempts_count[sequence_id]),
+                    "correct_count": int(correct_count[sequence_id]),
+                    "avg_response_time_ms": float(response_sum[sequence_id] / attempts_count[sequence_id]),
+                    "last_attempt_at": last_attempt_at[sequence_id],
+                }
+                row = existing.get((user_id, skill_id))
+                if row is None:
+                    db.add(UserSkillMastery(
+                        user_id=user_id,
+                        skill_id=skill_id,
+                        is_unlocked=skill_id in root_skill_ids,
+                        **values,
+                    ))
+                    report["created"] += 1
+                    continue
+                for field, value in values.items():
+                    setattr(row, field, value)
+                report["updated"] += 1
+
+        report["users"] += len(batch)
+        db.commit()
+
+    return report
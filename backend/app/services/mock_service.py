@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 from app.models import MockTestSession, Question, Attempt, MistakeReview, TestSet
 from app.services.scoring import answer_matches, raw_to_band, overall_band
+from app.services.user_stats import record_attempt_stats
 
 class MockExamService:
     
@@ -107,6 +108,7 @@ class MockExamService:
                     correct_answer=question.correct_answer,
                     explanation=question.explanation,
                 ))
+            record_attempt_stats(db, attempt, module)
         total = len(questions)
         return correct, total, raw_to_band(correct, module, total or 40)
 
@@ -0,0 +1,135 @@
+"""Bounded worker pool for bcrypt hashing and verification.
+
+bcrypt is deliberately slow (tens to hundreds of milliseconds per call). Run
+inline in an ``async def`` endpoint it blocks the event loop, so a burst of
+logins stalls every other request served by the worker. ``PasswordHasher``
+runs hashes on a small dedicated thread pool instead (bcrypt releases the GIL
+while hashing) and admits at most ``max_queue`` calls waiting for a thread;
+beyond that it raises ``PasswordHasherBusy`` so callers can shed load with a
+503 instead of queueing unboundedly.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from passlib.context import CryptContext
+
+from ..config import get_settings
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+class PasswordHasher:
+    """Runs CryptContext hash/verify on a bounded thread pool with queue metrics."""
+
+    def __init__(self, context: CryptContext, max_workers: int = 2, max_queue: int = 256):
+        self.context = context
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._recent_waits = deque(maxlen=1024)
+        self.reset_stats()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads; a new pool is created on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.queued = 0
+            self.running = 0
+            self.max_queued = 0
+            self.submitted = 0
+            self.completed = 0
+            self.rejected = 0
+            self.wait_seconds_total = 0.0
+            self.max_wait_seconds = 0.0
+            self.hash_seconds_total = 0.0
+            self._recent_waits.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, rejection and wait/hash time counters for monitoring."""
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "running": self.running,
+                "max_queued": self.max_queued,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": _mean_ms(self.wait_seconds_total, self.completed),
+                "p99_wait_ms": round(waits[int(0.99 * (len(waits) - 1))] * 1000, 2) if waits else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+                "avg_hash_ms": _mean_ms(self.hash_seconds_total, self.completed),
+            }
+
+    async def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self.queued += 1
+            self.submitted += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        enqueued_at = time.monotonic()
+
+        def task() -> Any:
+            started_at = time.monotonic()
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+            try:
+                return function(*args)
+            finally:
+                finished_at = time.monotonic()
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    wait = started_at - enqueued_at
+                    self.wait_seconds_total += wait
+                    self.max_wait_seconds = max(self.max_wait_seconds, wait)
+                    self.hash_seconds_total += finished_at - started_at
+                    self._recent_waits.append(wait)
+
+        if self.max_workers <= 0:
+            # Pool disabled: hash on the calling thread (old behaviour).
+            return task()
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), task)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+            return self._executor
+
+
+def _mean_ms(total_seconds: float, count: int) -> float:
+    return round(total_seconds / count * 1000, 2) if count else 0.0
+
+
+password_hasher = PasswordHasher(
+    CryptContext(schemes=["bcrypt"], deprecated="auto"),
+    max_workers=get_settings().password_hash_workers,
+    max_queue=get_settings().password_hash_max_queue,
+)
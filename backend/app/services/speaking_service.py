@@ -6,8 +6,8 @@ import google.generativeai as genai
 from typing import Dict, Any
 from dotenv import load_dotenv
 
-from ..config import get_settings
-from .ai_provider import complete_json_with_ollama, extract_json, provider_order, with_provider_meta
+from ..ml.transcription import transcription_engine
+from .ai_provider import call_gemini, complete_json_with_ollama, extract_json, provider_order, with_provider_meta
 
 load_dotenv()
 
@@ -52,20 +52,6 @@ def analyze_audio_locally(audio_path: str, prompt_text: str) -> Dict[str, Any]:
     }
 
 
-def _transcribe_with_local_whisper(audio_path: str) -> str | None:
-    try:
-        import whisper  # type: ignore
-    except Exception:
-        return None
-    try:
-        model = whisper.load_model(get_settings().whisper_model)
-        result = model.transcribe(audio_path, language="en")
-        return str(result.get("text", "")).strip()
-    except Exception as e:
-        print(f"Local Whisper transcription error: {e}")
-        return None
-
-
 def _speaking_prompt(transcript: str, prompt_text: str) -> str:
     return f"""
 You are an IELTS Speaking examiner. Evaluate the spoken response transcript.
@@ -131,14 +117,16 @@ async def analyze_audio_with_gemini(
     """
     Evaluates IELTS speaking audio using Gemini 1.5 Flash.
     """
-    transcript = _transcribe_with_local_whisper(audio_path)
+    transcript = await transcription_engine.transcribe(audio_path)
     for provider in provider_order():
         if provider == "ollama" and transcript:
-            result = _valid_speaking_result(complete_json_with_ollama(_speaking_prompt(transcript, prompt_text)), transcript)
+            result = _valid_speaking_result(
+                await complete_json_with_ollama(_speaking_prompt(transcript, prompt_text)), transcript
+            )
             if result:
                 return with_provider_meta(result, "ollama+whisper")
-        if provider == "gemini":
-            result = _valid_speaking_result(_analyze_audio_with_gemini(audio_path, prompt_text))
+        if provider == "gemini" and api_key:
+            result = _valid_speaking_result(await call_gemini(_analyze_audio_with_gemini, audio_path, prompt_text))
             if result:
                 return with_provider_meta(result, "gemini")
         if provider == "local":
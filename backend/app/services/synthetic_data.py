@@ -0,0 +1,284 @@
+"""Synthetic users, questions and attempts for load-test databases.
+
+Volumes are exact and the shape is meant to look like real usage. Learner
+activity is heavy-tailed (Pareto): a few learners produce most attempts.
+Question popularity follows a Zipf-like curve. Difficulty is roughly normal
+around the middle of the 1-10 scale. Correctness follows a logistic model of
+learner ability against question difficulty, and response times are
+log-normal. Attempts cluster towards recent days.
+
+Everything goes through ``BulkSeeder`` in one transaction. Users and content
+are keyed on natural keys, so a re-run with the same counts adds nothing, and
+attempts are topped up to the requested total. All learners share one password
+hash, so bcrypt runs once rather than once per user.
+"""
+
+import math
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from ..models import Attempt, Question, Skill, TestSet, User
+from .auth import get_password_hash
+from .bulk_seed import BulkSeeder
+from .gamification import calculate_xp_for_attempt, get_level_for_xp
+from .module_skills import MODULE_SKILL_CATEGORIES
+
+
+SYNTHETIC_EMAIL_DOMAIN = "synthetic.jana.local"
+SYNTHETIC_PASSWORD = "SyntheticPass123"
+SYNTHETIC_TITLE_PREFIX = "Synthetic "
+QUESTIONS_PER_SET = 10
+LISTENING_SETS_PER_TEN = 3
+
+LISTENING_QUESTION_TYPES = {
+    "LISTENING_MCQ": "MCQ",
+    "LISTENING_FORM": "FORM_COMPLETION",
+    "LISTENING_MAP": "MAP_PLAN",
+    "LISTENING_NOTES": "NOTE_COMPLETION",
+}
+CHOICE_OPTIONS = ["A", "B", "C", "D"]
+TF_NG_OPTIONS = ["True", "False", "Not Given"]
+
+
+def synthetic_email(index: int) -> str:
+    return f"learner{index:06d}@{SYNTHETIC_EMAIL_DOMAIN}"
+
+
+def _ensure_skills(seeder: BulkSeeder) -> Dict[str, int]:
+    """Reuse existing skills per category; create the missing ones."""
+    rows = [
+        {"name": f"{module.title()} {category}", "category": category, "description": f"IELTS skill: {category}"}
+        for module, categories in MODULE_SKILL_CATEGORIES.items()
+        for category in categories
+    ]
+    ids = seeder.upsert(Skill, rows, key=("category",))
+    return {category: skill_id for (category,), skill_id in ids.items()}
+
+
+def _seed_users(seeder: BulkSeeder, count: int, password: str, now: datetime, days: int) -> List[int]:
+    password_hash = get_password_hash(password)
+    joined = now - timedelta(days=days + 1)
+    ids = seeder.upsert(
+        User,
+        (
+            {
+                "email": synthetic_email(index),
+                "username": f"learner_{index:06d}",
+                "password_hash": password_hash,
+                "is_email_verified": True,
+                "created_at": joined,
+            }
+            for index in range(count)
+        ),
+        key=("email",),
+    )
+    return list(ids.values())
+
+
+def _question_row(index: int, module: str, category: str, skill_id: int, test_set_id: int, title: str,
+                  difficulty: int) -> Dict[str, Any]:
+    if module == "LISTENING":
+        question_type = LISTENING_QUESTION_TYPES.get(category, "MCQ")
+    else:
+        question_type = category
+    if question_type == "TF_NG":
+        options, answer = TF_NG_OPTIONS, TF_NG_OPTIONS[index % 3]
+    elif question_type in {"MCQ", "HEADINGS", "MATCHING_INFO", "MAP_PLAN"}:
+        options, answer = CHOICE_OPTIONS, CHOICE_OPTIONS[index % 4]
+    else:
+        options, answer = None, f"answer {index}"
+    return {
+        "skill_id": skill_id,
+        "test_set_id": test_set_id,
+        "module": module,
+        "passage": f"Synthetic {module.lower()} passage {index // QUESTIONS_PER_SET} used for load testing.",
+        "passage_title": title,
+        "question_text": f"Synthetic {question_type} question {index}.",
+        "question_type": question_type,
+        "options": options,
+        "correct_answer": answer,
+        "difficulty": difficulty,
+        "explanation": "Synthetic load-test question; the answer is fixed by the generator.",
+        "tags": ["synthetic", question_type.lower()],
+        "approved": True,
+        "is_active": True,
+    }
+
+
+def _seed_questions(seeder: BulkSeeder, rng: np.random.Generator, count: int, skill_ids: Dict[str, int]) -> None:
+    set_count = math.ceil(count / QUESTIONS_PER_SET)
+    difficulties = np.clip(np.rint(rng.normal(5.5, 1.8, count)), 1, 10).astype(int)
+    categories = rng.random(count)
+
+    sets = []
+    for set_index in range(set_count):
+        module = "LISTENING" if set_index % 10 < LISTENING_SETS_PER_TEN else "READING"
+        sets.append((module, f"{SYNTHETIC_TITLE_PREFIX}{module.title()} Set {set_index:06d}"))
+    set_ids = seeder.upsert(
+        TestSet,
+        ({"title": title, "module": module, "source": "synthetic", "approved": True} for module, title in sets),
+        key=("module", "title"),
+        where=(TestSet.source == "synthetic",),
+    )
+
+    rows = []
+    for index in range(count):
+        module, title = sets[index // QUESTIONS_PER_SET]
+        module_categories = MODULE_SKILL_CATEGORIES[module]
+        category = module_categories[int(categories[index] * len(module_categories))]
+        rows.append(_question_row(
+            index, module, category, skill_ids[category], set_ids[(module, title)], title, int(difficulties[index]),
+        ))
+    seeder.upsert(
+        Question,
+        rows,
+        key=("passage_title", "question_text"),
+        where=(Question.passage_title.like(f"{SYNTHETIC_TITLE_PREFIX}%"),),
+    )
+
+
+def _seed_attempts(
+    seeder: BulkSeeder,
+    rng: np.random.Generator,
+    user_ids: List[int],
+    ability: np.ndarray,
+    activity: np.ndarray,
+    total: int,
+    now: datetime,
+    days: int,
+) -> int:
+    db = seeder.db
+    existing = db.scalar(select(func.count(Attempt.id)).where(Attempt.user_id.in_(user_ids))) or 0
+    needed = total - existing
+    questions = db.execute(
+        select(Question.id, Question.difficulty, Question.correct_answer, Question.options)
+        .where(Question.passage_title.like(f"{SYNTHETIC_TITLE_PREFIX}%"))
+        .order_by(Question.id)
+    ).all()
+    if needed <= 0 or not questions or not user_ids:
+        return 0
+
+    popularity = 1.0 / np.arange(1, len(questions) + 1) ** 0.8
+    popularity = rng.permutation(popularity)
+    xp_by_difficulty = {difficulty: calculate_xp_for_attempt(difficulty, True, 0) for difficulty in range(1, 11)}
+    difficulty = np.array([row.difficulty or 5 for row in questions])
+    user_p = activity / activity.sum()
+    question_p = popularity / popularity.sum()
+
+    inserted = 0
+    while inserted < needed:
+        size = min(seeder.batch_size, needed - inserted)
+        users = rng.choice(len(user_ids), size=size, p=user_p)
+        picked = rng.choice(len(questions), size=size, p=question_p)
+        logit = 1.2 * ability[users] - 0.45 * (difficulty[picked] - 5.5) + 0.4
+        correct = rng.random(size) < np.clip(1 / (1 + np.exp(-logit)), 0.05, 0.95)
+        response_ms = np.clip(
+            rng.lognormal(np.log(14000 + 1500 * difficulty[picked]), 0.45, size) * np.where(correct, 1.0, 1.15),
+            1500, 300000,
+        ).astype(int)
+        age_seconds = days * 86400 * rng.beta(1.0, 2.5, size)
+
+        rows = []
+        for n in range(size):
+            question = questions[picked[n]]
+            is_correct = bool(correct[n])
+            if is_correct:
+                answer = question.correct_answer
+            else:
+                wrong = [option for option in (question.options or []) if option != question.correct_answer]
+                answer = wrong[n % len(wrong)] if wrong else "wrong answer"
+            rows.append({
+                "user_id": user_ids[users[n]],
+                "question_id": question.id,
+                "user_answer": answer,
+                "is_correct": is_correct,
+                "response_time_ms": int(response_ms[n]),
+                "xp_earned": xp_by_difficulty.get(int(difficulty[picked[n]]), 0) if is_correct else 0,
+                "created_at": now - timedelta(seconds=float(age_seconds[n])),
+            })
+        seeder.insert(Attempt, rows)
+        inserted += size
+    return inserted
+
+
+def _streaks(days: List[date], today: date) -> Tuple[int, int]:
+    """(current, longest) runs of consecutive practice days."""
+    longest = current = run = 0
+    previous = None
+    for day in days:
+        run = run + 1 if previous is not None and (day - previous).days == 1 else 1
+        longest = max(longest, run)
+        previous = day
+    if previous is not None and (today - previous).days <= 1:
+        current = run
+    return current, longest
+
+
+def _update_progress(seeder: BulkSeeder, user_ids: List[int], now: datetime) -> None:
+    """Set xp, level, streaks and last practice date from the attempts just written."""
+    db = seeder.db
+    totals = db.execute(
+        select(Attempt.user_id, func.sum(Attempt.xp_earned), func.max(Attempt.created_at))
+        .where(Attempt.user_id.in_(user_ids))
+        .group_by(Attempt.user_id)
+    ).all()
+    practice_days: Dict[int, List[date]] = {}
+    for user_id, day in db.execute(
+        select(Attempt.user_id, func.date(Attempt.created_at))
+        .where(Attempt.user_id.in_(user_ids))
+        .distinct()
+        .order_by(Attempt.user_id, func.date(Attempt.created_at))
+    ):
+        if isinstance(day, str):
+            day = datetime.strptime(day, "%Y-%m-%d").date()
+        practice_days.setdefault(user_id, []).append(day)
+
+    rows = []
+    for user_id, xp, last_practice in totals:
+        current, longest = _streaks(practice_days.get(user_id, []), now.date())
+        rows.append({
+            "id": user_id,
+            "xp": int(xp or 0),
+            "level": get_level_for_xp(int(xp or 0)),
+            "current_streak": current,
+            "longest_streak": longest,
+            "last_practice_date": last_practice,
+        })
+    for offset in range(0, len(rows), seeder.batch_size):
+        db.execute(update(User), rows[offset:offset + seeder.batch_size])
+
+
+def generate_synthetic_data(
+    db: Session,
+    users: int = 1000,
+    questions: int = 5000,
+    attempts: int = 100000,
+    seed: int = 7,
+    days: int = 90,
+    batch_size: int = 5000,
+    password: str = SYNTHETIC_PASSWORD,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Bring the synthetic population up to the requested volumes and commit once."""
+    now = now or datetime.now()
+    rng = np.random.default_rng(seed)
+    # Drawn up front so a learner keeps the same ability and activity across re-runs.
+    ability = rng.normal(0.0, 1.0, users)
+    activity = rng.pareto(1.16, users) + 1.0
+
+    seeder = BulkSeeder(db, batch_size=batch_size)
+    skill_ids = _ensure_skills(seeder)
+    user_ids = _seed_users(seeder, users, password, now, days)
+    _seed_questions(seeder, rng, questions, skill_ids)
+    added = _seed_attempts(seeder, rng, user_ids, ability, activity, attempts, now, days)
+    if added:
+        _update_progress(seeder, user_ids, now)
+    db.commit()
+
+    report = seeder.report()
+    report.update({"users": len(user_ids), "attempts_added": added})
+    return report
@@ -0,0 +1,174 @@
+"""Materialized lifetime practice stats per user.
+
+Dashboard, gamification profile, achievements and admin views read lifetime
+totals from UserStatsSnapshot instead of rescanning the attempts table. The
+answer submission pipeline keeps the row current in its own transaction.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+
+from ..database import dialect_insert
+from ..models import Attempt, Question, UserStatsSnapshot
+
+
+MODULE_COLUMNS = {
+    "READING": ("reading_attempts", "reading_correct"),
+    "LISTENING": ("listening_attempts", "listening_correct"),
+}
+
+
+def _aggregate_rows(db: Session, user_ids: Iterable[int]) -> List:
+    """Aggregate lifetime totals per user straight from Attempt history."""
+    is_correct = case((Attempt.is_correct == True, 1), else_=0)
+    is_reading = Question.module == "READING"
+    is_listening = Question.module == "LISTENING"
+    return db.query(
+        Attempt.user_id,
+        func.count(Attempt.id),
+        func.sum(is_correct),
+        func.sum(Attempt.response_time_ms),
+        func.sum(case((is_reading, 1), else_=0)),
+        func.sum(case((is_reading & (Attempt.is_correct == True), 1), else_=0)),
+        func.sum(case((is_listening, 1), else_=0)),
+        func.sum(case((is_listening & (Attempt.is_correct == True), 1), else_=0)),
+    ).select_from(Attempt).outerjoin(
+        Question, Question.id == Attempt.question_id
+    ).filter(
+        Attempt.user_id.in_(list(user_ids))
+    ).group_by(Attempt.user_id).all()
+
+
+def _values_from_row(row) -> Dict[str, int]:
+    _, total, correct, response_sum, reading, reading_correct, listening, listening_correct = row
+    return {
+        "total_attempts": int(total or 0),
+        "correct_attempts": int(correct or 0),
+        "response_time_sum_ms": int(response_sum or 0),
+        "reading_attempts": int(reading or 0),
+        "reading_correct": int(reading_correct or 0),
+        "listening_attempts": int(listening or 0),
+        "listening_correct": int(listening_correct or 0),
+    }
+
+
+def _empty_values() -> Dict[str, int]:
+    return {
+        "total_attempts": 0,
+        "correct_attempts": 0,
+        "response_time_sum_ms": 0,
+        "reading_attempts": 0,
+        "reading_correct": 0,
+        "listening_attempts": 0,
+        "listening_correct": 0,
+    }
+
+
+def build_user_stats_snapshot(db: Session, user_id: int) -> UserStatsSnapshot:
+    """Compute a transient snapshot from Attempt history without persisting it."""
+    rows = _aggregate_rows(db, [user_id])
+    values = _values_from_row(rows[0]) if rows else _empty_values()
+    return UserStatsSnapshot(user_id=user_id, **values)
+
+
+def get_user_stats_snapshot(db: Session, user_id: int) -> UserStatsSnapshot:
+    """
+    Return the user's stats snapshot in O(1).
+
+    Users without a stored row (no attempts yet, or data inserted outside the
+    submission pipeline) get a transient snapshot built from history.
+    """
+    snapshot = db.get(UserStatsSnapshot, user_id)
+    if snapshot is None:
+        snapshot = build_user_stats_snapshot(db, user_id)
+    return snapshot
+
+
+def record_attempt_stats(db: Session, attempt: Attempt, module: Optional[str]) -> None:
+    """
+    Fold a flushed attempt into the user's snapshot in the caller's transaction.
+
+    The common path is a single in-place UPDATE. When no row exists yet the
+    snapshot is built from history, which already includes this attempt, and
+    upserted: if a concurrent first attempt inserted the row meanwhile, this
+    attempt is added to it instead.
+    """
+    correct = 1 if attempt.is_correct else 0
+    values = {
+        "total_attempts": UserStatsSnapshot.total_attempts + 1,
+        "correct_attempts": UserStatsSnapshot.correct_attempts + correct,
+        "response_time_sum_ms": UserStatsSnapshot.response_time_sum_ms + (attempt.response_time_ms or 0),
+        "updated_at": func.now(),
+    }
+    module_columns = MODULE_COLUMNS.get(module)
+    if module_columns:
+        attempts_column, correct_column = module_columns
+        values[attempts_column] = getattr(UserStatsSnapshot, attempts_column) + 1
+        values[correct_column] = getattr(UserStatsSnapshot, correct_column) + correct
+
+    result = db.execute(
+        update(UserStatsSnapshot)
+        .where(UserStatsSnapshot.user_id == attempt.user_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        return
+
+    db.flush()
+    snapshot = build_user_stats_snapshot(db, attempt.user_id)
+    insert = dialect_insert(db)
+    if insert is None:
+        db.add(snapshot)
+        db.flush()
+        return
+    row = {name: getattr(snapshot, name) for name in _empty_values()}
+    db.execute(
+        insert(UserStatsSnapshot)
+        .values(user_id=attempt.user_id, **row)
+        .on_conflict_do_update(index_elements=[UserStatsSnapshot.user_id], set_=values)
+    )
+
+
+def rebuild_user_stats(db: Session, user_id: Optional[int] = None, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Recompute snapshots from Attempt history, committing per user batch.
+
+    Returns counts of users scanned, rows created and rows corrected.
+    """
+    if user_id is not None:
+        user_ids = [user_id]
+    else:
+        user_ids = sorted(
+            {row[0] for row in db.query(Attempt.user_id).distinct()}
+            | {row[0] for row in db.query(UserStatsSnapshot.user_id)}
+        )
+
+    report = {"users": 0, "created": 0, "corrected": 0}
+    for offset in range(0, len(user_ids), batch_size):
+        batch = user_ids[offset:offset + batch_size]
+        expected = {row[0]: _values_from_row(row) for row in _aggregate_rows(db, batch)}
+        existing = {
+            snapshot.user_id: snapshot
+            for snapshot in db.query(UserStatsSnapshot).filter(UserStatsSnapshot.user_id.in_(batch))
+        }
+        for batch_user_id in batch:
+            values = expected.get(batch_user_id, _empty_values())
+            snapshot = existing.get(batch_user_id)
+            if snapshot is None:
+                db.add(UserStatsSnapshot(user_id=batch_user_id, **values))
+                report["created"] += 1
+                continue
+            changed = False
+            for field, value in values.items():
+                if getattr(snapshot, field) != value:
+                    setattr(snapshot, field, value)
+                    changed = True
+            if changed:
+                report["corrected"] += 1
+        report["users"] += len(batch)
+        db.commit()
+
+    return report
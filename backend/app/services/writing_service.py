@@ -6,7 +6,7 @@ import google.generativeai as genai
 from typing import Dict, Any
 from dotenv import load_dotenv
 
-from .ai_provider import complete_json_with_ollama, extract_json, provider_order, with_provider_meta
+from .ai_provider import call_gemini, complete_json_with_ollama, extract_json, provider_order, with_provider_meta
 
 load_dotenv()
 
@@ -120,11 +120,13 @@ async def evaluate_essay_with_gemini(
     prompt = _writing_prompt(essay_text, task_type, prompt_text)
     for provider in provider_order():
         if provider == "ollama":
-            result = _valid_writing_result(complete_json_with_ollama(prompt))
+            result = _valid_writing_result(await complete_json_with_ollama(prompt))
             if result:
                 return with_provider_meta(result, "ollama")
-        if provider == "gemini":
-            result = _valid_writing_result(_evaluate_essay_with_gemini(essay_text, task_type, prompt_text))
+        if provider == "gemini" and api_key:
+            result = _valid_writing_result(
+                await call_gemini(_evaluate_essay_with_gemini, essay_text, task_type, prompt_text)
+            )
             if result:
                 return with_provider_meta(result, "gemini")
         if provider == "local":
@@ -0,0 +1,34 @@
+"""Evaluate every achievement for every user in batches.
+
+Usage:
+
+    python award_achievements.py
+    python award_achievements.py --batch-size 200
+"""
+
+import argparse
+import sys
+
+sys.path.insert(0, ".")
+
+from app.database import SessionLocal
+from app.services.achievements import achievement_engine
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Award any achievements users have already earned.")
+    parser.add_argument("--batch-size", type=int, default=500, help="users loaded per batch")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = achievement_engine.evaluate_all_users(db, batch_size=args.batch_size)
+        print(f"Users scanned: {report['users']}")
+        print(f"Achievements awarded: {report['awarded']}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1 @@
+"""Standalone performance benchmarks for the backend (run from backend/)."""
@@ -0,0 +1,142 @@
+"""Compare the question catalog index with the old per-request table scans.
+
+For each catalog size a scratch SQLite database is filled with synthetic
+questions. The legacy path re-runs the previous ``_select_question`` query
+(``.all()`` over the ±2 difficulty band plus Python weighting) and the
+``ORDER BY random()`` fallback; the catalog path picks in memory and loads a
+single row by primary key.
+
+Usage (from backend/):
+
+    python benchmarks/bench_adaptive_selector.py
+    python benchmarks/bench_adaptive_selector.py --sizes 10000,100000 --picks 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+from benchmarks.common import configure_environment, summarize_ms
+
+
+SKILLS = 30
+MODULES = ("READING", "LISTENING")
+
+
+def _seed(engine, size: int) -> None:
+    from app.models import Question, Skill
+
+    with engine.begin() as connection:
+        connection.execute(Skill.__table__.insert(), [
+            {"id": skill_id, "name": f"Skill {skill_id}", "category": f"CATEGORY_{skill_id % 6}"}
+            for skill_id in range(1, SKILLS + 1)
+        ])
+        batch = []
+        for question_id in range(1, size + 1):
+            skill_id = 1 + question_id % SKILLS
+            batch.append({
+                "id": question_id,
+                "skill_id": skill_id,
+                "module": MODULES[skill_id % 2],
+                "passage": "Benchmark passage.",
+                "question_text": f"Benchmark question {question_id}.",
+                "question_type": f"CATEGORY_{skill_id % 6}",
+                "correct_answer": "A",
+                "difficulty": 1 + (question_id // SKILLS) % 10,
+                "is_active": True,
+                "approved": True,
+            })
+            if len(batch) == 10_000:
+                connection.execute(Question.__table__.insert(), batch)
+                batch = []
+        if batch:
+            connection.execute(Question.__table__.insert(), batch)
+
+
+def _legacy_select(db, skill_id: int, module: str, target: int, exclude_ids: list[int]):
+    from sqlalchemy import func
+
+    from app.models import Question
+
+    questions = db.query(Question).filter(
+        Question.skill_id == skill_id,
+        Question.module == module,
+        Question.is_active == True,
+        Question.approved == True,
+        Question.difficulty.between(max(1, target - 2), min(10, target + 2)),
+        ~Question.id.in_(exclude_ids),
+    ).all()
+    if questions:
+        weights = [1 / (abs(q.difficulty - target) + 1) for q in questions]
+        return random.choices(questions, weights)[0]
+    return db.query(Question).filter(Question.module == module).order_by(func.random()).first()
+
+
+def _run_size(size: int, picks: int, legacy_picks: int) -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.database import Base
+    from app.ml.question_catalog import QuestionCatalog
+    from app.models import Question
+
+    path = os.path.join(tempfile.mkdtemp(prefix="jana-bench-catalog-"), "catalog.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    _seed(engine, size)
+    print(f"{size:>9,} questions (seeded in {time.perf_counter() - started:.1f}s)")
+
+    db = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        requests = [
+            (1 + index % SKILLS, random.randint(1, 10), random.sample(range(1, size + 1), 10))
+            for index in range(max(picks, legacy_picks))
+        ]
+
+        latencies = []
+        for skill_id, target, recent in requests[:legacy_picks]:
+            db.expunge_all()
+            started = time.perf_counter()
+            _legacy_select(db, skill_id, MODULES[skill_id % 2], target, recent)
+            latencies.append(time.perf_counter() - started)
+        print(f"  legacy query + weighting: {summarize_ms(latencies)} ({legacy_picks} picks)")
+
+        catalog = QuestionCatalog()
+        started = time.perf_counter()
+        index = catalog.get(db)
+        print(f"  catalog build:            {(time.perf_counter() - started) * 1000:.0f}ms")
+
+        latencies = []
+        for skill_id, target, recent in requests[:picks]:
+            db.expunge_all()
+            started = time.perf_counter()
+            question_id = index.pick(skill_id, MODULES[skill_id % 2], target, recent)
+            db.get(Question, question_id)
+            latencies.append(time.perf_counter() - started)
+        print(f"  catalog pick + PK load:   {summarize_ms(latencies)} ({picks} picks)")
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated catalog sizes")
+    parser.add_argument("--picks", type=int, default=1000, help="catalog selections per size")
+    parser.add_argument("--legacy-picks", type=int, default=50, help="legacy selections per size")
+    args = parser.parse_args()
+
+    configure_environment()
+    for size in (int(value) for value in args.sizes.split(",")):
+        _run_size(size, args.picks, args.legacy_picks)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
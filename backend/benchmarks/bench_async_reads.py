@@ -0,0 +1,170 @@
+"""Requests/sec of the hot read endpoints on the sync and async database paths.
+
+The app is driven in-process over ASGI (``httpx.AsyncClient``), so every
+request shares one event loop, as in a single uvicorn worker. ``--users``
+simulated learners (default 100) each loop over ``/api/questions/next``,
+``/api/dashboard/progress``, ``/api/plan/today`` and ``/api/review/mistakes``.
+
+The "sync" phase mounts copies of those endpoints that use the blocking
+``SessionLocal``, which is how they worked before the async read path. The
+"async" phase calls the real endpoints, which use ``AsyncSession``.
+
+A probe task measures event loop lag, meaning how late a 10ms timer fires. That
+lag is the time the loop spent blocked by database calls. Against a local
+SQLite file, with 20 learners, the two paths have similar throughput. The sync
+path shows about 5x the loop lag at p99. The gap widens with real network round
+trips; set ``DATABASE_URL`` to a PostgreSQL database to see it.
+
+With more learners than the pool holds (``DB_POOL_SIZE`` + ``DB_MAX_OVERFLOW``),
+the sync phase stalls. A checkout blocks the event loop thread, so the
+requests holding connections cannot finish and return them. The checkout
+waits until ``DB_POOL_TIMEOUT`` and then fails. The async path queues those
+checkouts on the loop instead.
+
+Usage (from backend/):
+
+    python benchmarks/bench_async_reads.py
+    python benchmarks/bench_async_reads.py --users 100 --seconds 10 --attempts 200000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from benchmarks.common import configure_environment, summarize_ms
+
+
+PATHS = ("/questions/next", "/dashboard/progress", "/plan/today", "/review/mistakes")
+
+
+def _mount_sync_baseline(app) -> None:
+    """The four endpoints as they were: sync Session inside ``async def``."""
+    from datetime import datetime
+
+    from fastapi import APIRouter, Depends
+    from sqlalchemy.orm import Session
+
+    from app.database import get_db
+    from app.ml import adaptive_selector
+    from app.models import Attempt, MistakeReview, User
+    from app.routers.auth import get_current_user
+    from app.routers.dashboard import _progress_response
+    from app.routers.review import _serialize_mistake
+    from app.services.today_plan import get_today_plan
+
+    router = APIRouter(prefix="/bench/sync")
+
+    @router.get("/questions/next")
+    async def next_question(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+        question, target_skill, reason = adaptive_selector.get_next_question(db, current_user.id)
+        today = db.query(Attempt).filter(
+            Attempt.user_id == current_user.id,
+            Attempt.created_at >= datetime.now().replace(hour=0, minute=0, second=0),
+        ).count()
+        return {"id": question.id if question else None, "target_skill": target_skill, "session_progress": today + 1}
+
+    @router.get("/dashboard/progress")
+    async def progress(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+        return _progress_response(db, current_user)
+
+    @router.get("/plan/today")
+    async def today_plan(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+        return get_today_plan(db, current_user.id)
+
+    @router.get("/review/mistakes")
+    async def mistakes(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+        rows = db.query(MistakeReview).filter(
+            MistakeReview.user_id == current_user.id, MistakeReview.is_resolved == False,  # noqa: E712
+        ).order_by(MistakeReview.created_at.desc()).limit(20).all()
+        return {"mistakes": [_serialize_mistake(row) for row in rows]}
+
+    app.include_router(router)
+
+
+async def _probe(stop: asyncio.Event, lags: list[float], interval: float = 0.01) -> None:
+    while not stop.is_set():
+        scheduled = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - scheduled))
+
+
+async def _phase(client, label: str, prefix: str, headers: list[dict], seconds: float) -> None:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    latencies: list[float] = []
+    errors = 0
+
+    async def learner(index: int) -> None:
+        nonlocal errors
+        step = index
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                response = await client.get(f"{prefix}{PATHS[step % len(PATHS)]}", headers=headers[index])
+                errors += response.status_code != 200
+            except Exception:  # pool checkout timeouts surface as exceptions in-process
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+            step += 1
+
+    probe = asyncio.create_task(_probe(stop, lags))
+    learners = [asyncio.create_task(learner(index)) for index in range(len(headers))]
+    started = time.perf_counter()
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(probe, *learners)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<6} {len(latencies) / elapsed:7.1f} req/s, {errors} errors")
+    print(f"         request {summarize_ms(latencies)}")
+    print(f"         loop lag {summarize_ms(lags)}")
+
+
+async def _run(args) -> None:
+    import httpx
+
+    from app.database import Base, SessionLocal, async_engine, engine
+    from app.main import app
+    from app.models import User
+    from app.services.auth import create_access_token
+    from app.services.dashboard import rebuild_daily_metrics
+    from app.services.synthetic_data import generate_synthetic_data
+    from app.services.user_stats import rebuild_user_stats
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    started = time.perf_counter()
+    generate_synthetic_data(db, users=args.users, questions=args.questions, attempts=args.attempts)
+    rebuild_user_stats(db)
+    rebuild_daily_metrics(db)
+    user_ids = [user_id for (user_id,) in db.query(User.id).order_by(User.id).limit(args.users)]
+    db.close()
+    print(f"seeded {args.users} learners, {args.attempts:,} attempts in {time.perf_counter() - started:.1f}s")
+
+    headers = [{"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"} for user_id in user_ids]
+    _mount_sync_baseline(app)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        print(f"{len(headers)} concurrent learners, {args.seconds:.0f}s per phase:")
+        await _phase(client, "sync", "/bench/sync", headers, args.seconds)
+        await _phase(client, "async", "/api", headers, args.seconds)
+    await async_engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100, help="concurrent simulated learners")
+    parser.add_argument("--questions", type=int, default=2000)
+    parser.add_argument("--attempts", type=int, default=50_000)
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration of each phase")
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,64 @@
+"""Replay synthetic attempt histories through scalar and batch BKT.
+
+The scalar path folds ``KnowledgeTracer.update_mastery`` over a sample of the
+attempts and is extrapolated; the batch path replays everything with
+``replay_sequences`` and is checked for exact equality on the sample.
+
+Usage (from backend/):
+
+    python benchmarks/bench_bkt_replay.py --attempts 10000000 --sequences 500000
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, ".")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--attempts", type=int, default=10_000_000, help="total attempts replayed")
+    parser.add_argument("--sequences", type=int, default=500_000, help="(user, skill) sequences")
+    parser.add_argument("--scalar-sample", type=int, default=200_000, help="attempts replayed by the scalar loop")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from app.ml.knowledge_tracing import KnowledgeTracer
+
+    tracer = KnowledgeTracer()
+    rng = np.random.default_rng(args.seed)
+    # Zipf-like lengths: a few very long sequences, many short ones.
+    weights = 1 / np.arange(1, args.sequences + 1) ** 0.8
+    sequence_ids = rng.choice(args.sequences, size=args.attempts, p=weights / weights.sum())
+    outcomes = rng.random(args.attempts) < 0.65
+    print(f"{args.attempts:,} attempts over {args.sequences:,} sequences "
+          f"(longest {np.bincount(sequence_ids).max():,})")
+
+    sample_ids = sequence_ids[:args.scalar_sample].tolist()
+    sample_outcomes = outcomes[:args.scalar_sample].tolist()
+    started = time.perf_counter()
+    scalar = [tracer.params.p_init] * args.sequences
+    for sequence_id, outcome in zip(sample_ids, sample_outcomes):
+        scalar[sequence_id] = tracer.update_mastery(scalar[sequence_id], outcome)
+    scalar_seconds = time.perf_counter() - started
+    print(f"  scalar:  {scalar_seconds:.2f}s for {args.scalar_sample:,} attempts "
+          f"(~{scalar_seconds * args.attempts / args.scalar_sample:.0f}s extrapolated)")
+
+    sample_batch = tracer.replay_sequences(
+        sequence_ids[:args.scalar_sample], outcomes[:args.scalar_sample], n_sequences=args.sequences
+    )
+    if sample_batch.tolist() != scalar:
+        print("  batch result differs from scalar replay")
+        return 1
+
+    started = time.perf_counter()
+    tracer.replay_sequences(sequence_ids, outcomes, n_sequences=args.sequences)
+    print(f"  batch:   {time.perf_counter() - started:.2f}s for {args.attempts:,} attempts (matches scalar)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
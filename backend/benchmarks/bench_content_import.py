@@ -0,0 +1,146 @@
+"""Compare the old per-row content import with the batched NDJSON import.
+
+A synthetic Reading question bank is imported twice into a scratch database.
+The first run uses the previous ``import_content`` loop (``db.add`` + flush per
+test set, then one ORM add per question). The second streams the same bank as
+NDJSON through ``POST /api/admin/content/import/ndjson``.
+
+Usage (from backend/):
+
+    python benchmarks/bench_content_import.py
+    python benchmarks/bench_content_import.py --questions 100000 --batch-size 5000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from benchmarks.common import SQLCounter, configure_environment, signup_and_login
+
+
+PASSAGE = (
+    "Coral reefs cover a tiny fraction of the ocean floor yet support roughly a quarter of all "
+    "marine species. Rising water temperatures cause corals to expel the algae that feed them, "
+    "a process known as bleaching, and repeated events leave reefs little time to recover."
+)
+
+
+def _test_sets(skill_id: int, questions: int, per_set: int):
+    for set_index in range(questions // per_set):
+        yield {
+            "title": f"Benchmark passage {set_index}",
+            "module": "READING",
+            "passage": PASSAGE,
+            "questions": [
+                {
+                    "skill_id": skill_id,
+                    "question_text": f"Statement {set_index}.{number} about coral reefs.",
+                    "question_type": "TF_NG",
+                    "correct_answer": "True",
+                    "options": ["True", "False", "Not Given"],
+                    "explanation": "The passage states this directly in its opening sentence.",
+                    "difficulty": 1 + number % 10,
+                }
+                for number in range(per_set)
+            ],
+        }
+
+
+def _legacy_import(db, items) -> None:
+    """The pre-batching import_content loop."""
+    from app.models import Question, TestSet
+
+    for item in items:
+        test_set = TestSet(
+            title=item.title, module=item.module.upper(), section=item.section,
+            instructions=item.instructions, passage=item.passage, audio_url=item.audio_url,
+            transcript=item.transcript, source=item.source, estimated_band=item.estimated_band,
+            time_limit_minutes=item.time_limit_minutes, needs_review=item.needs_review,
+            approved=not item.needs_review,
+        )
+        db.add(test_set)
+        db.flush()
+        for q in item.questions:
+            db.add(Question(
+                skill_id=q.skill_id, test_set_id=test_set.id, module=item.module.upper(),
+                section=item.section, passage=item.passage or item.transcript, passage_title=item.title,
+                audio_url=item.audio_url, audio_duration_sec=None, question_text=q.question_text,
+                question_type=q.question_type, options=q.options, correct_answer=q.correct_answer,
+                difficulty=q.difficulty, estimated_band=q.estimated_band, explanation=q.explanation,
+                tags=q.tags, needs_review=item.needs_review, approved=not item.needs_review,
+            ))
+    db.commit()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=100_000, help="questions per import")
+    parser.add_argument("--per-set", type=int, default=10, help="questions per test set")
+    parser.add_argument("--batch-size", type=int, default=2000, help="questions per INSERT batch")
+    parser.add_argument("--skip-legacy", action="store_true", help="only run the NDJSON import")
+    args = parser.parse_args()
+
+    configure_environment()
+    os.environ["ADMIN_EMAILS"] = "bench-admin@example.com"
+    from fastapi.testclient import TestClient
+
+    from app.database import SessionLocal, engine
+    from app.main import app
+    from app.models import Skill
+    from app.routers.admin import ImportTestSet
+
+    db = SessionLocal()
+    try:
+        skill = Skill(name="Benchmark TF/NG", category="TF_NG")
+        db.add(skill)
+        db.commit()
+        skill_id = skill.id
+    finally:
+        db.close()
+
+    counter = SQLCounter()
+    if not args.skip_legacy:
+        items = [ImportTestSet(**item) for item in _test_sets(skill_id, args.questions, args.per_set)]
+        db = SessionLocal()
+        try:
+            with counter.attach(engine):
+                started = time.perf_counter()
+                _legacy_import(db, items)
+                seconds = time.perf_counter() - started
+        finally:
+            db.close()
+        print(f"per-row ORM import: {args.questions} questions in {seconds:.1f}s "
+              f"({args.questions / seconds:,.0f} q/s, {counter.statements} statements)")
+
+    def body():
+        for item in _test_sets(skill_id, args.questions, args.per_set):
+            yield (json.dumps(item) + "\n").encode()
+
+    counter.reset()
+    with TestClient(app) as client:
+        headers = signup_and_login(client, "bench-admin@example.com", "benchadmin")
+        counter.reset()
+        with counter.attach(engine):
+            started = time.perf_counter()
+            response = client.post(
+                f"/api/admin/content/import/ndjson?batch_size={args.batch_size}",
+                content=body(),
+                headers={**headers, "Content-Type": "application/x-ndjson"},
+            )
+            seconds = time.perf_counter() - started
+    if response.status_code != 200:
+        print(f"NDJSON import failed: {response.status_code} {response.text[:200]}")
+        return 1
+    report = response.json()
+    print(f"NDJSON batched import: {report['imported_questions']} questions in {seconds:.1f}s "
+          f"({report['imported_questions'] / seconds:,.0f} q/s, {counter.statements} statements, "
+          f"{report['batches']} batches, {report['failed']} rejected)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+"""Compare the in-memory leaderboard with the old ``ORDER BY users.xp`` queries.
+
+A scratch SQLite database is filled with users whose XP follows a heavy-tailed
+distribution. The legacy path runs the previous endpoint query (full ``User``
+ORM objects, ``ORDER BY xp DESC LIMIT n``), first without and then with the
+``ix_users_xp_id`` index. "My rank" without an in-memory board means a
+``COUNT(*)`` over every user ahead. The new path loads the board once and then
+serves top pages, keyset pages, rank lookups and XP updates from memory.
+
+Usage (from backend/):
+
+    python benchmarks/bench_leaderboard.py
+    python benchmarks/bench_leaderboard.py --users 1000000 --lookups 2000
+"""
+
+import argparse
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from benchmarks.common import configure_environment, summarize_ms
+
+
+def _seed(engine, users: int) -> None:
+    from app.models import User
+
+    rng = random.Random(7)
+    with engine.begin() as connection:
+        batch = []
+        for user_id in range(1, users + 1):
+            batch.append({
+                "id": user_id,
+                "email": f"user{user_id}@bench.local",
+                "username": f"user{user_id}",
+                "password_hash": "x",
+                "xp": int(rng.paretovariate(1.2) * 50) - 50,
+                "level": 1,
+            })
+            if len(batch) == 50_000:
+                connection.execute(User.__table__.insert(), batch)
+                batch = []
+        if batch:
+            connection.execute(User.__table__.insert(), batch)
+
+
+def _time(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=1000, help="rank lookups and XP updates to time")
+    parser.add_argument("--repeat", type=int, default=20, help="runs of each SQL query")
+    args = parser.parse_args()
+
+    configure_environment()
+    from sqlalchemy import func, text
+
+    from app.database import Base, SessionLocal, engine
+    from app.models import User
+    from app.services.leaderboard import Leaderboard
+
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    _seed(engine, args.users)
+    print(f"seeded {args.users:,} users in {time.perf_counter() - started:.1f}s")
+    rng = random.Random(11)
+    probes = [rng.randint(1, args.users) for _ in range(args.lookups)]
+
+    db = SessionLocal()
+    try:
+        def legacy_top():
+            db.query(User).order_by(User.xp.desc()).limit(10).all()
+            db.expunge_all()
+
+        def legacy_rank():
+            user = db.get(User, probes[0])
+            db.query(func.count(User.id)).filter(
+                (User.xp > user.xp) | ((User.xp == user.xp) & (User.id < user.id))
+            ).scalar()
+            db.expunge_all()
+
+        db.execute(text("DROP INDEX ix_users_xp_id"))
+        print(f"legacy top-10, no xp index:    {summarize_ms(_time(legacy_top, min(args.repeat, 5)))}")
+        db.execute(text("CREATE INDEX ix_users_xp_id ON users (xp DESC, id)"))
+        db.commit()
+        print(f"legacy top-10, xp index:       {summarize_ms(_time(legacy_top, args.repeat))}")
+        print(f"legacy my-rank COUNT(*):       {summarize_ms(_time(legacy_rank, args.repeat))}")
+
+        board = Leaderboard(refresh_seconds=3600)
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        board.page(db, limit=10)
+        load_seconds = time.perf_counter() - started
+        rss_growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+        print(f"board load (index-ordered scan): {load_seconds * 1000:.0f}ms, +{rss_growth:.0f} MiB RSS")
+
+        cursor = None
+
+        def keyset_page():
+            nonlocal cursor
+            _, cursor = board.page(db, limit=50, cursor=cursor)
+
+        print(f"top-10 page:                   {summarize_ms(_time(lambda: board.page(db, limit=10), args.repeat))}")
+        print(f"keyset page of 50:             {summarize_ms(_time(keyset_page, args.repeat))}")
+        probe = iter(probes * 2)
+        print(f"my rank + 5 neighbours:        "
+              f"{summarize_ms(_time(lambda: board.around(db, next(probe), radius=2), args.lookups))}")
+        print(f"record_xp (move one user):     "
+              f"{summarize_ms(_time(lambda: board.record_xp(next(probe), rng.randint(0, 5000)), args.lookups))}")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+"""Latency of an unrelated endpoint while a login storm is in progress.
+
+The app is driven in-process over ASGI (``httpx.AsyncClient``), so the storm
+and the probe share one event loop exactly like a single uvicorn worker. The
+probe requests ``GET /health`` on a fixed 10ms schedule and records latency
+from each scheduled start (so time spent blocked counts) for three phases:
+idle, a storm with bcrypt run inline on the event loop (the old behaviour,
+``password_hash_workers=0``), and a storm with the bounded hashing pool. With the pool, probe p99 should stay close to idle.
+
+Usage (from backend/):
+
+    python benchmarks/bench_login_storm.py
+    python benchmarks/bench_login_storm.py --logins 200 --concurrency 64 --workers 4
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from benchmarks.common import configure_environment, summarize_ms
+
+
+PASSWORD = "BenchPass123"
+
+
+async def _probe(client, stop: asyncio.Event, latencies: list[float], interval: float = 0.01) -> None:
+    # Fixed schedule, latency measured from the scheduled start: a blocked
+    # event loop delays the probes themselves and must count against them.
+    scheduled = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        await client.get("/health")
+        finished = time.perf_counter()
+        latencies.append(finished - scheduled)
+        scheduled = max(scheduled + interval, finished - interval)
+
+
+async def _storm(client, emails: list[str], logins: int, concurrency: int) -> list[int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = []
+
+    async def login(index: int) -> None:
+        async with semaphore:
+            response = await client.post(
+                "/api/auth/login/json",
+                json={"email": emails[index % len(emails)], "password": PASSWORD},
+            )
+            statuses.append(response.status_code)
+
+    await asyncio.gather(*(login(index) for index in range(logins)))
+    return statuses
+
+
+async def _phase(client, label: str, emails: list[str], logins: int, concurrency: int) -> None:
+    stop = asyncio.Event()
+    latencies: list[float] = []
+    probe = asyncio.create_task(_probe(client, stop, latencies))
+    started = time.perf_counter()
+    if logins:
+        statuses = await _storm(client, emails, logins, concurrency)
+        ok = sum(1 for status in statuses if status == 200)
+        elapsed = time.perf_counter() - started
+        detail = f"{ok}/{logins} logins ok in {elapsed:.1f}s"
+    else:
+        await asyncio.sleep(1.0)
+        detail = "no logins"
+    stop.set()
+    await probe
+    print(f"  {label:<14} /health {summarize_ms(latencies)} ({len(latencies)} probes, {detail})")
+
+
+async def _run(args) -> None:
+    import httpx
+
+    from app.database import Base, SessionLocal, engine
+    from app.main import app
+    from app.models import User
+    from app.services.auth import get_password_hash
+    from app.services.password_hasher import password_hasher
+
+    Base.metadata.create_all(bind=engine)
+    password_hash = get_password_hash(PASSWORD)
+    emails = [f"storm{index}@example.com" for index in range(args.users)]
+    db = SessionLocal()
+    db.add_all(
+        User(email=email, username=f"storm{index}", password_hash=password_hash)
+        for index, email in enumerate(emails)
+    )
+    db.commit()
+    db.close()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await _phase(client, "idle", emails, 0, args.concurrency)
+
+        password_hasher.max_workers = 0
+        await _phase(client, "inline bcrypt", emails, args.logins, args.concurrency)
+
+        password_hasher.max_workers = args.workers
+        password_hasher.reset_stats()
+        await _phase(client, f"pool ({args.workers})", emails, args.logins, args.concurrency)
+        stats = password_hasher.stats()
+        print(
+            f"  pool queue: max_queued={stats['max_queued']} avg_wait={stats['avg_wait_ms']}ms "
+            f"p99_wait={stats['p99_wait_ms']}ms avg_hash={stats['avg_hash_ms']}ms rejected={stats['rejected']}"
+        )
+    password_hasher.shutdown()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=40, help="logins per storm")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent login requests")
+    parser.add_argument("--workers", type=int, default=2, help="hashing pool size for the pool phase")
+    parser.add_argument("--users", type=int, default=20, help="distinct accounts to log in as")
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+"""Per-check overhead of the rate limit storage backends.
+
+Times ``limiter.hit`` for the previous per-process ``memory://`` storage, the
+local SQLite fallback and, when ``--redis`` (or ``REDIS_URL``) is given, Redis.
+A check uses a realistic spread of client keys. Then several processes share
+one budget on a single key, to show how many hits each backend lets through
+compared with the advertised limit.
+
+Usage (from backend/):
+
+    python benchmarks/bench_rate_limit.py
+    python benchmarks/bench_rate_limit.py --checks 20000 --processes 4 --redis redis://localhost:6379/0
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, ".")
+
+from benchmarks.common import configure_environment, summarize_ms
+
+
+def _checks(uri: str, strategy: str, checks: int, clients: int) -> list[float]:
+    from limits import parse
+    from limits.storage import storage_from_string
+    from limits.strategies import STRATEGIES
+
+    limiter = STRATEGIES[strategy](storage_from_string(uri))
+    item = parse("200/minute")
+    rng = random.Random(3)
+    samples = []
+    for _ in range(checks):
+        key = f"user:{rng.randrange(clients)}"
+        started = time.perf_counter()
+        limiter.hit(item, key)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _shared_budget_worker(uri: str, strategy: str, attempts: int, results) -> None:
+    from limits import parse
+    from limits.storage import storage_from_string
+    from limits.strategies import STRATEGIES
+
+    limiter = STRATEGIES[strategy](storage_from_string(uri))
+    item = parse("100/minute")
+    results.put(sum(limiter.hit(item, "ip:203.0.113.9") for _ in range(attempts)))
+
+
+def _shared_budget(uri: str, strategy: str, processes: int, attempts: int) -> int:
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [
+        context.Process(target=_shared_budget_worker, args=(uri, strategy, attempts, results))
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(results.get() for _ in workers)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--checks", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=500, help="distinct rate limit keys")
+    parser.add_argument("--processes", type=int, default=4, help="workers sharing one 100/minute budget")
+    parser.add_argument("--strategy", default="sliding-window-counter")
+    parser.add_argument("--redis", default=os.environ.get("REDIS_URL"), help="also benchmark this Redis URL")
+    args = parser.parse_args()
+
+    configure_environment()
+    import app.middleware.rate_limit_storage  # noqa: F401 registers the sqlite:// scheme
+
+    backends = [
+        ("memory (per process)", "memory://"),
+        ("sqlite (shared file)", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jana-bench-'), 'limits.sqlite3')}"),
+    ]
+    if args.redis:
+        backends.append(("redis", args.redis))
+
+    for label, uri in backends:
+        samples = _checks(uri, args.strategy, args.checks, args.clients)
+        allowed = _shared_budget(uri, args.strategy, args.processes, 100)
+        print(f"{label:22} check {summarize_ms(samples)}; "
+              f"{args.processes} processes x 100 hits on a 100/minute key -> {allowed} allowed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
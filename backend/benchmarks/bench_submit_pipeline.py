@@ -0,0 +1,91 @@
+"""Measure commits, SQL statements and latency per answer submission.
+
+Usage (from backend/):
+
+    python benchmarks/bench_submit_pipeline.py --answers 200
+"""
+
+import argparse
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from benchmarks.common import SQLCounter, configure_environment, signup_and_login, summarize_ms
+
+
+ENDPOINTS = ("/api/questions/submit", "/api/practice/submit")
+
+
+def _seed_questions(db, count: int) -> list[int]:
+    from app.models import Question, Skill
+
+    skill = Skill(name="Benchmark TF/NG", category="TF_NG")
+    db.add(skill)
+    db.flush()
+    questions = [
+        Question(
+            skill_id=skill.id,
+            passage="Benchmark passage.",
+            question_text=f"Benchmark statement {index}.",
+            question_type="TF_NG",
+            correct_answer="True",
+            difficulty=1 + index % 10,
+        )
+        for index in range(count)
+    ]
+    db.add_all(questions)
+    db.commit()
+    return [question.id for question in questions]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--answers", type=int, default=200, help="answers submitted per endpoint")
+    args = parser.parse_args()
+
+    configure_environment()
+    from fastapi.testclient import TestClient
+
+    from app.database import SessionLocal, engine
+    from app.main import app
+
+    db = SessionLocal()
+    try:
+        question_ids = _seed_questions(db, 50)
+    finally:
+        db.close()
+
+    counter = SQLCounter()
+    with TestClient(app) as client:
+        headers = signup_and_login(client, "bench-submit@example.com", "benchsubmit")
+        for path in ENDPOINTS:
+            commits = []
+            statements = []
+            latencies = []
+            with counter.attach(engine):
+                for index in range(args.answers):
+                    counter.reset()
+                    started = time.perf_counter()
+                    response = client.post(path, headers=headers, json={
+                        "question_id": question_ids[index % len(question_ids)],
+                        "user_answer": "True" if index % 3 else "False",
+                        "response_time_ms": 4000,
+                    })
+                    latencies.append(time.perf_counter() - started)
+                    if response.status_code != 200:
+                        print(f"{path}: unexpected status {response.status_code}")
+                        return 1
+                    commits.append(counter.commits)
+                    statements.append(counter.statements)
+
+            print(f"{path} ({args.answers} answers)")
+            print(f"  commits/request:    min={min(commits)} max={max(commits)}")
+            print(f"  statements/request: min={min(statements)} max={max(statements)} "
+                  f"mean={sum(statements) / len(statements):.1f}")
+            print(f"  latency:            {summarize_ms(latencies)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+"""Shared helpers for backend benchmark scripts.
+
+Benchmarks run against a throwaway SQLite database unless DATABASE_URL is
+already set, so they never touch the local development database.
+"""
+
+import os
+import statistics
+import tempfile
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+def configure_environment() -> str:
+    """Point the app at a scratch database. Call before importing ``app``."""
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    if "DATABASE_URL" not in os.environ:
+        path = os.path.join(tempfile.mkdtemp(prefix="jana-bench-"), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return os.environ["DATABASE_URL"]
+
+
+class SQLCounter:
+    """Counts SQL statements and commits issued through an engine."""
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+
+    def reset(self) -> None:
+        self.statements = 0
+        self.commits = 0
+
+    def _on_execute(self, *args) -> None:
+        self.statements += 1
+
+    def _on_commit(self, *args) -> None:
+        self.commits += 1
+
+    @contextmanager
+    def attach(self, engine):
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+        try:
+            yield self
+        finally:
+            event.remove(engine, "before_cursor_execute", self._on_execute)
+            event.remove(engine, "commit", self._on_commit)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize_ms(samples: list[float]) -> str:
+    """Format latency samples (seconds) as mean/p50/p95/p99 milliseconds."""
+    if not samples:
+        return "no samples"
+    ms = [s * 1000 for s in samples]
+    return (
+        f"mean={statistics.fmean(ms):.2f}ms p50={percentile(ms, 50):.2f}ms "
+        f"p95={percentile(ms, 95):.2f}ms p99={percentile(ms, 99):.2f}ms"
+    )
+
+
+def signup_and_login(client, email: str, username: str, password: str = "BenchPass123") -> dict:
+    """Create a user through the public API and return auth headers."""
+    client.post("/api/auth/signup", json={"email": email, "username": username, "password": password})
+    response = client.post("/api/auth/login/json", json={"email": email, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
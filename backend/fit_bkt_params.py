@@ -0,0 +1,63 @@
+"""Fit per-skill BKT parameters from Attempt history and store them on Skill.
+
+Usage:
+
+    python fit_bkt_params.py                     # fit and persist
+    python fit_bkt_params.py --dry-run           # report only
+    python fit_bkt_params.py --rebuild-masteries # also replay mastery with the new params
+"""
+
+import argparse
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from app.database import SessionLocal
+from app.ml.bkt_fitting import fit_all_skills
+from app.services.mastery import rebuild_skill_masteries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fit BKT parameters per skill.")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="attempt rows fetched per round trip")
+    parser.add_argument("--max-sequence-length", type=int, default=200, help="attempts used per (user, skill)")
+    parser.add_argument("--max-attempts-per-skill", type=int, default=5_000_000, help="memory bound per skill")
+    parser.add_argument("--min-attempts", type=int, default=200, help="skip skills with fewer attempts")
+    parser.add_argument("--dry-run", action="store_true", help="report fits without saving them")
+    parser.add_argument("--rebuild-masteries", action="store_true", help="replay mastery after saving")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        fits = fit_all_skills(
+            db,
+            chunk_size=args.chunk_size,
+            max_sequence_length=args.max_sequence_length,
+            max_attempts_per_skill=args.max_attempts_per_skill,
+            min_attempts=args.min_attempts,
+            persist=not args.dry_run,
+        )
+        for fit in fits:
+            p = fit.params
+            print(
+                f"skill {fit.skill_id}: {fit.attempts} attempts / {fit.sequences} sequences | "
+                f"init={p.p_init:.3f} learn={p.p_learn:.3f} guess={p.p_guess:.3f} slip={p.p_slip:.3f} | "
+                f"loglik={fit.log_likelihood:.1f} (defaults {fit.default_log_likelihood:.1f}) | "
+                f"{fit.seconds:.2f}s{'' if fit.converged else ' (not converged)'}"
+            )
+        print(f"Skills fitted: {len(fits)} in {time.perf_counter() - started:.1f}s")
+        print(f"Total log-likelihood: {sum(fit.log_likelihood for fit in fits):.1f}")
+        if args.dry_run:
+            print("Dry run: parameters not saved")
+        elif args.rebuild_masteries and fits:
+            report = rebuild_skill_masteries(db)
+            print(f"Mastery rows updated: {report['updated']} created: {report['created']}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
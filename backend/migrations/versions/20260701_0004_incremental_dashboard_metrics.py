@@ -0,0 +1,66 @@
+"""Support incremental dashboard metric upserts.
+
+Adds a running response-time sum and a unique (user_id, date) key so each
+attempt can be folded into its day's row with a single upsert.
+
+Revision ID: 20260701_0004
+Revises: 20260619_0003
+Create Date: 2026-07-01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20260701_0004"
+down_revision: Union[str, Sequence[str], None] = "20260619_0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CONSTRAINT_NAME = "uq_dashboard_metric_user_date"
+
+
+def _column_names(bind, table_name: str) -> set[str]:
+    return {column["name"] for column in inspect(bind).get_columns(table_name)}
+
+
+def _unique_names(bind, table_name: str) -> set[str]:
+    inspector = inspect(bind)
+    names = {item["name"] for item in inspector.get_unique_constraints(table_name)}
+    names |= {item["name"] for item in inspector.get_indexes(table_name) if item.get("unique")}
+    return names
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if "dashboard_metrics" not in set(inspect(bind).get_table_names()):
+        return
+
+    if "response_time_sum_ms" not in _column_names(bind, "dashboard_metrics"):
+        with op.batch_alter_table("dashboard_metrics") as batch_op:
+            batch_op.add_column(sa.Column("response_time_sum_ms", sa.Integer(), nullable=True))
+        op.execute(
+            "UPDATE dashboard_metrics "
+            "SET response_time_sum_ms = CAST(ROUND(COALESCE(avg_response_time_ms, 0) "
+            "* COALESCE(total_attempts, 0)) AS INTEGER)"
+        )
+
+    if CONSTRAINT_NAME not in _unique_names(bind, "dashboard_metrics"):
+        # Older get-or-create code could race into duplicate day rows; keep the
+        # first one. `python reconcile_dashboard_metrics.py` recomputes values.
+        op.execute(
+            "DELETE FROM dashboard_metrics WHERE id NOT IN ("
+            "SELECT MIN(id) FROM dashboard_metrics GROUP BY user_id, date)"
+        )
+        with op.batch_alter_table("dashboard_metrics") as batch_op:
+            batch_op.create_unique_constraint(CONSTRAINT_NAME, ["user_id", "date"])
+
+
+def downgrade() -> None:
+    """No-op downgrade to avoid destructive local data loss."""
+    pass
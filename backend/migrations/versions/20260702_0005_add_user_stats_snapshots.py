@@ -0,0 +1,78 @@
+"""Add materialized per-user stats snapshots.
+
+Creates user_stats_snapshots and backfills it from existing attempts so
+dashboard, gamification, achievement and admin reads stay O(1).
+
+Revision ID: 20260702_0005
+Revises: 20260701_0004
+Create Date: 2026-07-02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20260702_0005"
+down_revision: Union[str, Sequence[str], None] = "20260701_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_SQL = """
+INSERT INTO user_stats_snapshots (
+    user_id, total_attempts, correct_attempts, response_time_sum_ms,
+    reading_attempts, reading_correct, listening_attempts, listening_correct,
+    updated_at
+)
+SELECT
+    a.user_id,
+    COUNT(a.id),
+    SUM(CASE WHEN a.is_correct THEN 1 ELSE 0 END),
+    COALESCE(SUM(a.response_time_ms), 0),
+    SUM(CASE WHEN q.module = 'READING' THEN 1 ELSE 0 END),
+    SUM(CASE WHEN q.module = 'READING' AND a.is_correct THEN 1 ELSE 0 END),
+    SUM(CASE WHEN q.module = 'LISTENING' THEN 1 ELSE 0 END),
+    SUM(CASE WHEN q.module = 'LISTENING' AND a.is_correct THEN 1 ELSE 0 END),
+    CURRENT_TIMESTAMP
+FROM attempts a
+LEFT OUTER JOIN questions q ON q.id = a.question_id
+WHERE a.user_id NOT IN (SELECT user_id FROM user_stats_snapshots)
+GROUP BY a.user_id
+"""
+
+
+def _table_names(bind) -> set[str]:
+    return set(inspect(bind).get_table_names())
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = _table_names(bind)
+
+    if "user_stats_snapshots" not in tables:
+        op.create_table(
+            "user_stats_snapshots",
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("total_attempts", sa.Integer(), nullable=False),
+            sa.Column("correct_attempts", sa.Integer(), nullable=False),
+            sa.Column("response_time_sum_ms", sa.Integer(), nullable=False),
+            sa.Column("reading_attempts", sa.Integer(), nullable=False),
+            sa.Column("reading_correct", sa.Integer(), nullable=False),
+            sa.Column("listening_attempts", sa.Integer(), nullable=False),
+            sa.Column("listening_correct", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("user_id"),
+        )
+
+    if "attempts" in tables:
+        op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    """No-op downgrade to avoid destructive local data loss."""
+    pass
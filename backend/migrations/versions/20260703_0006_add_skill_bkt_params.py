@@ -0,0 +1,62 @@
+"""Add fitted per-skill BKT parameters.
+
+Revision ID: 20260703_0006
+Revises: 20260702_0005
+Create Date: 2026-07-03
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20260703_0006"
+down_revision: Union[str, Sequence[str], None] = "20260702_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SKILL_COLUMNS = {
+    "bkt_p_init": sa.Column("bkt_p_init", sa.Float(), nullable=True),
+    "bkt_p_learn": sa.Column("bkt_p_learn", sa.Float(), nullable=True),
+    "bkt_p_guess": sa.Column("bkt_p_guess", sa.Float(), nullable=True),
+    "bkt_p_slip": sa.Column("bkt_p_slip", sa.Float(), nullable=True),
+    "bkt_log_likelihood": sa.Column("bkt_log_likelihood", sa.Float(), nullable=True),
+    "bkt_fit_attempts": sa.Column("bkt_fit_attempts", sa.Integer(), nullable=True),
+    "bkt_fitted_at": sa.Column("bkt_fitted_at", sa.DateTime(), nullable=True),
+}
+
+
+def _table_names(bind) -> set[str]:
+    return set(inspect(bind).get_table_names())
+
+
+def _column_names(bind, table_name: str) -> set[str]:
+    return {column["name"] for column in inspect(bind).get_columns(table_name)}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if "skills" not in _table_names(bind):
+        return
+
+    existing_columns = _column_names(bind, "skills")
+    missing_columns = [
+        column.copy()
+        for name, column in SKILL_COLUMNS.items()
+        if name not in existing_columns
+    ]
+    if not missing_columns:
+        return
+
+    with op.batch_alter_table("skills") as batch_op:
+        for column in missing_columns:
+            batch_op.add_column(column)
+
+
+def downgrade() -> None:
+    """No-op downgrade to avoid destructive local data loss."""
+    pass
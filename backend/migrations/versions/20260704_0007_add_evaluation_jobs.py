@@ -0,0 +1,73 @@
+"""Add the evaluation job queue and attempt evaluation status.
+
+Revision ID: 20260704_0007
+Revises: 20260703_0006
+Create Date: 2026-07-04
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20260704_0007"
+down_revision: Union[str, Sequence[str], None] = "20260703_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ATTEMPT_TABLES = ("writing_attempts", "speaking_attempts")
+
+
+def _table_names(bind) -> set[str]:
+    return set(inspect(bind).get_table_names())
+
+
+def _column_names(bind, table_name: str) -> set[str]:
+    return {column["name"] for column in inspect(bind).get_columns(table_name)}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = _table_names(bind)
+
+    for table_name in ATTEMPT_TABLES:
+        if table_name in tables and "evaluation_status" not in _column_names(bind, table_name):
+            with op.batch_alter_table(table_name) as batch_op:
+                batch_op.add_column(sa.Column(
+                    "evaluation_status", sa.String(length=20),
+                    server_default="completed", nullable=False,
+                ))
+
+    if "evaluation_jobs" not in tables:
+        op.create_table(
+            "evaluation_jobs",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("kind", sa.String(length=20), nullable=False),
+            sa.Column("attempt_id", sa.Integer(), nullable=False),
+            sa.Column("status", sa.String(length=20), nullable=False),
+            sa.Column("payload", sa.JSON(), nullable=True),
+            sa.Column("result", sa.JSON(), nullable=True),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("provider", sa.String(length=50), nullable=True),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("max_attempts", sa.Integer(), nullable=False),
+            sa.Column("available_at", sa.DateTime(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("started_at", sa.DateTime(), nullable=True),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_evaluation_jobs_id", "evaluation_jobs", ["id"])
+        op.create_index("ix_evaluation_jobs_user_id", "evaluation_jobs", ["user_id"])
+        op.create_index("ix_evaluation_jobs_status_available", "evaluation_jobs", ["status", "available_at"])
+
+
+def downgrade() -> None:
+    """No-op downgrade to avoid destructive local data loss."""
+    pass
@@ -0,0 +1,43 @@
+"""Add the persistent AI evaluation cache.
+
+Revision ID: 20260705_0008
+Revises: 20260704_0007
+Create Date: 2026-07-05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20260705_0008"
+down_revision: Union[str, Sequence[str], None] = "20260704_0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if "evaluation_cache" in inspect(bind).get_table_names():
+        return
+
+    op.create_table(
+        "evaluation_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("provider", sa.String(length=50), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index("ix_evaluation_cache_last_used_at", "evaluation_cache", ["last_used_at"])
+
+
+def downgrade() -> None:
+    """No-op downgrade to avoid destructive local data loss."""
+    pass
@@ -0,0 +1,32 @@
+"""Index users by (xp DESC, id) for the leaderboard.
+
+Revision ID: 20260706_0009
+Revises: 20260705_0008
+Create Date: 2026-07-06
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20260706_0009"
+down_revision: Union[str, Sequence[str], None] = "20260705_0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if "ix_users_xp_id" in {index["name"] for index in inspect(bind).get_indexes("users")}:
+        return
+
+    op.create_index("ix_users_xp_id", "users", [sa.text("xp DESC"), "id"])
+
+
+def downgrade() -> None:
+    """No-op downgrade to avoid destructive local data loss."""
+    pass
@@ -0,0 +1,134 @@
+"""Composite indexes for the hot query paths, and unique (user_id, skill_id) masteries.
+
+On PostgreSQL the indexes are built CONCURRENTLY, outside a transaction, so
+attempts and mistakes keep accepting writes while they build. The mastery
+unique constraint is attached to a concurrently built unique index. An index
+left INVALID by an interrupted build is dropped and rebuilt on the next run.
+
+Revision ID: 20260707_0010
+Revises: 20260706_0009
+Create Date: 2026-07-07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20260707_0010"
+down_revision: Union[str, Sequence[str], None] = "20260706_0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_attempts_user_created", "attempts", ["user_id", "created_at"]),
+    ("ix_attempts_user_question", "attempts", ["user_id", "question_id"]),
+    (
+        "ix_mistake_reviews_user_resolved_created",
+        "mistake_reviews",
+        ["user_id", "is_resolved", "created_at"],
+    ),
+    (
+        "ix_questions_module_active_skill",
+        "questions",
+        ["module", "is_active", "approved", "skill_id", "difficulty"],
+    ),
+    ("ix_user_vocabulary_user_next_review", "user_vocabulary", ["user_id", "next_review_at"]),
+]
+
+MASTERY_CONSTRAINT = "uq_user_skill_mastery_user_skill"
+
+
+def _index_names(bind, table_name: str) -> set[str]:
+    inspector = inspect(bind)
+    names = {item["name"] for item in inspector.get_indexes(table_name)}
+    names |= {item["name"] for item in inspector.get_unique_constraints(table_name)}
+    return names
+
+
+def _drop_invalid_postgres_index(bind, name: str) -> None:
+    invalid = bind.execute(
+        text(
+            "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).first()
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True)
+
+
+def _has_mastery_constraint(bind) -> bool:
+    if bind.dialect.name == "postgresql":
+        # The unique index can exist without the constraint when a run stopped
+        # between CREATE UNIQUE INDEX CONCURRENTLY and ADD CONSTRAINT.
+        return bind.execute(
+            text("SELECT 1 FROM pg_constraint WHERE conname = :name"),
+            {"name": MASTERY_CONSTRAINT},
+        ).first() is not None
+    return MASTERY_CONSTRAINT in _index_names(bind, "user_skill_masteries")
+
+
+def _dedupe_masteries() -> None:
+    # Concurrent first attempts on a skill could each insert a row; keep the
+    # first. The survivor may lack the newer row's BKT state, so deploys run
+    # `python rebuild_masteries.py` afterwards (docs/DEPLOYMENT.md).
+    op.execute(
+        "DELETE FROM user_skill_masteries WHERE id NOT IN ("
+        "SELECT MIN(id) FROM user_skill_masteries GROUP BY user_id, skill_id)"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = set(inspect(bind).get_table_names())
+    postgres = bind.dialect.name == "postgresql"
+
+    add_constraint = "user_skill_masteries" in tables and not _has_mastery_constraint(bind)
+    if add_constraint and not postgres:
+        _dedupe_masteries()
+        with op.batch_alter_table("user_skill_masteries") as batch_op:
+            batch_op.create_unique_constraint(MASTERY_CONSTRAINT, ["user_id", "skill_id"])
+
+    if not postgres:
+        for name, table, columns in INDEXES:
+            if table in tables and name not in _index_names(bind, table):
+                op.create_index(name, table, columns)
+        return
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if table not in tables:
+                continue
+            _drop_invalid_postgres_index(bind, name)
+            if name not in _index_names(bind, table):
+                op.create_index(name, table, columns, postgresql_concurrently=True)
+
+        if add_constraint:
+            _drop_invalid_postgres_index(bind, MASTERY_CONSTRAINT)
+            if MASTERY_CONSTRAINT not in _index_names(bind, "user_skill_masteries"):
+                # Right before the build, after the other indexes, to keep the
+                # window for new duplicates short. One that still lands during
+                # the build leaves the index INVALID; a re-run drops it,
+                # dedupes again and rebuilds.
+                _dedupe_masteries()
+                op.create_index(
+                    MASTERY_CONSTRAINT,
+                    "user_skill_masteries",
+                    ["user_id", "skill_id"],
+                    unique=True,
+                    postgresql_concurrently=True,
+                )
+            op.execute(
+                f"ALTER TABLE user_skill_masteries ADD CONSTRAINT {MASTERY_CONSTRAINT} "
+                f"UNIQUE USING INDEX {MASTERY_CONSTRAINT}"
+            )
+
+
+def downgrade() -> None:
+    """No-op downgrade to avoid destructive local data loss."""
+    pass
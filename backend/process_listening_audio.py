@@ -0,0 +1,69 @@
+"""Transcode and analyse the listening audio library, then update questions.
+
+Usage:
+
+    python process_listening_audio.py                 # changed files only
+    python process_listening_audio.py --workers 8
+    python process_listening_audio.py --force         # reprocess everything
+    python process_listening_audio.py --no-db         # files only, leave questions alone
+
+Requires ffmpeg and ffprobe on PATH.
+"""
+
+import argparse
+import shutil
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from app.database import SessionLocal
+from app.routers.listening import AUDIO_DIR
+from app.services.audio_library import StreamingProfile, apply_to_questions, process_library
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Prepare listening audio for streaming.")
+    parser.add_argument("--audio-dir", default=str(AUDIO_DIR), help="library root (default: static/audio)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--bitrate", type=int, default=StreamingProfile.bitrate_kbps, help="MP3 bitrate in kbps")
+    parser.add_argument("--force", action="store_true", help="reprocess files whose hash is unchanged")
+    parser.add_argument("--no-db", action="store_true", help="do not update listening questions")
+    args = parser.parse_args()
+
+    missing = [tool for tool in ("ffmpeg", "ffprobe") if shutil.which(tool) is None]
+    if missing:
+        print(f"Missing required tools: {', '.join(missing)}")
+        return 1
+
+    started = time.perf_counter()
+    report = process_library(
+        args.audio_dir,
+        workers=args.workers,
+        profile=StreamingProfile(bitrate_kbps=args.bitrate),
+        force=args.force,
+    )
+    for source, error in report["failed"].items():
+        print(f"FAILED {source}: {error}")
+    print(
+        f"Processed: {len(report['processed'])} skipped (unchanged): {len(report['skipped'])} "
+        f"failed: {len(report['failed'])} in {time.perf_counter() - started:.1f}s"
+    )
+    if report["source_bytes"]:
+        print(
+            f"Library size: {report['source_bytes'] / 1e6:.1f} MB source -> "
+            f"{report['output_bytes'] / 1e6:.1f} MB streamed "
+            f"({100 * report['output_bytes'] / report['source_bytes']:.0f}%)"
+        )
+
+    if not args.no_db:
+        db = SessionLocal()
+        try:
+            print(f"Listening questions updated: {apply_to_questions(db, report['entries'])}")
+        finally:
+            db.close()
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
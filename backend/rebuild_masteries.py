@@ -0,0 +1,38 @@
+"""Recompute UserSkillMastery rows by replaying Attempt history through BKT.
+
+Run after changing BKT parameters or after bulk-importing attempts.
+
+Usage:
+
+    python rebuild_masteries.py                  # every user with attempts
+    python rebuild_masteries.py --user-id 42 --user-id 43
+"""
+
+import argparse
+import sys
+
+sys.path.insert(0, ".")
+
+from app.database import SessionLocal
+from app.services.mastery import rebuild_skill_masteries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild skill mastery from attempt history.")
+    parser.add_argument("--user-id", type=int, action="append", default=None, help="only rebuild this user (repeatable)")
+    parser.add_argument("--batch-size", type=int, default=500, help="users replayed per batch")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = rebuild_skill_masteries(db, user_ids=args.user_id, batch_size=args.batch_size)
+        print(f"Users scanned: {report['users']}")
+        print(f"Mastery rows created: {report['created']}")
+        print(f"Mastery rows updated: {report['updated']}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,39 @@
+"""Rebuild daily dashboard metrics and user stats snapshots from Attempt history.
+
+Usage:
+
+    python reconcile_dashboard_metrics.py            # every user
+    python reconcile_dashboard_metrics.py --user-id 42
+"""
+
+import argparse
+import sys
+
+sys.path.insert(0, ".")
+
+from app.database import SessionLocal
+from app.services.dashboard import rebuild_daily_metrics
+from app.services.user_stats import rebuild_user_stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reconcile dashboard_metrics and user_stats_snapshots with attempts.")
+    parser.add_argument("--user-id", type=int, default=None, help="only reconcile this user")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = rebuild_daily_metrics(db, user_id=args.user_id)
+        print(f"Users scanned: {report['users']}")
+        print(f"Metric rows created: {report['created']}")
+        print(f"Metric rows corrected: {report['corrected']}")
+        report = rebuild_user_stats(db, user_id=args.user_id)
+        print(f"Stats snapshots created: {report['created']}")
+        print(f"Stats snapshots corrected: {report['corrected']}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
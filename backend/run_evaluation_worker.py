@@ -0,0 +1,52 @@
+"""Run writing/speaking evaluation job workers in their own process.
+
+API processes start in-process workers unless EVALUATION_WORKERS=0; set it to
+0 there and run this script instead to keep slow evaluations off the web
+workers. Any number of worker processes can share the database queue.
+
+Usage:
+
+    python run_evaluation_worker.py
+    python run_evaluation_worker.py --concurrency 4
+    python run_evaluation_worker.py --drain          # process queued jobs and exit
+"""
+
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, ".")
+
+from app.services.ai_provider import ollama_client
+from app.services.evaluation_jobs import evaluation_workers
+
+
+async def _run(drain: bool) -> None:
+    try:
+        if drain:
+            print(f"Jobs processed: {await evaluation_workers.drain()}")
+            return
+        await evaluation_workers.start()
+        print(f"Evaluation workers running: {evaluation_workers.concurrency}")
+        await asyncio.Event().wait()
+    finally:
+        await evaluation_workers.stop()
+        await ollama_client.aclose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Process queued writing/speaking evaluations.")
+    parser.add_argument("--concurrency", type=int, default=2, help="concurrent jobs")
+    parser.add_argument("--drain", action="store_true", help="process queued jobs once and exit")
+    args = parser.parse_args()
+
+    evaluation_workers.concurrency = args.concurrency
+    try:
+        asyncio.run(_run(args.drain))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
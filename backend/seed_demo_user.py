@@ -21,10 +21,11 @@ from app.models import (
     UserSkillMastery,
 )
 from app.services.auth import get_password_hash
-from app.services.dashboard import update_daily_metrics
+from app.services.dashboard import rebuild_daily_metrics
 from app.services.gamification import get_level_for_xp
 from app.services.module_skills import get_categories_for_module
 from app.services.scoring import raw_to_band
+from app.services.user_stats import rebuild_user_stats
 
 
 DEMO_EMAIL = "demo@ieltsjana.local"
@@ -301,7 +302,8 @@ def seed_demo_profile(db) -> User:
     user.longest_streak = 6
     user.last_practice_date = now
     db.commit()
-    update_daily_metrics(db, user.id)
+    rebuild_daily_metrics(db, user_id=user.id)
+    rebuild_user_stats(db, user_id=user.id)
     db.refresh(user)
     return user
 
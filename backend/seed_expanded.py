@@ -3,8 +3,11 @@
 import sys
 sys.path.insert(0, '.')
 
+from sqlalchemy import update
+
 from app.database import SessionLocal, engine, Base
 from app.models import Skill, Question
+from app.services.bulk_seed import BulkSeeder, model_rows
 
 def add_new_skills():
     """Add new question type skills."""
@@ -377,41 +380,34 @@ def main():
     db = SessionLocal()
     
     try:
-        # Add new skills
-        existing_skills = db.query(Skill).count()
-        
-        if existing_skills <= 9:  # Only original skills
-            new_skills = add_new_skills()
-            for skill in new_skills:
-                db.add(skill)
-            db.commit()
-            print(f"Added {len(new_skills)} new skills")
-            
-            # Set up skill relationships for new skills
-            skills = db.query(Skill).all()
-            skill_by_name = {s.name: s for s in skills}
-            
-            if "Complex Matching Info" in skill_by_name and "Basic Matching Info" in skill_by_name:
-                skill_by_name["Complex Matching Info"].parent_skill_id = skill_by_name["Basic Matching Info"].id
-            if "Advanced Sentence Completion" in skill_by_name and "Sentence Completion Basics" in skill_by_name:
-                skill_by_name["Advanced Sentence Completion"].parent_skill_id = skill_by_name["Sentence Completion Basics"].id
-            
-            db.commit()
-            print("Set up new skill tree relationships")
-        else:
-            print(f"Skills already expanded ({existing_skills} skills found)")
-        
-        # Add new questions
-        existing_questions = db.query(Question).count()
-        
-        if existing_questions < 60:  # Add if not already expanded
-            new_questions = add_expanded_questions()
-            for question in new_questions:
-                db.add(question)
-            db.commit()
-            print(f"Added {len(new_questions)} new questions")
-        else:
-            print(f"Questions already expanded ({existing_questions} questions found)")
+        seeder = BulkSeeder(db)
+
+        # Skills and questions are matched on natural keys, so re-runs only add what is missing
+        new_skills = add_new_skills()
+        skill_ids = seeder.upsert(Skill, model_rows(new_skills), key=("name", "category"))
+        print(f"Added {seeder.tables['skills']['inserted']} new skills")
+
+        # Set up skill relationships for new skills
+        parents = {
+            ("Complex Matching Info", "MATCHING_INFO"): ("Basic Matching Info", "MATCHING_INFO"),
+            ("Advanced Sentence Completion", "SENTENCE_COMP"): ("Sentence Completion Basics", "SENTENCE_COMP"),
+        }
+        for child, parent in parents.items():
+            db.execute(
+                update(Skill)
+                .where(Skill.id == skill_ids[child], Skill.parent_skill_id.is_(None))
+                .values(parent_skill_id=skill_ids[parent])
+            )
+        print("Set up new skill tree relationships")
+
+        # Questions refer to the new skills by their seeding position (ids 10-13 on a fresh database)
+        positions = {10 + index: skill_ids[(skill.name, skill.category)] for index, skill in enumerate(new_skills)}
+        questions = model_rows(add_expanded_questions())
+        for row in questions:
+            row["skill_id"] = positions.get(row["skill_id"], row["skill_id"])
+        seeder.upsert(Question, questions, key=("passage_title", "question_text"))
+        db.commit()
+        print(f"Added {seeder.tables['questions']['inserted']} new questions")
         
         print("\nExpansion complete!")
         print(f"  Total Skills: {db.query(Skill).count()}")
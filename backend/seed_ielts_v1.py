@@ -4,8 +4,11 @@ import sys
 
 sys.path.insert(0, ".")
 
+from sqlalchemy import or_, select, update
+
 from app.database import Base, SessionLocal, engine
 from app.models import Question, Skill, TestSet
+from app.services.bulk_seed import BulkSeeder
 
 
 Base.metadata.create_all(bind=engine)
@@ -558,188 +561,188 @@ LISTENING_TOPICS = [
 ]
 
 
-def get_or_create_skill(db, name, category):
-    skill = db.query(Skill).filter(Skill.category == category).first()
-    if skill:
-        if skill.name != name:
-            skill.name = name
-        if not skill.description:
-            skill.description = f"IELTS skill: {name}"
-        return skill
-
-    skill = db.query(Skill).filter(Skill.name == name).first()
-    if skill:
-        skill.category = category
-        skill.description = f"IELTS skill: {name}"
-        return skill
-
-    skill = Skill(name=name, category=category, description=f"IELTS skill: {name}", mastery_threshold=0.7)
-    db.add(skill)
-    db.flush()
-    return skill
+def seed_skills(seeder, skills):
+    """Upsert skills by category (the IELTS question type); returns category -> skill id."""
+    ids = seeder.upsert(
+        Skill,
+        [
+            {"name": name, "category": category, "description": f"IELTS skill: {name}", "mastery_threshold": 0.7}
+            for name, category in skills
+        ],
+        key=("category",),
+        update_columns=("name",),
+    )
+    seeder.db.execute(
+        update(Skill)
+        .where(Skill.id.in_(ids.values()), or_(Skill.description.is_(None), Skill.description == ""))
+        .values(description="IELTS skill: " + Skill.name)
+    )
+    return {category: skill_id for (category,), skill_id in ids.items()}
 
 
 def deactivate_legacy_reading_seed(db):
     """Keep old local demo rows from failing stricter validation."""
     legacy_sets = (
-        db.query(TestSet)
-        .filter(TestSet.module == "READING", TestSet.source == "original", TestSet.title.in_(LEGACY_READING_TITLES))
-        .all()
+        select(TestSet.id)
+        .where(TestSet.module == "READING", TestSet.source == "original", TestSet.title.in_(LEGACY_READING_TITLES))
     )
-    for test_set in legacy_sets:
-        test_set.approved = False
-        for question in test_set.questions:
-            question.is_active = False
-            question.approved = False
-
-
-def _upsert_reading_question(db, test_set, skill, question, passage):
-    existing_questions = (
-        db.query(Question)
-        .filter(
-            Question.module == "READING",
-            Question.passage_title == test_set.title,
-            Question.question_type == question["type"],
-            Question.question_text == question["text"],
-        )
-        .order_by(Question.id)
-        .all()
+    db.execute(update(TestSet).where(TestSet.id.in_(legacy_sets)).values(approved=False))
+    db.execute(
+        update(Question)
+        .where(Question.test_set_id.in_(legacy_sets))
+        .values(is_active=False, approved=False)
     )
-    payload = {
-        "skill_id": skill.id,
-        "test_set_id": test_set.id,
+
+
+def _reading_question_row(test_set_id, passage_data, skill_id, question):
+    return {
+        "skill_id": skill_id,
+        "test_set_id": test_set_id,
         "module": "READING",
-        "section": test_set.section,
-        "passage": passage,
-        "passage_title": test_set.title,
+        "section": passage_data["section"],
+        "passage": passage_data["passage"],
+        "passage_title": passage_data["title"],
         "question_text": question["text"],
         "question_type": question["type"],
         "options": question.get("options"),
         "correct_answer": question["answer"],
         "difficulty": question.get("difficulty", 5),
-        "estimated_band": test_set.estimated_band,
+        "estimated_band": passage_data["estimated_band"],
         "explanation": question["explanation"],
         "tags": ["reading_v2", question["type"].lower()],
         "approved": True,
         "is_active": True,
     }
-    if existing_questions:
-        existing = existing_questions[0]
-        for key, value in payload.items():
-            setattr(existing, key, value)
-        for duplicate in existing_questions[1:]:
-            duplicate.is_active = False
-            duplicate.approved = False
-        return False
-
-    db.add(Question(**payload))
-    return True
 
 
-def seed_reading(db, skills):
-    created = 0
+def seed_reading(seeder, skill_ids):
+    db = seeder.db
     deactivate_legacy_reading_seed(db)
 
-    for passage_data in READING_PASSAGES:
-        test_set = (
-            db.query(TestSet)
-            .filter(TestSet.title == passage_data["title"], TestSet.module == "READING")
-            .first()
-        )
-        if not test_set:
-            test_set = TestSet(
-                title=passage_data["title"],
-                module="READING",
-                section=passage_data["section"],
-                source="original",
-            )
-            db.add(test_set)
-            db.flush()
-
-        test_set.passage = passage_data["passage"]
-        test_set.section = passage_data["section"]
-        test_set.estimated_band = passage_data["estimated_band"]
-        test_set.time_limit_minutes = 20
-        test_set.approved = True
-
-        for question in passage_data["questions"]:
-            if _upsert_reading_question(db, test_set, skills[question["type"]], question, passage_data["passage"]):
-                created += 1
-
-    return created
-
-
-def seed_listening(db, skills):
-    created = 0
+    set_ids = seeder.upsert(
+        TestSet,
+        [
+            {
+                "title": passage_data["title"],
+                "module": "READING",
+                "section": passage_data["section"],
+                "source": "original",
+                "passage": passage_data["passage"],
+                "estimated_band": passage_data["estimated_band"],
+                "time_limit_minutes": 20,
+                "approved": True,
+            }
+            for passage_data in READING_PASSAGES
+        ],
+        key=("module", "title"),
+        update_columns=("passage", "section", "estimated_band", "time_limit_minutes", "approved"),
+        where=(TestSet.module == "READING",),
+    )
+
+    rows = [
+        _reading_question_row(set_ids[("READING", passage_data["title"])], passage_data, skill_ids[question["type"]], question)
+        for passage_data in READING_PASSAGES
+        for question in passage_data["questions"]
+    ]
+    before = seeder.tables.get("questions", {}).get("inserted", 0)
+    seeder.upsert(
+        Question,
+        rows,
+        key=("passage_title", "question_type", "question_text"),
+        update_columns=tuple(column for column in rows[0] if column not in {"passage_title", "question_type", "question_text"}),
+        where=(Question.module == "READING",),
+    )
+    duplicates = seeder.duplicates.get("questions", [])
+    if duplicates:
+        db.execute(update(Question).where(Question.id.in_(duplicates)).values(is_active=False, approved=False))
+    return seeder.tables["questions"]["inserted"] - before
+
+
+def _listening_templates(skill_ids, place, location, day, item, number):
+    return [
+        (skill_ids["LISTENING_FORM"], "FORM_COMPLETION", "Complete the form: meeting point: ____.", None, place),
+        (skill_ids["LISTENING_FORM"], "FORM_COMPLETION", "Complete the form: group limit: ____ people.", None, number),
+        (skill_ids["LISTENING_SENTENCE"], "SENTENCE_COMPLETION", "The main activity starts near the ____.", None, location),
+        (skill_ids["LISTENING_SENTENCE"], "SENTENCE_COMPLETION", "The activity is on ____.", None, day),
+        (skill_ids["LISTENING_MCQ"], "MCQ", "What item is needed?", [item, "passport", "umbrella", "calculator"], item),
+        (skill_ids["LISTENING_MCQ"], "MCQ", "What should participants write clearly?", ["their names", "their scores", "the weather", "the price"], "their names"),
+        (skill_ids["LISTENING_MATCHING"], "MATCHING", "Match the person to the action: participants should wait for the ____.", ["coordinator", "driver", "doctor", "chef"], "coordinator"),
+        (skill_ids["LISTENING_MAP"], "MAP_PLAN", "Where does the main activity start?", [location, place, "car park", "cafeteria"], location),
+        (skill_ids["LISTENING_FORM"], "FORM_COMPLETION", "Complete the note: required item: ____.", None, item),
+        (skill_ids["LISTENING_SENTENCE"], "SENTENCE_COMPLETION", "After the briefing, participants should wait for the ____.", None, "coordinator"),
+        (skill_ids["LISTENING_MCQ"], "MCQ", "Where should people meet?", [place, "sports field", "bus stop", "restaurant"], place),
+        (skill_ids["LISTENING_MATCHING"], "MATCHING", "Match the schedule detail: day of activity.", [day, "Sunday", "April", "morning"], day),
+        (skill_ids["LISTENING_MAP"], "MAP_PLAN", "Which place is mentioned as the starting area?", [location, "east exit", "river bridge", "main road"], location),
+        (skill_ids["LISTENING_FORM"], "FORM_COMPLETION", "Complete the sentence: The group limit is ____.", None, number),
+    ]
+
+
+def seed_listening(seeder, skill_ids):
+    test_sets = []
     for index, (title, place, location, day, item, number) in enumerate(LISTENING_TOPICS, start=1):
-        if db.query(TestSet).filter(TestSet.title == title, TestSet.module == "LISTENING").first():
-            continue
         transcript = (
             f"Welcome to the {title.lower()}. Please meet at the {place}. The main activity starts near "
             f"the {location} on {day}. You will need a {item}. The group limit is {number} people. "
             f"After the briefing, participants should write their names clearly and wait for the coordinator."
         )
-        test_set = TestSet(
-            title=title,
-            module="LISTENING",
-            section=f"Section {((index - 1) % 4) + 1}",
-            transcript=transcript,
-            source="original",
-            estimated_band=5.0 + (index % 4) * 0.5,
-            time_limit_minutes=10,
-            approved=True,
-        )
-        db.add(test_set)
-        db.flush()
-        templates = [
-            (skills["LISTENING_FORM"], "FORM_COMPLETION", "Complete the form: meeting point: ____.", None, place),
-            (skills["LISTENING_FORM"], "FORM_COMPLETION", "Complete the form: group limit: ____ people.", None, number),
-            (skills["LISTENING_SENTENCE"], "SENTENCE_COMPLETION", "The main activity starts near the ____.", None, location),
-            (skills["LISTENING_SENTENCE"], "SENTENCE_COMPLETION", "The activity is on ____.", None, day),
-            (skills["LISTENING_MCQ"], "MCQ", "What item is needed?", [item, "passport", "umbrella", "calculator"], item),
-            (skills["LISTENING_MCQ"], "MCQ", "What should participants write clearly?", ["their names", "their scores", "the weather", "the price"], "their names"),
-            (skills["LISTENING_MATCHING"], "MATCHING", "Match the person to the action: participants should wait for the ____.", ["coordinator", "driver", "doctor", "chef"], "coordinator"),
-            (skills["LISTENING_MAP"], "MAP_PLAN", "Where does the main activity start?", [location, place, "car park", "cafeteria"], location),
-            (skills["LISTENING_FORM"], "FORM_COMPLETION", "Complete the note: required item: ____.", None, item),
-            (skills["LISTENING_SENTENCE"], "SENTENCE_COMPLETION", "After the briefing, participants should wait for the ____.", None, "coordinator"),
-            (skills["LISTENING_MCQ"], "MCQ", "Where should people meet?", [place, "sports field", "bus stop", "restaurant"], place),
-            (skills["LISTENING_MATCHING"], "MATCHING", "Match the schedule detail: day of activity.", [day, "Sunday", "April", "morning"], day),
-            (skills["LISTENING_MAP"], "MAP_PLAN", "Which place is mentioned as the starting area?", [location, "east exit", "river bridge", "main road"], location),
-            (skills["LISTENING_FORM"], "FORM_COMPLETION", "Complete the sentence: The group limit is ____.", None, number),
-        ]
-        for skill, qtype, text, options, answer in templates:
-            db.add(Question(
-                skill_id=skill.id,
-                test_set_id=test_set.id,
-                module="LISTENING",
-                section=test_set.section,
-                passage=transcript,
-                passage_title=title,
-                question_text=text,
-                question_type=qtype,
-                options=options,
-                correct_answer=answer,
-                difficulty=3 + (index % 6),
-                estimated_band=test_set.estimated_band,
-                explanation="The answer is stated directly in the listening transcript.",
-                tags=[qtype.lower(), "listening"],
-                approved=True,
-                audio_duration_sec=90,
-            ))
-            created += 1
-    return created
+        test_sets.append((index, title, transcript, _listening_templates(skill_ids, place, location, day, item, number)))
+
+    set_ids = seeder.upsert(
+        TestSet,
+        [
+            {
+                "title": title,
+                "module": "LISTENING",
+                "section": f"Section {((index - 1) % 4) + 1}",
+                "transcript": transcript,
+                "source": "original",
+                "estimated_band": 5.0 + (index % 4) * 0.5,
+                "time_limit_minutes": 10,
+                "approved": True,
+            }
+            for index, title, transcript, _ in test_sets
+        ],
+        key=("module", "title"),
+        where=(TestSet.module == "LISTENING",),
+    )
+
+    rows = [
+        {
+            "skill_id": skill_id,
+            "test_set_id": set_ids[("LISTENING", title)],
+            "module": "LISTENING",
+            "section": f"Section {((index - 1) % 4) + 1}",
+            "passage": transcript,
+            "passage_title": title,
+            "question_text": text,
+            "question_type": qtype,
+            "options": options,
+            "correct_answer": answer,
+            "difficulty": 3 + (index % 6),
+            "estimated_band": 5.0 + (index % 4) * 0.5,
+            "explanation": "The answer is stated directly in the listening transcript.",
+            "tags": [qtype.lower(), "listening"],
+            "approved": True,
+            "audio_duration_sec": 90,
+        }
+        for index, title, transcript, templates in test_sets
+        for skill_id, qtype, text, options, answer in templates
+    ]
+    before = seeder.tables.get("questions", {}).get("inserted", 0)
+    seeder.upsert(Question, rows, key=("passage_title", "question_text"), where=(Question.module == "LISTENING",))
+    return seeder.tables["questions"]["inserted"] - before
 
 
 def main():
     db = SessionLocal()
     try:
-        skill_map = {}
-        for name, category in READING_SKILLS + LISTENING_SKILLS:
-            skill_map[category] = get_or_create_skill(db, name, category)
-        reading_created = seed_reading(db, skill_map)
-        listening_created = seed_listening(db, skill_map)
+        seeder = BulkSeeder(db)
+        skill_ids = seed_skills(seeder, READING_SKILLS + LISTENING_SKILLS)
+        reading_created = seed_reading(seeder, skill_ids)
+        listening_created = seed_listening(seeder, skill_ids)
         db.commit()
-        print(f"Seeded IELTS v1: {reading_created} reading questions, {listening_created} listening questions")
+        print(f"Seeded IELTS v1: {reading_created} reading questions, {listening_created} listening questions "
+              f"in {seeder.report()['seconds']:.2f}s")
     finally:
         db.close()
 
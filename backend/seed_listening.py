@@ -5,6 +5,7 @@ sys.path.insert(0, '.')
 
 from app.database import SessionLocal, engine, Base
 from app.models import Skill, Question
+from app.services.bulk_seed import BulkSeeder, model_rows
 
 # Recreate tables to add new columns
 Base.metadata.create_all(bind=engine)
@@ -194,34 +195,26 @@ def main():
     db = SessionLocal()
     
     try:
-        # Check for existing Listening skills
-        existing_listening = db.query(Skill).filter(
-            Skill.category.like("LISTENING%")
-        ).count()
-        
-        if existing_listening == 0:
-            # Add Listening skills
-            skills = add_listening_skills()
-            for skill in skills:
-                db.add(skill)
-            db.commit()
-            print(f"Added {len(skills)} Listening skills")
-        else:
-            print(f"Listening skills already exist ({existing_listening} found)")
-        
-        # Check for existing Listening questions
-        existing_qs = db.query(Question).filter(
-            Question.module == "LISTENING"
-        ).count()
-        
-        if existing_qs == 0:
-            questions = add_listening_questions()
-            for q in questions:
-                db.add(q)
-            db.commit()
-            print(f"Added {len(questions)} Listening questions")
-        else:
-            print(f"Listening questions already exist ({existing_qs} found)")
+        seeder = BulkSeeder(db)
+
+        # Skills and questions are matched on natural keys, so re-runs only add what is missing
+        skills = add_listening_skills()
+        skill_ids = seeder.upsert(Skill, model_rows(skills), key=("name", "category"))
+        print(f"Added {seeder.tables['skills']['inserted']} Listening skills")
+
+        # Questions refer to these skills by their seeding position (ids 14-17 on a fresh database)
+        positions = {14 + index: skill_ids[(skill.name, skill.category)] for index, skill in enumerate(skills)}
+        questions = model_rows(add_listening_questions())
+        for row in questions:
+            row["skill_id"] = positions.get(row["skill_id"], row["skill_id"])
+        seeder.upsert(
+            Question,
+            questions,
+            key=("passage_title", "question_text"),
+            where=(Question.module == "LISTENING",),
+        )
+        db.commit()
+        print(f"Added {seeder.tables['questions']['inserted']} Listening questions")
         
         print("\nListening module setup complete!")
         print(f"  Total Skills: {db.query(Skill).count()}")
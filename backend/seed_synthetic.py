@@ -0,0 +1,71 @@
+"""Fill a load-test database with synthetic learners, questions and attempts.
+
+Usage (from backend/):
+
+    python seed_synthetic.py --users 1000 --questions 5000 --attempts 100000
+    python seed_synthetic.py --users 20000 --attempts 2000000 --skip-rollups
+
+Re-running with the same counts adds nothing; raising ``--attempts`` tops the
+attempt history up. All learners share the password ``SyntheticPass123`` and
+log in as ``learner000000@synthetic.jana.local`` and so on.
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from app.database import Base, SessionLocal, engine
+from app.services.dashboard import rebuild_daily_metrics
+from app.services.synthetic_data import SYNTHETIC_PASSWORD, generate_synthetic_data, synthetic_email
+from app.services.user_stats import rebuild_user_stats
+
+
+logging.getLogger("passlib.handlers.bcrypt").setLevel(logging.ERROR)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Seed synthetic load-test data.")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--questions", type=int, default=5000)
+    parser.add_argument("--attempts", type=int, default=100000, help="total attempts across synthetic learners")
+    parser.add_argument("--days", type=int, default=90, help="spread attempts over this many past days")
+    parser.add_argument("--seed", type=int, default=7, help="random seed")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per INSERT batch")
+    parser.add_argument("--skip-rollups", action="store_true",
+                        help="do not rebuild user stats snapshots and daily dashboard metrics")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        report = generate_synthetic_data(
+            db,
+            users=args.users,
+            questions=args.questions,
+            attempts=args.attempts,
+            seed=args.seed,
+            days=args.days,
+            batch_size=args.batch_size,
+        )
+        for table, counts in report["tables"].items():
+            print(f"  {table}: {counts['inserted']} inserted, {counts['unchanged']} already present")
+        print(f"Seeded synthetic data in {report['seconds']:.1f}s")
+
+        if report["attempts_added"] and not args.skip_rollups:
+            started = time.perf_counter()
+            stats = rebuild_user_stats(db)
+            metrics = rebuild_daily_metrics(db)
+            print(f"Rebuilt rollups in {time.perf_counter() - started:.1f}s "
+                  f"({stats['created'] + stats['corrected']} stats rows, "
+                  f"{metrics['created'] + metrics['corrected']} daily metric rows)")
+        print(f"Log in as {synthetic_email(0)} / {SYNTHETIC_PASSWORD}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,19 +3,31 @@
 import os
 
 os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+# Tests drive evaluation jobs explicitly instead of via background workers.
+os.environ.setdefault("EVALUATION_WORKERS", "0")
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_async_db, get_db
+from app.middleware.rate_limiter import throttle_stats
+from app.ml import knowledge_tracer, question_catalog
+from app.services.achievements import achievement_engine
+from app.services.audio_streaming import listening_audio_cache
+from app.services.leaderboard import leaderboard
+from app.services.evaluation_cache import evaluation_cache
+from app.services.identity_cache import user_identity_cache
 
 
-# Create in-memory SQLite database for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Create in-memory SQLite database for testing. The shared cache lets the
+# async read path (aiosqlite) see the same database as the sync engine, whose
+# single StaticPool connection keeps it alive.
+SQLALCHEMY_DATABASE_URL = "sqlite:///file:jana_tests?mode=memory&cache=shared&uri=true"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -23,6 +35,11 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1),
+    poolclass=NullPool,
+)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 
 def override_get_db():
@@ -34,10 +51,25 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    """Override the async read-path session with the test database."""
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 @pytest.fixture(scope="function")
 def db():
     """Create a fresh database for each test."""
     Base.metadata.create_all(bind=engine)
+    # Process-wide indexes must never outlive a test database.
+    achievement_engine.invalidate()
+    question_catalog.invalidate()
+    knowledge_tracer.invalidate_skill_params()
+    user_identity_cache.clear()
+    evaluation_cache.reset_stats()
+    listening_audio_cache.clear()
+    leaderboard.clear()
+    throttle_stats.clear()
     db = TestingSessionLocal()
     try:
         yield db
@@ -50,6 +82,7 @@ def db():
 def client(db):
     """Create a test client with database override."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     Base.metadata.create_all(bind=engine)
     
     with TestClient(app) as c:
@@ -59,6 +92,42 @@ def client(db):
     app.dependency_overrides.clear()
 
 
+class SQLCounter:
+    """Counts SQL statements and commits issued against the test engine."""
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+        self.sql = []
+
+    def reset(self):
+        self.statements = 0
+        self.commits = 0
+        self.sql = []
+
+    def _on_execute(self, conn, cursor, statement, *args):
+        self.statements += 1
+        self.sql.append(statement)
+
+    def _on_commit(self, *args):
+        self.commits += 1
+
+
+@pytest.fixture
+def sql_counter():
+    """Attach a statement/commit counter to the sync and async test engines."""
+    counter = SQLCounter()
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", counter._on_execute)
+        event.listen(target, "commit", counter._on_commit)
+    try:
+        yield counter
+    finally:
+        for target in (engine, async_engine.sync_engine):
+            event.remove(target, "before_cursor_execute", counter._on_execute)
+            event.remove(target, "commit", counter._on_commit)
+
+
 @pytest.fixture
 def test_user_data():
     """Standard test user data."""
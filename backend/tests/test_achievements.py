@@ -0,0 +1,105 @@
+"""Tests for the achievement evaluation engine."""
+
+from app.models import Achievement, Question, Skill, User, UserAchievement
+from app.services.achievements import achievement_engine, seed_achievements
+
+
+def _create_user(db, email="learner@example.com", username="learner", **fields) -> User:
+    user = User(email=email, username=username, password_hash="x", **fields)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _create_question(db) -> Question:
+    skill = Skill(name="True False Not Given", category="TF_NG")
+    db.add(skill)
+    db.flush()
+    question = Question(
+        skill_id=skill.id,
+        passage="Passage",
+        question_text="Is it true?",
+        question_type="TF_NG",
+        correct_answer="TRUE",
+    )
+    db.add(question)
+    db.commit()
+    return question
+
+
+def _unlocked_codes(db, user_id: int) -> set:
+    return {
+        code for (code,) in db.query(Achievement.code).join(
+            UserAchievement, UserAchievement.achievement_id == Achievement.id
+        ).filter(UserAchievement.user_id == user_id)
+    }
+
+
+class TestAchievementEngine:
+    """Only requirement types whose stats changed are evaluated."""
+
+    def test_streak_rules_skipped_when_only_counts_changed(self, db):
+        seed_achievements(db)
+        user = _create_user(db, current_streak=7, level=1, xp=0)
+
+        assert achievement_engine.evaluate(db, user, changed={"counts"}) == []
+
+        earned = achievement_engine.evaluate(db, user, changed={"streak"})
+        assert {achievement.code for achievement in earned} == {"STREAK_3", "STREAK_7"}
+        assert user.xp == sum(achievement.xp_reward for achievement in earned)
+
+    def test_awards_are_not_repeated(self, db):
+        seed_achievements(db)
+        user = _create_user(db, current_streak=3)
+
+        assert len(achievement_engine.evaluate(db, user)) == 1
+        assert achievement_engine.evaluate(db, user) == []
+        assert db.query(UserAchievement).filter(UserAchievement.user_id == user.id).count() == 1
+
+    def test_invalidate_picks_up_new_definitions(self, db):
+        seed_achievements(db)
+        user = _create_user(db, level=2)
+        achievement_engine.evaluate(db, user, changed={"level"})
+
+        db.add(Achievement(
+            code="LEVEL_2", name="Warm Up", category="LEVEL",
+            requirement={"type": "level", "value": 2}, xp_reward=10,
+        ))
+        db.commit()
+        achievement_engine.invalidate()
+
+        earned = achievement_engine.evaluate(db, user, changed={"level"})
+        assert [achievement.code for achievement in earned] == ["LEVEL_2"]
+
+    def test_batch_mode_awards_every_user(self, db):
+        seed_achievements(db)
+        first = _create_user(db, current_streak=3)
+        second = _create_user(db, email="second@example.com", username="second", level=5)
+        _create_user(db, email="third@example.com", username="third")
+
+        report = achievement_engine.evaluate_all_users(db, batch_size=2)
+
+        assert report == {"users": 3, "awarded": 2}
+        assert _unlocked_codes(db, first.id) == {"STREAK_3"}
+        assert _unlocked_codes(db, second.id) == {"LEVEL_5"}
+
+
+class TestSubmitAwardsAchievements:
+    """The submission pipeline awards achievements in its own commit."""
+
+    def test_first_correct_answer_awards_first_steps(self, authenticated_client, db):
+        seed_achievements(db)
+        question = _create_question(db)
+
+        response = authenticated_client.post(
+            "/api/questions/submit",
+            json={"question_id": question.id, "user_answer": "TRUE", "response_time_ms": 3000},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        codes = {achievement["code"] for achievement in data["new_achievements"]}
+        assert "FIRST_CORRECT" in codes
+        assert not codes & {"STREAK_3", "LEVEL_5", "ATTEMPTS_100"}
+        profile = authenticated_client.get("/api/gamification/profile").json()
+        assert profile["xp"] == data["new_xp"]
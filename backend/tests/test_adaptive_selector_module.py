@@ -1,6 +1,9 @@
 """Tests for module-aware adaptive question selection."""
 
-from app.ml import adaptive_selector
+import threading
+
+from app.ml import adaptive_selector, question_catalog
+from app.ml.question_catalog import CatalogIndex, QuestionCatalog
 from app.models import Question, Skill, User, UserSkillMastery
 from app.services.module_skills import skill_belongs_to_module
 
@@ -111,3 +114,72 @@ def test_adaptive_selector_listening_chooses_listening_when_available(db):
     assert question.module == "LISTENING"
     assert target_skill == listening_skill.name
     assert skill_belongs_to_module(question.skill.category, "LISTENING")
+
+
+def test_selection_reads_questions_from_catalog_not_table_scans(db, sql_counter):
+    user = _create_user(db)
+    _add_skill_with_question(db, "Matching Headings", "HEADINGS", "READING")
+    db.commit()
+    adaptive_selector.get_next_question(db, user.id, module="READING")
+
+    sql_counter.reset()
+    question, _, _ = adaptive_selector.get_next_question(db, user.id, module="READING")
+
+    assert question is not None
+    question_reads = [sql for sql in sql_counter.sql if "FROM questions" in sql]
+    assert all("WHERE questions.id = ?" in sql for sql in question_reads)
+    assert not any("FROM skills" in sql for sql in sql_counter.sql)
+
+
+def test_catalog_pick_stays_in_difficulty_window_and_skips_recent():
+    skill_rows = [(1, "Matching Headings", "HEADINGS")]
+    question_rows = [
+        (question_id, "READING", 1, "HEADINGS", 1 + question_id % 10)
+        for question_id in range(1, 201)
+    ]
+    index = CatalogIndex(question_rows, skill_rows)
+    recent = {question_id for question_id in range(1, 201) if question_id % 10 == 4}
+
+    picks = [index.pick(1, "READING", 5, recent) for _ in range(300)]
+
+    difficulties = {index.key_by_id[question_id][3] for question_id in picks}
+    assert difficulties <= {3, 4, 5, 6, 7}
+    assert not set(picks) & recent
+    assert index.pick(1, "READING", 5, question_type="TF_NG") is None
+
+
+def test_catalog_is_rebuilt_after_invalidation(db):
+    user = _create_user(db)
+    assert adaptive_selector.get_next_question(db, user.id, module="LISTENING")[0] is None
+
+    _, listening_question = _add_skill_with_question(db, "Listening Forms", "LISTENING_FORM", "LISTENING")
+    db.commit()
+    question_catalog.invalidate()
+
+    question, _, _ = adaptive_selector.get_next_question(db, user.id, module="LISTENING")
+    assert question.id == listening_question.id
+
+
+def test_one_request_rebuilds_a_stale_catalog_while_others_use_the_old_index(db, monkeypatch):
+    catalog = QuestionCatalog(ttl_seconds=0)
+    stale = catalog.get(db)
+    building, release = threading.Event(), threading.Event()
+    builds = []
+
+    def slow_build(session):
+        builds.append(True)
+        building.set()
+        release.wait(5)
+        return CatalogIndex([], [])
+
+    monkeypatch.setattr(catalog, "build", slow_build)
+    rebuilder = threading.Thread(target=catalog.get, args=(db,))
+    rebuilder.start()
+    assert building.wait(5)
+    try:
+        assert [catalog.get(db) for _ in range(3)] == [stale] * 3
+    finally:
+        release.set()
+        rebuilder.join(5)
+    assert len(builds) == 1
+    assert catalog.get(db) is not stale
@@ -0,0 +1,193 @@
+"""Async AI provider client tests against a local fake Ollama server."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config import get_settings
+from app.services import ai_provider
+from app.services.ai_provider import OllamaClient, ProviderLimiter
+from app.services.writing_service import evaluate_essay_with_gemini
+
+
+ESSAY_RESULT = {
+    "band_score": 6.5,
+    "task_response": {"score": 6.5, "comment": "Clear position."},
+    "coherence_cohesion": {"score": 6.5, "comment": "Logical paragraphs."},
+    "lexical_resource": {"score": 6.0, "comment": "Some repetition."},
+    "grammatical_range": {"score": 6.5, "comment": "Mostly accurate."},
+    "overall_feedback": "A solid response.",
+    "improvements": [],
+    "annotated_errors": [],
+}
+
+
+class FakeOllama(ThreadingHTTPServer):
+    """Answers /api/generate after ``delay`` seconds and records concurrency."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, delay: float):
+        super().__init__(("127.0.0.1", 0), _FakeOllamaHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.requests = 0
+        self.connections = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        json.loads(self.rfile.read(length))
+        with server.lock:
+            server.active += 1
+            server.requests += 1
+            server.max_active = max(server.max_active, server.active)
+            server.connections.add(self.client_address)
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+        body = json.dumps({"response": json.dumps(ESSAY_RESULT)}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_ollama(monkeypatch):
+    def start(delay: float, max_concurrency: int, timeout_sec: int = 20, queue_timeout_sec: float = 30.0):
+        server = FakeOllama(delay)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        monkeypatch.setenv("AI_PROVIDER", "ollama")
+        monkeypatch.setenv("OLLAMA_BASE_URL", server.url)
+        monkeypatch.setenv("OLLAMA_TIMEOUT_SEC", str(timeout_sec))
+        get_settings.cache_clear()
+        client = OllamaClient(ProviderLimiter("ollama", max_concurrency, queue_timeout_sec))
+        monkeypatch.setattr(ai_provider, "ollama_client", client)
+        return server, client
+
+    servers = []
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+    get_settings.cache_clear()
+
+
+async def _evaluate_many(client: OllamaClient, count: int):
+    try:
+        return await asyncio.gather(*(
+            evaluate_essay_with_gemini(f"Essay number {index}.", "Task 2", "Discuss both views.")
+            for index in range(count)
+        ))
+    finally:
+        await client.aclose()
+
+
+def test_concurrent_essay_evaluations_do_not_serialize(fake_ollama):
+    server, client = fake_ollama(delay=0.2, max_concurrency=50)
+
+    started = time.perf_counter()
+    results = asyncio.run(_evaluate_many(client, 50))
+    elapsed = time.perf_counter() - started
+
+    assert [result["ai_provider"] for result in results] == ["ollama"] * 50
+    assert results[0]["band_score"] == 6.5
+    # Serialized, 50 calls would take 10s.
+    assert elapsed < 3.0
+    assert server.max_active > 10
+
+
+def test_limiter_caps_concurrency_and_reuses_connections(fake_ollama):
+    server, client = fake_ollama(delay=0.05, max_concurrency=4)
+
+    results = asyncio.run(_evaluate_many(client, 20))
+
+    assert all(result["ai_provider"] == "ollama" for result in results)
+    assert server.max_active <= 4
+    assert len(server.connections) <= 4
+    stats = client.limiter.stats()
+    assert (stats["calls"], stats["failed"], stats["timed_out"]) == (20, 0, 0)
+    assert stats["max_in_flight"] == 4
+    assert stats["max_waiting"] > 0
+
+
+def test_timeout_falls_back_without_blocking_loop(fake_ollama):
+    server, client = fake_ollama(delay=2.0, max_concurrency=2, timeout_sec=1, queue_timeout_sec=0.1)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        results = await _evaluate_many(client, 3)
+        task.cancel()
+        return results, ticks
+
+    started = time.perf_counter()
+    results, ticks = asyncio.run(scenario())
+
+    assert [result["ai_provider"] for result in results] == ["local"] * 3
+    assert time.perf_counter() - started < 1.9
+    # The loop kept running while requests were pending.
+    assert ticks > 30
+    stats = client.limiter.stats()
+    assert (stats["timed_out"], stats["rejected"]) == (2, 1)
+
+
+def test_writing_endpoint_persists_ollama_evaluation(fake_ollama, authenticated_client):
+    fake_ollama(delay=0.0, max_concurrency=2)
+
+    response = authenticated_client.post("/api/writing/evaluate", json={
+        "task_type": "Task 2",
+        "prompt_text": "Discuss both views.",
+        "essay_text": "Some people argue that cities should invest in public transport.",
+    })
+
+    assert response.status_code == 200
+    assert response.json()["band_score"] == 6.5
+    history = authenticated_client.get("/api/writing/history").json()["attempts"]
+    assert [attempt["band_score"] for attempt in history] == [6.5]
+
+
+def test_thread_call_holds_its_slot_until_the_thread_returns():
+    limiter = ProviderLimiter("gemini", 1, queue_timeout_sec=0.05)
+    release = threading.Event()
+
+    async def scenario():
+        timed_out = await limiter.call_in_thread(release.wait, timeout_sec=0.05)
+        # The worker thread is still blocked, so a second call cannot get the slot.
+        rejected = await limiter.call_in_thread(lambda: "late", timeout_sec=1)
+        release.set()
+        while limiter.in_flight:
+            await asyncio.sleep(0.01)
+        return timed_out, rejected, await limiter.call_in_thread(lambda: "ok", timeout_sec=1)
+
+    assert asyncio.run(scenario()) == (None, None, "ok")
+    stats = limiter.stats()
+    assert (stats["timed_out"], stats["rejected"], stats["calls"]) == (1, 1, 2)
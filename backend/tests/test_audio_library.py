@@ -0,0 +1,165 @@
+"""Listening audio pipeline tests."""
+
+import json
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.models import Question, Skill
+from app.routers.listening import AUDIO_DIR
+from app.services.audio_library import (
+    ANALYSIS_SAMPLE_RATE,
+    apply_to_questions,
+    library_path,
+    loudness_dbfs,
+    process_library,
+    speech_segments,
+    stream_paths,
+    waveform_peaks,
+)
+
+
+def _tone(seconds: float, amplitude: float = 0.5) -> np.ndarray:
+    t = np.arange(int(seconds * ANALYSIS_SAMPLE_RATE)) / ANALYSIS_SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * ANALYSIS_SAMPLE_RATE), dtype=np.float32)
+
+
+def _fake_process(library_dir, source, sha256, profile):
+    output, metadata = stream_paths(source)
+    for path, content in ((output, b"mp3"), (metadata, b"{}")):
+        os.makedirs(os.path.dirname(os.path.join(library_dir, path)), exist_ok=True)
+        with open(os.path.join(library_dir, path), "wb") as file:
+            file.write(content)
+    return {
+        "sha256": sha256, "profile": profile.key, "output": output, "metadata": metadata,
+        "duration_sec": 61.6, "source_bytes": 1000, "output_bytes": 250,
+    }
+
+
+def _threads(workers):
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+def test_waveform_loudness_and_segments():
+    samples = np.concatenate([_tone(1.0), _silence(1.0), _tone(0.5, amplitude=0.25), _silence(0.2), _tone(0.3)])
+
+    peaks = waveform_peaks(samples, buckets=30)
+    assert len(peaks) == 30
+    assert max(peaks) == pytest.approx(0.5, abs=0.01)
+    assert min(peaks) == 0.0
+    assert loudness_dbfs(_tone(1.0)) == pytest.approx(-9.0, abs=0.1)
+    assert loudness_dbfs(_silence(1.0)) is None
+    # The 0.2s pause is shorter than the minimum silence, so it does not split.
+    assert speech_segments(samples) == [[0.0, 1.0], [2.0, 3.0]]
+
+
+@pytest.mark.parametrize("audio_url, expected", [
+    ("/audio/campus_tour.mp3", "campus_tour.mp3"),
+    ("campus_tour.mp3", "campus_tour.mp3"),
+    ("stream/campus_tour.mp3", "stream/campus_tour.mp3"),
+    ("https://cdn.example.com/a.mp3", None),
+    (None, None),
+])
+def test_library_path(audio_url, expected):
+    assert library_path(audio_url) == expected
+
+
+def test_unchanged_files_are_skipped_by_content_hash(tmp_path):
+    (tmp_path / "a.wav").write_bytes(b"first recording")
+    (tmp_path / "sections").mkdir()
+    (tmp_path / "sections" / "b.mp3").write_bytes(b"second recording")
+
+    first = process_library(str(tmp_path), workers=2, executor_factory=_threads, process=_fake_process)
+    assert first["processed"] == ["a.wav", "sections/b.mp3"]
+    assert (tmp_path / "stream" / "sections" / "b.mp3").exists()
+
+    os.utime(tmp_path / "a.wav")  # touched, same content
+    (tmp_path / "sections" / "b.mp3").write_bytes(b"re-recorded")
+    second = process_library(str(tmp_path), workers=2, executor_factory=_threads, process=_fake_process)
+
+    assert second["skipped"] == ["a.wav"]
+    assert second["processed"] == ["sections/b.mp3"]
+    manifest = json.loads((tmp_path / "stream" / "manifest.json").read_text())
+    assert set(manifest) == {"a.wav", "sections/b.mp3"}
+    assert (second["source_bytes"], second["output_bytes"]) == (2000, 500)
+
+
+def test_failures_are_reported_per_file(tmp_path):
+    (tmp_path / "good.wav").write_bytes(b"ok")
+    (tmp_path / "bad.wav").write_bytes(b"broken")
+
+    def flaky(library_dir, source, sha256, profile):
+        if source == "bad.wav":
+            raise RuntimeError("invalid data found when processing input")
+        return _fake_process(library_dir, source, sha256, profile)
+
+    report = process_library(str(tmp_path), executor_factory=_threads, process=flaky)
+
+    assert report["processed"] == ["good.wav"]
+    assert "invalid data" in report["failed"]["bad.wav"]
+    assert "bad.wav" not in report["entries"]
+
+
+def test_questions_point_at_streaming_copy_with_duration(db):
+    skill = Skill(name="Maps", category="LISTENING_MAP")
+    db.add(skill)
+    db.flush()
+    question = Question(
+        skill_id=skill.id, module="LISTENING", question_text="Where is the library?",
+        question_type="MCQ", correct_answer="A", audio_url="/audio/campus_tour.mp3", audio_duration_sec=120,
+    )
+    db.add(question)
+    db.commit()
+    manifest = {"campus_tour.mp3": {"output": "stream/campus_tour.mp3", "duration_sec": 97.4}}
+
+    assert apply_to_questions(db, manifest) == 1
+    assert (question.audio_url, question.audio_duration_sec) == ("stream/campus_tour.mp3", 97)
+    assert apply_to_questions(db, manifest) == 0
+
+
+def test_metadata_endpoint_serves_sidecar(authenticated_client, db):
+    skill = Skill(name="Forms", category="LISTENING_FORM")
+    db.add(skill)
+    db.flush()
+    question = Question(
+        skill_id=skill.id, module="LISTENING", question_text="Name?", question_type="FILL_BLANK",
+        correct_answer="Smith", audio_url="stream/test-metadata-sidecar.mp3",
+    )
+    db.add(question)
+    db.commit()
+    sidecar = AUDIO_DIR / "stream" / "test-metadata-sidecar.json"
+    sidecar.parent.mkdir(parents=True, exist_ok=True)
+    sidecar.write_text(json.dumps({"duration_sec": 12.5, "waveform": [0.1, 0.4], "segments": [[0.0, 12.0]]}))
+    try:
+        response = authenticated_client.get(f"/api/listening/audio/{question.id}/metadata")
+    finally:
+        sidecar.unlink()
+
+    assert response.status_code == 200
+    assert response.json()["segments"] == [[0.0, 12.0]]
+    assert authenticated_client.get(f"/api/listening/audio/{question.id}/metadata").status_code == 404
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None, reason="ffmpeg not installed")
+def test_ffmpeg_pipeline_transcodes_and_probes(tmp_path):
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=3",
+         "-ac", "2", "-ar", "44100", str(tmp_path / "tone.wav")],
+        check=True,
+    )
+
+    report = process_library(str(tmp_path), workers=1)
+
+    entry = report["entries"]["tone.wav"]
+    assert entry["duration_sec"] == pytest.approx(3.0, abs=0.2)
+    assert entry["output_bytes"] < entry["source_bytes"]
+    metadata = json.loads((tmp_path / entry["metadata"]).read_text())
+    assert metadata["waveform"] and metadata["segments"]
@@ -0,0 +1,92 @@
+"""Streaming speaking upload tests."""
+
+import asyncio
+import os
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.routers.speaking import TEMP_DIR
+from app.services.audio_upload import MAX_AUDIO_BYTES, receive_audio_upload, sniff_audio_format
+
+
+WEBM_HEADER = b"\x1a\x45\xdf\xa3"
+
+
+@pytest.fixture
+def temp_files():
+    before = set(os.listdir(TEMP_DIR))
+    yield lambda: set(os.listdir(TEMP_DIR)) - before
+
+
+def _post(client, payload: bytes, content_type: str = "audio/webm", prompt: str = "Describe your hometown."):
+    return client.post(
+        "/api/speaking/analyze",
+        data={"prompt_text": prompt} if prompt else {},
+        files={"file": ("answer.webm", payload, content_type)},
+    )
+
+
+@pytest.mark.parametrize("head, extension", [
+    (WEBM_HEADER + b"\x00" * 8, "webm"),
+    (b"RIFF\x24\x00\x00\x00WAVE", "wav"),
+    (b"OggS\x00\x02" + b"\x00" * 6, "ogg"),
+    (b"\x00\x00\x00\x20ftypM4A ", "m4a"),
+    (b"ID3\x04\x00" + b"\x00" * 7, "mp3"),
+    (b"\xff\xfb\x90\x64" + b"\x00" * 8, "mp3"),
+    (b"<html><body>", None),
+    (b"%PDF-1.7\n%\xe2\xe3", None),
+])
+def test_sniff_audio_format(head, extension):
+    assert sniff_audio_format(head) == extension
+
+
+def test_valid_upload_is_written_once_and_cleaned_up(authenticated_client, temp_files):
+    response = _post(authenticated_client, WEBM_HEADER + b"\x00" * 200_000)
+
+    assert response.status_code == 200
+    assert response.json()["band_score"] > 0
+    assert temp_files() == set()
+
+
+def test_wrong_type_and_non_audio_bytes_are_rejected(authenticated_client, temp_files):
+    assert _post(authenticated_client, WEBM_HEADER + b"\x00" * 100, "application/pdf").status_code == 400
+    response = _post(authenticated_client, b"<script>alert(1)</script>" * 100)
+
+    assert response.status_code == 400
+    assert "not a supported audio" in response.json()["detail"]
+    assert temp_files() == set()
+
+
+def test_oversize_body_is_rejected_while_streaming(authenticated_client, temp_files):
+    response = _post(authenticated_client, WEBM_HEADER + b"\x00" * MAX_AUDIO_BYTES)
+
+    assert response.status_code == 413
+    assert temp_files() == set()
+
+
+def test_missing_prompt_is_rejected(authenticated_client, temp_files):
+    assert _post(authenticated_client, WEBM_HEADER + b"\x00" * 100, prompt="").status_code == 422
+    assert temp_files() == set()
+
+
+def test_declared_oversize_is_rejected_before_reading_body(tmp_path):
+    async def receive():
+        raise AssertionError("body must not be read")
+
+    request = Request({
+        "type": "http",
+        "method": "POST",
+        "path": "/api/speaking/analyze",
+        "headers": [
+            (b"content-type", b"multipart/form-data; boundary=abc"),
+            (b"content-length", str(50 * 1024 * 1024).encode()),
+        ],
+    }, receive)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(receive_audio_upload(request, str(tmp_path)))
+
+    assert error.value.status_code == 413
+    assert list(tmp_path.iterdir()) == []
@@ -1,7 +1,15 @@
 """Tests for authentication API endpoints."""
 
+import asyncio
+import threading
+
 import pytest
 
+from app.models import User
+from app.services.identity_cache import UserIdentityCache, user_identity_cache
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy, password_hasher
+from tests.conftest import TestingSessionLocal
+
 
 class TestSignup:
     """Test cases for user registration."""
@@ -114,3 +122,132 @@ class TestGetMe:
         response = client.get("/api/auth/me")
         
         assert response.status_code == 401
+
+
+class TestIdentityCache:
+    """get_current_user resolves warm identities without touching the DB."""
+
+    @staticmethod
+    def _create_user(db) -> User:
+        user = User(email="cached@example.com", username="cached", password_hash="x", xp=10)
+        db.add(user)
+        db.commit()
+        return user
+
+    def test_warm_lookup_issues_no_sql_and_loads_stats_fresh(self, db, sql_counter):
+        cache = UserIdentityCache()
+        user_id = self._create_user(db).id
+        warm_session = TestingSessionLocal()
+        cache.get(warm_session, user_id)
+        warm_session.close()
+        db.query(User).filter(User.id == user_id).update({"xp": 250})
+        db.commit()
+
+        session = TestingSessionLocal()
+        sql_counter.reset()
+        user = cache.get(session, user_id)
+
+        assert user.email == "cached@example.com"
+        assert sql_counter.statements == 0
+        assert user.xp == 250
+        assert sql_counter.statements == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        session.close()
+
+    def test_invalidate_and_bounds(self, db):
+        cache = UserIdentityCache(max_entries=1)
+        user_id = self._create_user(db).id
+        other = User(email="other@example.com", username="other", password_hash="x")
+        db.add(other)
+        db.commit()
+
+        cache.get(db, user_id)
+        cache.invalidate(user_id)
+        cache.get(db, user_id)
+        cache.get(db, other.id)
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (0, 3, 1, 1)
+        assert cache.get(db, 999) is None
+
+    def test_cached_identity_across_requests(self, authenticated_client, test_user_data):
+        user_identity_cache.clear()
+        for _ in range(3):
+            response = authenticated_client.get("/api/auth/me")
+            assert response.json()["email"] == test_user_data["email"]
+
+        stats = user_identity_cache.stats()
+        assert stats["misses"] >= 1
+        assert stats["hits"] >= 2
+
+
+class _BlockingContext:
+    """CryptContext stand-in whose hashes wait until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.threads = set()
+
+    def hash(self, password):
+        self.threads.add(threading.current_thread().name)
+        self.release.wait(5)
+        return f"hashed:{password}"
+
+    def verify(self, plain_password, hashed_password):
+        return self.hash(plain_password) == hashed_password
+
+
+class TestPasswordHasher:
+    """bcrypt runs on a bounded pool off the event loop."""
+
+    def test_hashes_off_loop_and_rejects_when_queue_full(self):
+        context = _BlockingContext()
+        hasher = PasswordHasher(context, max_workers=1, max_queue=2)
+
+        async def scenario():
+            first = asyncio.ensure_future(hasher.hash("a"))
+            second = asyncio.ensure_future(hasher.hash("b"))
+            third = asyncio.ensure_future(hasher.verify("c", "hashed:c"))
+            await asyncio.sleep(0.05)
+            # One hash runs, two wait: the loop itself stays responsive.
+            with pytest.raises(PasswordHasherBusy):
+                await hasher.hash("d")
+            context.release.set()
+            return await asyncio.gather(first, second, third)
+
+        try:
+            assert asyncio.run(scenario()) == ["hashed:a", "hashed:b", True]
+        finally:
+            hasher.shutdown()
+
+        stats = hasher.stats()
+        assert (stats["submitted"], stats["completed"], stats["rejected"]) == (3, 3, 1)
+        assert stats["max_queued"] == 2
+        assert stats["queued"] == stats["running"] == 0
+        assert stats["max_wait_ms"] > 0
+        assert all(name.startswith("password-hash") for name in context.threads)
+
+    def test_login_uses_pool(self, client, test_user_data):
+        client.post("/api/auth/signup", json=test_user_data)
+        before = password_hasher.stats()["completed"]
+
+        response = client.post(
+            "/api/auth/login/json",
+            json={"email": test_user_data["email"], "password": test_user_data["password"]},
+        )
+
+        assert response.status_code == 200
+        assert password_hasher.stats()["completed"] == before + 1
+
+    def test_full_queue_returns_503(self, client, test_user_data, monkeypatch):
+        client.post("/api/auth/signup", json=test_user_data)
+        monkeypatch.setattr(password_hasher, "max_queue", 0)
+
+        response = client.post(
+            "/api/auth/login/json",
+            json={"email": test_user_data["email"], "password": test_user_data["password"]},
+        )
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
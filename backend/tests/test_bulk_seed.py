@@ -0,0 +1,106 @@
+"""Tests for the bulk seeding engine, seed scripts and synthetic data generator."""
+
+from datetime import datetime
+
+from app.models import Attempt, Question, Skill, TestSet, User
+from app.services.auth import authenticate_user
+from app.services.bulk_seed import BulkSeeder
+from app.services.synthetic_data import SYNTHETIC_PASSWORD, generate_synthetic_data, synthetic_email
+from seed_ielts_v1 import LISTENING_SKILLS, READING_SKILLS, seed_listening, seed_reading, seed_skills
+
+
+def _skill_rows(count):
+    return [{"name": f"Skill {index}", "category": f"CAT_{index % 3}", "mastery_threshold": 0.6} for index in range(count)]
+
+
+def test_upsert_inserts_in_batches_and_is_idempotent(db, sql_counter):
+    seeder = BulkSeeder(db, batch_size=4)
+    sql_counter.reset()
+    ids = seeder.upsert(Skill, _skill_rows(10), key=("name", "category"))
+    db.commit()
+
+    inserts = [sql for sql in sql_counter.sql if sql.startswith("INSERT")]
+    assert len(inserts) == 3
+    assert db.query(Skill).count() == 10
+    assert ids[("Skill 3", "CAT_0")] == db.query(Skill).filter(Skill.name == "Skill 3").one().id
+
+    again = BulkSeeder(db).upsert(Skill, _skill_rows(10), key=("name", "category"))
+    db.commit()
+    assert again == ids
+    assert db.query(Skill).count() == 10
+
+
+def test_upsert_updates_changed_columns_and_reports_duplicates(db):
+    db.add_all([
+        Skill(name="Headings", category="HEADINGS", mastery_threshold=0.5),
+        Skill(name="Headings copy", category="HEADINGS", mastery_threshold=0.5),
+        Skill(name="Summary", category="SUMMARY", mastery_threshold=0.7),
+    ])
+    db.commit()
+    oldest = db.query(Skill).filter(Skill.name == "Headings").one().id
+
+    seeder = BulkSeeder(db)
+    ids = seeder.upsert(
+        Skill,
+        [
+            {"name": "Reading Headings", "category": "HEADINGS", "mastery_threshold": 0.7},
+            {"name": "Summary", "category": "SUMMARY", "mastery_threshold": 0.7},
+            {"name": "Reading MCQ", "category": "MCQ", "mastery_threshold": 0.7},
+        ],
+        key=("category",),
+        update_columns=("name", "mastery_threshold"),
+    )
+    db.commit()
+
+    assert ids[("HEADINGS",)] == oldest
+    assert db.get(Skill, oldest).name == "Reading Headings"
+    assert db.get(Skill, oldest).mastery_threshold == 0.7
+    assert seeder.tables["skills"] == {"inserted": 1, "updated": 1, "unchanged": 1}
+    assert seeder.duplicates["skills"] == [db.query(Skill).filter(Skill.name == "Headings copy").one().id]
+
+
+def test_ielts_seed_is_single_transaction_and_rerunnable(db, sql_counter):
+    sql_counter.reset()
+    seeder = BulkSeeder(db)
+    skill_ids = seed_skills(seeder, READING_SKILLS + LISTENING_SKILLS)
+    reading = seed_reading(seeder, skill_ids)
+    listening = seed_listening(seeder, skill_ids)
+    db.commit()
+
+    assert reading > 0 and listening > 0
+    assert sql_counter.commits == 1
+    question_inserts = [sql for sql in sql_counter.sql if sql.startswith("INSERT INTO questions")]
+    assert len(question_inserts) <= 4
+    counts = (db.query(Question).count(), db.query(TestSet).count(), db.query(Skill).count())
+
+    seeder = BulkSeeder(db)
+    skill_ids = seed_skills(seeder, READING_SKILLS + LISTENING_SKILLS)
+    assert seed_reading(seeder, skill_ids) == 0
+    assert seed_listening(seeder, skill_ids) == 0
+    db.commit()
+    assert (db.query(Question).count(), db.query(TestSet).count(), db.query(Skill).count()) == counts
+    assert seeder.tables["questions"]["updated"] == 0
+
+
+def test_synthetic_generator_creates_requested_volumes(db):
+    now = datetime(2026, 6, 1, 12, 0)
+    report = generate_synthetic_data(db, users=12, questions=45, attempts=400, days=30, batch_size=100, now=now)
+
+    assert report["attempts_added"] == 400
+    users = db.query(User).filter(User.email.like("%@synthetic.jana.local")).all()
+    assert len(users) == 12
+    assert db.query(Question).filter(Question.passage_title.like("Synthetic %")).count() == 45
+    assert db.query(Attempt).count() == 400
+    assert {question.module for question in db.query(Question).all()} == {"READING", "LISTENING"}
+    assert sum(user.xp for user in users) == sum(attempt.xp_earned for attempt in db.query(Attempt).all())
+    assert all(attempt.created_at <= now for attempt in db.query(Attempt).all())
+    assert authenticate_user(db, synthetic_email(0), SYNTHETIC_PASSWORD) is not None
+
+    rerun = generate_synthetic_data(db, users=12, questions=45, attempts=400, days=30, now=now)
+    assert rerun["attempts_added"] == 0
+    assert rerun["tables"]["users"]["inserted"] == 0
+    assert rerun["tables"]["questions"]["inserted"] == 0
+
+    topped_up = generate_synthetic_data(db, users=12, questions=45, attempts=500, days=30, now=now)
+    assert topped_up["attempts_added"] == 100
+    assert db.query(Attempt).count() == 500
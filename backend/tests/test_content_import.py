@@ -0,0 +1,137 @@
+"""Admin content import tests (JSON and streaming NDJSON)."""
+
+import json
+
+import pytest
+
+from app.config import get_settings
+from app.models import Question, Skill, TestSet
+
+
+PASSAGE = (
+    "Urban beekeeping has grown rapidly over the last decade as city councils relax rules on "
+    "rooftop hives and residents look for ways to support pollinators close to home."
+)
+
+
+@pytest.fixture
+def admin_headers(client, monkeypatch):
+    monkeypatch.setenv("ADMIN_EMAILS", "admin@example.com")
+    get_settings.cache_clear()
+    client.post("/api/auth/signup", json={"email": "admin@example.com", "username": "importadmin", "password": "TestPass123"})
+    token = client.post(
+        "/api/auth/login/json", json={"email": "admin@example.com", "password": "TestPass123"}
+    ).json()["access_token"]
+    yield {"Authorization": f"Bearer {token}"}
+    get_settings.cache_clear()
+
+
+@pytest.fixture
+def tf_ng_skill(db):
+    skill = Skill(name="True/False/Not Given", category="TF_NG")
+    db.add(skill)
+    db.commit()
+    return skill.id
+
+
+def _test_set(skill_id: int, title: str, questions: int = 2, **overrides) -> dict:
+    item = {
+        "title": title,
+        "module": "reading",
+        "passage": PASSAGE,
+        "questions": [
+            {
+                "skill_id": skill_id,
+                "question_text": f"Rooftop hives are now allowed in most cities ({number}).",
+                "question_type": "TF_NG",
+                "correct_answer": "Not Given",
+                "options": ["True", "False", "Not Given"],
+                "explanation": "The passage says rules were relaxed but not where or how widely.",
+                "difficulty": 5,
+            }
+            for number in range(questions)
+        ],
+    }
+    item.update(overrides)
+    return item
+
+
+def _ndjson(items) -> bytes:
+    return "\n".join(item if isinstance(item, str) else json.dumps(item) for item in items).encode()
+
+
+def test_ndjson_import_inserts_valid_sets_and_reports_errors(client, db, admin_headers, tf_ng_skill):
+    bad_question = _test_set(tf_ng_skill, "Bad explanation")
+    bad_question["questions"][1]["explanation"] = "Too short."
+    body = _ndjson([
+        _test_set(tf_ng_skill, "Bees 1"),
+        "",
+        "{not json",
+        bad_question,
+        _test_set(999, "Unknown skill", questions=1),
+        _test_set(tf_ng_skill, "Bees 2", questions=3),
+    ])
+
+    response = client.post(
+        "/api/admin/content/import/ndjson",
+        content=body,
+        headers={**admin_headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["count"], report["imported_questions"], report["failed"]) == (2, 5, 3)
+    assert [error["line"] for error in report["errors"]] == [3, 4, 5]
+    assert "explanation" in report["errors"][1]["errors"][0]
+    assert "unknown skill_id 999" in report["errors"][2]["errors"][0]
+
+    titles = [title for (title,) in db.query(TestSet.title).order_by(TestSet.id)]
+    assert titles == ["Bees 1", "Bees 2"]
+    questions = db.query(Question).filter(Question.test_set_id == report["created_test_sets"][1]).all()
+    assert len(questions) == 3
+    assert all(q.module == "READING" and q.needs_review and not q.approved and q.is_active for q in questions)
+
+
+def test_ndjson_import_batches_inserts(client, db, admin_headers, tf_ng_skill, sql_counter):
+    body = _ndjson(_test_set(tf_ng_skill, f"Set {number}", questions=5) for number in range(40))
+
+    sql_counter.reset()
+    response = client.post(
+        "/api/admin/content/import/ndjson?batch_size=100",
+        content=body,
+        headers=admin_headers,
+    )
+
+    assert response.json()["imported_questions"] == 200
+    assert response.json()["batches"] == 2
+    question_inserts = [sql for sql in sql_counter.sql if sql.startswith("INSERT INTO questions")]
+    assert len(question_inserts) == 2
+    assert sql_counter.commits == 1
+
+
+def test_json_import_keeps_response_shape(client, db, admin_headers, tf_ng_skill):
+    response = client.post(
+        "/api/admin/content/import",
+        json=[_test_set(tf_ng_skill, "Legacy import", questions=1, needs_review=False)],
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    test_set = db.get(TestSet, response.json()["created_test_sets"][0])
+    assert test_set.approved and len(test_set.questions) == 1
+
+
+def test_json_import_rejects_the_payload_when_a_skill_is_unknown(client, db, admin_headers, tf_ng_skill):
+    response = client.post(
+        "/api/admin/content/import",
+        json=[_test_set(tf_ng_skill, "Known skill"), _test_set(tf_ng_skill + 99, "Unknown skill")],
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["failed"] == 1
+    assert detail["errors"][0]["line"] == 2
+    assert detail["errors"][0]["title"] == "Unknown skill"
+    assert db.query(TestSet).count() == 0
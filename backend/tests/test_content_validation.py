@@ -1,12 +1,13 @@
 """Tests for strict Reading content validation."""
 
 from app.models import Question, Skill
+from app.services.bulk_seed import BulkSeeder
 from app.services.content_validation import (
     VALID_READING_TYPES,
     get_reading_category_counts,
     validate_reading_question,
 )
-from seed_ielts_v1 import READING_SKILLS, get_or_create_skill, seed_reading
+from seed_ielts_v1 import READING_SKILLS, seed_reading, seed_skills
 
 
 PASSAGE = (
@@ -82,12 +83,8 @@ def test_placeholder_explanation_fails_for_active_approved_question(db):
 
 
 def test_seeded_reading_content_passes_validation_and_covers_categories(db):
-    skill_map = {
-        category: get_or_create_skill(db, name, category)
-        for name, category in READING_SKILLS
-    }
-
-    seed_reading(db, skill_map)
+    seeder = BulkSeeder(db)
+    seed_reading(seeder, seed_skills(seeder, READING_SKILLS))
     db.commit()
 
     questions = (
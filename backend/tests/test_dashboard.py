@@ -1,6 +1,33 @@
 """Tests for dashboard API endpoints."""
 
+from datetime import datetime
+
 import pytest
+from sqlalchemy import insert
+
+from app.models import (
+    Attempt, DashboardMetric, MistakeReview, Question, Skill, SpeakingAttempt, User,
+    UserSkillMastery, UserStatsSnapshot, WritingAttempt
+)
+from app.services import dashboard, user_stats
+from app.services.dashboard import get_progress_history, rebuild_daily_metrics, record_attempt_metrics
+from app.services.user_stats import rebuild_user_stats
+
+
+def _create_question(db) -> Question:
+    skill = Skill(name="Matching Headings", category="HEADINGS")
+    db.add(skill)
+    db.flush()
+    question = Question(
+        skill_id=skill.id,
+        passage="Test passage",
+        question_text="Choose the best heading.",
+        question_type="HEADINGS",
+        correct_answer="A",
+    )
+    db.add(question)
+    db.commit()
+    return question
 
 
 class TestDashboardProgress:
@@ -37,6 +64,278 @@ class TestDashboardProgress:
         assert "estimated_band" in data
 
 
+class TestDashboardQueryPlan:
+    """The dashboard query count must not grow with history size."""
+
+    @staticmethod
+    def _add_history(db, user_id: int, skills: int, attempts_per_skill: int):
+        for skill_index in range(skills):
+            skill = Skill(name=f"Skill {skill_index}", category=("TF_NG", "HEADINGS", "SUMMARY")[skill_index % 3])
+            db.add(skill)
+            db.flush()
+            question = Question(
+                skill_id=skill.id,
+                module=("READING", "LISTENING")[skill_index % 2],
+                passage="Passage",
+                question_text=f"Question {skill_index}",
+                question_type=skill.category,
+                correct_answer="A",
+            )
+            db.add(question)
+            db.flush()
+            db.add(UserSkillMastery(
+                user_id=user_id,
+                skill_id=skill.id,
+                attempts_count=attempts_per_skill,
+                correct_count=attempts_per_skill // 2,
+            ))
+            for attempt_index in range(attempts_per_skill):
+                attempt = Attempt(
+                    user_id=user_id,
+                    question_id=question.id,
+                    user_answer="A" if attempt_index % 2 else "B",
+                    is_correct=bool(attempt_index % 2),
+                    response_time_ms=1000,
+                )
+                db.add(attempt)
+                db.flush()
+                if not attempt.is_correct:
+                    db.add(MistakeReview(
+                        user_id=user_id,
+                        question_id=question.id,
+                        attempt_id=attempt.id,
+                        module=question.module,
+                        question_type=question.question_type,
+                        user_answer="B",
+                        correct_answer="A",
+                    ))
+        for band in (5.5, 6.0, 6.5):
+            db.add(WritingAttempt(user_id=user_id, task_type="Task 2", prompt_text="p",
+                                  essay_text="e", band_score=band))
+            db.add(SpeakingAttempt(user_id=user_id, prompt_text="p", band_score=band))
+        db.commit()
+        rebuild_user_stats(db, user_id=user_id)
+
+    def _progress_statements(self, client, sql_counter) -> int:
+        # Warm the identity cache so both measurements take the same path.
+        client.get("/api/dashboard/progress")
+        sql_counter.reset()
+        response = client.get("/api/dashboard/progress")
+        assert response.status_code == 200
+        return sql_counter.statements
+
+    def test_query_count_is_bounded(self, authenticated_client, db, sql_counter):
+        user = db.query(User).one()
+        self._add_history(db, user.id, skills=1, attempts_per_skill=2)
+        small = self._progress_statements(authenticated_client, sql_counter)
+
+        self._add_history(db, user.id, skills=8, attempts_per_skill=25)
+        large = self._progress_statements(authenticated_client, sql_counter)
+
+        assert large == small
+        assert large <= 10
+
+    def test_aggregates_match_history(self, authenticated_client, db):
+        user = db.query(User).one()
+        self._add_history(db, user.id, skills=2, attempts_per_skill=4)
+
+        data = authenticated_client.get("/api/dashboard/progress").json()
+
+        assert data["total_attempts"] == 8
+        assert data["overall_accuracy"] == 0.5
+        assert data["avg_response_time_ms"] == 1000
+        assert {skill["accuracy_rate"] for skill in data["skills"]} == {0.5}
+        assert set(data["section_bands"]) == {"reading", "listening", "writing", "speaking"}
+        assert data["section_bands"]["writing"] == 6.5
+        assert data["section_bands"]["speaking"] == 6.5
+        assert len(data["mistake_log"]) == 4
+
+
+class TestUserStatsSnapshot:
+    """Lifetime totals are materialized alongside each attempt."""
+
+    def test_submissions_update_snapshot(self, authenticated_client, db):
+        question = _create_question(db)
+        for answer in ("A", "B", "A"):
+            authenticated_client.post("/api/questions/submit", json={
+                "question_id": question.id,
+                "user_answer": answer,
+                "response_time_ms": 2000,
+            })
+
+        snapshot = db.query(UserStatsSnapshot).one()
+        assert snapshot.total_attempts == 3
+        assert snapshot.correct_attempts == 2
+        assert snapshot.response_time_sum_ms == 6000
+        assert snapshot.module_totals("READING") == (3, 2)
+        assert snapshot.module_totals("LISTENING") == (0, 0)
+
+        profile = authenticated_client.get("/api/gamification/profile").json()
+        assert profile["total_questions_answered"] == 3
+        assert profile["accuracy_rate"] == pytest.approx(2 / 3)
+        progress = authenticated_client.get("/api/dashboard/progress").json()
+        assert progress["total_attempts"] == 3
+        assert progress["avg_response_time_ms"] == 2000
+
+    def test_listening_submissions_update_snapshot(self, authenticated_client, db):
+        reading = _create_question(db)
+        listening = Question(
+            skill_id=reading.skill_id,
+            module="LISTENING",
+            passage="Transcript",
+            question_text="Where does the tour start?",
+            question_type="FILL_BLANK",
+            correct_answer="museum",
+        )
+        db.add(listening)
+        db.commit()
+
+        authenticated_client.post("/api/questions/submit", json={
+            "question_id": reading.id, "user_answer": "A", "response_time_ms": 1000,
+        })
+        for _ in range(3):
+            response = authenticated_client.post("/api/listening/submit", json={
+                "question_id": listening.id, "user_answer": "museum", "response_time_ms": 1000,
+            })
+            assert response.status_code == 200
+
+        progress = authenticated_client.get("/api/dashboard/progress").json()
+        assert progress["total_attempts"] == 4
+        assert set(progress["section_bands"]) >= {"reading", "listening"}
+        profile = authenticated_client.get("/api/gamification/profile").json()
+        assert profile["total_questions_answered"] == 4
+        assert db.query(UserStatsSnapshot).one().module_totals("LISTENING") == (3, 3)
+
+    def test_concurrent_first_attempt_is_added_to_the_winning_row(self, db, monkeypatch):
+        user = User(email="race@example.com", username="race", password_hash="x")
+        db.add(user)
+        question = _create_question(db)
+        attempt = Attempt(user_id=user.id, question_id=question.id, user_answer="A",
+                          is_correct=True, response_time_ms=1000)
+        db.add(attempt)
+        db.flush()
+
+        build = user_stats.build_user_stats_snapshot
+
+        def build_then_lose_the_race(session, user_id):
+            snapshot = build(session, user_id)
+            # Another request's first attempt commits its row between our UPDATE and INSERT
+            session.execute(insert(UserStatsSnapshot).values(
+                user_id=user_id, total_attempts=5, correct_attempts=2, response_time_sum_ms=5000,
+                reading_attempts=5, reading_correct=2, listening_attempts=0, listening_correct=0,
+            ))
+            return snapshot
+
+        monkeypatch.setattr(user_stats, "build_user_stats_snapshot", build_then_lose_the_race)
+        user_stats.record_attempt_stats(db, attempt, "READING")
+        db.commit()
+
+        snapshot = db.query(UserStatsSnapshot).one()
+        assert (snapshot.total_attempts, snapshot.correct_attempts) == (6, 3)
+        assert snapshot.module_totals("READING") == (6, 3)
+        assert snapshot.response_time_sum_ms == 6000
+
+    def test_rebuild_matches_history(self, authenticated_client, db):
+        user = db.query(User).one()
+        question = _create_question(db)
+        db.add_all([
+            Attempt(user_id=user.id, question_id=question.id, user_answer="A",
+                    is_correct=True, response_time_ms=1000),
+            Attempt(user_id=user.id, question_id=question.id, user_answer="B",
+                    is_correct=False, response_time_ms=3000),
+        ])
+        db.add(UserStatsSnapshot(user_id=user.id, total_attempts=9, correct_attempts=9,
+                                 response_time_sum_ms=0, reading_attempts=0, reading_correct=0,
+                                 listening_attempts=0, listening_correct=0))
+        db.commit()
+
+        assert rebuild_user_stats(db) == {"users": 1, "created": 0, "corrected": 1}
+        snapshot = db.query(UserStatsSnapshot).one()
+        assert (snapshot.total_attempts, snapshot.correct_attempts) == (2, 1)
+        assert snapshot.avg_response_time_ms == 2000
+
+
+class TestDailyMetrics:
+    """Incremental daily metric maintenance and reconciliation."""
+
+    def test_attempts_fold_into_one_daily_row(self, authenticated_client, db):
+        question = _create_question(db)
+
+        for answer, response_time in (("A", 1000), ("B", 3000), ("A", 5000)):
+            response = authenticated_client.post("/api/questions/submit", json={
+                "question_id": question.id,
+                "user_answer": answer,
+                "response_time_ms": response_time,
+            })
+            assert response.status_code == 200
+
+        metric = db.query(DashboardMetric).one()
+        assert metric.total_attempts == 3
+        assert metric.correct_attempts == 2
+        assert metric.response_time_sum_ms == 9000
+        assert metric.avg_response_time_ms == pytest.approx(3000)
+        assert metric.accuracy_rate == pytest.approx(2 / 3)
+        assert metric.xp_earned == sum(
+            a.xp_earned for a in db.query(Attempt).all()
+        )
+        assert metric.estimated_band is not None
+
+    def test_rebuild_corrects_drifted_and_missing_rows(self, db):
+        user = User(email="drift@example.com", username="drift", password_hash="x")
+        db.add(user)
+        question = _create_question(db)
+        day_one = datetime(2026, 3, 1, 9, 30)
+        day_two = datetime(2026, 3, 2, 18, 0)
+        db.add_all([
+            Attempt(user_id=user.id, question_id=question.id, user_answer="A", is_correct=True,
+                    response_time_ms=2000, xp_earned=10, created_at=day_one),
+            Attempt(user_id=user.id, question_id=question.id, user_answer="B", is_correct=False,
+                    response_time_ms=4000, xp_earned=0, created_at=day_one),
+            Attempt(user_id=user.id, question_id=question.id, user_answer="A", is_correct=True,
+                    response_time_ms=1000, xp_earned=12, created_at=day_two),
+            DashboardMetric(user_id=user.id, date=datetime(2026, 3, 1), total_attempts=7,
+                            correct_attempts=7, estimated_band=5.5),
+            DashboardMetric(user_id=user.id, date=datetime(2026, 2, 27), total_attempts=3),
+        ])
+        db.commit()
+
+        report = rebuild_daily_metrics(db)
+
+        assert report == {"users": 1, "created": 1, "corrected": 2}
+        rows = {m.date.date().isoformat(): m for m in db.query(DashboardMetric).all()}
+        assert rows["2026-03-01"].total_attempts == 2
+        assert rows["2026-03-01"].correct_attempts == 1
+        assert rows["2026-03-01"].avg_response_time_ms == pytest.approx(3000)
+        assert rows["2026-03-01"].xp_earned == 10
+        assert rows["2026-03-01"].estimated_band == 5.5
+        assert rows["2026-03-02"].total_attempts == 1
+        assert rows["2026-02-27"].total_attempts == 0
+        assert rebuild_daily_metrics(db) == {"users": 1, "created": 0, "corrected": 0}
+
+    def test_history_window_uses_the_attempt_clock(self, db, monkeypatch):
+        user = User(email="clock@example.com", username="clock", password_hash="x")
+        db.add(user)
+        question = _create_question(db)
+        # Just after UTC midnight, while a server east of UTC is already on the 8th
+        # and one west of it is still on the 6th.
+        now = datetime(2026, 7, 7, 0, 30)
+
+        class Clock(datetime):
+            @classmethod
+            def utcnow(cls):
+                return now
+
+        monkeypatch.setattr(dashboard, "datetime", Clock)
+        attempt = Attempt(user_id=user.id, question_id=question.id, user_answer="A",
+                          is_correct=True, response_time_ms=1000, created_at=datetime(2026, 7, 7, 0, 15))
+        db.add(attempt)
+        record_attempt_metrics(db, attempt)
+
+        history = get_progress_history(db, user.id, days=0)
+        assert [(row["date"], row["attempts_count"]) for row in history] == [(datetime(2026, 7, 7), 1)]
+
+
+
 class TestHealthEndpoint:
     """Test cases for health check endpoint."""
 
@@ -0,0 +1,87 @@
+"""Tests for engine/pool configuration, SQLite pragmas, pool metrics and the async read path."""
+
+import pytest
+from sqlalchemy import create_engine, event, exc, text
+
+from app.config import Settings
+from app.database import (
+    InstrumentedQueuePool, async_database_url, configure_sqlite_pragmas, engine_options, pool_stats,
+)
+from tests.conftest import engine as sync_engine
+
+
+def test_engine_options_follow_settings_per_backend():
+    memory = engine_options(Settings(database_url="sqlite:///:memory:"))
+    assert memory == {"connect_args": {"check_same_thread": False}}
+
+    sqlite = engine_options(Settings(database_url="sqlite:///./app.db", db_pool_size=3, db_pool_recycle=60))
+    assert sqlite["poolclass"] is InstrumentedQueuePool
+    assert (sqlite["pool_size"], sqlite["pool_recycle"], sqlite["pool_pre_ping"]) == (3, 60, True)
+
+    postgres = engine_options(Settings(
+        database_url="postgresql+psycopg://jana:secret@db:5432/jana", db_statement_timeout_ms=1500,
+    ))
+    assert postgres["connect_args"] == {"options": "-c statement_timeout=1500"}
+    untimed = engine_options(Settings(database_url="postgresql+psycopg://db/jana", db_statement_timeout_ms=0))
+    assert untimed["connect_args"] == {}
+
+
+def test_sqlite_file_connections_use_wal_and_busy_timeout(tmp_path):
+    settings = Settings(database_url=f"sqlite:///{tmp_path / 'app.db'}", sqlite_busy_timeout_ms=2500)
+    engine = create_engine(settings.database_url, **engine_options(settings))
+    configure_sqlite_pragmas(engine, settings)
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 2500
+    engine.dispose()
+
+
+def test_pool_stats_report_checkouts_overflow_and_timeouts(tmp_path):
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path / 'app.db'}", db_pool_size=1, db_max_overflow=1, db_pool_timeout=0.05,
+    )
+    engine = create_engine(settings.database_url, **engine_options(settings))
+    first, second = engine.connect(), engine.connect()
+
+    stats = pool_stats(engine)
+    assert (stats["checked_out"], stats["overflow"], stats["checkouts"]) == (2, 1, 2)
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    stats = pool_stats(engine)
+    assert stats["timeouts"] == 1
+    assert stats["max_wait_ms"] >= 40
+
+    first.close()
+    second.close()
+    assert pool_stats(engine)["checked_out"] == 0
+    engine.dispose()
+
+
+def test_api_health_reports_pool_on_request(client):
+    assert "pool" not in client.get("/api/health").json()
+    pool = client.get("/api/health?pool=true").json()["pool"]
+    assert {"pool", "checked_out"} <= set(pool)
+
+
+def test_async_database_url_swaps_in_asyncio_drivers():
+    assert async_database_url("sqlite:///./jana.db") == "sqlite+aiosqlite:///./jana.db"
+    assert async_database_url("postgresql://jana:pw@db:5432/jana") == "postgresql+psycopg://jana:pw@db:5432/jana"
+    assert async_database_url("postgresql+psycopg://jana:pw@db/jana") == "postgresql+psycopg://jana:pw@db/jana"
+
+
+def test_hot_read_endpoints_query_through_the_async_engine(authenticated_client, sql_counter):
+    sync_statements = []
+
+    def record(conn, cursor, statement, *args):
+        sync_statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", record)
+    sql_counter.reset()
+    try:
+        for path in ("/api/dashboard/progress", "/api/plan/today", "/api/review/mistakes"):
+            assert authenticated_client.get(path).status_code == 200
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+    # sql_counter sees both test engines; none of these reads used the sync one
+    assert sql_counter.statements > 0
+    assert sync_statements == []
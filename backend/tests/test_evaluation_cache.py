@@ -0,0 +1,102 @@
+"""Persistent AI evaluation cache tests."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import get_settings
+from app.models import EvaluationCacheEntry, WritingAttempt
+from app.routers import writing as writing_router
+from app.services.evaluation_cache import EvaluationCache, evaluation_cache, writing_cache_key
+from app.services.writing_service import evaluate_essay_locally
+
+
+ESSAY = {
+    "task_type": "Task 2",
+    "prompt_text": "Some people think university should be free. Discuss.",
+    "essay_text": "Free university education widens access to opportunity. " * 25,
+}
+
+
+@pytest.fixture
+def provider_calls(monkeypatch):
+    calls = []
+
+    async def fake_provider(essay_text, task_type, prompt_text):
+        calls.append(essay_text)
+        result = evaluate_essay_locally(essay_text, task_type, prompt_text)
+        result.pop("error", None)
+        result["ai_provider"] = "ollama"
+        return result
+
+    monkeypatch.setattr(writing_router, "evaluate_essay_with_gemini", fake_provider)
+    return calls
+
+
+def test_identical_resubmission_reuses_feedback_and_records_attempt(authenticated_client, db, provider_calls):
+    first = authenticated_client.post("/api/writing/evaluate", json=ESSAY)
+    spaced = {**ESSAY, "essay_text": "  " + ESSAY["essay_text"].replace(". ", ".\n\n")}
+    second = authenticated_client.post("/api/writing/submit", json=spaced)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert len(provider_calls) == 1
+    assert db.query(WritingAttempt).count() == 2
+
+    stats = evaluation_cache.stats(db)
+    assert (stats["hits"], stats["misses"], stats["stores"], stats["size"]) == (1, 1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_key_changes_with_prompt_and_model(monkeypatch):
+    key = writing_cache_key("Task 2", "Prompt", "Essay text")
+
+    assert writing_cache_key("Task 2", "Prompt ", " Essay  text") == key
+    assert writing_cache_key("Task 1", "Prompt", "Essay text") != key
+    assert writing_cache_key("Task 2", "Other prompt", "Essay text") != key
+    monkeypatch.setenv("OLLAMA_MODEL", "llama3:8b")
+    get_settings.cache_clear()
+    try:
+        assert writing_cache_key("Task 2", "Prompt", "Essay text") != key
+    finally:
+        get_settings.cache_clear()
+
+
+def test_local_fallback_and_errors_are_not_stored(db):
+    cache = EvaluationCache(ttl_seconds=60, max_entries=10)
+
+    cache.put(db, "a" * 64, "writing", {"band_score": 5.0, "ai_provider": "local"})
+    cache.put(db, "b" * 64, "writing", {"band_score": 0.0, "ai_provider": "gemini", "error": "quota"})
+
+    assert db.query(EvaluationCacheEntry).count() == 0
+
+
+def test_entries_expire_and_least_recently_used_are_evicted(db):
+    cache = EvaluationCache(ttl_seconds=60, max_entries=2)
+    for key in ("a", "b"):
+        cache.put(db, key, "writing", {"band_score": 6.0, "ai_provider": "ollama"})
+    assert cache.get(db, "a") is not None  # "b" is now least recently used
+
+    cache.put(db, "c", "writing", {"band_score": 7.0, "ai_provider": "ollama"})
+
+    assert {entry.key for entry in db.query(EvaluationCacheEntry)} == {"a", "c"}
+    assert cache.evictions == 1
+
+    db.get(EvaluationCacheEntry, "a").created_at = datetime.utcnow() - timedelta(seconds=61)
+    db.commit()
+    assert cache.get(db, "a") is None
+    assert cache.expired == 1
+
+
+def test_evaluate_calls_provider_only_on_miss(db):
+    cache = EvaluationCache(ttl_seconds=60, max_entries=10)
+
+    async def evaluate():
+        return {"band_score": 6.5, "ai_provider": "ollama"}
+
+    result = asyncio.run(cache.evaluate(db, "k", "writing", evaluate))
+    again = asyncio.run(cache.evaluate(db, "k", "writing", evaluate))
+
+    assert result == again == {"band_score": 6.5, "ai_provider": "ollama"}
+    assert (cache.hits, cache.misses, cache.stores) == (1, 1, 1)
@@ -0,0 +1,185 @@
+"""Background evaluation job queue tests."""
+
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import get_settings
+from app.models import EvaluationJob, SpeakingAttempt, WritingAttempt
+from app.services import evaluation_jobs
+from app.services.evaluation_jobs import (
+    EvaluationWorkerPool, claim_next_job, evaluation_workers, requeue_stale_jobs,
+)
+from tests.conftest import TestingSessionLocal
+
+
+ESSAY = {
+    "task_type": "Task 2",
+    "prompt_text": "Discuss both views and give your opinion.",
+    "essay_text": "Many people believe that public transport should be free. " * 20,
+}
+
+
+@pytest.fixture(autouse=True)
+def local_provider(monkeypatch):
+    monkeypatch.setenv("AI_PROVIDER", "local")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+@pytest.fixture
+def pool():
+    return EvaluationWorkerPool(concurrency=2, retry_backoff_sec=0, session_factory=TestingSessionLocal)
+
+
+def _submit_essay(client, essay: dict = ESSAY) -> dict:
+    response = client.post("/api/writing/jobs", json=essay)
+    assert response.status_code == 202
+    return response.json()
+
+
+def test_writing_job_is_pending_until_a_worker_runs_it(authenticated_client, db, pool):
+    job = _submit_essay(authenticated_client)
+
+    assert job["status"] == "pending"
+    assert authenticated_client.get("/api/writing/history").json()["attempts"] == []
+
+    assert asyncio.run(pool.drain()) == 1
+
+    polled = authenticated_client.get(f"/api/evaluation-jobs/{job['job_id']}").json()
+    assert polled["status"] == "succeeded"
+    assert polled["provider"] == "local"
+    assert polled["result"]["band_score"] > 0
+    history = authenticated_client.get("/api/writing/history").json()["attempts"]
+    assert [attempt["id"] for attempt in history] == [job["attempt_id"]]
+    assert history[0]["band_score"] == polled["result"]["band_score"]
+
+    stats = pool.stats(db)
+    assert (stats["claimed"], stats["succeeded"], stats["pending"]) == (1, 1, 0)
+    assert stats["succeeded_total"] == 1
+
+
+def test_failed_runs_are_retried_then_marked_failed(authenticated_client, db, pool, monkeypatch):
+    calls = []
+
+    async def flaky(essay_text, task_type, prompt_text):
+        calls.append(essay_text)
+        if len(calls) == 1:
+            raise RuntimeError("provider crashed")
+        return {"band_score": 7.0, "ai_provider": "ollama"}
+
+    monkeypatch.setattr(evaluation_jobs, "evaluate_essay_with_gemini", flaky)
+    retried = _submit_essay(authenticated_client)
+    asyncio.run(pool.drain())
+
+    job = db.get(EvaluationJob, retried["job_id"])
+    assert (job.status, job.attempts, job.provider) == ("succeeded", 2, "ollama")
+    assert db.get(WritingAttempt, retried["attempt_id"]).band_score == 7.0
+
+    async def broken(essay_text, task_type, prompt_text):
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(evaluation_jobs, "evaluate_essay_with_gemini", broken)
+    # A different essay: the first one's evaluation is now cached.
+    failed = _submit_essay(authenticated_client, {**ESSAY, "essay_text": "Cities should invest in parks. " * 30})
+    asyncio.run(pool.drain())
+
+    polled = authenticated_client.get(f"/api/evaluation-jobs/{failed['job_id']}").json()
+    assert polled["status"] == "failed"
+    assert polled["attempts"] == get_settings().evaluation_job_max_attempts
+    assert "provider down" in polled["error"]
+    db.expire_all()
+    assert db.get(WritingAttempt, failed["attempt_id"]).evaluation_status == "failed"
+    assert (pool.retried, pool.failed) == (1 + 2, 1)
+
+
+def test_speaking_job_removes_audio_after_evaluation(authenticated_client, db, pool):
+    response = authenticated_client.post(
+        "/api/speaking/jobs",
+        data={"prompt_text": "Describe a place you like to visit."},
+        files={"file": ("answer.webm", b"\x1a\x45\xdf\xa3" + b"\x00" * 4096, "audio/webm")},
+    )
+    assert response.status_code == 202
+    audio_path = db.get(EvaluationJob, response.json()["job_id"]).payload["audio_path"]
+    assert os.path.exists(audio_path)
+
+    asyncio.run(pool.drain())
+
+    db.expire_all()
+    attempt = db.get(SpeakingAttempt, response.json()["attempt_id"])
+    assert attempt.evaluation_status == "completed"
+    assert attempt.feedback["ai_provider"] == "local"
+    assert not os.path.exists(audio_path)
+
+
+def test_job_is_claimed_once(authenticated_client, db):
+    _submit_essay(authenticated_client)
+
+    first, second = TestingSessionLocal(), TestingSessionLocal()
+    try:
+        assert claim_next_job(first) is not None
+        assert claim_next_job(second) is None
+    finally:
+        first.close()
+        second.close()
+
+
+def test_other_users_cannot_read_job(authenticated_client, client):
+    job = _submit_essay(authenticated_client)
+    client.post("/api/auth/signup", json={"email": "other@example.com", "username": "other", "password": "OtherPass123"})
+    token = client.post(
+        "/api/auth/login/json", json={"email": "other@example.com", "password": "OtherPass123"}
+    ).json()["access_token"]
+
+    response = client.get(
+        f"/api/evaluation-jobs/{job['job_id']}",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 404
+
+
+def test_running_workers_stream_status_events(authenticated_client, monkeypatch):
+    monkeypatch.setattr(evaluation_workers, "session_factory", TestingSessionLocal)
+    monkeypatch.setattr(evaluation_workers, "concurrency", 2)
+    monkeypatch.setattr(evaluation_workers, "poll_interval_sec", 0.05)
+    authenticated_client.portal.call(evaluation_workers.start)
+    try:
+        job = _submit_essay(authenticated_client)
+        statuses = []
+        with authenticated_client.stream("GET", f"/api/evaluation-jobs/{job['job_id']}/events") as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            for line in response.iter_lines():
+                if line.startswith("data: "):
+                    statuses.append(json.loads(line[len("data: "):])["status"])
+    finally:
+        authenticated_client.portal.call(evaluation_workers.stop)
+
+    assert statuses[-1] == "succeeded"
+    assert set(statuses) <= {"pending", "running", "succeeded"}
+
+
+def test_stale_jobs_out_of_attempts_fail_instead_of_requeueing(authenticated_client, db):
+    retryable = _submit_essay(authenticated_client)
+    exhausted = _submit_essay(authenticated_client)
+    stale_start = datetime.utcnow() - timedelta(hours=1)
+    for job_id, attempts in ((retryable["job_id"], 1), (exhausted["job_id"], 3)):
+        db.query(EvaluationJob).filter(EvaluationJob.id == job_id).update({
+            EvaluationJob.status: "running",
+            EvaluationJob.started_at: stale_start,
+            EvaluationJob.attempts: attempts,
+            EvaluationJob.max_attempts: 3,
+        })
+    db.commit()
+
+    assert requeue_stale_jobs(db) == 1
+
+    db.expire_all()
+    assert db.get(EvaluationJob, retryable["job_id"]).status == "pending"
+    failed = db.get(EvaluationJob, exhausted["job_id"])
+    assert failed.status == "failed" and failed.attempts == 3
+    assert db.get(WritingAttempt, exhausted["attempt_id"]).evaluation_status == "failed"
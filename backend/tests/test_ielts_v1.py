@@ -113,7 +113,7 @@ def test_speaking_fallback_and_history(authenticated_client):
     response = authenticated_client.post(
         "/api/speaking/analyze",
         data={"prompt_text": "Describe a useful skill."},
-        files={"file": ("speaking.webm", b"0" * 120000, "audio/webm")},
+        files={"file": ("speaking.webm", b"\x1a\x45\xdf\xa3" + b"0" * 120000, "audio/webm")},
     )
     assert response.status_code == 200
     assert response.json()["band_score"] > 0
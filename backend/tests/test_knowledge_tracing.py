@@ -1,7 +1,13 @@
 """Tests for the Bayesian Knowledge Tracing implementation."""
 
+import random
+
+import numpy as np
 import pytest
-from app.ml.knowledge_tracing import KnowledgeTracer, BKTParams
+from app.ml.bkt_fitting import SkillSequences, fit_all_skills, fit_skill, iter_skill_sequences
+from app.ml.knowledge_tracing import KnowledgeTracer, BKTParams, knowledge_tracer
+from app.models import Attempt, Question, Skill, User, UserSkillMastery
+from app.services.mastery import rebuild_skill_masteries
 
 
 class TestKnowledgeTracer:
@@ -84,3 +90,162 @@ class TestBKTParams:
         tracer = KnowledgeTracer(params)
         assert tracer.params.p_init == 0.5
         assert tracer.params.p_learn == 0.2
+
+
+class TestBatchReplay:
+    """The vectorized replay must equal folding update_mastery per sequence."""
+
+    @staticmethod
+    def _scalar_replay(tracer, sequence_ids, outcomes, initial):
+        mastery = list(initial)
+        for sequence_id, outcome in zip(sequence_ids, outcomes):
+            mastery[sequence_id] = tracer.update_mastery(mastery[sequence_id], outcome)
+        return mastery
+
+    @pytest.mark.parametrize("params", [
+        BKTParams(),
+        BKTParams(p_init=0.5, p_learn=0.3, p_guess=0.25, p_slip=0.05),
+        # Strong learning drives sequences into the 0.99 clamp quickly.
+        BKTParams(p_init=0.9, p_learn=0.6, p_guess=0.01, p_slip=0.01),
+    ])
+    def test_matches_scalar_exactly(self, params):
+        tracer = KnowledgeTracer(params)
+        rng = random.Random(7)
+        n_sequences = 300
+        sequence_ids = [rng.randrange(n_sequences) for _ in range(15000)]
+        outcomes = [rng.random() < 0.65 for _ in sequence_ids]
+        initial = [rng.choice([0.01, params.p_init, 0.99, rng.random()]) for _ in range(n_sequences)]
+
+        batch = tracer.replay_sequences(sequence_ids, outcomes, initial_mastery=initial)
+
+        assert batch.tolist() == self._scalar_replay(tracer, sequence_ids, outcomes, initial)
+
+    def test_all_wrong_hits_lower_clamp(self):
+        tracer = KnowledgeTracer(BKTParams(p_learn=0.0, p_guess=0.01, p_slip=0.5))
+        mastery = tracer.replay_sequences([0] * 50 + [1], [False] * 51)
+        assert mastery.tolist() == [0.01, tracer.update_mastery(tracer.params.p_init, False)]
+
+    def test_sequences_without_attempts_keep_initial_mastery(self):
+        tracer = KnowledgeTracer()
+        mastery = tracer.replay_sequences([], [], n_sequences=3)
+        assert mastery.tolist() == [tracer.params.p_init] * 3
+
+
+class TestRebuildSkillMasteries:
+    """Rebuilding from Attempt history reproduces the live mastery rows."""
+
+    def test_rebuild_matches_submission_pipeline(self, authenticated_client, db):
+        skill = Skill(name="True False Not Given", category="TF_NG")
+        db.add(skill)
+        db.flush()
+        question = Question(
+            skill_id=skill.id,
+            passage="Passage",
+            question_text="Is it true?",
+            question_type="TF_NG",
+            correct_answer="TRUE",
+        )
+        db.add(question)
+        db.commit()
+        for answer in ["TRUE", "FALSE", "TRUE", "TRUE", "FALSE", "TRUE"]:
+            response = authenticated_client.post("/api/questions/submit", json={
+                "question_id": question.id,
+                "user_answer": answer,
+                "response_time_ms": 4000,
+            })
+            assert response.status_code == 200
+
+        live = db.query(UserSkillMastery).one()
+        expected = (live.mastery_probability, live.attempts_count, live.correct_count)
+        live.mastery_probability = 0.3
+        live.attempts_count = 0
+        db.commit()
+
+        report = rebuild_skill_masteries(db)
+
+        db.refresh(live)
+        assert report == {"users": 1, "created": 0, "updated": 1}
+        assert (live.mastery_probability, live.attempts_count, live.correct_count) == expected
+        assert live.avg_response_time_ms == 4000
+
+
+def _simulate_bkt(params, n_sequences, length, seed=0):
+    rng = np.random.default_rng(seed)
+    known = rng.random(n_sequences) < params.p_init
+    sequence_ids, outcomes = [], []
+    for _ in range(length):
+        p_correct = np.where(known, 1 - params.p_slip, params.p_guess)
+        sequence_ids.append(np.arange(n_sequences))
+        outcomes.append(rng.random(n_sequences) < p_correct)
+        known |= rng.random(n_sequences) < params.p_learn
+    return np.stack(sequence_ids, axis=1).reshape(-1), np.stack(outcomes, axis=1).reshape(-1)
+
+
+class TestBKTFitting:
+    """Offline per-skill parameter fitting."""
+
+    def test_fit_recovers_simulated_params(self):
+        true_params = BKTParams(p_init=0.35, p_learn=0.12, p_guess=0.22, p_slip=0.08)
+        sequence_ids, outcomes = _simulate_bkt(true_params, n_sequences=5000, length=25)
+
+        fit = fit_skill(SkillSequences(1, sequence_ids, outcomes))
+
+        assert fit.log_likelihood >= fit.default_log_likelihood
+        assert fit.params.p_init == pytest.approx(true_params.p_init, abs=0.08)
+        assert fit.params.p_learn == pytest.approx(true_params.p_learn, abs=0.05)
+        assert fit.params.p_guess == pytest.approx(true_params.p_guess, abs=0.05)
+        assert fit.params.p_slip == pytest.approx(true_params.p_slip, abs=0.05)
+
+    @staticmethod
+    def _add_attempts(db):
+        users = [User(email=f"fit{i}@example.com", username=f"fit{i}", password_hash="x") for i in range(4)]
+        skills = [Skill(name=f"Skill {i}", category="TF_NG") for i in range(2)]
+        db.add_all(users + skills)
+        db.flush()
+        questions = [
+            Question(skill_id=skill.id, passage="P", question_text="Q", question_type="TF_NG", correct_answer="A")
+            for skill in skills
+        ]
+        db.add_all(questions)
+        db.flush()
+        rng = random.Random(3)
+        history = {}
+        for _ in range(300):
+            user = rng.choice(users)
+            question = rng.choice(questions)
+            is_correct = rng.random() < 0.6
+            db.add(Attempt(
+                user_id=user.id, question_id=question.id, user_answer="A",
+                is_correct=is_correct, response_time_ms=1000,
+            ))
+            history.setdefault(question.skill_id, {}).setdefault(user.id, []).append(is_correct)
+        db.commit()
+        return history
+
+    def test_streaming_groups_by_skill_and_user_across_chunks(self, db):
+        history = self._add_attempts(db)
+
+        streamed = list(iter_skill_sequences(db, chunk_size=7, max_sequence_length=20))
+
+        assert [sequences.skill_id for sequences in streamed] == sorted(history)
+        for sequences in streamed:
+            expected = [outcomes[:20] for _, outcomes in sorted(history[sequences.skill_id].items())]
+            actual = [
+                sequences.outcomes[sequences.sequence_ids == sequence_id].tolist()
+                for sequence_id in range(sequences.n_sequences)
+            ]
+            assert actual == expected
+
+    def test_fit_all_skills_persists_params_used_by_tracer(self, db):
+        self._add_attempts(db)
+
+        fits = fit_all_skills(db, chunk_size=50, min_attempts=1)
+
+        assert len(fits) == 2
+        for fit in fits:
+            skill = db.get(Skill, fit.skill_id)
+            assert skill.bkt_p_learn == fit.params.p_learn
+            assert skill.bkt_log_likelihood == pytest.approx(fit.log_likelihood)
+            assert skill.bkt_fit_attempts == fit.attempts
+            assert knowledge_tracer.params_for_skill(db, fit.skill_id) == fit.params
+        assert knowledge_tracer.params_for_skill(db, -1) is knowledge_tracer.params
@@ -0,0 +1,120 @@
+"""Tests for the in-memory leaderboard, keyset pagination and rank lookups."""
+
+from datetime import datetime, timedelta
+
+from app.models import Attempt, Question, Skill, User
+from app.services.leaderboard import Leaderboard, RankIndex, window_start
+
+
+def _users(db, xps):
+    users = [
+        User(email=f"player{index}@example.com", username=f"player{index}", password_hash="x", xp=xp, level=1)
+        for index, xp in enumerate(xps)
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def _question(db):
+    skill = Skill(name="True/False/Not Given", category="TF_NG")
+    db.add(skill)
+    db.flush()
+    question = Question(
+        skill_id=skill.id,
+        passage="Bees communicate by dancing.",
+        question_text="Bees communicate by dancing.",
+        question_type="TF_NG",
+        correct_answer="True",
+        explanation="The passage states it directly.",
+    )
+    db.add(question)
+    db.commit()
+    return question
+
+
+def test_rank_index_orders_by_score_then_id():
+    index = RankIndex()
+    index.load([(5, 100), (2, 300), (9, 100), (4, 0)])
+
+    assert [row[1:] for row in index.slice(0, 4)] == [(2, 300), (5, 100), (9, 100), (4, 0)]
+    assert index.rank(9) == 3
+
+    index.add(4, 250)
+    index.set(2, 50)
+    assert [index.rank(user_id) for user_id in (5, 9, 4, 2)] == [2, 3, 1, 4]
+    assert [row[1] for row in index.after(100, 5, 10)] == [9, 2]
+    assert index.rank(77) is None
+
+
+def test_leaderboard_pages_with_keyset_cursor(client, db):
+    _users(db, [50, 400, 400, 10, 900])
+
+    first = client.get("/api/gamification/leaderboard?limit=2")
+    assert first.status_code == 200
+    assert [(entry["rank"], entry["username"], entry["xp"]) for entry in first.json()] == [
+        (1, "player4", 900), (2, "player1", 400),
+    ]
+    second = client.get(f"/api/gamification/leaderboard?limit=2&cursor={first.headers['x-next-cursor']}")
+    assert [entry["username"] for entry in second.json()] == ["player2", "player0"]
+    last = client.get(f"/api/gamification/leaderboard?limit=2&cursor={second.headers['x-next-cursor']}")
+    assert [entry["rank"] for entry in last.json()] == [5]
+    assert "x-next-cursor" not in last.headers
+
+    assert client.get("/api/gamification/leaderboard?cursor=bogus").status_code == 400
+    assert client.get("/api/gamification/leaderboard?window=daily").status_code == 422
+
+
+def test_my_rank_and_neighbours_follow_submitted_answers(authenticated_client, db):
+    _users(db, [15, 12, 5])
+    question = _question(db)
+
+    before = authenticated_client.get("/api/gamification/leaderboard/me?radius=1").json()
+    assert before["rank"] == 4
+    assert before["total"] == 4
+    assert [entry["username"] for entry in before["entries"]] == ["player2", "testuser"]
+
+    response = authenticated_client.post("/api/questions/submit", json={
+        "question_id": question.id, "user_answer": "True", "response_time_ms": 3000,
+    })
+    new_xp = response.json()["new_xp"]
+    assert new_xp > 15
+
+    after = authenticated_client.get("/api/gamification/leaderboard/me?radius=1").json()
+    assert after["rank"] == 1
+    assert after["xp"] == new_xp
+    assert [entry["username"] for entry in after["entries"]] == ["testuser", "player0"]
+
+    weekly = authenticated_client.get("/api/gamification/leaderboard/me?window=weekly").json()
+    assert weekly["rank"] == 1
+    assert weekly["xp"] == response.json()["xp_earned"]
+
+
+def test_windowed_boards_sum_attempt_xp_in_period(client, db):
+    players = _users(db, [1000, 0, 0])
+    question = _question(db)
+    now = datetime.utcnow()
+    old = window_start("monthly", now) - timedelta(days=1)
+    db.add_all([
+        Attempt(user_id=players[0].id, question_id=question.id, user_answer="True", is_correct=True,
+                response_time_ms=1000, xp_earned=500, created_at=old),
+        Attempt(user_id=players[1].id, question_id=question.id, user_answer="True", is_correct=True,
+                response_time_ms=1000, xp_earned=40, created_at=now),
+        Attempt(user_id=players[2].id, question_id=question.id, user_answer="True", is_correct=True,
+                response_time_ms=1000, xp_earned=25, created_at=now),
+    ])
+    db.commit()
+
+    monthly = client.get("/api/gamification/leaderboard?window=monthly").json()
+    assert [(entry["username"], entry["xp"]) for entry in monthly] == [("player1", 40), ("player2", 25)]
+    all_time = client.get("/api/gamification/leaderboard?window=all&limit=1").json()
+    assert all_time[0]["username"] == "player0"
+
+
+def test_board_load_streams_without_changing_the_session_connection(db):
+    _users(db, [30, 20, 10])
+
+    entries, _ = Leaderboard().page(db, limit=2)
+
+    assert [entry["xp"] for entry in entries] == [30, 20]
+    assert "yield_per" not in db.connection().get_execution_options()
@@ -0,0 +1,117 @@
+"""Range and conditional-GET tests for listening audio."""
+
+import uuid
+
+import pytest
+
+from app.models import Question, Skill
+from app.routers.listening import AUDIO_DIR
+from app.services.audio_streaming import listening_audio_cache
+
+
+AUDIO = bytes(range(256)) * 40  # 10,240 bytes
+
+
+@pytest.fixture
+def audio_question(db):
+    filename = f"test-{uuid.uuid4().hex}.mp3"
+    path = AUDIO_DIR / filename
+    path.write_bytes(AUDIO)
+    skill = Skill(name="Form Completion", category="LISTENING_FORM")
+    db.add(skill)
+    db.flush()
+    question = Question(
+        skill_id=skill.id,
+        module="LISTENING",
+        question_text="What is the caller's surname?",
+        question_type="FILL_BLANK",
+        correct_answer="Smith",
+        audio_url=filename,
+    )
+    db.add(question)
+    db.commit()
+    try:
+        yield question.id
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def _url(question_id: int) -> str:
+    return f"/api/listening/audio/{question_id}"
+
+
+def test_full_response_has_validators_and_cache_headers(authenticated_client, audio_question):
+    response = authenticated_client.get(_url(audio_question))
+
+    assert response.status_code == 200
+    assert response.content == AUDIO
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["last-modified"].endswith("GMT")
+    assert response.headers["cache-control"].startswith("private, max-age=")
+    assert response.headers["content-length"] == str(len(AUDIO))
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=100-199", 100, 199),
+    ("bytes=10000-", 10000, len(AUDIO) - 1),
+    ("bytes=-40", len(AUDIO) - 40, len(AUDIO) - 1),
+    ("bytes=10200-99999", 10200, len(AUDIO) - 1),
+])
+def test_byte_ranges_return_partial_content(authenticated_client, audio_question, header, start, end):
+    response = authenticated_client.get(_url(audio_question), headers={"Range": header})
+
+    assert response.status_code == 206
+    assert response.content == AUDIO[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(AUDIO)}"
+
+
+def test_unsatisfiable_and_ignored_ranges(authenticated_client, audio_question):
+    unsatisfiable = authenticated_client.get(_url(audio_question), headers={"Range": "bytes=20000-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(AUDIO)}"
+
+    multiple = authenticated_client.get(_url(audio_question), headers={"Range": "bytes=0-1,5-6"})
+    assert multiple.status_code == 200
+    assert multiple.content == AUDIO
+
+
+def test_conditional_requests(authenticated_client, audio_question):
+    first = authenticated_client.get(_url(audio_question))
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+    assert authenticated_client.get(_url(audio_question), headers={"If-None-Match": etag}).status_code == 304
+    assert authenticated_client.get(
+        _url(audio_question), headers={"If-Modified-Since": last_modified}
+    ).status_code == 304
+
+    current = authenticated_client.get(_url(audio_question), headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert current.status_code == 206
+    stale = authenticated_client.get(_url(audio_question), headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == AUDIO
+
+
+def test_repeated_chunk_requests_skip_question_query(authenticated_client, audio_question, sql_counter):
+    authenticated_client.get(_url(audio_question), headers={"Range": "bytes=0-1023"})
+
+    sql_counter.reset()
+    hits = listening_audio_cache.stats()["hits"]
+    for offset in range(1024, 4096, 1024):
+        response = authenticated_client.get(
+            _url(audio_question), headers={"Range": f"bytes={offset}-{offset + 1023}"}
+        )
+        assert response.status_code == 206
+
+    assert not [sql for sql in sql_counter.sql if "FROM questions" in sql]
+    assert listening_audio_cache.stats()["hits"] == hits + 3
+
+
+def test_missing_audio_is_not_found(authenticated_client, audio_question, db):
+    assert authenticated_client.get(_url(audio_question + 999)).status_code == 404
+
+    db.get(Question, audio_question).audio_url = None
+    db.commit()
+    listening_audio_cache.invalidate(audio_question)
+
+    assert authenticated_client.get(_url(audio_question)).status_code == 404
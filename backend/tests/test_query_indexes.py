@@ -0,0 +1,109 @@
+"""The planner serves the hot query patterns from their composite indexes."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.models import Attempt, MistakeReview, Question, Skill, User, UserSkillMastery
+from app.models.models import UserVocabulary
+from app.services.gamification import check_and_unlock_skills
+
+
+HOT_QUERIES = [
+    (
+        "ix_attempts_user_created",
+        select(Attempt.question_id).where(Attempt.user_id == 1).order_by(Attempt.created_at.desc()).limit(20),
+    ),
+    (
+        "ix_attempts_user_question",
+        select(Attempt.id).where(Attempt.user_id == 1, Attempt.question_id == 7),
+    ),
+    (
+        "ix_mistake_reviews_user_resolved_created",
+        select(MistakeReview)
+        .where(MistakeReview.user_id == 1, MistakeReview.is_resolved == False)  # noqa: E712
+        .order_by(MistakeReview.created_at.desc()),
+    ),
+    (
+        "sqlite_autoindex_user_skill_masteries",  # backs uq_user_skill_mastery_user_skill
+        select(UserSkillMastery).where(UserSkillMastery.user_id == 1, UserSkillMastery.skill_id == 2),
+    ),
+    (
+        "ix_questions_module_active_skill",
+        select(Question.id).where(
+            Question.module == "READING",
+            Question.is_active == True,  # noqa: E712
+            Question.approved == True,  # noqa: E712
+            Question.skill_id == 2,
+        ),
+    ),
+    (
+        "ix_user_vocabulary_user_next_review",
+        select(UserVocabulary).where(
+            UserVocabulary.user_id == 1, UserVocabulary.next_review_at <= datetime(2026, 7, 7),
+        ),
+    ),
+]
+
+
+def _query_plan(db, statement) -> str:
+    compiled = statement.compile(dialect=db.get_bind().dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize("index_name, statement", HOT_QUERIES, ids=[name for name, _ in HOT_QUERIES])
+def test_hot_queries_use_their_composite_index(db, index_name, statement):
+    plan = _query_plan(db, statement)
+    assert index_name in plan, plan
+    assert "USE TEMP B-TREE" not in plan, plan  # ORDER BY is served by the index too
+
+
+def test_skill_mastery_is_unique_per_user_and_skill(db):
+    user = User(email="mastery@example.com", username="mastery", password_hash="x")
+    skill = Skill(name="Skimming", category="READING")
+    db.add_all([user, skill])
+    db.flush()
+    db.add(UserSkillMastery(user_id=user.id, skill_id=skill.id))
+    db.flush()
+
+    db.add(UserSkillMastery(user_id=user.id, skill_id=skill.id))
+    with pytest.raises(IntegrityError):
+        db.flush()
+    db.rollback()
+
+
+def test_unlock_races_with_a_concurrent_child_mastery_insert(db):
+    user = User(email="unlock@example.com", username="unlock", password_hash="x")
+    parent = Skill(name="Scanning", category="READING", mastery_threshold=0.8)
+    db.add_all([user, parent])
+    db.flush()
+    child = Skill(name="Detail Scanning", category="READING", parent_skill_id=parent.id)
+    db.add(child)
+    db.flush()
+    db.add(UserSkillMastery(user_id=user.id, skill_id=parent.id, mastery_probability=0.9))
+    db.commit()
+
+    raced = []
+
+    def load_masteries_then_lose_the_race(state):
+        entities = [column["entity"] for column in state.statement.column_descriptions] if state.is_select else []
+        if raced or UserSkillMastery not in entities:
+            return None
+        raced.append(True)
+        loaded = state.invoke_statement().freeze()
+        # Another request's first attempt on the child skill commits a locked row meanwhile
+        state.session.execute(insert(UserSkillMastery).values(user_id=user.id, skill_id=child.id, is_unlocked=False))
+        return loaded()
+
+    event.listen(db, "do_orm_execute", load_masteries_then_lose_the_race)
+    try:
+        assert check_and_unlock_skills(db, user.id) == [child.id]
+    finally:
+        event.remove(db, "do_orm_execute", load_masteries_then_lose_the_race)
+
+    rows = db.query(UserSkillMastery).filter(UserSkillMastery.skill_id == child.id).all()
+    assert [row.is_unlocked for row in rows] == [True]
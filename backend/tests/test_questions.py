@@ -76,3 +76,66 @@ class TestGetCategories:
         response = client.get("/api/questions/categories")
         
         assert response.status_code == 401
+
+
+class TestSubmitPipeline:
+    """The submission pipeline stages every side effect into one commit."""
+
+    @staticmethod
+    def _create_question(db):
+        from app.models import Question, Skill
+
+        skill = Skill(name="True/False/Not Given", category="TF_NG")
+        db.add(skill)
+        db.flush()
+        question = Question(
+            skill_id=skill.id,
+            passage="Bees communicate by dancing.",
+            question_text="Bees communicate by dancing.",
+            question_type="TF_NG",
+            correct_answer="True",
+            explanation="The passage states it directly.",
+        )
+        db.add(question)
+        db.commit()
+        return question.id
+
+    @pytest.mark.parametrize("path", ["/api/questions/submit", "/api/practice/submit"])
+    def test_submit_commits_once(self, authenticated_client, db, sql_counter, path):
+        """Each answer persists attempt, mastery, mistake and metrics in one commit."""
+        from app.models import Attempt, DashboardMetric, MistakeReview, UserSkillMastery
+
+        question_id = self._create_question(db)
+        sql_counter.reset()
+
+        response = authenticated_client.post(path, json={
+            "question_id": question_id,
+            "user_answer": "False",
+            "response_time_ms": 4000,
+        })
+
+        assert response.status_code == 200
+        assert response.json()["is_correct"] is False
+        assert response.json()["created_at"]
+        assert sql_counter.commits == 1
+        assert db.query(Attempt).count() == 1
+        assert db.query(MistakeReview).count() == 1
+        assert db.query(UserSkillMastery).one().attempts_count == 1
+        assert db.query(DashboardMetric).one().total_attempts == 1
+
+    def test_correct_answer_updates_xp_and_streak(self, authenticated_client, db):
+        """XP and streak changes are committed with the attempt."""
+        question_id = self._create_question(db)
+
+        response = authenticated_client.post("/api/questions/submit", json={
+            "question_id": question_id,
+            "user_answer": "True",
+            "response_time_ms": 3000,
+        })
+
+        data = response.json()
+        assert data["is_correct"] is True
+        assert data["new_streak"] == 1
+        profile = authenticated_client.get("/api/gamification/profile").json()
+        assert profile["xp"] == data["new_xp"] > 0
+        assert profile["current_streak"] == 1
@@ -0,0 +1,77 @@
+"""Tests for shared rate limit storage selection and the SQLite counter backend."""
+
+import multiprocessing
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+from slowapi import Limiter
+
+from app.config import Settings
+from app.middleware.rate_limit_storage import DEFAULT_SQLITE_PATH, SQLiteStorage, rate_limit_storage_uri
+from app.middleware.rate_limiter import get_user_identifier, setup_rate_limiter
+
+
+def _hammer(uri, attempts, results):
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+    item = parse("50/minute")
+    results.put(sum(limiter.hit(item, "user:1") for _ in range(attempts)))
+
+
+def test_storage_uri_prefers_explicit_setting_then_redis():
+    assert rate_limit_storage_uri(Settings(rate_limit_storage="memory://", redis_url="redis://r:6379/0")) == "memory://"
+    assert rate_limit_storage_uri(Settings(rate_limit_storage="", redis_url="redis://r:6379/0")) == "redis://r:6379/0"
+    assert rate_limit_storage_uri(Settings(rate_limit_storage="", redis_url=None)) == f"sqlite:///{DEFAULT_SQLITE_PATH}"
+
+
+def test_sqlite_sliding_window_is_shared_between_storage_instances(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'limits.sqlite3'}"
+    first = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+    second = SlidingWindowCounterRateLimiter(SQLiteStorage(uri))
+    item = parse("3/minute")
+
+    assert [first.hit(item, "ip:1"), second.hit(item, "ip:1"), first.hit(item, "ip:1")] == [True, True, True]
+    assert not second.hit(item, "ip:1")
+    assert second.hit(item, "ip:2")
+    assert first.get_window_stats(item, "ip:1").remaining == 0
+
+    first.clear(item, "ip:1")
+    assert second.hit(item, "ip:1")
+
+    fixed = FixedWindowRateLimiter(storage_from_string(uri))
+    assert fixed.hit(item, "ip:3", cost=3) and not fixed.hit(item, "ip:3")
+
+
+def test_sqlite_storage_enforces_one_budget_across_processes(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'limits.sqlite3'}"
+    SQLiteStorage(uri)
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_hammer, args=(uri, 30, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert sum(results.get(timeout=5) for _ in workers) == 50
+
+
+def test_app_limiter_throttles_with_sqlite_storage(tmp_path):
+    app = FastAPI()
+    limiter = Limiter(
+        key_func=get_user_identifier,
+        storage_uri=f"sqlite:///{tmp_path / 'limits.sqlite3'}",
+        strategy="sliding-window-counter",
+    )
+    setup_rate_limiter(app)
+    app.state.limiter = limiter
+
+    @app.get("/ping")
+    @limiter.limit("2/minute")
+    def ping(request: Request):
+        return {"ok": True}
+
+    with TestClient(app) as client:
+        assert [client.get("/ping").status_code for _ in range(3)] == [200, 200, 429]
@@ -0,0 +1,72 @@
+"""Tests for per-user rate limit keys, cost-weighted AI limits and throttle counters."""
+
+import pytest
+from limits.storage import MemoryStorage
+from limits.strategies import SlidingWindowCounterRateLimiter
+from slowapi.wrappers import LimitGroup
+
+from app.config import get_settings
+from app.middleware.rate_limiter import limiter
+from app.services.auth import create_access_token
+
+ESSAY = {"task_type": "task2", "prompt_text": "Discuss parks.", "essay_text": "Parks matter. " * 30}
+
+
+@pytest.fixture
+def enforced_limits(monkeypatch):
+    """Turn the app limiter on with fresh per-test counters."""
+    monkeypatch.setattr(limiter, "enabled", True)
+    monkeypatch.setattr(limiter, "_limiter", SlidingWindowCounterRateLimiter(MemoryStorage()))
+    return limiter
+
+
+def _bearer(user_id):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+def test_default_limit_is_keyed_by_token_user_not_ip(client, enforced_limits, monkeypatch, sql_counter):
+    monkeypatch.setattr(limiter, "_default_limits", [
+        LimitGroup("3/minute", limiter._key_func, None, False, None, None, None, 1, False),
+    ])
+
+    sql_counter.reset()
+    # Tokens for users that don't exist: identity comes from the JWT alone, without a DB hit
+    first = [client.get("/health", headers=_bearer(101)).status_code for _ in range(4)]
+    assert sql_counter.statements == 0
+    second = [client.get("/health", headers=_bearer(102)).status_code for _ in range(3)]
+    anonymous = [client.get("/health").status_code for _ in range(3)]
+    forged = client.get("/health", headers={"Authorization": "Bearer not-a-token"}).status_code
+
+    assert first == [200, 200, 200, 429]
+    assert second == [200, 200, 200]
+    assert anonymous == [200, 200, 200]
+    assert forged == 429  # an invalid token falls back to the (exhausted) client IP bucket
+
+
+def test_ai_routes_share_a_cost_weighted_budget(authenticated_client, enforced_limits):
+    statuses = [authenticated_client.post("/api/writing/jobs", json=ESSAY).status_code for _ in range(11)]
+
+    # HEAVY_LIMIT is 20 tokens a minute and an essay evaluation costs 2
+    assert statuses == [202] * 10 + [429]
+    generator = authenticated_client.post("/api/generator/reading", json={"url": "https://example.com/a"})
+    assert generator.status_code == 429
+
+
+def test_admin_sees_throttled_requests_per_route(client, enforced_limits, monkeypatch):
+    monkeypatch.setenv("ADMIN_EMAILS", "admin@example.com")
+    get_settings.cache_clear()
+    client.post("/api/auth/signup", json={
+        "email": "admin@example.com", "username": "limitadmin", "password": "AdminPass123",
+    })
+    token = client.post("/api/auth/login/json", json={
+        "email": "admin@example.com", "password": "AdminPass123",
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for _ in range(11):
+        client.post("/api/writing/jobs", json=ESSAY, headers=headers)
+
+    stats = client.get("/api/admin/rate-limit-stats", headers=headers).json()
+    assert stats["enabled"] is True
+    assert stats["throttled"] == 1
+    assert stats["by_route"] == {"POST /api/writing/jobs": 1}
+    assert stats["by_limit"] == {"20 per 1 minute": 1}
@@ -66,6 +66,21 @@ def test_admin_email_matching_trims_whitespace_and_ignores_case(client, monkeypa
     assert response.status_code == 200
 
 
+def test_admin_cache_stats_exposes_identity_counters(client, monkeypatch):
+    monkeypatch.setenv("ADMIN_EMAILS", "admin@example.com")
+    get_settings.cache_clear()
+    token = _signup_and_login(client, "admin@example.com", "adminuser")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/api/admin/dashboard", headers=headers)
+
+    response = client.get("/api/admin/cache-stats", headers=headers)
+
+    assert response.status_code == 200
+    stats = response.json()["user_identity"]
+    assert stats["hits"] >= 1
+    assert {"misses", "hit_rate", "size", "evictions"} <= set(stats)
+
+
 def test_csv_config_parsing_trims_empty_values():
     assert parse_csv_setting(" http://a.test, ,http://b.test ") == ["http://a.test", "http://b.test"]
     assert Settings(backend_cors_origins=" http://localhost:3000, https://example.com ").cors_origins == [
@@ -233,3 +248,16 @@ def test_generator_endpoint_returns_400_for_redirect_to_localhost(client, monkey
 
     assert response.status_code == 400
     assert "private or internal" in response.json()["detail"]
+
+
+def test_admin_worker_stats_exposes_password_hasher_queue(client, monkeypatch):
+    monkeypatch.setenv("ADMIN_EMAILS", "admin@example.com")
+    get_settings.cache_clear()
+    token = _signup_and_login(client, "admin@example.com", "workeradmin")
+
+    response = client.get("/api/admin/worker-stats", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    stats = response.json()["password_hasher"]
+    assert stats["completed"] >= 2
+    assert {"queued", "running", "max_queued", "rejected", "avg_wait_ms", "p99_wait_ms"} <= set(stats)
@@ -0,0 +1,199 @@
+"""Resident Whisper transcription engine tests."""
+
+import asyncio
+import threading
+
+from app.ml.transcription import SAMPLE_RATE, TranscriptionEngine
+
+
+class FakeBackend:
+    """Stands in for the whisper package; each path names the clip length in seconds."""
+
+    loads = 0
+
+    def __init__(self, gate: threading.Event | None = None):
+        self.gate = gate
+        self.batches = []
+
+    def load_model(self, name):
+        FakeBackend.loads += 1
+        return f"model:{name}"
+
+    def load_audio(self, path):
+        if path == "broken":
+            raise RuntimeError("ffmpeg failed")
+        return [0.0] * int(float(path) * SAMPLE_RATE)
+
+    def transcribe(self, model, audio):
+        if self.gate is not None:
+            self.gate.wait(5)
+        return f"{model} single {len(audio) // SAMPLE_RATE}s"
+
+    def transcribe_batch(self, model, audios):
+        self.batches.append(len(audios))
+        return [f"{model} batch {len(audio) // SAMPLE_RATE}s" for audio in audios]
+
+
+def _engine(backend, **kwargs) -> TranscriptionEngine:
+    FakeBackend.loads = 0
+    return TranscriptionEngine("base", backend_factory=lambda: backend, **kwargs)
+
+
+def test_model_is_loaded_once_and_stats_report_timings():
+    engine = _engine(FakeBackend())
+
+    async def run():
+        return await asyncio.gather(*(engine.transcribe("2") for _ in range(5)))
+
+    try:
+        texts = asyncio.run(run())
+    finally:
+        engine.shutdown()
+
+    assert texts == ["model:base single 2s"] * 5
+    assert FakeBackend.loads == 1
+    stats = engine.stats()
+    assert stats["loaded"] and stats["load_seconds"] is not None
+    assert (stats["completed"], stats["failed"], stats["rejected"]) == (5, 0, 0)
+    assert stats["real_time_factor"] is not None and stats["real_time_factor"] < 1
+    assert stats["avg_wait_ms"] >= 0 and stats["p95_wait_ms"] >= 0
+
+
+def test_short_clips_are_batched_and_long_clips_run_alone():
+    backend = FakeBackend()
+    engine = _engine(backend, batch_size=4, batch_window_sec=0.5)
+
+    futures = [engine.submit(path) for path in ("3", "4", "45", "5")]
+    try:
+        texts = [future.result(timeout=5) for future in futures]
+    finally:
+        engine.shutdown()
+
+    assert texts == [
+        "model:base batch 3s", "model:base batch 4s", "model:base single 45s", "model:base batch 5s",
+    ]
+    assert backend.batches == [3]
+    assert engine.stats()["batches"] == 1
+
+
+def test_full_queue_rejects_and_failures_return_none():
+    gate = threading.Event()
+    engine = _engine(FakeBackend(gate), max_queue=1)
+
+    try:
+        first = engine.submit("1")
+        # Wait until the worker holds the first clip so the queue slot is free again.
+        while engine.stats()["queued"]:
+            threading.Event().wait(0.01)
+        second = engine.submit("1")
+        assert engine.submit("1") is None
+        gate.set()
+        assert first.result(timeout=5) and second.result(timeout=5)
+        assert asyncio.run(engine.transcribe("broken")) is None
+    finally:
+        gate.set()
+        engine.shutdown()
+
+    stats = engine.stats()
+    assert (stats["completed"], stats["failed"], stats["rejected"]) == (2, 1, 1)
+
+
+def test_missing_whisper_package_disables_engine():
+    def missing():
+        raise ImportError("No module named 'whisper'")
+
+    engine = TranscriptionEngine("base", backend_factory=missing)
+
+    assert asyncio.run(engine.transcribe("1")) is None
+    assert engine.stats()["available"] is False
+
+
+def test_cancelled_request_is_dropped_and_worker_keeps_serving():
+    gate = threading.Event()
+    engine = _engine(FakeBackend(gate))
+
+    async def run():
+        first = asyncio.create_task(engine.transcribe("1"))
+        while engine.stats()["queued"]:
+            await asyncio.sleep(0.01)  # the worker holds the first clip, blocked on the gate
+        cancelled = asyncio.create_task(engine.transcribe("2"))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        await asyncio.sleep(0.01)  # let the cancellation reach the queued concurrent Future
+        gate.set()
+        return await first, await asyncio.wait_for(engine.transcribe("3"), timeout=5)
+
+    try:
+        first, after = asyncio.run(run())
+    finally:
+        gate.set()
+        engine.shutdown()
+
+    assert (first, after) == ("model:base single 1s", "model:base single 3s")
+    stats = engine.stats()
+    assert (stats["completed"], stats["cancelled"], stats["failed"]) == (2, 1, 0)
+
+
+def test_average_wait_counts_every_request_past_the_recent_window():
+    engine = _engine(FakeBackend())
+    engine._recent_waits = type(engine._recent_waits)(maxlen=2)
+
+    futures = [engine.submit("1") for _ in range(6)]
+    try:
+        for future in futures:
+            future.result(timeout=5)
+    finally:
+        engine.shutdown()
+
+    with engine._lock:
+        expected = engine.wait_seconds_total / 6 * 1000
+    assert engine.stats()["avg_wait_ms"] == round(expected, 2)
+
+
+class SlowBackend(FakeBackend):
+    """Model load and batch decode take measurable time."""
+
+    def load_model(self, name):
+        threading.Event().wait(0.2)
+        return super().load_model(name)
+
+    def transcribe_batch(self, model, audios):
+        threading.Event().wait(0.1)
+        return super().transcribe_batch(model, audios)
+
+
+def test_real_time_factor_excludes_model_load_and_splits_batch_time():
+    engine = _engine(SlowBackend(), batch_size=4, batch_window_sec=0.5)
+
+    futures = [engine.submit("10") for _ in range(4)]
+    try:
+        for future in futures:
+            future.result(timeout=5)
+    finally:
+        engine.shutdown()
+
+    stats = engine.stats()
+    # One ~0.1s batch over 40s of audio; the 0.2s model load is not inference time
+    assert 0.1 / 40 <= stats["real_time_factor"] < 0.2 / 40
+    assert stats["last_real_time_factor"] < 0.2 / 40
+
+
+def test_shutdown_with_a_full_queue_does_not_hang():
+    gate = threading.Event()
+    engine = _engine(FakeBackend(gate), max_queue=2)
+
+    running = engine.submit("1")
+    while engine.stats()["queued"]:
+        threading.Event().wait(0.01)
+    queued = [engine.submit("1"), engine.submit("1")]
+    stopper = threading.Thread(target=engine.shutdown)
+    stopper.start()
+    stopper.join(0.2)
+    gate.set()
+    stopper.join(5)
+
+    assert not stopper.is_alive()
+    assert running.result(timeout=5) == "model:base single 1s"
+    # The oldest queued clip makes room for the stop marker; the one behind it still runs
+    assert isinstance(queued[0].exception(timeout=5), RuntimeError)
+    assert queued[1].result(timeout=5) == "model:base single 1s"